@@ -30,6 +30,38 @@ class DjangoEvolutionSettings:
         2.2
 
     Attributes:
+        BACKFILL_CHUNK_SIZE:
+            The number of rows to populate per transaction when backfilling
+            initial values for new or changed columns.
+
+            If set, initial values will be set in ranges of primary keys of
+            this size, each in its own transaction, with the ``NOT NULL``
+            constraint applied only once all rows have been populated. This
+            avoids holding locks on every row of large tables for the
+            duration of a single ``UPDATE``.
+
+            If ``None``, all rows will be updated in a single statement.
+
+            Type:
+                int
+
+            Version Added:
+                3.0
+
+        CONCURRENT_INDEXES:
+            Whether to create and drop indexes without blocking writes to
+            the table.
+
+            This is only supported on Postgres, where indexes will be
+            managed using ``CREATE INDEX CONCURRENTLY`` and
+            ``DROP INDEX CONCURRENTLY`` outside of a transaction.
+
+            Type:
+                bool
+
+            Version Added:
+                3.0
+
         CUSTOM_EVOLUTIONS:
             A mapping of app labels to lists of custom evolution modules.
 
@@ -49,6 +81,128 @@ class DjangoEvolutionSettings:
             Type:
                 bool
 
+        LOCK_TIMEOUT:
+            The maximum number of seconds that each SQL statement will wait
+            to acquire locks when applying evolutions.
+
+            DDL statements waiting on a lock held by a long-running query
+            also block all other queries on the table queued behind them.
+            Setting a timeout causes the statement to fail quickly instead,
+            allowing it to be retried (see ``LOCK_TIMEOUT_RETRIES``).
+
+            This is supported on Postgres (``lock_timeout``) and MySQL
+            (``lock_wait_timeout``, in whole seconds).
+
+            If ``None``, the database's default will be used.
+
+            Type:
+                float
+
+            Version Added:
+                3.0
+
+        LOCK_TIMEOUT_RETRIES:
+            The number of times to retry SQL that failed due to
+            ``LOCK_TIMEOUT``.
+
+            A failed transaction will be rolled back and retried from the
+            start. Statements run outside of a transaction, or on databases
+            that can't roll back schema changes, will be retried
+            individually.
+
+            Type:
+                int
+
+            Version Added:
+                3.0
+
+        LOCK_TIMEOUT_RETRY_DELAY:
+            The base number of seconds to wait before retrying SQL that failed
+            due to ``LOCK_TIMEOUT``.
+
+            This doubles after each attempt, with random jitter applied, so
+            that retries don't line up with other waiting queries.
+
+            Type:
+                float
+
+            Version Added:
+                3.0
+
+        MAX_BLOCKING_TABLE_ROWS:
+            The maximum estimated number of rows in a table that evolutions
+            may rewrite, or scan or index while blocking writes.
+
+            Before evolving, the SQL for each pending operation is checked
+            against the database's statistics. If any operation would
+            rewrite a larger table, or block writes to one while scanning or
+            indexing it, the evolution will fail before any SQL is run,
+            rather than risk a long outage.
+
+            This can be overridden by the ``--allow-rewrite`` option to
+            :command:`evolve`. Tables the database has no statistics for
+            aren't checked.
+
+            If ``None``, operations won't be checked.
+
+            Type:
+                int
+
+            Version Added:
+                3.0
+
+        MYSQL_ONLINE_DDL:
+            The policy for performing ``ALTER TABLE`` statements online on
+            MySQL and MariaDB.
+
+            If set, each ``ALTER TABLE`` statement will request
+            ``ALGORITHM=INSTANT``, or ``ALGORITHM=INPLACE, LOCK=NONE``,
+            when every operation in the statement supports it. The database
+            will then fail the statement rather than fall back to a blocking
+            table copy, unless the policy is ``'prefer'``.
+
+            For statements that can't be performed online, this controls
+            what happens:
+
+            ``'prefer'``:
+                The statement will be run without requesting an algorithm,
+                and a warning will be logged. If the database refuses the
+                requested algorithm for a statement when it's run (for
+                instance, due to the table's row format or indexes), the
+                statement will be run again without requesting one.
+
+            ``'require'``:
+                The statement will request ``ALGORITHM=COPY``, and the
+                evolution will fail before any SQL is run. The SQL can still
+                be reviewed.
+
+            If ``None``, no algorithm will be requested.
+
+            Type:
+                str
+
+            Version Added:
+                3.0
+
+        PREPARE_WORKERS:
+            The number of worker threads used to prepare evolutions for
+            apps.
+
+            When greater than 1, the pending mutations for each app will be
+            simulated and their SQL generated concurrently, once the
+            project signature has been updated for all apps. The results
+            are merged in the same order as they would be when preparing
+            apps one at a time.
+
+            This can be overridden by the ``--prepare-workers`` option to
+            :command:`evolve`.
+
+            Type:
+                int
+
+            Version Added:
+                3.0
+
         RENAMED_FIELD_TYPES:
             A mapping for fields that have been moved or renamed. This will map
             the old path to the new one, for purposes of loading and validating
@@ -59,13 +213,59 @@ class DjangoEvolutionSettings:
 
             Version Added:
                 2.4
+
+        SQL_BATCH_SIZE:
+            The maximum number of SQL statements to send to the database in
+            a single round trip when applying evolutions.
+
+            This reduces the number of round trips when applying many
+            schema changes over a high-latency connection. Only statements
+            without parameters that run in a transaction will be combined.
+            If a combined statement fails, its statements will be run
+            individually to find the one that failed.
+
+            This is only supported on Postgres.
+
+            If ``None``, each statement will be sent separately.
+
+            Type:
+                int
+
+            Version Added:
+                3.0
+
+        TWO_PHASE_CONSTRAINTS:
+            Whether to add constraints without blocking writes to the table
+            while existing rows are validated.
+
+            This is only supported on Postgres. Check and foreign key
+            constraints will be added as ``NOT VALID`` and then validated in
+            a separate transaction using ``VALIDATE CONSTRAINT``. On
+            Postgres 12+, ``NOT NULL`` will be set after validating an
+            equivalent check constraint.
+
+            Type:
+                bool
+
+            Version Added:
+                3.0
     """
 
     #: Default settings for all keys.
     _DEFAULTS = {
+        'BACKFILL_CHUNK_SIZE': None,
+        'CONCURRENT_INDEXES': False,
         'CUSTOM_EVOLUTIONS': {},
         'ENABLED': True,
+        'LOCK_TIMEOUT': None,
+        'LOCK_TIMEOUT_RETRIES': 3,
+        'LOCK_TIMEOUT_RETRY_DELAY': 1.0,
+        'MAX_BLOCKING_TABLE_ROWS': None,
+        'MYSQL_ONLINE_DDL': None,
+        'PREPARE_WORKERS': 1,
         'RENAMED_FIELD_TYPES': {},
+        'SQL_BATCH_SIZE': None,
+        'TWO_PHASE_CONSTRAINTS': False,
     }
 
     #: All valid settings in settings.DJANGO_EVOLUTION.
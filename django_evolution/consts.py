@@ -26,3 +26,78 @@ class EvolutionsSource:
 
     #: The evolutions are provided custom by the project.
     PROJECT = 'project'
+
+
+# TODO: Replace with StrEnum once we're on Python 3.11+
+class DatabaseEvolutionStatus:
+    """The result of evolving one of several databases.
+
+    Version Added:
+        3.0
+    """
+
+    #: Evolutions were applied to the database.
+    EVOLVED = 'evolved'
+
+    #: Evolving the database failed.
+    FAILED = 'failed'
+
+    #: The database was not evolved, due to a failure on another database.
+    SKIPPED = 'skipped'
+
+    #: The database was already up-to-date.
+    UP_TO_DATE = 'up-to-date'
+
+
+# TODO: Replace with StrEnum once we're on Python 3.11+
+class DDLCost:
+    """The cost of an SQL statement on an existing table.
+
+    Costs are listed from least to most expensive.
+
+    Version Added:
+        3.0
+    """
+
+    #: Only the table's metadata is changed. Existing rows are untouched.
+    METADATA_ONLY = 'metadata-only'
+
+    #: Existing rows are read (such as to validate a constraint), but not
+    #: written.
+    SCAN = 'scan'
+
+    #: Existing rows are written in small batches, each in its own
+    #: transaction. Access to the table isn't blocked while this runs.
+    BATCHED_WRITE = 'batched-write'
+
+    #: An index is built from the existing rows.
+    INDEX_BUILD = 'index-build'
+
+    #: Every existing row is rewritten, or copied into a new table.
+    REWRITE = 'rewrite'
+
+    #: All costs, ordered from least to most expensive.
+    ORDER = (METADATA_ONLY, SCAN, BATCHED_WRITE, INDEX_BUILD, REWRITE)
+
+
+# TODO: Replace with StrEnum once we're on Python 3.11+
+class DDLLockLevel:
+    """The access to a table blocked while an SQL statement runs.
+
+    Lock levels are listed from least to most restrictive.
+
+    Version Added:
+        3.0
+    """
+
+    #: Reads and writes to the table are allowed.
+    NONE = 'none'
+
+    #: Reads are allowed, but writes to the table are blocked.
+    WRITE = 'write'
+
+    #: Both reads and writes to the table are blocked.
+    EXCLUSIVE = 'exclusive'
+
+    #: All lock levels, ordered from least to most restrictive.
+    ORDER = (NONE, WRITE, EXCLUSIVE)
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import copy
+import functools
 import logging
+import re
 from collections import defaultdict
 from typing import TYPE_CHECKING
 
@@ -11,6 +13,8 @@ import django
 from django.db import connection as default_connection, models
 
 from django_evolution import support
+from django_evolution.conf import django_evolution_settings
+from django_evolution.consts import DDLCost, DDLLockLevel
 from django_evolution.db.sql_result import AlterTableSQLResult, SQLResult
 from django_evolution.errors import EvolutionNotImplementedError
 from django_evolution.support import supports_index_feature
@@ -24,9 +28,11 @@ from django_evolution.utils.db import (
     sql_delete_index,
     sql_indexes_for_field,
     sql_indexes_for_fields,
+    sql_validate_constraints,
     truncate_name,
 )
 from django_evolution.utils.models import iter_non_m2m_reverse_relations
+from django_evolution.utils.sql import ChunkedSQL, NewTransactionSQL
 
 if TYPE_CHECKING:
     from django_evolution.db.state import DatabaseState
@@ -67,10 +73,20 @@ class BaseEvolutionOperations:
         'unique_together': True,
     }
 
+    # Operations whose Alter Table rules can be combined with adjacent
+    # operations into a single ALTER TABLE statement.
+    #
+    # Version Changed:
+    #     3.0:
+    #     ``delete_column`` is now mergeable, so adjacent column deletions on
+    #     a table share one ALTER TABLE (or one table rebuild on SQLite).
+    #     Previously, a missing comma joined ``'change_meta'`` and
+    #     ``'delete_column'`` into a single entry, so neither was mergeable.
+    #     ``change_meta`` is still left out on purpose, since its SQL isn't
+    #     made up of ALTER TABLE rules and can't be reordered around them.
     mergeable_ops = (
         'add_column',
         'change_column',
-        'change_meta'
         'delete_column',
     )
 
@@ -99,6 +115,137 @@ class BaseEvolutionOperations:
     #:     bool
     change_column_type_sets_attrs = True
 
+    #: Whether indexes can be created and dropped without blocking writes.
+    #:
+    #: If ``True``, and ``settings.DJANGO_EVOLUTION['CONCURRENT_INDEXES']``
+    #: is enabled, index operations will be performed concurrently.
+    #:
+    #: Version Added:
+    #:     3.0
+    #:
+    #: Type:
+    #:     bool
+    supports_concurrent_indexes = False
+
+    #: Whether constraints can be added before existing rows are validated.
+    #:
+    #: If ``True``, and ``settings.DJANGO_EVOLUTION['TWO_PHASE_CONSTRAINTS']``
+    #: is enabled, constraints will be added without validation and then
+    #: validated separately, without blocking writes to the table.
+    #:
+    #: Version Added:
+    #:     3.0
+    #:
+    #: Type:
+    #:     bool
+    supports_two_phase_constraints = False
+
+    #: Whether ALTER TABLE rules can be merged across SQL results.
+    #:
+    #: If ``True``, :py:meth:`merge_alter_table_sql_results` will combine
+    #: compatible Alter Table operations for a table that were generated by
+    #: different mutations into a single ALTER TABLE statement.
+    #:
+    #: Version Added:
+    #:     3.0
+    #:
+    #: Type:
+    #:     bool
+    supports_alter_table_merging = True
+
+    #: Whether multiple statements can be executed in a single round trip.
+    #:
+    #: If ``True``, and ``settings.DJANGO_EVOLUTION['SQL_BATCH_SIZE']`` is
+    #: set, consecutive statements without parameters in a transaction will
+    #: be sent to the database together, using
+    #: :py:meth:`get_multi_statement_sql`.
+    #:
+    #: Version Added:
+    #:     3.0
+    #:
+    #: Type:
+    #:     bool
+    supports_multi_statement_sql = False
+
+    #: The name of the savepoint used when executing multiple statements.
+    #:
+    #: Version Added:
+    #:     3.0
+    #:
+    #: Type:
+    #:     str
+    _MULTI_STATEMENT_SAVEPOINT_NAME = 'django_evolution_multi'
+
+    #: Primary key field types that can be used to backfill in chunks.
+    #:
+    #: Version Added:
+    #:     3.0
+    #:
+    #: Type:
+    #:     set of str
+    _CHUNKED_BACKFILL_PK_TYPES = {
+        'AutoField',
+        'BigAutoField',
+        'BigIntegerField',
+        'IntegerField',
+        'PositiveBigIntegerField',
+        'PositiveIntegerField',
+        'PositiveSmallIntegerField',
+        'SmallAutoField',
+        'SmallIntegerField',
+    }
+
+    #: Patterns for statements affecting a table, and their costs.
+    #:
+    #: Each pattern must capture the affected table as ``table``.
+    #:
+    #: Version Added:
+    #:     3.0
+    #:
+    #: Type:
+    #:     list of tuple
+    _SQL_STATEMENT_COSTS = [
+        (re.compile(r'^CREATE\s+(?:UNIQUE\s+)?INDEX\s+(?:CONCURRENTLY\s+)?'
+                    r'(?:IF\s+NOT\s+EXISTS\s+)?\S+\s+ON\s+(?:ONLY\s+)?'
+                    r'(?P<table>\S+)',
+                    re.I),
+         DDLCost.INDEX_BUILD),
+        (re.compile(r'^CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?'
+                    r'(?P<table>[^\s(]+)',
+                    re.I),
+         DDLCost.METADATA_ONLY),
+        (re.compile(r'^DROP\s+TABLE\s+(?:IF\s+EXISTS\s+)?(?P<table>\S+)',
+                    re.I),
+         DDLCost.METADATA_ONLY),
+        (re.compile(r'^DROP\s+INDEX\s+(?:CONCURRENTLY\s+)?'
+                    r'(?:IF\s+EXISTS\s+)?\S+(?:\s+ON\s+(?P<table>\S+))?',
+                    re.I),
+         DDLCost.METADATA_ONLY),
+        (re.compile(r'^RENAME\s+TABLE\s+(?P<table>\S+)', re.I),
+         DDLCost.METADATA_ONLY),
+        (re.compile(r'^UPDATE\s+(?P<table>\S+)', re.I),
+         DDLCost.REWRITE),
+
+        # Tables rebuilt by copying rows into a new table are attributed to
+        # the table being copied.
+        (re.compile(r'^INSERT\s+INTO\s+\S+.*?\bSELECT\b.*?\bFROM\s+'
+                    r'(?P<table>[^\s;]+)',
+                    re.I | re.S),
+         DDLCost.REWRITE),
+    ]
+
+    #: The pattern for an ALTER TABLE statement.
+    #:
+    #: Version Added:
+    #:     3.0
+    #:
+    #: Type:
+    #:     re.Pattern
+    _ALTER_TABLE_RE = re.compile(
+        r'^ALTER\s+TABLE\s+(?:ONLY\s+)?(?:IF\s+EXISTS\s+)?(?P<table>\S+)'
+        r'\s+(?P<clauses>.*)$',
+        re.I | re.S)
+
     alter_table_sql_result_cls = AlterTableSQLResult
 
     def __init__(
@@ -165,6 +312,332 @@ class BaseEvolutionOperations:
         """
         return True
 
+    def get_add_column_default_is_instant(self, field):
+        """Return whether adding a column with a constant default is instant.
+
+        Some databases can add a ``NOT NULL`` column with a constant
+        ``DEFAULT`` by only updating table metadata, without rewriting or
+        scanning existing rows. When this returns ``True``,
+        :py:meth:`add_column` will prefer a constant default over populating
+        the column through an ``UPDATE``.
+
+        By default, this returns ``False``. Subclasses should override this
+        if the database supports this.
+
+        Version Added:
+            3.0
+
+        Args:
+            field (django.db.models.Field):
+                The field being added.
+
+        Returns:
+            bool:
+            ``True`` if the column can be added with a constant default
+            without a table rewrite. ``False`` if it cannot.
+        """
+        return False
+
+    def get_alter_table_options(self, model, alter_table_items):
+        """Return options to append to an ALTER TABLE statement.
+
+        This is called for each ``ALTER TABLE`` statement built from
+        Alter Table operations, and allows databases to append options
+        (such as the algorithm or locking behavior to use) based on the
+        operations in the statement.
+
+        By default, this returns no options.
+
+        Version Added:
+            3.0
+
+        Args:
+            model (type):
+                The model representing the table being altered.
+
+            alter_table_items (list of dict):
+                The Alter Table operations making up the statement.
+
+        Returns:
+            list of str:
+            The options to append to the statement.
+        """
+        return []
+
+    def get_sql_statement_cost(self, sql):
+        """Return the table affected by an SQL statement, and its cost.
+
+        This is used to estimate the impact of evolutions before they're
+        applied. Statements that create, drop, or rename tables and indexes,
+        update rows, copy rows into a rebuilt table, or alter a table are
+        recognized. Costs for ``ALTER TABLE`` statements are determined by
+        :py:meth:`get_alter_table_clause_cost`.
+
+        Version Added:
+            3.0
+
+        Args:
+            sql (str or tuple):
+                The SQL statement, or a tuple of the statement and its
+                parameters.
+
+        Returns:
+            tuple:
+            A 2-tuple containing:
+
+            1. The name of the affected table (:py:class:`str`), or
+               ``None`` if unknown.
+            2. The cost of the statement (:py:class:`str`, from
+               :py:class:`~django_evolution.consts.DDLCost`), or ``None``
+               if unknown.
+        """
+        if isinstance(sql, tuple):
+            sql = sql[0]
+
+        sql = sql.strip().rstrip(';')
+
+        for regex, cost in self._SQL_STATEMENT_COSTS:
+            m = regex.match(sql)
+
+            if m:
+                return self._normalize_sql_table_name(m.group('table')), cost
+
+        m = self._ALTER_TABLE_RE.match(sql)
+
+        if not m:
+            return None, None
+
+        costs = [
+            cost
+            for cost in (
+                self.get_alter_table_clause_cost(clause)
+                for clause in self._split_alter_table_clauses(
+                    m.group('clauses'))
+            )
+            if cost is not None
+        ]
+
+        if costs:
+            cost = max(costs, key=DDLCost.ORDER.index)
+        else:
+            cost = None
+
+        return self._normalize_sql_table_name(m.group('table')), cost
+
+    def get_sql_statement_costs(self, statements):
+        """Return the costs of a sequence of SQL statements.
+
+        This is used to estimate the impact of statements that will be
+        executed in order, allowing the cost of a statement to depend on the
+        statements that ran before it.
+
+        By default, each statement's cost is determined independently by
+        :py:meth:`get_sql_statement_cost`.
+
+        Subclasses can override this to account for statements that make
+        later statements cheaper.
+
+        Version Added:
+            3.0
+
+        Args:
+            statements (list):
+                The SQL statements, in execution order. Each is a string or
+                a tuple of the statement and its parameters.
+
+        Returns:
+            list of tuple:
+            A list containing the result of :py:meth:`get_sql_statement_cost`
+            for each statement.
+        """
+        return [
+            self.get_sql_statement_cost(sql)
+            for sql in statements
+        ]
+
+    def get_alter_table_clause_cost(self, clause):
+        """Return the cost of a clause in an ALTER TABLE statement.
+
+        By default, adding a ``NOT NULL`` column with a default value is
+        considered a rewrite, changing a column's type or definition is a
+        rewrite, and adding a unique or primary key constraint is an index
+        build. Adding other constraints or making a column ``NOT NULL``
+        requires a scan, unless the constraint is ``NOT VALID``. Renames,
+        drops, and other column changes only affect metadata.
+
+        Subclasses can override this to provide more accurate costs for the
+        database.
+
+        Version Added:
+            3.0
+
+        Args:
+            clause (str):
+                A single clause from the statement, such as
+                ``ADD COLUMN ...``.
+
+        Returns:
+            str:
+            The cost of the clause (from
+            :py:class:`~django_evolution.consts.DDLCost`), or ``None`` if
+            unknown.
+        """
+        clause = ' '.join(clause.upper().split())
+
+        if clause.startswith(('RENAME ', 'DROP ')):
+            return DDLCost.METADATA_ONLY
+        elif clause.startswith('VALIDATE '):
+            return DDLCost.SCAN
+        elif clause.startswith(('ADD CONSTRAINT ', 'ADD UNIQUE ',
+                                'ADD PRIMARY KEY ', 'ADD FOREIGN KEY ',
+                                'ADD CHECK ', 'ADD INDEX ', 'ADD KEY ')):
+            if 'NOT VALID' in clause:
+                return DDLCost.METADATA_ONLY
+            elif ('UNIQUE' in clause or
+                  'PRIMARY KEY' in clause or
+                  clause.startswith(('ADD INDEX ', 'ADD KEY '))):
+                return DDLCost.INDEX_BUILD
+            else:
+                return DDLCost.SCAN
+        elif clause.startswith('ADD '):
+            if 'PRIMARY KEY' in clause or 'UNIQUE' in clause:
+                return DDLCost.INDEX_BUILD
+            elif 'NOT NULL' in clause and 'DEFAULT' in clause:
+                return DDLCost.REWRITE
+            else:
+                return DDLCost.METADATA_ONLY
+        elif clause.startswith('ALTER '):
+            if ' TYPE ' in clause:
+                return DDLCost.REWRITE
+            elif 'SET NOT NULL' in clause:
+                return DDLCost.SCAN
+            else:
+                return DDLCost.METADATA_ONLY
+        elif clause.startswith(('MODIFY ', 'CHANGE ')):
+            return DDLCost.REWRITE
+
+        return None
+
+    def get_sql_statement_lock_level(self, sql):
+        """Return the access to a table blocked by an SQL statement.
+
+        By default, altering, dropping, or renaming a table blocks both reads
+        and writes. Creating an index (unless done concurrently) and updating
+        or copying rows block writes. Creating a table doesn't block access to
+        any existing table.
+
+        This doesn't take into account how long the lock is held. Use
+        :py:meth:`get_sql_statement_cost` for that.
+
+        Subclasses can override this to provide more accurate lock levels for
+        the database.
+
+        Version Added:
+            3.0
+
+        Args:
+            sql (str or tuple):
+                The SQL statement, or a tuple of the statement and its
+                parameters.
+
+        Returns:
+            str:
+            The lock level (from
+            :py:class:`~django_evolution.consts.DDLLockLevel`).
+        """
+        if isinstance(sql, tuple):
+            sql = sql[0]
+
+        sql = ' '.join(sql.upper().split())
+
+        if sql.startswith(('CREATE INDEX CONCURRENTLY ',
+                           'CREATE UNIQUE INDEX CONCURRENTLY ',
+                           'DROP INDEX CONCURRENTLY ')):
+            return DDLLockLevel.NONE
+        elif sql.startswith(('CREATE INDEX ', 'CREATE UNIQUE INDEX ',
+                             'INSERT ', 'UPDATE ')):
+            return DDLLockLevel.WRITE
+        elif sql.startswith(('ALTER TABLE ', 'DROP INDEX ', 'DROP TABLE ',
+                             'RENAME TABLE ')):
+            return DDLLockLevel.EXCLUSIVE
+
+        return DDLLockLevel.NONE
+
+    def get_sql_statement_policies_enabled(self):
+        """Return whether any policies may disallow SQL statements.
+
+        If enabled, planned statements will be checked with
+        :py:meth:`get_sql_statement_policy_error` before evolving.
+
+        By default, no policies are enabled. Subclasses can override this
+        along with :py:meth:`get_sql_statement_policy_error`.
+
+        Version Added:
+            3.0
+
+        Returns:
+            bool:
+            ``True`` if statements should be checked against policies.
+            ``False`` if they should not.
+        """
+        return False
+
+    def get_sql_statement_policy_error(self, sql):
+        """Return why an SQL statement is disallowed by a policy.
+
+        Evolutions containing disallowed statements will fail before any
+        SQL is run. This is only called if
+        :py:meth:`get_sql_statement_policies_enabled` returns ``True``.
+
+        By default, no statements are disallowed.
+
+        Version Added:
+            3.0
+
+        Args:
+            sql (str or tuple):
+                The SQL statement, or a tuple of the statement and its
+                parameters.
+
+        Returns:
+            str:
+            The reason the statement is disallowed, or ``None`` if it's
+            allowed.
+        """
+        return None
+
+    def get_table_stats(self, table_names):
+        """Return estimated row counts and sizes for tables.
+
+        These are estimates from the database's own statistics, and are
+        used to show the impact of evolutions before they're applied. Tables
+        that don't exist, or that the database has no statistics for, will
+        not be included.
+
+        By default, no statistics are available, and this returns an empty
+        dictionary. Subclasses should override this if the database
+        maintains statistics.
+
+        Version Added:
+            3.0
+
+        Args:
+            table_names (list of str):
+                The names of the tables.
+
+        Returns:
+            dict:
+            A dictionary mapping table names to a dictionary containing:
+
+            ``rows`` (:py:class:`int`):
+                The estimated number of rows, or ``None`` if unknown.
+
+            ``size`` (:py:class:`int`):
+                The estimated size of the table in bytes, or ``None`` if
+                unknown.
+        """
+        return {}
+
     def get_deferrable_sql(self):
         """Return the SQL for marking a reference as deferrable.
 
@@ -329,6 +802,39 @@ class BaseEvolutionOperations:
         This will process each operation one-by-one, generating default SQL,
         using generate_table_op_sql().
         """
+        sql = []
+
+        for sql_result in self.generate_table_ops_sql_results(mutator, ops):
+            sql.extend(sql_result.to_sql())
+
+        return sql
+
+    def generate_table_ops_sql_results(
+        self,
+        mutator: ModelMutator,
+        ops,
+    ) -> list[SQLResult]:
+        """Generate SQL results for a sequence of mutation operations.
+
+        This will process each operation one-by-one, using
+        :py:meth:`generate_table_op_sql`, and return the resulting SQL
+        results without flattening them. This allows callers to merge
+        results generated by different mutators.
+
+        Version Added:
+            3.0
+
+        Args:
+            mutator (django_evolution.mutators.model_mutator.ModelMutator):
+                The mutator that owns the operations.
+
+            ops (list of dict):
+                The operations to generate SQL for.
+
+        Returns:
+            list of django_evolution.db.sql_result.SQLResult:
+            The SQL results for the operations.
+        """
         sql_results = []
         prev_sql_result = None
         prev_op = None
@@ -343,12 +849,128 @@ class BaseEvolutionOperations:
 
             prev_op = op
 
-        sql = []
+        return sql_results
+
+    def merge_alter_table_sql_results(
+        self,
+        sql_results: list[SQLResult],
+    ) -> list[SQLResult]:
+        """Merge compatible Alter Table operations across SQL results.
+
+        Each group of adjacent mutations on a model generates its own
+        ALTER TABLE statements. When mutations (or evolutions in the same
+        batch) for a table are interleaved with mutations on other tables,
+        each group would normally result in another ALTER TABLE, which on
+        some databases means another copy of the table.
+
+        This moves Alter Table operations from later results into an
+        earlier ALTER TABLE statement for the same table, when this can be
+        done safely. Operations are only moved if the later result:
+
+        * Has no SQL that must run before its ALTER TABLE.
+        * Only contains operations on named columns that aren't already
+          touched by the earlier statement, and that aren't marked as
+          ``independent``.
+        * Doesn't refer to any of the tables changed by SQL between the
+          two statements.
+
+        Any SQL between the two statements must also not refer to the table.
+        Any remaining SQL from the later result is left in place.
+
+        Whether SQL refers to a table is determined by searching its text
+        (and the columns, types, and parameters of Alter Table operations)
+        for the table's name, case-insensitively. This errs on the side of
+        not merging, since any mention of the name (even in a column name or
+        a string) counts as a reference. SQL that can't be inspected, such as
+        SQL generated at execution time, or SQL results that aren't Alter
+        Table results, stop any merging across them. SQL that affects a
+        table without naming it (for instance, through a trigger or stored
+        procedure called from custom SQL) can't be detected.
+
+        Merging only happens within the list of results passed in. Callers
+        pass the results from a single
+        :py:class:`~django_evolution.mutators.app_mutator.AppMutator`, which
+        covers the mutations for one app in an evolution batch. Operations
+        are never merged across apps or batches.
+
+        Version Added:
+            3.0
+
+        Args:
+            sql_results (list of django_evolution.db.sql_result.SQLResult):
+                The SQL results to merge, in execution order.
+
+        Returns:
+            list of django_evolution.db.sql_result.SQLResult:
+            The resulting list of SQL results.
+        """
+        if not self.supports_alter_table_merging:
+            return sql_results
+
+        new_sql_results = []
+
+        # Each table maps to the earlier result that can accept further
+        # Alter Table operations, along with the columns that result touches
+        # and the tables changed since.
+        targets = {}
 
         for sql_result in sql_results:
-            sql.extend(sql_result.to_sql())
+            if not isinstance(sql_result, AlterTableSQLResult):
+                # This is SQL we know nothing about, such as custom SQL
+                # from a mutation. Nothing can be moved before it.
+                targets.clear()
+                new_sql_results.append(sql_result)
+                continue
 
-        return sql
+            table_name = sql_result.model._meta.db_table
+            target_info = targets.get(table_name)
+
+            if (target_info is not None and
+                not sql_result.pre_sql and
+                self._can_merge_alter_table_items(
+                    items=sql_result.alter_table,
+                    columns=target_info['columns'],
+                    tables=target_info['tables'])):
+                # Move these operations into the earlier ALTER TABLE, and
+                # leave the rest of the SQL where it was.
+                target_info['sql_result'].add_alter_table(
+                    sql_result.alter_table)
+                target_info['columns'].update(
+                    item['column']
+                    for item in sql_result.alter_table
+                )
+
+                sql_result = SQLResult(sql=sql_result.sql,
+                                       post_sql=sql_result.post_sql)
+
+                if sql_result.sql or sql_result.post_sql:
+                    new_sql_results.append(sql_result)
+                    self._update_alter_table_merge_targets(
+                        targets=targets,
+                        sql_result=sql_result,
+                        table_name=table_name)
+            else:
+                new_sql_results.append(sql_result)
+                targets.pop(table_name, None)
+                self._update_alter_table_merge_targets(
+                    targets=targets,
+                    sql_result=sql_result,
+                    table_name=table_name)
+
+                if self._can_merge_alter_table_items(
+                    items=sql_result.alter_table,
+                    columns=set(),
+                    tables=set()):
+                    targets[table_name] = {
+                        'columns': {
+                            item['column']
+                            for item in sql_result.alter_table
+                        },
+                        'sql_result': sql_result,
+                        'tables': set(),
+                    }
+
+        return new_sql_results
 
     def generate_table_op_sql(self, mutator, op, prev_sql_result, prev_op):
         """Generates SQL for a single mutation operation.
@@ -537,6 +1159,21 @@ class BaseEvolutionOperations:
         can_set_initial = (remote_field is None and
                            initial is not None and
                            self.get_field_type_allows_default(field))
+        normalized_initial = None
+
+        if (can_set_initial and
+            callable(initial) and
+            self.get_add_column_default_is_instant(field)):
+            # The database can add a column with a constant default without
+            # touching existing rows. If the callable produces a constant
+            # value (rather than SQL to embed, which may reference other
+            # columns), use it as that default instead of populating the
+            # column through an UPDATE and then scanning it for NOT NULL.
+            normalized_initial = self.normalize_initial(initial)
+            value, embed_initial = normalized_initial
+
+            if not embed_initial and value is not None:
+                initial = value
 
         schema = self.build_column_schema(
             model=model,
@@ -555,23 +1192,14 @@ class BaseEvolutionOperations:
 
         if can_set_initial:
             if callable(initial):
-                initial, embed_initial = self.normalize_initial(initial)
-
-                set_sql = (
-                    'UPDATE %(table_name)s SET %(column_name)s = %%s'
-                    ' WHERE %(column_name)s IS NULL;'
-                    % {
-                        'column_name': qn(column_name),
-                        'table_name': qn(table_name),
-                    }
-                )
+                initial, embed_initial = (normalized_initial or
+                                          self.normalize_initial(initial))
 
-                if embed_initial:
-                    set_sql = set_sql % initial
-                else:
-                    set_sql = (set_sql, (initial,))
-
-                sql_result.add_sql([set_sql])
+                sql_result.add_sql(self.get_backfill_column_sql(
+                    model=model,
+                    column_name=column_name,
+                    initial=initial,
+                    embed_initial=embed_initial))
 
                 if not field.null:
                     # Now that we've set initial values, we can make this
@@ -601,6 +1229,119 @@ class BaseEvolutionOperations:
 
         return sql_result
 
+    def get_backfill_column_sql(self, model, column_name, initial,
+                                embed_initial):
+        """Return SQL for populating NULL values in a column.
+
+        By default, this is a single ``UPDATE`` covering every row in the
+        table.
+
+        If ``settings.DJANGO_EVOLUTION['BACKFILL_CHUNK_SIZE']`` is set and
+        the table has an integer primary key, rows will instead be updated
+        in ranges of primary keys, each in its own transaction. The ranges
+        are computed from the table at the time the SQL is executed, and
+        progress is logged as each range is updated. This is returned as a
+        :py:class:`~django_evolution.utils.sql.ChunkedSQL`, so that plans
+        can report it without computing the ranges.
+
+        Version Added:
+            3.0
+
+        Args:
+            model (type):
+                The model representing the table containing the column.
+
+            column_name (str):
+                The name of the column to populate.
+
+            initial (object):
+                The normalized initial value to set.
+
+            embed_initial (bool):
+                Whether ``initial`` is SQL to embed directly in the
+                statement, rather than a value to pass as a parameter.
+
+        Returns:
+            list:
+            The list of SQL statements for populating the column.
+        """
+        qn = self.connection.ops.quote_name
+        table_name = model._meta.db_table
+
+        update_sql = (
+            'UPDATE %(table_name)s SET %(column_name)s = %%s'
+            ' WHERE %(column_name)s IS NULL'
+            % {
+                'column_name': qn(column_name),
+                'table_name': qn(table_name),
+            }
+        )
+
+        if embed_initial:
+            update_sql = update_sql % initial
+            sql_params = None
+            full_sql = '%s;' % update_sql
+        else:
+            sql_params = (initial,)
+            full_sql = ('%s;' % update_sql, sql_params)
+
+        chunk_size = django_evolution_settings.BACKFILL_CHUNK_SIZE
+        pk = model._meta.pk
+
+        if (not chunk_size or
+            pk is None or
+            pk.get_internal_type() not in self._CHUNKED_BACKFILL_PK_TYPES):
+            return [full_sql]
+
+        pk_column = qn(pk.column)
+
+        def _build_chunks(cursor):
+            cursor.execute('SELECT MIN(%s), MAX(%s) FROM %s;'
+                           % (pk_column, pk_column, qn(table_name)))
+            min_pk, max_pk = cursor.fetchone()
+
+            if min_pk is None:
+                # There are no rows to populate.
+                return []
+
+            chunk_starts = range(min_pk, max_pk + 1, chunk_size)
+            num_chunks = len(chunk_starts)
+            statements = []
+
+            for chunk_num, chunk_start in enumerate(chunk_starts, start=1):
+                chunk_sql = (
+                    '%s AND %s >= %d AND %s < %d;'
+                    % (update_sql, pk_column, chunk_start, pk_column,
+                       chunk_start + chunk_size))
+
+                if sql_params is not None:
+                    chunk_sql = (chunk_sql, sql_params)
+
+                statements += [
+                    NewTransactionSQL([chunk_sql]),
+
+                    # Statements are prepared just ahead of being run, one
+                    # transaction at a time, so this is logged as each
+                    # chunk begins.
+                    functools.partial(_log_progress,
+                                      chunk_num=chunk_num,
+                                      num_chunks=num_chunks),
+                ]
+
+            return statements
+
+        def _log_progress(cursor, chunk_num, num_chunks):
+            logger.info('Backfilling %s.%s: chunk %d of %d',
+                        table_name, column_name, chunk_num, num_chunks)
+
+            return []
+
+        return [
+            ChunkedSQL(sql=full_sql,
+                       table_name=table_name,
+                       build_chunks=_build_chunks),
+        ]
+
     def set_field_null(self, model, field, null):
         if null:
             attr = 'DROP NOT NULL'
@@ -637,15 +1378,24 @@ class BaseEvolutionOperations:
         if index_state:
             return []
 
+        index_name = create_index_name(self.connection,
+                                       table_name,
+                                       field_names=[field.name],
+                                       col_names=[column])
+
         self.database_state.add_index(
             table_name=table_name,
-            index_name=create_index_name(self.connection,
-                                         table_name,
-                                         field_names=[field.name],
-                                         col_names=[column]),
+            index_name=index_name,
             columns=[column])
 
-        return SQLResult(sql_indexes_for_field(self.connection, model, field))
+        return self.get_create_index_sql_result(
+            model=model,
+            index_name=index_name,
+            sql=sql_indexes_for_field(
+                self.connection,
+                model,
+                field,
+                concurrently=self.get_concurrent_indexes_enabled()))
 
     def create_unique_index(self, model, index_name, fields):
         qn = self.connection.ops.quote_name
@@ -657,11 +1407,248 @@ class BaseEvolutionOperations:
             columns=self.get_column_names_for_fields(fields),
             unique=True)
 
-        return SQLResult([
-            'CREATE UNIQUE INDEX %s ON %s (%s);'
-            % (qn(index_name), qn(table_name),
-               ', '.join([qn(field.column) for field in fields])),
-        ])
+        if self.get_concurrent_indexes_enabled():
+            create_sql = 'CREATE UNIQUE INDEX CONCURRENTLY'
+        else:
+            create_sql = 'CREATE UNIQUE INDEX'
+
+        return self.get_create_index_sql_result(
+            model=model,
+            index_name=index_name,
+            sql=[
+                '%s %s ON %s (%s);'
+                % (create_sql, qn(index_name), qn(table_name),
+                   ', '.join([qn(field.column) for field in fields])),
+            ])
+
+    def get_concurrent_indexes_enabled(self):
+        """Return whether indexes should be created and dropped concurrently.
+
+        This requires both database support and
+        ``settings.DJANGO_EVOLUTION['CONCURRENT_INDEXES']`` to be enabled.
+
+        Version Added:
+            3.0
+
+        Returns:
+            bool:
+            ``True`` if index operations should be performed concurrently.
+            ``False`` if they should not.
+        """
+        return (self.supports_concurrent_indexes and
+                django_evolution_settings.CONCURRENT_INDEXES)
+
+    def get_two_phase_constraints_enabled(self):
+        """Return whether constraints should be validated separately.
+
+        This requires both database support and
+        ``settings.DJANGO_EVOLUTION['TWO_PHASE_CONSTRAINTS']`` to be enabled.
+
+        Version Added:
+            3.0
+
+        Returns:
+            bool:
+            ``True`` if constraints should be added without validation and
+            then validated in a separate transaction. ``False`` if they
+            should be validated when added.
+        """
+        return (self.supports_two_phase_constraints and
+                django_evolution_settings.TWO_PHASE_CONSTRAINTS)
+
+    def get_lock_timeout_sql(self, timeout, use_transaction):
+        """Return SQL to limit how long statements wait to acquire locks.
+
+        This is executed at the start of each batch of SQL statements when
+        ``settings.DJANGO_EVOLUTION['LOCK_TIMEOUT']`` is set.
+
+        By default, lock timeouts are not supported, and this returns no SQL.
+
+        Version Added:
+            3.0
+
+        Args:
+            timeout (float):
+                The maximum number of seconds to wait for a lock.
+
+            use_transaction (bool):
+                Whether the batch of statements is being run in a
+                transaction.
+
+        Returns:
+            list of str:
+            The SQL statements for setting the lock timeout.
+        """
+        return []
+
+    def get_reset_lock_timeout_sql(self, use_transaction):
+        """Return SQL to restore the lock timeout.
+
+        This is executed at the end of each batch of SQL statements that
+        set a lock timeout using :py:meth:`get_lock_timeout_sql`.
+
+        By default, this returns no SQL.
+
+        Version Added:
+            3.0
+
+        Args:
+            use_transaction (bool):
+                Whether the batch of statements was run in a transaction.
+
+        Returns:
+            list of str:
+            The SQL statements for restoring the lock timeout.
+        """
+        return []
+
+    def get_multi_statement_sql(self, statements):
+        """Return SQL for executing multiple statements in one round trip.
+
+        The statements are wrapped in a savepoint. If any statement fails,
+        the savepoint can be rolled back using
+        :py:meth:`get_multi_statement_rollback_sql`, allowing the statements
+        to be executed individually in order to find the one that failed.
+
+        Version Added:
+            3.0
+
+        Args:
+            statements (list of str):
+                The SQL statements to execute. These must not take
+                parameters.
+
+        Returns:
+            str:
+            The combined SQL.
+        """
+        savepoint_name = self._MULTI_STATEMENT_SAVEPOINT_NAME
+        sql = ['SAVEPOINT %s;' % savepoint_name]
+
+        for statement in statements:
+            if not statement.endswith(';'):
+                statement += ';'
+
+            sql.append(statement)
+
+        sql.append('RELEASE SAVEPOINT %s;' % savepoint_name)
+
+        return '\n'.join(sql)
+
+    def get_multi_statement_rollback_sql(self):
+        """Return SQL for rolling back failed multi-statement SQL.
+
+        Version Added:
+            3.0
+
+        Returns:
+            str:
+            The SQL for rolling back to the savepoint set by
+            :py:meth:`get_multi_statement_sql`.
+        """
+        return ('ROLLBACK TO SAVEPOINT %s;'
+                % self._MULTI_STATEMENT_SAVEPOINT_NAME)
+
+    def is_lock_timeout_error(self, error):
+        """Return whether an error was caused by a lock timeout.
+
+        Statements failing due to a lock timeout may be retried, based on
+        ``settings.DJANGO_EVOLUTION['LOCK_TIMEOUT_RETRIES']``.
+
+        By default, no errors are considered lock timeouts.
+
+        Version Added:
+            3.0
+
+        Args:
+            error (Exception):
+                The error raised when executing a statement.
+
+        Returns:
+            bool:
+            ``True`` if the error was caused by a lock timeout. ``False``
+            if it was not.
+        """
+        return False
+
+    def get_sql_statement_fallback(self, sql, error):
+        """Return a statement to run in place of one that failed.
+
+        This allows a statement requesting an optional behavior from the
+        database (such as a less-blocking algorithm) to be run again without
+        it, if the database rejected the request. The failed statement must
+        not have had any effect.
+
+        By default, no fallbacks are provided.
+
+        Version Added:
+            3.0
+
+        Args:
+            sql (str):
+                The SQL statement that failed.
+
+            error (Exception):
+                The error raised when executing the statement.
+
+        Returns:
+            str:
+            The SQL statement to run instead, or ``None`` if the error
+            should be raised.
+        """
+        return None
+
+    def get_create_index_sql_result(self, model, index_name, sql):
+        """Return the SQL result for creating an index.
+
+        This takes the SQL generated for creating an index and returns the
+        result to include in the evolution. Subclasses can override this to
+        control how the SQL is executed, or to add further statements.
+
+        Version Added:
+            3.0
+
+        Args:
+            model (django.db.models.Model):
+                The model the index is being created on.
+
+            index_name (str):
+                The name of the index being created.
+
+            sql (list):
+                The SQL statements for creating the index.
+
+        Returns:
+            django_evolution.db.sql_result.SQLResult:
+            The resulting SQL for creating the index.
+        """
+        return SQLResult(sql)
+
+    def get_drop_index_sql_result(self, model, index_name, sql):
+        """Return the SQL result for dropping an index.
+
+        This takes the SQL generated for dropping an index and returns the
+        result to include in the evolution. Subclasses can override this to
+        control how the SQL is executed, or to add further statements.
+
+        Version Added:
+            3.0
+
+        Args:
+            model (django.db.models.Model):
+                The model the index is being dropped from.
+
+            index_name (str):
+                The name of the index being dropped.
+
+            sql (list):
+                The SQL statements for dropping the index.
+
+        Returns:
+            django_evolution.db.sql_result.SQLResult:
+            The resulting SQL for dropping the index.
+        """
+        return SQLResult(sql)
 
     def drop_index(self, model, field):
         """Returns the SQL for dropping an index for a single field.
@@ -704,9 +1691,14 @@ class BaseEvolutionOperations:
         This can be overridden by subclasses if they use a syntax
         other than "DROP INDEX <name>;"
         """
-        return SQLResult(sql_delete_index(connection=self.connection,
-                                          model=model,
-                                          index_name=index_name))
+        return self.get_drop_index_sql_result(
+            model=model,
+            index_name=index_name,
+            sql=sql_delete_index(
+                connection=self.connection,
+                model=model,
+                index_name=index_name,
+                concurrently=self.get_concurrent_indexes_enabled()))
 
     def get_new_index_name(self, model, fields, unique=False):
         """Return a newly generated index name.
@@ -922,32 +1914,23 @@ class BaseEvolutionOperations:
     def change_column_attr_null(self, model, mutation, field, old_value,
                                 new_value):
         """Returns the SQL for changing a column's NULL/NOT NULL attribute."""
-        qn = self.connection.ops.quote_name
         initial = mutation.initial
-        opts = model._meta
         pre_sql = []
 
         if not new_value and initial is not None:
-            sql_prefix = (
-                'UPDATE %(table_name)s SET %(column_name)s = %%s'
-                ' WHERE %(column_name)s IS NULL;'
-                % {
-                    'table_name': qn(opts.db_table),
-                    'column_name': qn(field.column),
-                }
-            )
-
             initial, embed_initial = self.normalize_initial(initial)
 
-            if embed_initial:
-                update_sql = sql_prefix % initial
-            else:
-                update_sql = (sql_prefix, (initial,))
-
-            pre_sql.append(update_sql)
+            pre_sql += self.get_backfill_column_sql(
+                model=model,
+                column_name=field.column,
+                initial=initial,
+                embed_initial=embed_initial)
 
-        sql_result = self.set_field_null(model, field, new_value)
-        sql_result.add_pre_sql(pre_sql)
+        # Any initial values must be set before any SQL needed to change
+        # the column.
+        sql_result = self.alter_table_sql_result_cls(self, model,
+                                                     pre_sql=pre_sql)
+        sql_result.add(self.set_field_null(model, field, new_value))
 
         return sql_result
 
@@ -1389,8 +2372,15 @@ class BaseEvolutionOperations:
                 self.database_state.add_index(table_name=table_name,
                                               index_name=index_name,
                                               columns=columns)
-                sql_result.add(sql_indexes_for_fields(
-                    self.connection, model, fields, index_together=True))
+                sql_result.add(self.get_create_index_sql_result(
+                    model=model,
+                    index_name=index_name,
+                    sql=sql_indexes_for_fields(
+                        self.connection,
+                        model,
+                        fields,
+                        index_together=True,
+                        concurrently=self.get_concurrent_indexes_enabled())))
 
         return sql_result
 
@@ -1644,6 +2634,10 @@ class BaseEvolutionOperations:
         sql_result = SQLResult()
         table_name = model._meta.db_table
         db_state = self.database_state
+        index_sql_kwargs = {}
+
+        if self.get_concurrent_indexes_enabled():
+            index_sql_kwargs['concurrently'] = True
 
         with self.connection.schema_editor(collect_sql=True) as schema_editor:
             for index_info in to_remove:
@@ -1677,8 +2671,14 @@ class BaseEvolutionOperations:
                             'name': index_name,
                             'fields': list(index_field_names),
                         })
-                    sql_result.add('%s;' % index.remove_sql(model,
-                                                            schema_editor))
+                    sql_result.add(self.get_drop_index_sql_result(
+                        model=model,
+                        index_name=index_name,
+                        sql=[
+                            '%s;' % index.remove_sql(model,
+                                                     schema_editor,
+                                                     **index_sql_kwargs),
+                        ]))
 
                     db_state.remove_index(table_name=table_name,
                                           index_name=index_name)
@@ -1726,8 +2726,14 @@ class BaseEvolutionOperations:
                             columns=self.get_column_names_for_fields(
                                 fields or []))
 
-                        sql_result.add(
-                            '%s;' % index.create_sql(model, schema_editor))
+                        sql_result.add(self.get_create_index_sql_result(
+                            model=model,
+                            index_name=index.name,
+                            sql=[
+                                '%s;' % index.create_sql(model,
+                                                         schema_editor,
+                                                         **index_sql_kwargs),
+                            ]))
 
         return sql_result
 
@@ -1982,26 +2988,39 @@ class BaseEvolutionOperations:
                     seen_m2m_models.add(through._meta.db_table)
 
         for field_info in replaced_field_types.values():
-            old_rels = iter_non_m2m_reverse_relations(field_info['old_field'])
-            new_rels = iter_non_m2m_reverse_relations(field_info['new_field'])
-
-            for old_rel, new_rel in zip(old_rels, new_rels):
-                rel_to_model = old_rel.model
-                rel_from_model = old_rel.related_model
-                old_rel_field = old_rel.field
-                new_rel_field = new_rel.field
-
-                assert old_rel_field.column == new_rel_field.column
-                assert rel_to_model == new_rel.model
-                assert rel_from_model == new_rel.related_model
+            # The relations found point to the registered versions of the
+            # field. Each referencing field will be bound to the old and new
+            # fields being replaced, so that its old and new column types
+            # are based on them. Fields referencing those fields in turn
+            # are bound to the new referencing fields.
+            ref_targets = {}
+
+            for rel in iter_non_m2m_reverse_relations(
+                field_info['old_field']):
+                rel_to_model = rel.model
+                rel_from_model = rel.related_model
+                rel_field = rel.field
+
+                old_target_field, new_target_field = ref_targets.get(
+                    id(rel_field.target_field),
+                    (field_info['old_field'], field_info['new_field']))
+
+                old_rel_field = self._get_field_ref_for_target(
+                    ref_field=rel_field,
+                    target_field=old_target_field)
+                new_rel_field = self._get_field_ref_for_target(
+                    ref_field=rel_field,
+                    target_field=new_target_field)
+                ref_targets[id(rel_field)] = (old_rel_field, new_rel_field)
 
                 replaced_field_refs.append((rel_from_model,
                                             old_rel_field,
-                                            new_rel.field))
+                                            new_rel_field))
+
                 if (rel_from_model._meta.db_table not in seen_m2m_models and
                     db_state.has_model(rel_from_model)):
                     models_to_refs[rel_to_model].append(
-                        (rel_from_model, old_rel_field))
+                        (rel_from_model, rel_field))
 
         if models_to_refs:
             remove_refs = models_to_refs.copy()
@@ -2032,6 +3051,12 @@ class BaseEvolutionOperations:
 
         This requires a prior call to :py:meth:`stash_field_ref_constraints`.
 
+        Version Changed:
+            3.0:
+            If :py:meth:`get_two_phase_constraints_enabled` is ``True``, the
+            constraints will be added without validation, and then validated
+            in a new transaction.
+
         Args:
             stash (dict):
                 Stashed constraint data from
@@ -2098,12 +3123,26 @@ class BaseEvolutionOperations:
 
         if models_to_refs:
             add_refs = models_to_refs.copy()
+            two_phase = self.get_two_phase_constraints_enabled()
+            validate_sql = []
 
             for ref_model in models_to_refs:
+                if two_phase:
+                    validate_sql += sql_validate_constraints(
+                        connection=connection,
+                        model=ref_model,
+                        refs=add_refs)
+
                 sql_result.add_sql(sql_add_constraints(
                     connection=connection,
                     model=ref_model,
-                    refs=add_refs))
+                    refs=add_refs,
+                    not_valid=two_phase))
+
+            if validate_sql:
+                # Validate the existing rows in a new transaction, which
+                # won't block writes to the tables.
+                sql_result.add_sql([NewTransactionSQL(validate_sql)])
 
         return sql_result
 
@@ -2151,6 +3190,220 @@ class BaseEvolutionOperations:
         else:
             return 0
 
+    def _get_field_ref_for_target(self, ref_field, target_field):
+        """Return a copy of a relation field that points to another field.
+
+        This is used to compute the column type of a field referencing a
+        field being replaced, since that type is based on the referenced
+        field.
+
+        Version Added:
+            3.0
+
+        Args:
+            ref_field (django.db.models.ForeignKey):
+                The relation field referencing the field.
+
+            target_field (django.db.models.Field):
+                The field that the copy should reference.
+
+        Returns:
+            django.db.models.ForeignKey:
+            The copy of the relation field.
+        """
+        new_ref_field = copy.copy(ref_field)
+        new_ref_field.__dict__.update({
+            'foreign_related_fields': (target_field,),
+            'local_related_fields': (new_ref_field,),
+            'related_fields': ((new_ref_field, target_field),),
+            'reverse_related_fields': ((target_field, new_ref_field),),
+        })
+
+        return new_ref_field
+
+    def _normalize_sql_table_name(self, table_name):
+        """Return a table name from SQL without any quotes.
+
+        Version Added:
+            3.0
+
+        Args:
+            table_name (str):
+                The table name as it appears in the SQL, or ``None``.
+
+        Returns:
+            str:
+            The unquoted table name, or ``None`` if not provided.
+        """
+        if table_name is None:
+            return None
+
+        return table_name.strip('"`[]')
+
+    def _split_alter_table_clauses(self, sql):
+        """Split the clauses of an ALTER TABLE statement.
+
+        Clauses are separated by commas, ignoring any commas in parentheses
+        or quotes.
+
+        Version Added:
+            3.0
+
+        Args:
+            sql (str):
+                The SQL following the table name in the statement.
+
+        Returns:
+            list of str:
+            The clauses in the statement.
+        """
+        clauses = []
+        depth = 0
+        quote = None
+        start = 0
+
+        for i, c in enumerate(sql):
+            if quote:
+                if c == quote:
+                    quote = None
+            elif c in '\'"`':
+                quote = c
+            elif c == '(':
+                depth += 1
+            elif c == ')':
+                depth -= 1
+            elif c == ',' and depth == 0:
+                clauses.append(sql[start:i].strip())
+                start = i + 1
+
+        clauses.append(sql[start:].strip())
+
+        return [
+            clause
+            for clause in clauses
+            if clause
+        ]
+
+    def _can_merge_alter_table_items(self, items, columns, tables):
+        """Return whether Alter Table operations can be merged elsewhere.
+
+        Version Added:
+            3.0
+
+        Args:
+            items (list of dict):
+                The Alter Table operations to check.
+
+            columns (set of str):
+                Columns that the operations must not touch.
+
+            tables (set of str):
+                Table names that the operations must not refer to.
+
+        Returns:
+            bool:
+            ``True`` if the operations can be merged.
+        """
+        if not items:
+            return False
+
+        for item in items:
+            column = item.get('column')
+
+            if (not column or
+                item.get('independent', False) or
+                column in columns):
+                return False
+
+        if tables:
+            text = self._get_sql_text_for_merge(items=items)
+
+            if any(table_name.lower() in text for table_name in tables):
+                return False
+
+        return True
+
+    def _update_alter_table_merge_targets(self, targets, sql_result,
+                                          table_name):
+        """Update merge targets for SQL that runs after them.
+
+        Any target that the SQL may depend on or affect will be removed.
+        The remaining targets will record the SQL's table, so that later
+        operations depending on it won't be moved before it.
+
+        Version Added:
+            3.0
+
+        Args:
+            targets (dict):
+                The merge targets, keyed by table name.
+
+            sql_result (django_evolution.db.sql_result.SQLResult):
+                The SQL that will run after the targets.
+
+            table_name (str):
+                The name of the table the SQL applies to.
+        """
+        text = self._get_sql_text_for_merge(
+            items=getattr(sql_result, 'alter_table', []),
+            sql=sql_result.pre_sql + sql_result.sql + sql_result.post_sql)
+
+        for target_table_name, target_info in list(targets.items()):
+            if target_table_name == table_name:
+                continue
+
+            if text is None or target_table_name.lower() in text:
+                del targets[target_table_name]
+            else:
+                target_info['tables'].add(table_name)
+
+    def _get_sql_text_for_merge(self, items=(), sql=()):
+        """Return searchable text for Alter Table operations and SQL.
+
+        This is used to check whether SQL may refer to a table, by looking
+        for the table's name in the text. See
+        :py:meth:`merge_alter_table_sql_results` for the limits of this
+        check.
+
+        Version Added:
+            3.0
+
+        Args:
+            items (list of dict, optional):
+                Alter Table operations to include.
+
+            sql (list, optional):
+                SQL statements to include.
+
+        Returns:
+            str:
+            The lowercase text, or ``None`` if any SQL can't be inspected
+            (such as SQL generated at execution time).
+        """
+        parts = []
+
+        for item in items:
+            for key in ('column', 'db_type', 'sql'):
+                if item.get(key):
+                    parts.append(str(item[key]))
+
+            parts += [
+                str(param)
+                for param in item.get('params', [])
+                if param
+            ]
+
+        for statement in sql:
+            if isinstance(statement, tuple):
+                statement = statement[0]
+
+            if not isinstance(statement, str):
+                return None
+
+            parts.append(statement)
+
+        return '\n'.join(parts).lower()
+
     def _are_ops_mergeable(self, op1, op2):
         """Returns whether two operations can be merged.
 
@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
+import logging
+
+from django_evolution.conf import django_evolution_settings
+from django_evolution.consts import DDLCost, DDLLockLevel
 from django_evolution.db.common import BaseEvolutionOperations
 from django_evolution.db.sql_result import AlterTableSQLResult, SQLResult
 from django_evolution.utils.db import sql_delete_constraints
 
+logger = logging.getLogger(__name__)
+
 
 class EvolutionOperations(BaseEvolutionOperations):
     """Evolution operations for MySQL and MariaDB databases."""
@@ -29,6 +35,65 @@ class EvolutionOperations(BaseEvolutionOperations):
         'json',
     }
 
+    #: The user variable saving the session's lock timeout while it's set.
+    #:
+    #: Version Added:
+    #:     3.0
+    #:
+    #: Type:
+    #:     str
+    _SAVED_LOCK_WAIT_TIMEOUT_VAR = '@django_evolution_lock_wait_timeout'
+
+    #: Minimum versions supporting ALGORITHM=INSTANT for Alter Table ops.
+    #:
+    #: Each maps an operation to the minimum MariaDB and MySQL versions.
+    #:
+    #: Version Added:
+    #:     3.0
+    #:
+    #: Type:
+    #:     dict
+    _INSTANT_ALTER_TABLE_OPS = {
+        'ADD COLUMN': {
+            'mariadb': (10, 3, 2),
+            'mysql': (8, 0, 12),
+        },
+        'DROP COLUMN': {
+            'mariadb': (10, 4, 0),
+            'mysql': (8, 0, 29),
+        },
+    }
+
+    #: The error code for a lock wait timeout (ER_LOCK_WAIT_TIMEOUT).
+    #:
+    #: Version Added:
+    #:     3.0
+    _LOCK_WAIT_TIMEOUT_ERROR_CODE = 1205
+
+    #: Error codes for an unsupported ALGORITHM or LOCK on ALTER TABLE.
+    #:
+    #: These are ``ER_ALTER_OPERATION_NOT_SUPPORTED`` and
+    #: ``ER_ALTER_OPERATION_NOT_SUPPORTED_REASON``.
+    #:
+    #: Version Added:
+    #:     3.0
+    #:
+    #: Type:
+    #:     set of int
+    _ALTER_OPERATION_NOT_SUPPORTED_ERROR_CODES = {1845, 1846}
+
+    #: Alter Table ops that can run in-place without blocking writes.
+    #:
+    #: Version Added:
+    #:     3.0
+    #:
+    #: Type:
+    #:     set of str
+    _INPLACE_ALTER_TABLE_OPS = {
+        'ADD COLUMN',
+        'DROP COLUMN',
+    }
+
     def get_field_type_allows_default(self, field):
         """Return whether default values are allowed for a field.
 
@@ -48,6 +113,298 @@ class EvolutionOperations(BaseEvolutionOperations):
         return (field_type is not None and
                 field_type.lower() not in self._NO_DEFAULT_FIELD_TYPES)
 
+    def get_add_column_default_is_instant(self, field):
+        """Return whether adding a column with a constant default is instant.
+
+        MySQL 8.0.12+ and MariaDB 10.3.2+ can add a column using
+        ``ALGORITHM=INSTANT`` on InnoDB, which only updates the table's
+        metadata.
+
+        Version Added:
+            3.0
+
+        Args:
+            field (django.db.models.Field):
+                The field being added.
+
+        Returns:
+            bool:
+            ``True`` if the column can be added with a constant default
+            without a table rewrite. ``False`` if it cannot.
+        """
+        return (self._get_alter_table_op_is_instant('ADD COLUMN') and
+                self.get_field_type_allows_default(field))
+
+    def get_alter_table_options(self, model, alter_table_items):
+        """Return options to append to an ALTER TABLE statement.
+
+        If ``settings.DJANGO_EVOLUTION['MYSQL_ONLINE_DDL']`` is set, this
+        will request the least-blocking algorithm supported by every
+        operation in the statement. ``ALGORITHM=INSTANT`` is used if all
+        operations only need to change table metadata, and
+        ``ALGORITHM=INPLACE, LOCK=NONE`` is used if all operations can be
+        performed while allowing writes to the table.
+
+        The algorithm is chosen from the operations and the server version,
+        but the server may still refuse it for a particular table (for
+        instance, due to its row format or indexes), failing the statement
+        rather than falling back to copying the table. For the ``'prefer'``
+        policy, the statement is then run again without the options (see
+        :py:meth:`get_sql_statement_fallback`).
+
+        If any operation requires a table copy, then the statement will
+        either be left as-is (for the ``'prefer'`` policy) or request
+        ``ALGORITHM=COPY`` (for the ``'require'`` policy). The latter is
+        disallowed by :py:meth:`get_sql_statement_policy_error`, failing the
+        evolution before any SQL is run, while still allowing the SQL to be
+        reviewed.
+
+        The chosen algorithm for each statement is logged.
+
+        Version Added:
+            3.0
+
+        Args:
+            model (type):
+                The model representing the table being altered.
+
+            alter_table_items (list of dict):
+                The Alter Table operations making up the statement.
+
+        Returns:
+            list of str:
+            The options to append to the statement.
+        """
+        policy = django_evolution_settings.MYSQL_ONLINE_DDL
+
+        if not policy:
+            return []
+
+        table_name = model._meta.db_table
+        algorithms = {
+            self._get_alter_table_item_algorithm(item)
+            for item in alter_table_items
+        }
+
+        if algorithms == {'INSTANT'}:
+            options = ['ALGORITHM=INSTANT']
+        elif algorithms <= {'INSTANT', 'INPLACE'}:
+            options = ['ALGORITHM=INPLACE', 'LOCK=NONE']
+        elif policy == 'require':
+            options = ['ALGORITHM=COPY']
+        else:
+            logger.warning('Altering table "%s" may copy the table and '
+                           'block writes to it.',
+                           table_name)
+
+            return []
+
+        logger.info('Altering table "%s" using %s.',
+                    table_name, ', '.join(options))
+
+        return options
+
+    def get_alter_table_clause_cost(self, clause):
+        """Return the cost of a clause in an ALTER TABLE statement.
+
+        Adding and dropping columns only changes the table's metadata when
+        ``ALGORITHM=INSTANT`` is supported for the operation. Otherwise,
+        InnoDB rebuilds the table. Dropping a primary key also rebuilds the
+        table.
+
+        Version Added:
+            3.0
+
+        Args:
+            clause (str):
+                A single clause from the statement, such as
+                ``ADD COLUMN ...``.
+
+        Returns:
+            str:
+            The cost of the clause (from
+            :py:class:`~django_evolution.consts.DDLCost`), or ``None`` if
+            unknown.
+        """
+        norm_clause = ' '.join(clause.upper().split())
+
+        if norm_clause.startswith(('ALGORITHM=', 'ALGORITHM ', 'LOCK=',
+                                   'LOCK ')):
+            return None
+        elif norm_clause.startswith('DROP PRIMARY KEY'):
+            return DDLCost.REWRITE
+        elif norm_clause.startswith('DROP COLUMN '):
+            if self._get_alter_table_op_is_instant('DROP COLUMN'):
+                return DDLCost.METADATA_ONLY
+
+            return DDLCost.REWRITE
+
+        cost = super().get_alter_table_clause_cost(clause)
+
+        if (cost in (DDLCost.METADATA_ONLY, DDLCost.REWRITE) and
+            norm_clause.startswith('ADD COLUMN ')):
+            if ('AUTO_INCREMENT' not in norm_clause and
+                self._get_alter_table_op_is_instant('ADD COLUMN')):
+                cost = DDLCost.METADATA_ONLY
+            else:
+                cost = DDLCost.REWRITE
+
+        return cost
+
+    def get_sql_statement_lock_level(self, sql):
+        """Return the access to a table blocked by an SQL statement.
+
+        InnoDB creates and drops indexes, and performs most ``ALTER TABLE``
+        operations, while allowing reads and writes to the table. Operations
+        that copy the table allow reads, but block writes, unless
+        ``ALGORITHM=INSTANT`` or ``LOCK=NONE`` was requested.
+
+        Version Added:
+            3.0
+
+        Args:
+            sql (str or tuple):
+                The SQL statement, or a tuple of the statement and its
+                parameters.
+
+        Returns:
+            str:
+            The lock level (from
+            :py:class:`~django_evolution.consts.DDLLockLevel`).
+        """
+        if isinstance(sql, tuple):
+            sql = sql[0]
+
+        sql = sql.strip().rstrip(';')
+        norm_sql = ' '.join(sql.upper().split())
+
+        if norm_sql.startswith(('CREATE INDEX ', 'CREATE UNIQUE INDEX ',
+                                'DROP INDEX ')):
+            return DDLLockLevel.NONE
+
+        m = self._ALTER_TABLE_RE.match(sql)
+
+        if m:
+            clauses = [
+                ''.join(clause.upper().split())
+                for clause in self._split_alter_table_clauses(
+                    m.group('clauses'))
+            ]
+
+            if 'ALGORITHM=INSTANT' in clauses or 'LOCK=NONE' in clauses:
+                return DDLLockLevel.NONE
+            elif 'ALGORITHM=COPY' in clauses:
+                return DDLLockLevel.WRITE
+            elif self.get_sql_statement_cost(sql)[1] == DDLCost.REWRITE:
+                return DDLLockLevel.WRITE
+            else:
+                return DDLLockLevel.NONE
+
+        return super().get_sql_statement_lock_level(sql)
+
+    def get_sql_statement_policies_enabled(self):
+        """Return whether any policies may disallow SQL statements.
+
+        This is enabled when
+        ``settings.DJANGO_EVOLUTION['MYSQL_ONLINE_DDL']`` is ``'require'``.
+
+        Version Added:
+            3.0
+
+        Returns:
+            bool:
+            ``True`` if statements should be checked against policies.
+            ``False`` if they should not.
+        """
+        return django_evolution_settings.MYSQL_ONLINE_DDL == 'require'
+
+    def get_sql_statement_policy_error(self, sql):
+        """Return why an SQL statement is disallowed by a policy.
+
+        ``ALTER TABLE`` statements that copy the table are disallowed by the
+        ``'require'`` policy for
+        ``settings.DJANGO_EVOLUTION['MYSQL_ONLINE_DDL']``.
+
+        Version Added:
+            3.0
+
+        Args:
+            sql (str or tuple):
+                The SQL statement, or a tuple of the statement and its
+                parameters.
+
+        Returns:
+            str:
+            The reason the statement is disallowed, or ``None`` if it's
+            allowed.
+        """
+        if not self.get_sql_statement_policies_enabled():
+            return None
+
+        if isinstance(sql, tuple):
+            sql = sql[0]
+
+        m = self._ALTER_TABLE_RE.match(sql.strip().rstrip(';'))
+
+        if m and 'ALGORITHM=COPY' in (
+            ''.join(clause.upper().split())
+            for clause in self._split_alter_table_clauses(m.group('clauses'))
+        ):
+            return (
+                'Unable to alter table "%s" without copying the table and '
+                'blocking writes to it. To allow this, set '
+                'settings.DJANGO_EVOLUTION["MYSQL_ONLINE_DDL"] to "prefer".'
+                % self._normalize_sql_table_name(m.group('table')))
+
+        return None
+
+    def get_table_stats(self, table_names):
+        """Return estimated row counts and sizes for tables.
+
+        These come from ``information_schema.TABLES``. Row counts are
+        estimates for InnoDB tables. Sizes include indexes.
+
+        Version Added:
+            3.0
+
+        Args:
+            table_names (list of str):
+                The names of the tables.
+
+        Returns:
+            dict:
+            A dictionary mapping table names to a dictionary containing:
+
+            ``rows`` (:py:class:`int`):
+                The estimated number of rows, or ``None`` if unknown.
+
+            ``size`` (:py:class:`int`):
+                The estimated size of the table in bytes, or ``None`` if
+                unknown.
+        """
+        if not table_names:
+            return {}
+
+        table_names = list(table_names)
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT TABLE_NAME, TABLE_ROWS,'
+                '       DATA_LENGTH + INDEX_LENGTH'
+                '  FROM information_schema.TABLES'
+                ' WHERE TABLE_SCHEMA = DATABASE()'
+                '   AND TABLE_NAME IN (%s)'
+                % ', '.join(['%s'] * len(table_names)),
+                table_names)
+
+            return {
+                table_name: {
+                    'rows': rows,
+                    'size': size,
+                }
+                for table_name, rows, size in cursor.fetchall()
+            }
+
     def get_change_column_type_sql(self, model, old_field, new_field):
         """Return SQL to change the type of a column.
 
@@ -200,6 +557,7 @@ class EvolutionOperations(BaseEvolutionOperations):
                     'column': field.column,
                     'db_type': field.db_type(connection=self.connection),
                     'params': [null_attr],
+                    'algorithm': 'INPLACE',
                 },
             ],
         )
@@ -361,3 +719,219 @@ class EvolutionOperations(BaseEvolutionOperations):
             indexes[index_name]['columns'].append(col_name)
 
         return indexes
+
+    def get_lock_timeout_sql(self, timeout, use_transaction):
+        """Return SQL to limit how long statements wait to acquire locks.
+
+        This sets ``lock_wait_timeout``, which applies to the metadata locks
+        acquired by DDL statements. MySQL only supports whole seconds.
+
+        The session's current timeout is saved to a user variable first, so
+        that :py:meth:`get_reset_lock_timeout_sql` can restore it. If it's
+        already been saved (when retrying a batch), it's left alone.
+
+        Version Added:
+            3.0
+
+        Args:
+            timeout (float):
+                The maximum number of seconds to wait for a lock.
+
+            use_transaction (bool, unused):
+                Whether the batch of statements is being run in a
+                transaction.
+
+        Returns:
+            list of str:
+            The SQL statements for setting the lock timeout.
+        """
+        var = self._SAVED_LOCK_WAIT_TIMEOUT_VAR
+
+        return [
+            'SET %s = COALESCE(%s, @@SESSION.lock_wait_timeout);'
+            % (var, var),
+            'SET SESSION lock_wait_timeout = %d;' % max(int(timeout), 1),
+        ]
+
+    def get_reset_lock_timeout_sql(self, use_transaction):
+        """Return SQL to restore the lock timeout.
+
+        This restores the session's ``lock_wait_timeout`` saved by
+        :py:meth:`get_lock_timeout_sql`, rather than the server's default,
+        so any timeout set for the session beforehand is kept. If nothing
+        was saved, the timeout is left alone.
+
+        Version Added:
+            3.0
+
+        Args:
+            use_transaction (bool, unused):
+                Whether the batch of statements was run in a transaction.
+
+        Returns:
+            list of str:
+            The SQL statements for restoring the lock timeout.
+        """
+        var = self._SAVED_LOCK_WAIT_TIMEOUT_VAR
+
+        return [
+            'SET SESSION lock_wait_timeout ='
+            ' COALESCE(%s, @@SESSION.lock_wait_timeout);'
+            % var,
+            'SET %s = NULL;' % var,
+        ]
+
+    def is_lock_timeout_error(self, error):
+        """Return whether an error was caused by a lock timeout.
+
+        Version Added:
+            3.0
+
+        Args:
+            error (Exception):
+                The error raised when executing a statement.
+
+        Returns:
+            bool:
+            ``True`` if the error was caused by a lock timeout. ``False``
+            if it was not.
+        """
+        return bool(error.args and
+                    error.args[0] == self._LOCK_WAIT_TIMEOUT_ERROR_CODE)
+
+    def get_sql_statement_fallback(self, sql, error):
+        """Return a statement to run in place of one that failed.
+
+        The algorithm requested by :py:meth:`get_alter_table_options` is
+        chosen based on the operations and the server version, but the
+        server may still refuse it for a particular table (for instance,
+        tables using ``ROW_FORMAT=COMPRESSED`` or with ``FULLTEXT``
+        indexes). When ``settings.DJANGO_EVOLUTION['MYSQL_ONLINE_DDL']`` is
+        ``'prefer'``, the statement is run again without the ``ALGORITHM``
+        and ``LOCK`` options, letting the server pick the algorithm. This
+        may copy the table and block writes to it.
+
+        The server rejects the algorithm before making any changes, so the
+        statement can be safely run again.
+
+        Version Added:
+            3.0
+
+        Args:
+            sql (str):
+                The SQL statement that failed.
+
+            error (Exception):
+                The error raised when executing the statement.
+
+        Returns:
+            str:
+            The SQL statement to run instead, or ``None`` if the error
+            should be raised.
+        """
+        if (django_evolution_settings.MYSQL_ONLINE_DDL != 'prefer' or
+            not error.args or
+            error.args[0] not in
+            self._ALTER_OPERATION_NOT_SUPPORTED_ERROR_CODES):
+            return None
+
+        m = self._ALTER_TABLE_RE.match(sql.strip().rstrip(';'))
+
+        if not m:
+            return None
+
+        clauses = self._split_alter_table_clauses(m.group('clauses'))
+        new_clauses = [
+            clause
+            for clause in clauses
+            if not ' '.join(clause.upper().split()).startswith(
+                ('ALGORITHM=', 'ALGORITHM ', 'LOCK=', 'LOCK '))
+        ]
+
+        if not new_clauses or len(new_clauses) == len(clauses):
+            return None
+
+        table_name = self._normalize_sql_table_name(m.group('table'))
+
+        logger.warning('Unable to alter table "%s" online (%s). Retrying '
+                       'without requesting an algorithm. This may copy the '
+                       'table and block writes to it.',
+                       table_name, error)
+
+        return 'ALTER TABLE %s %s;' % (m.group('table'),
+                                       ', '.join(new_clauses))
+
+    def _get_alter_table_op_is_instant(self, op):
+        """Return whether an Alter Table operation can use ALGORITHM=INSTANT.
+
+        Version Added:
+            3.0
+
+        Args:
+            op (str):
+                The Alter Table operation.
+
+        Returns:
+            bool:
+            ``True`` if the operation can be performed by only changing table
+            metadata. ``False`` if it cannot.
+        """
+        min_versions = self._INSTANT_ALTER_TABLE_OPS.get(op)
+
+        if not min_versions:
+            return False
+
+        connection = self.connection
+
+        if connection.mysql_is_mariadb:
+            min_version = min_versions['mariadb']
+        else:
+            min_version = min_versions['mysql']
+
+        return connection.mysql_version >= min_version
+
+    def _get_alter_table_item_algorithm(self, item):
+        """Return the least-blocking algorithm for an Alter Table operation.
+
+        Version Added:
+            3.0
+
+        Args:
+            item (dict):
+                The Alter Table operation.
+
+        Returns:
+            str:
+            ``INSTANT``, ``INPLACE``, or ``None`` if the operation may need
+            to copy the table.
+        """
+        algorithm = item.get('algorithm')
+
+        if algorithm:
+            return algorithm
+
+        op = item.get('op')
+
+        if op not in self._INPLACE_ALTER_TABLE_OPS:
+            return None
+
+        if op == 'ADD COLUMN':
+            definition = ' '.join(
+                [item.get('db_type') or ''] +
+                [
+                    param
+                    for param in item.get('params', [])
+                    if param
+                ]).upper()
+
+            if 'AUTO_INCREMENT' in definition:
+                # Adding an auto-increment column blocks writes.
+                return None
+            elif 'PRIMARY KEY' in definition or 'UNIQUE' in definition:
+                # The column needs a new index, which must be built in-place.
+                return 'INPLACE'
+
+        if self._get_alter_table_op_is_instant(op):
+            return 'INSTANT'
+
+        return 'INPLACE'
@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+import re
+
 import django
+from django.db import models
 
+from django_evolution.consts import DDLCost, DDLLockLevel
 from django_evolution.db.common import BaseEvolutionOperations
-from django_evolution.db.sql_result import AlterTableSQLResult
+from django_evolution.db.sql_result import AlterTableSQLResult, SQLResult
 from django_evolution.utils.db import truncate_name
+from django_evolution.utils.sql import NewTransactionSQL, NoTransactionSQL
 
 
 class EvolutionOperations(BaseEvolutionOperations):
@@ -18,6 +23,54 @@ class EvolutionOperations(BaseEvolutionOperations):
 
     change_column_type_sets_attrs = False
 
+    supports_concurrent_indexes = True
+
+    supports_two_phase_constraints = True
+
+    supports_multi_statement_sql = True
+
+    #: A regex matching an ALTER TABLE clause adding a NOT NULL check.
+    #:
+    #: Version Added:
+    #:     3.0
+    #:
+    #: Type:
+    #:     re.Pattern
+    _NOT_NULL_CHECK_CLAUSE_RE = re.compile(
+        r'^ADD\s+CONSTRAINT\s+(?P<name>\S+)\s+CHECK\s*\(\s*(?P<column>\S+)'
+        r'\s+IS\s+NOT\s+NULL\s*\)(?P<not_valid>\s+NOT\s+VALID)?$',
+        re.I)
+
+    #: A regex matching an ALTER TABLE clause validating or dropping a
+    #: constraint.
+    #:
+    #: Version Added:
+    #:     3.0
+    #:
+    #: Type:
+    #:     re.Pattern
+    _CONSTRAINT_CLAUSE_RE = re.compile(
+        r'^(?P<action>VALIDATE|DROP)\s+CONSTRAINT\s+(?:IF\s+EXISTS\s+)?'
+        r'(?P<name>\S+)',
+        re.I)
+
+    #: A regex matching an ALTER TABLE clause setting a column NOT NULL.
+    #:
+    #: Version Added:
+    #:     3.0
+    #:
+    #: Type:
+    #:     re.Pattern
+    _SET_NOT_NULL_CLAUSE_RE = re.compile(
+        r'^ALTER\s+(?:COLUMN\s+)?(?P<column>\S+)\s+SET\s+NOT\s+NULL$',
+        re.I)
+
+    #: The SQLSTATE code for a lock that could not be acquired in time.
+    #:
+    #: Version Added:
+    #:     3.0
+    _LOCK_NOT_AVAILABLE_SQLSTATE = '55P03'
+
     #: A mapping of field types for use when altering types.
     #:
     #: Version Added:
@@ -28,6 +81,245 @@ class EvolutionOperations(BaseEvolutionOperations):
         'smallserial': 'smallint',
     }
 
+    def get_add_column_default_is_instant(self, field):
+        """Return whether adding a column with a constant default is instant.
+
+        Postgres 11 and higher store a constant default for a new column in
+        the catalog, rather than rewriting every row in the table.
+
+        Version Added:
+            3.0
+
+        Args:
+            field (django.db.models.Field):
+                The field being added.
+
+        Returns:
+            bool:
+            ``True`` if the column can be added with a constant default
+            without a table rewrite. ``False`` if it cannot.
+        """
+        return self.connection.pg_version >= 110000
+
+    def get_alter_table_clause_cost(self, clause):
+        """Return the cost of a clause in an ALTER TABLE statement.
+
+        On Postgres 11 and higher, adding a ``NOT NULL`` column with a
+        constant default only changes the table's metadata.
+
+        Version Added:
+            3.0
+
+        Args:
+            clause (str):
+                A single clause from the statement, such as
+                ``ADD COLUMN ...``.
+
+        Returns:
+            str:
+            The cost of the clause (from
+            :py:class:`~django_evolution.consts.DDLCost`), or ``None`` if
+            unknown.
+        """
+        cost = super().get_alter_table_clause_cost(clause)
+
+        if (cost == DDLCost.REWRITE and
+            clause.upper().startswith('ADD ') and
+            self.connection.pg_version >= 110000):
+            cost = DDLCost.METADATA_ONLY
+
+        return cost
+
+    def get_sql_statement_costs(self, statements):
+        """Return the costs of a sequence of SQL statements.
+
+        On Postgres 12 and higher, ``SET NOT NULL`` skips the table scan if
+        a validated ``CHECK (column IS NOT NULL)`` constraint exists on the
+        column. This is what two-phase ``NOT NULL`` changes rely on (see
+        :py:meth:`set_field_null`), so ``ALTER TABLE`` statements that only
+        set such columns ``NOT NULL`` are considered metadata-only when
+        following the statements that add and validate the constraint.
+
+        Version Added:
+            3.0
+
+        Args:
+            statements (list):
+                The SQL statements, in execution order. Each is a string or
+                a tuple of the statement and its parameters.
+
+        Returns:
+            list of tuple:
+            A list containing the result of :py:meth:`get_sql_statement_cost`
+            for each statement.
+        """
+        costs = super().get_sql_statement_costs(statements)
+
+        if self.connection.pg_version < 120000:
+            return costs
+
+        # Maps (table, constraint) to the column, for NOT VALID checks.
+        not_valid_checks = {}
+
+        # Maps (table, constraint) to the column, for validated checks.
+        validated_checks = {}
+
+        for i, sql in enumerate(statements):
+            if isinstance(sql, tuple):
+                sql = sql[0]
+
+            m = self._ALTER_TABLE_RE.match(sql.strip().rstrip(';'))
+
+            if not m:
+                continue
+
+            table_name = self._normalize_sql_table_name(m.group('table'))
+            clauses = self._split_alter_table_clauses(m.group('clauses'))
+            clause_costs = []
+            recomputed = False
+
+            # Postgres drops constraints before processing any other changes
+            # in the statement, so a check dropped here can't be relied on.
+            for clause in clauses:
+                constraint_m = self._CONSTRAINT_CLAUSE_RE.match(clause)
+
+                if (constraint_m and
+                    constraint_m.group('action').upper() == 'DROP'):
+                    key = (table_name,
+                           self._normalize_sql_table_name(
+                               constraint_m.group('name')))
+                    not_valid_checks.pop(key, None)
+                    validated_checks.pop(key, None)
+
+            for clause in clauses:
+                cost = self.get_alter_table_clause_cost(clause)
+                check_m = self._NOT_NULL_CHECK_CLAUSE_RE.match(clause)
+                constraint_m = self._CONSTRAINT_CLAUSE_RE.match(clause)
+                set_not_null_m = self._SET_NOT_NULL_CLAUSE_RE.match(clause)
+
+                if check_m:
+                    key = (table_name,
+                           self._normalize_sql_table_name(
+                               check_m.group('name')))
+                    column = self._normalize_sql_table_name(
+                        check_m.group('column'))
+
+                    if check_m.group('not_valid'):
+                        not_valid_checks[key] = column
+                    else:
+                        validated_checks[key] = column
+                elif (constraint_m and
+                      constraint_m.group('action').upper() == 'VALIDATE'):
+                    key = (table_name,
+                           self._normalize_sql_table_name(
+                               constraint_m.group('name')))
+
+                    if key in not_valid_checks:
+                        validated_checks[key] = not_valid_checks.pop(key)
+                elif set_not_null_m:
+                    column = self._normalize_sql_table_name(
+                        set_not_null_m.group('column'))
+
+                    if any(
+                        (check_table_name == table_name and
+                         check_column == column)
+                        for (check_table_name, constraint_name), check_column
+                        in validated_checks.items()
+                    ):
+                        cost = DDLCost.METADATA_ONLY
+                        recomputed = True
+
+                if cost is not None:
+                    clause_costs.append(cost)
+
+            if recomputed:
+                costs[i] = (table_name,
+                            max(clause_costs, key=DDLCost.ORDER.index))
+
+        return costs
+
+    def get_sql_statement_lock_level(self, sql):
+        """Return the access to a table blocked by an SQL statement.
+
+        Validating constraints only takes a ``SHARE UPDATE EXCLUSIVE`` lock,
+        which allows reads and writes to the table.
+
+        Version Added:
+            3.0
+
+        Args:
+            sql (str or tuple):
+                The SQL statement, or a tuple of the statement and its
+                parameters.
+
+        Returns:
+            str:
+            The lock level (from
+            :py:class:`~django_evolution.consts.DDLLockLevel`).
+        """
+        if isinstance(sql, tuple):
+            sql = sql[0]
+
+        m = self._ALTER_TABLE_RE.match(sql.strip().rstrip(';'))
+
+        if m and all(
+            clause.upper().startswith('VALIDATE ')
+            for clause in self._split_alter_table_clauses(m.group('clauses'))
+        ):
+            return DDLLockLevel.NONE
+
+        return super().get_sql_statement_lock_level(sql)
+
+    def get_table_stats(self, table_names):
+        """Return estimated row counts and sizes for tables.
+
+        Row counts are estimated from ``pg_class.reltuples``, which is
+        updated by ``VACUUM`` and ``ANALYZE``. Sizes include indexes and
+        TOAST data.
+
+        Version Added:
+            3.0
+
+        Args:
+            table_names (list of str):
+                The names of the tables.
+
+        Returns:
+            dict:
+            A dictionary mapping table names to a dictionary containing:
+
+            ``rows`` (:py:class:`int`):
+                The estimated number of rows, or ``None`` if the table has
+                never been analyzed.
+
+            ``size`` (:py:class:`int`):
+                The size of the table in bytes.
+        """
+        if not table_names:
+            return {}
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT c.relname, c.reltuples,'
+                '       pg_total_relation_size(c.oid)'
+                '  FROM pg_catalog.pg_class c'
+                '  JOIN pg_catalog.pg_namespace n'
+                '    ON n.oid = c.relnamespace'
+                " WHERE c.relkind IN ('r', 'p')"
+                '   AND n.nspname = ANY(current_schemas(false))'
+                '   AND c.relname = ANY(%s)',
+                [list(table_names)])
+
+            return {
+                table_name: {
+                    # Tables that have never been analyzed have a
+                    # reltuples of -1 on Postgres 14+.
+                    'rows': int(rows) if rows >= 0 else None,
+                    'size': size,
+                }
+                for table_name, rows, size in cursor.fetchall()
+            }
+
     def get_change_column_type_sql(self, model, old_field, new_field):
         """Return SQL to change the type of a column.
 
@@ -159,6 +451,304 @@ class EvolutionOperations(BaseEvolutionOperations):
 
         return sql_result
 
+    def set_field_null(self, model, field, null):
+        """Return SQL for setting or removing NULL on a column.
+
+        If two-phase constraints are enabled on Postgres 12 and higher,
+        setting ``NOT NULL`` will be done in three short transactions:
+
+        1. A ``CHECK (... IS NOT NULL)`` constraint is added without
+           validation.
+        2. The constraint is validated, which doesn't block writes to the
+           table.
+        3. ``NOT NULL`` is set, which Postgres does using the validated
+           constraint without scanning the table, and the constraint is
+           dropped.
+
+        The ``ACCESS EXCLUSIVE`` locks taken by the first and last steps are
+        held only for the duration of those steps, rather than through
+        the rest of the evolution's statements.
+
+        Version Added:
+            3.0
+
+        Args:
+            model (django.db.models.Model):
+                The model owning the column.
+
+            field (django.db.models.Field):
+                The field for the column.
+
+            null (bool):
+                Whether the column should allow ``NULL`` values.
+
+        Returns:
+            django_evolution.db.sql_result.AlterTableSQLResult:
+            The SQL for changing the column.
+        """
+        if (null or
+            self.connection.pg_version < 120000 or
+            not self.get_two_phase_constraints_enabled()):
+            return super().set_field_null(model=model,
+                                          field=field,
+                                          null=null)
+
+        qn = self.connection.ops.quote_name
+        table_name = model._meta.db_table
+        constraint_name = truncate_name(
+            '%s_%s_notnull' % (table_name, field.column),
+            self.connection.ops.max_name_length())
+
+        sql_result = self.alter_table_sql_result_cls(self, model)
+        sql_result.add_pre_sql([
+            NewTransactionSQL([
+                'ALTER TABLE %s ADD CONSTRAINT %s CHECK (%s IS NOT NULL)'
+                ' NOT VALID;'
+                % (qn(table_name), qn(constraint_name), qn(field.column)),
+            ]),
+            NewTransactionSQL([
+                self._get_validate_constraint_sql(
+                    table_name=table_name,
+                    constraint_name=constraint_name),
+            ]),
+            NewTransactionSQL([
+                'ALTER TABLE %s ALTER COLUMN %s SET NOT NULL;'
+                % (qn(table_name), qn(field.column)),
+
+                'ALTER TABLE %s DROP CONSTRAINT %s;'
+                % (qn(table_name), qn(constraint_name)),
+            ]),
+        ])
+
+        return sql_result
+
+    def get_update_table_constraints_sql(self, model, old_constraints,
+                                         new_constraints, to_add, to_remove):
+        """Return SQL for updating the constraints on a table.
+
+        If two-phase constraints are enabled, new check constraints will be
+        added with ``NOT VALID``, without validating existing rows, and then
+        validated in a new transaction. This is the equivalent of passing
+        ``not_valid=True`` to
+        :py:func:`~django_evolution.utils.db.sql_add_constraints` for
+        foreign keys. Other constraints are added as normal.
+
+        Version Added:
+            3.0
+
+        Args:
+            model (django.db.models.Model):
+                The model being changed.
+
+            old_constraints (list of
+                             django.db.models.constraints.BaseConstraint):
+                The old constraints pre-evolution.
+
+            new_constraints (list of
+                             django.db.models.constraints.BaseConstraint):
+                The new constraints post-evolution.
+
+            to_add (list of django.db.models.constraints.BaseConstraint):
+                A list of new constraints to add to the database that weren't
+                set before.
+
+            to_remove (list of django.db.models.constraints.BaseConstraint):
+                A list of old constraints to remove from the database that
+                aren't set now.
+
+        Returns:
+            django_evolution.sql_result.SQLResult:
+            The SQL statements for changing the constraints. If any check
+            constraints were added with ``NOT VALID``, this will end with a
+            :py:class:`~django_evolution.utils.sql.NewTransactionSQL`
+            validating them.
+        """
+        if not self.get_two_phase_constraints_enabled():
+            return super().get_update_table_constraints_sql(
+                model=model,
+                old_constraints=old_constraints,
+                new_constraints=new_constraints,
+                to_add=to_add,
+                to_remove=to_remove)
+
+        check_constraints = [
+            constraint
+            for constraint in to_add
+            if isinstance(constraint, models.CheckConstraint)
+        ]
+
+        sql_result = super().get_update_table_constraints_sql(
+            model=model,
+            old_constraints=old_constraints,
+            new_constraints=new_constraints,
+            to_add=[
+                constraint
+                for constraint in to_add
+                if constraint not in check_constraints
+            ],
+            to_remove=to_remove)
+
+        if check_constraints:
+            table_name = model._meta.db_table
+            validate_sql = []
+
+            with self.connection.schema_editor(collect_sql=True) as \
+                    schema_editor:
+                for constraint in check_constraints:
+                    sql_result.add('%s NOT VALID;'
+                                   % constraint.create_sql(model,
+                                                           schema_editor))
+                    validate_sql.append(self._get_validate_constraint_sql(
+                        table_name=table_name,
+                        constraint_name=constraint.name))
+
+            sql_result.add([NewTransactionSQL(validate_sql)])
+
+        return sql_result
+
+    def get_create_index_sql_result(self, model, index_name, sql):
+        """Return the SQL result for creating an index.
+
+        When creating indexes concurrently, the index will be built outside
+        of a transaction.
+
+        A concurrent build that fails will leave behind an invalid index.
+        Before building, any invalid index with the same name will be
+        dropped, allowing a failed evolution to be run again.
+
+        Version Added:
+            3.0
+
+        Args:
+            model (django.db.models.Model):
+                The model the index is being created on.
+
+            index_name (str):
+                The name of the index being created.
+
+            sql (list):
+                The SQL statements for creating the index.
+
+        Returns:
+            django_evolution.db.sql_result.SQLResult:
+            The resulting SQL for creating the index.
+        """
+        if not sql or not self.get_concurrent_indexes_enabled():
+            return super().get_create_index_sql_result(model=model,
+                                                       index_name=index_name,
+                                                       sql=sql)
+
+        qn = self.connection.ops.quote_name
+
+        def _drop_invalid_index(cursor):
+            cursor.execute(
+                'SELECT 1'
+                '  FROM pg_catalog.pg_index ix, pg_catalog.pg_class i'
+                ' WHERE i.oid = ix.indexrelid AND'
+                '       i.relname = %s AND'
+                '       NOT ix.indisvalid AND'
+                '       pg_catalog.pg_table_is_visible(i.oid);',
+                [index_name])
+
+            if cursor.fetchone() is None:
+                return []
+
+            return [
+                NoTransactionSQL([
+                    'DROP INDEX CONCURRENTLY IF EXISTS %s;' % qn(index_name),
+                ]),
+            ]
+
+        return SQLResult([
+            _drop_invalid_index,
+            NoTransactionSQL(sql),
+        ])
+
+    def get_drop_index_sql_result(self, model, index_name, sql):
+        """Return the SQL result for dropping an index.
+
+        When dropping indexes concurrently, the index will be dropped outside
+        of a transaction.
+
+        Version Added:
+            3.0
+
+        Args:
+            model (django.db.models.Model):
+                The model the index is being dropped from.
+
+            index_name (str):
+                The name of the index being dropped.
+
+            sql (list):
+                The SQL statements for dropping the index.
+
+        Returns:
+            django_evolution.db.sql_result.SQLResult:
+            The resulting SQL for dropping the index.
+        """
+        if not sql or not self.get_concurrent_indexes_enabled():
+            return super().get_drop_index_sql_result(model=model,
+                                                     index_name=index_name,
+                                                     sql=sql)
+
+        return SQLResult([NoTransactionSQL(sql)])
+
+    def get_change_unique_sql(self, model, field, new_unique_value,
+                              constraint_name, initial):
+        """Return SQL to change a column's unique flag.
+
+        When creating indexes concurrently, a new unique constraint will be
+        backed by a unique index built concurrently, which the constraint
+        will then take ownership of.
+
+        Args:
+            model (django.db.models.Model):
+                The model owning the field.
+
+            field (django.db.models.Field):
+                The field being changed.
+
+            new_unique_value (bool):
+                The new value for ``unique``.
+
+            constraint_name (str):
+                The name of the constraint.
+
+            initial (object):
+                The initial value from the mutation.
+
+        Returns:
+            django_evolution.db.sql_result.AlterTableSQLResult:
+            The resulting SQL for changing the unique flag.
+        """
+        if not new_unique_value or not self.get_concurrent_indexes_enabled():
+            return super().get_change_unique_sql(
+                model=model,
+                field=field,
+                new_unique_value=new_unique_value,
+                constraint_name=constraint_name,
+                initial=initial)
+
+        qn = self.connection.ops.quote_name
+
+        sql_result = AlterTableSQLResult(self, model)
+        sql_result.add_pre_sql(self.get_create_index_sql_result(
+            model=model,
+            index_name=constraint_name,
+            sql=[
+                'CREATE UNIQUE INDEX CONCURRENTLY %s ON %s (%s);'
+                % (qn(constraint_name),
+                   qn(model._meta.db_table),
+                   qn(field.column)),
+            ]))
+        sql_result.add_alter_table([{
+            'sql': 'ADD CONSTRAINT %s UNIQUE USING INDEX %s'
+                   % (qn(constraint_name), qn(constraint_name)),
+        }])
+
+        return sql_result
+
     def get_drop_unique_constraint_sql(self, model, index_name):
         qn = self.connection.ops.quote_name
 
@@ -205,6 +795,57 @@ class EvolutionOperations(BaseEvolutionOperations):
             return truncate_name(index_name,
                                  self.connection.ops.max_name_length())
 
+    def get_constraints_for_table(self, table_name):
+        """Return all known constraints/indexes on a table.
+
+        When concurrent index operations are enabled, invalid indexes left
+        behind by a failed concurrent index build are excluded. These aren't
+        used by the database, and must be rebuilt. Otherwise, no additional
+        queries are made for each table.
+
+        Version Added:
+            3.0
+
+        Args:
+            table_name (str):
+                The name of the table.
+
+        Returns:
+            dict:
+            A dictionary mapping index names to a dictionary containing:
+
+            ``columns`` (:py:class:`list`):
+                The list of columns that the index covers.
+
+            ``unique`` (:py:class:`bool`):
+                Whether this is a unique index.
+        """
+        constraints = super().get_constraints_for_table(table_name)
+
+        if not self.get_concurrent_indexes_enabled():
+            return constraints
+
+        cursor = self.connection.cursor()
+
+        try:
+            cursor.execute(
+                'SELECT i.relname'
+                '  FROM pg_catalog.pg_class t, pg_catalog.pg_class i,'
+                '       pg_catalog.pg_index ix'
+                ' WHERE t.oid = ix.indrelid AND'
+                '       i.oid = ix.indexrelid AND'
+                '       t.relname = %s AND'
+                '       NOT ix.indisvalid AND'
+                '       pg_catalog.pg_table_is_visible(t.oid);',
+                [table_name])
+
+            for row in cursor.fetchall():
+                constraints.pop(row[0], None)
+        finally:
+            cursor.close()
+
+        return constraints
+
     def get_indexes_for_table(self, table_name):
         """Return all known indexes on a table.
 
@@ -256,6 +897,85 @@ class EvolutionOperations(BaseEvolutionOperations):
 
         return indexes
 
+    def get_lock_timeout_sql(self, timeout, use_transaction):
+        """Return SQL to limit how long statements wait to acquire locks.
+
+        Inside of a transaction, this uses ``SET LOCAL``, so the timeout is
+        reset when the transaction ends.
+
+        Version Added:
+            3.0
+
+        Args:
+            timeout (float):
+                The maximum number of seconds to wait for a lock.
+
+            use_transaction (bool):
+                Whether the batch of statements is being run in a
+                transaction.
+
+        Returns:
+            list of str:
+            The SQL statements for setting the lock timeout.
+        """
+        if use_transaction:
+            set_sql = 'SET LOCAL'
+        else:
+            set_sql = 'SET'
+
+        return [
+            "%s lock_timeout = '%dms';"
+            % (set_sql, max(int(timeout * 1000), 1)),
+        ]
+
+    def get_reset_lock_timeout_sql(self, use_transaction):
+        """Return SQL to restore the default lock timeout.
+
+        Version Added:
+            3.0
+
+        Args:
+            use_transaction (bool):
+                Whether the batch of statements was run in a transaction.
+
+        Returns:
+            list of str:
+            The SQL statements for restoring the lock timeout.
+        """
+        if use_transaction:
+            # SET LOCAL is reset automatically when the transaction ends.
+            return []
+
+        return ['RESET lock_timeout;']
+
+    def is_lock_timeout_error(self, error):
+        """Return whether an error was caused by a lock timeout.
+
+        Version Added:
+            3.0
+
+        Args:
+            error (Exception):
+                The error raised when executing a statement.
+
+        Returns:
+            bool:
+            ``True`` if the error was caused by a lock timeout. ``False``
+            if it was not.
+        """
+        # Django wraps the database driver's error, which contains the
+        # SQLSTATE code. psycopg2 names this "pgcode", and psycopg 3 names
+        # it "sqlstate".
+        for e in (error, error.__cause__):
+            if e is not None:
+                code = (getattr(e, 'sqlstate', None) or
+                        getattr(e, 'pgcode', None))
+
+                if code == self._LOCK_NOT_AVAILABLE_SQLSTATE:
+                    return True
+
+        return False
+
     def normalize_bool(self, value):
         if value:
             return True
@@ -309,6 +1029,32 @@ class EvolutionOperations(BaseEvolutionOperations):
             }],
         )
 
+    def _get_validate_constraint_sql(self, table_name, constraint_name):
+        """Return SQL for validating a constraint added as NOT VALID.
+
+        Validation only takes a ``SHARE UPDATE EXCLUSIVE`` lock on the table,
+        allowing reads and writes to continue while existing rows are
+        checked.
+
+        Version Added:
+            3.0
+
+        Args:
+            table_name (str):
+                The name of the table owning the constraint.
+
+            constraint_name (str):
+                The name of the constraint.
+
+        Returns:
+            str:
+            The SQL statement for validating the constraint.
+        """
+        qn = self.connection.ops.quote_name
+
+        return ('ALTER TABLE %s VALIDATE CONSTRAINT %s;'
+                % (qn(table_name), qn(constraint_name)))
+
     def _are_column_types_compatible(self, old_field, new_field):
         """Return whether two column types are compatible.
 
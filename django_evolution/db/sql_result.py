@@ -159,7 +159,11 @@ class AlterTableSQLResult(SQLResult):
             quoted_table_name = qn(self.model._meta.db_table)
             alter_table_batches = self._preprocess_alter_table_ops()
 
-            for statements, sql_params in alter_table_batches:
+            for statements, sql_params, items in alter_table_batches:
+                statements += self.evolver.get_alter_table_options(
+                    model=self.model,
+                    alter_table_items=items)
+
                 alter_table_sql = (
                     'ALTER TABLE %s %s;'
                     % (quoted_table_name, ', '.join(statements))
@@ -183,6 +187,11 @@ class AlterTableSQLResult(SQLResult):
 
         It will also split the Alter Table operations into batches,
         separated by operations setting independent=True.
+
+        Version Changed:
+            3.0:
+            Each batch now includes the list of Alter Table operations
+            it was built from.
         """
         qn = self.evolver.connection.ops.quote_name
         new_alter_table_items = []
@@ -211,6 +220,11 @@ class AlterTableSQLResult(SQLResult):
                         prev_item.setdefault('sql_params', []).extend(
                             item['sql_params'])
 
+                    if prev_item.get('algorithm') != item.get('algorithm'):
+                        # The combined operation can't be assumed to support
+                        # either algorithm.
+                        prev_item.pop('algorithm', None)
+
                     # Skip adding this or setting the prev_op/prev_item.
                     continue
 
@@ -220,8 +234,10 @@ class AlterTableSQLResult(SQLResult):
 
         alter_table_statements = []
         alter_table_sql_params = []
+        alter_table_batch_items = []
         alter_table_batches = [(alter_table_statements,
-                                alter_table_sql_params)]
+                                alter_table_sql_params,
+                                alter_table_batch_items)]
 
         for item in new_alter_table_items:
             alter_table_attrs = []
@@ -233,8 +249,10 @@ class AlterTableSQLResult(SQLResult):
                 # alone, so break it up into its own batch.
                 alter_table_statements = []
                 alter_table_sql_params = []
+                alter_table_batch_items = []
                 alter_table_batches.append((alter_table_statements,
-                                            alter_table_sql_params))
+                                            alter_table_sql_params,
+                                            alter_table_batch_items))
 
             if op == 'sql':
                 alter_table_attrs.append(item['sql'])
@@ -255,6 +273,7 @@ class AlterTableSQLResult(SQLResult):
                     ])
 
             alter_table_statements.append(' '.join(alter_table_attrs))
+            alter_table_batch_items.append(item)
 
             if 'sql_params' in item:
                 alter_table_sql_params.extend(item['sql_params'])
@@ -264,8 +283,10 @@ class AlterTableSQLResult(SQLResult):
                 # start a new batch for the next.
                 alter_table_statements = []
                 alter_table_sql_params = []
+                alter_table_batch_items = []
                 alter_table_batches.append((alter_table_statements,
-                                            alter_table_sql_params))
+                                            alter_table_sql_params,
+                                            alter_table_batch_items))
 
         # Filter out any batches that we are empty, and return the result.
         return [
@@ -5,9 +5,10 @@ from __future__ import annotations
 from collections import OrderedDict
 
 import django
-from django.db import models
+from django.db import OperationalError, models
 from django.db.backends.sqlite3.base import Database
 
+from django_evolution.consts import DDLCost
 from django_evolution.db.common import BaseEvolutionOperations
 from django_evolution.db.sql_result import AlterTableSQLResult, SQLResult
 from django_evolution.utils.db import (create_index_name,
@@ -363,6 +364,11 @@ class EvolutionOperations(BaseEvolutionOperations):
 
     alter_table_sql_result_cls = SQLiteAlterTableSQLResult
 
+    # Table rebuilds are generated from the state of the model when the
+    # rebuild was started, so operations from later mutations can't be
+    # moved into them.
+    supports_alter_table_merging = False
+
     _can_rename_cols_min_version = (3, 26, 0)
     _can_rename_cols = (Database.sqlite_version_info >=
                         _can_rename_cols_min_version)
@@ -387,6 +393,85 @@ class EvolutionOperations(BaseEvolutionOperations):
         """
         return 'DEFERRABLE INITIALLY DEFERRED'
 
+    def get_alter_table_clause_cost(self, clause):
+        """Return the cost of a clause in an ALTER TABLE statement.
+
+        SQLite only supports renaming tables and columns, and adding or
+        dropping columns, through ALTER TABLE. Adding a column only changes
+        the table's metadata. Any other changes rebuild the table by copying
+        its rows, which is accounted for separately.
+
+        Version Added:
+            3.0
+
+        Args:
+            clause (str):
+                A single clause from the statement, such as
+                ``ADD COLUMN ...``.
+
+        Returns:
+            str:
+            The cost of the clause (from
+            :py:class:`~django_evolution.consts.DDLCost`), or ``None`` if
+            unknown.
+        """
+        if clause.upper().startswith('ADD '):
+            return DDLCost.METADATA_ONLY
+
+        return super().get_alter_table_clause_cost(clause)
+
+    def get_table_stats(self, table_names):
+        """Return row counts and sizes for tables.
+
+        These are computed from the ``dbstat`` virtual table, if SQLite was
+        built with support for it. Sizes don't include indexes.
+
+        Version Added:
+            3.0
+
+        Args:
+            table_names (list of str):
+                The names of the tables.
+
+        Returns:
+            dict:
+            A dictionary mapping table names to a dictionary containing:
+
+            ``rows`` (:py:class:`int`):
+                The number of rows.
+
+            ``size`` (:py:class:`int`):
+                The size of the table in bytes.
+        """
+        if not table_names:
+            return {}
+
+        table_names = list(table_names)
+
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT name,"
+                    "       SUM(CASE WHEN pagetype = 'leaf' THEN ncell"
+                    "                ELSE 0 END),"
+                    "       SUM(pgsize)"
+                    "  FROM dbstat"
+                    " WHERE name IN (%s)"
+                    " GROUP BY name"
+                    % ', '.join(['%s'] * len(table_names)),
+                    table_names)
+
+                return {
+                    table_name: {
+                        'rows': rows,
+                        'size': size,
+                    }
+                    for table_name, rows, size in cursor.fetchall()
+                }
+        except OperationalError:
+            # SQLite wasn't built with dbstat support.
+            return {}
+
     def rename_table(self, model, old_db_table, new_db_table):
         """Rename a table.
 
@@ -97,14 +97,24 @@ class DatabaseState:
         if scan:
             self.rescan_tables()
 
-    def clone(self):
+    def clone(self, db_name=None):
         """Clone the database state.
 
+        Args:
+            db_name (str, optional):
+                The name of the database for the cloned state. This allows
+                state to be copied to another database with the same tables
+                and indexes. Defaults to this state's database.
+
+                Version Added:
+                    3.0
+
         Returns:
             DatabaseState:
             The cloned copy of the state.
         """
-        cloned_sig = DatabaseState(db_name=self.db_name, scan=False)
+        cloned_sig = DatabaseState(db_name=db_name or self.db_name,
+                                   scan=False)
         cloned_sig._tables = deepcopy(self._tables)
 
         return cloned_sig
@@ -353,20 +363,32 @@ class DatabaseState:
 
             yield from indexes.values()
 
-    def rescan_tables(self):
+    def rescan_tables(self, table_names=None):
         """Rescan the list of tables from the database.
 
         This will look up all tables found in the database, along with
         information (such as indexes) on those tables.
 
         Existing information on the tables will be flushed.
+
+        Version Changed:
+            3.0:
+            Added the ``table_names`` argument.
+
+        Args:
+            table_names (list of str, optional):
+                The names of the tables to scan. If not provided, all tables
+                in the database will be scanned.
         """
         evolver = EvolutionOperationsMulti(self.db_name).get_evolver()
         connection = evolver.connection
-        introspection = connection.introspection
-        cursor = connection.cursor()
 
-        for table_name in introspection.get_table_list(cursor):
+        if table_names is None:
+            introspection = connection.introspection
+            cursor = connection.cursor()
+            table_names = introspection.get_table_list(cursor)
+
+        for table_name in table_names:
             # NOTE: The table names are already normalized, so there's no
             #       need to normalize them again.
             if hasattr(table_name, 'name'):
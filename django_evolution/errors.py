@@ -73,6 +73,22 @@ class DatabaseStateError(EvolutionException):
     """There was an issue working with database state."""
 
 
+class BlockingOperationError(EvolutionException):
+    """An operation would block access to a table while it runs.
+
+    Version Added:
+        3.0
+    """
+
+
+class SchemaSnapshotError(EvolutionException):
+    """A schema snapshot could not be created or restored.
+
+    Version Added:
+        3.0
+    """
+
+
 class MissingSignatureError(EvolutionException):
     """A requested signature could not be found."""
 
@@ -11,7 +11,12 @@ Version Changed:
    ~django_evolution.evolve.base.BaseEvolutionTask
    ~django_evolution.evolve.evolver.Evolver
    ~django_evolution.evolve.evolve_app_task.EvolveAppTask
+   ~django_evolution.evolve.multi_database.DatabaseEvolutionResult
+   ~django_evolution.evolve.multi_database.MultiDatabaseEvolver
+   ~django_evolution.evolve.plan.EvolutionPlan
+   ~django_evolution.evolve.plan.EvolutionPlanCache
    ~django_evolution.evolve.purge_app_task.PurgeAppTask
+   ~django_evolution.evolve.snapshot.SchemaSnapshot
 """
 
 from __future__ import annotations
@@ -19,14 +24,23 @@ from __future__ import annotations
 from django_evolution.evolve.base import BaseEvolutionTask
 from django_evolution.evolve.evolver import Evolver
 from django_evolution.evolve.evolve_app_task import EvolveAppTask
+from django_evolution.evolve.multi_database import (DatabaseEvolutionResult,
+                                                    MultiDatabaseEvolver)
+from django_evolution.evolve.plan import EvolutionPlan, EvolutionPlanCache
 from django_evolution.evolve.purge_app_task import PurgeAppTask
+from django_evolution.evolve.snapshot import SchemaSnapshot
 
 
 __all__ = (
     'BaseEvolutionTask',
+    'DatabaseEvolutionResult',
+    'EvolutionPlan',
+    'EvolutionPlanCache',
     'Evolver',
     'EvolveAppTask',
+    'MultiDatabaseEvolver',
     'PurgeAppTask',
+    'SchemaSnapshot',
 )
 
 __autodoc_excludes__ = __all__
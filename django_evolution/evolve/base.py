@@ -7,7 +7,7 @@ Version Added:
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
@@ -51,6 +51,24 @@ class BaseEvolutionTask:
             :py:meth:`~django_evolution.utils.sql.SQLExecutor.run_sql`.
     """
 
+    #: The attributes set on a task by :py:meth:`prepare`.
+    #:
+    #: These are stored in an
+    #: :py:class:`~django_evolution.evolve.plan.EvolutionPlan`, and restored
+    #: on tasks when the plan is applied to another evolver.
+    #:
+    #: Version Added:
+    #:     3.0
+    #:
+    #: Type:
+    #:     tuple of str
+    prepared_attrs: tuple[str, ...] = (
+        'can_simulate',
+        'evolution_required',
+        'new_evolutions',
+        'sql',
+    )
+
     @classmethod
     def prepare_tasks(
         cls,
@@ -81,7 +99,139 @@ class BaseEvolutionTask:
                 methods.
         """
         for task in tasks:
-            task.prepare(**kwargs)
+            with evolver.profile_phase('prepare_task',
+                                       app_label=getattr(task, 'app_label',
+                                                         None)):
+                task.prepare(**kwargs)
+
+    @classmethod
+    def get_prepared_tasks_state(
+        cls,
+        evolver: Evolver,
+        tasks: Sequence[BaseEvolutionTask],
+    ) -> dict[str, Any]:
+        """Return state computed by :py:meth:`prepare_tasks`.
+
+        This is stored in an
+        :py:class:`~django_evolution.evolve.plan.EvolutionPlan`, and passed
+        to :py:meth:`restore_prepared_tasks` when the plan is applied to
+        another evolver. It will be deep-copied, and must not contain any
+        state tied to a database connection.
+
+        By default, this returns an empty dictionary.
+
+        Version Added:
+            3.0
+
+        Args:
+            evolver (django_evolution.evolve.evolver.Evolver):
+                The evolver that prepared the tasks.
+
+            tasks (list of BaseEvolutionTask):
+                The list of tasks that were prepared. These will match the
+                current class.
+
+        Returns:
+            dict:
+            The state to store in the plan.
+        """
+        return {}
+
+    @classmethod
+    def restore_prepared_tasks(
+        cls,
+        evolver: Evolver,
+        tasks: Sequence[BaseEvolutionTask],
+        state: dict[str, Any],
+    ) -> None:
+        """Restore state computed by :py:meth:`prepare_tasks`.
+
+        This is called in place of :py:meth:`prepare_tasks` when applying an
+        :py:class:`~django_evolution.evolve.plan.EvolutionPlan`, after the
+        :py:attr:`prepared_attrs` have been restored on each task. It's
+        responsible for rebuilding any state that's tied to the evolver's
+        database.
+
+        By default, this does nothing.
+
+        Version Added:
+            3.0
+
+        Args:
+            evolver (django_evolution.evolve.evolver.Evolver):
+                The evolver the plan is being applied to.
+
+            tasks (list of BaseEvolutionTask):
+                The list of tasks to restore. These will match the current
+                class.
+
+            state (dict):
+                A copy of the state returned by
+                :py:meth:`get_prepared_tasks_state`.
+        """
+        pass
+
+    @classmethod
+    def get_planned_batches(
+        cls,
+        evolver: Evolver,
+        tasks: Sequence[BaseEvolutionTask],
+    ) -> list[dict[str, Any]]:
+        """Return the batches of operations that will be executed.
+
+        This describes what :py:meth:`execute_tasks` will do, without
+        executing anything. It's used to report on an evolution plan before
+        it's applied. It must only be called after :py:meth:`prepare_tasks`.
+
+        Each batch is a dictionary containing:
+
+        ``type`` (:py:class:`str`):
+            The type of batch. This is ``sql`` for batches that run SQL for
+            tasks, or one of the
+            :py:class:`~django_evolution.consts.UpgradeMethod` values.
+
+        ``tasks`` (:py:class:`list` of :py:class:`dict`, optional):
+            Information on each task in the batch, containing a ``task`` key
+            and a ``sql`` key with the SQL the task will execute. These may
+            also contain ``evolutions`` and ``mutations`` keys listing the
+            evolution labels and mutations being applied.
+
+        ``new_models_sql`` (:py:class:`list`, optional):
+            SQL for creating new models in the batch.
+
+        ``migrations`` (:py:class:`list` of :py:class:`tuple`, optional):
+            The migrations applied in the batch, as
+            ``(app_label, name, backwards)`` tuples.
+
+        By default, this returns a single batch containing the SQL for each
+        task.
+
+        Version Added:
+            3.0
+
+        Args:
+            evolver (django_evolution.evolve.evolver.Evolver):
+                The evolver that prepared the tasks.
+
+            tasks (list of BaseEvolutionTask):
+                The list of prepared tasks. These will match the current
+                class.
+
+        Returns:
+            list of dict:
+            The list of batches.
+        """
+        return [{
+            'type': 'sql',
+            'tasks': [
+                {
+                    'sql': task.sql,
+                    'task': task,
+                }
+                for task in tasks
+                if task.sql
+            ],
+        }]
 
     @classmethod
     def execute_tasks(
@@ -116,7 +266,11 @@ class BaseEvolutionTask:
         """
         with evolver.sql_executor(check_constraints=False) as sql_executor:
             for task in tasks:
-                task.execute(sql_executor=sql_executor, **kwargs)
+                with evolver.profile_phase('execute_task',
+                                           app_label=getattr(task,
+                                                             'app_label',
+                                                             None)):
+                    task.execute(sql_executor=sql_executor, **kwargs)
 
     def __init__(
         self,
@@ -140,6 +294,22 @@ class BaseEvolutionTask:
         self.new_evolutions = []
         self.sql = []
 
+    @property
+    def can_reuse_plan(self) -> bool:
+        """Whether the prepared state for this task can be reused.
+
+        If ``False``, evolvers with this task will always be prepared,
+        rather than applying an
+        :py:class:`~django_evolution.evolve.plan.EvolutionPlan`.
+
+        Version Added:
+            3.0
+
+        Type:
+            bool
+        """
+        return True
+
     def is_mutation_mutable(
         self,
         mutation: BaseMutation,
@@ -10,8 +10,10 @@ from __future__ import annotations
 import itertools
 import logging
 from collections import OrderedDict
-from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
+from django.db import connections
 from django.utils.translation import gettext as _
 
 from django_evolution.consts import UpgradeMethod
@@ -39,6 +41,7 @@ from django_evolution.utils.graph import EvolutionGraph
 from django_evolution.utils.migrations import (
     MigrationExecutor,
     MigrationList,
+    MigrationLoader,
     apply_migrations,
     clear_global_custom_migrations,
     create_pre_migrate_state,
@@ -47,14 +50,17 @@ from django_evolution.utils.migrations import (
     filter_migration_targets,
     finalize_migrations,
     is_migration_initial,
+    is_migration_schema_only,
     record_applied_migrations,
     register_global_custom_migrations)
+from django_evolution.utils.models import get_model_rel_tree
 from django_evolution.utils.sql import SQLExecutor
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
     from django_evolution.evolve.evolver import Evolver
+    from django_evolution.signature import ProjectSignature
 
 
 logger = logging.getLogger(__name__)
@@ -74,6 +80,20 @@ class EvolveAppTask(BaseEvolutionTask):
             The app label for the app to evolve.
     """
 
+    prepared_attrs = BaseEvolutionTask.prepared_attrs + (
+        'app_sig',
+        'app_sig_is_new',
+        'applied_migrations',
+        'hinted_evolution',
+        'new_model_names',
+        'new_models',
+        'upgrade_method',
+        '_mutations',
+        '_new_models_deferred_sql',
+        '_new_models_sql',
+        '_pending_mutations',
+    )
+
     @classmethod
     def prepare_tasks(
         cls,
@@ -88,6 +108,10 @@ class EvolveAppTask(BaseEvolutionTask):
         this will begin setting up state needed to apply any migrations for
         apps that use them (or will use them after any evolutions are applied).
 
+        If the evolver is performing a fresh install, apps with schema-only
+        migrations will have their models created directly, and their
+        migrations recorded as applied.
+
         After tasks are prepared, this will apply any migrations that need to
         be applied, updating the app's signature appropriately and recording
         all applied migrations.
@@ -112,17 +136,20 @@ class EvolveAppTask(BaseEvolutionTask):
                 There was an error with the setup or validation of migrations.
                 A subclass containing additional details will be raised.
         """
-        # Register any custom migrations that we want globally available.
-        # This is of course not thread-safe, but nobody should be doing
-        # concurrent migrations, or they're in for a pretty bad time.
-        if supports_migrations:
-            custom_migrations = MigrationList()
+        cls._register_custom_migrations(tasks)
 
-            for task in tasks:
-                for migration in task._migrations or []:
-                    custom_migrations.add_migration(migration)
+        if evolver.fresh_install:
+            # Find the apps whose migrations can be recorded as applied
+            # instead of run, so that their models can be created along with
+            # all the others.
+            with evolver.profile_phase('find_fresh_install_migrations'):
+                fresh_install_migrations = \
+                    cls._get_fresh_install_migrations(evolver=evolver,
+                                                      tasks=tasks)
 
-            register_global_custom_migrations(custom_migrations)
+            for task in tasks:
+                task._fresh_install_migrations = \
+                    fresh_install_migrations.get(task.app_label)
 
         # We're going to let Django determine a plan for all migrations, and
         # we'll determine a plan for evolutions. These will be combined into a
@@ -131,33 +158,337 @@ class EvolveAppTask(BaseEvolutionTask):
         #
         # First, run through the tasks, preparing state that we'll use to
         # build the migrations and evolutions graph and resulting batches.
-        super().prepare_tasks(
-            evolver=evolver,
-            tasks=tasks,
-            hinted=hinted,
-            **kwargs)
+        # Worker threads use their own database connections, which can't see
+        # any uncommitted changes made in a transaction on the evolver's
+        # connection. Tasks must be prepared one at a time in that case.
+        if (evolver.prepare_workers > 1 and
+            len(tasks) > 1 and
+            not evolver.connection.in_atomic_block):
+            with evolver.profile_phase('prepare_tasks_parallel'):
+                cls._prepare_tasks_parallel(evolver=evolver,
+                                            tasks=tasks,
+                                            hinted=hinted)
+        else:
+            super().prepare_tasks(
+                evolver=evolver,
+                tasks=tasks,
+                hinted=hinted,
+                **kwargs)
 
         # Now we can generate the remaining state needed to determine the
         # order in which migrations and evolutions need to be applied. We'll
         # compute the migration plans, build a graph from it, and then
         # convert that into batches for execution.
-        migration_executor = cls._build_migration_executor(
-            evolver=evolver,
-            tasks=tasks)
-        migrations_info = cls._build_migrations_info(
+        migration_executor, migrations_info = cls._build_migrations_state(
             evolver=evolver,
-            migration_executor=migration_executor,
             tasks=tasks)
-        graph = cls._build_evolutions_graph(
+
+        with evolver.profile_phase('build_evolutions_graph'):
+            graph = cls._build_evolutions_graph(
+                evolver=evolver,
+                migration_executor=migration_executor,
+                migrations_info=migrations_info,
+                tasks=tasks)
+
+        with evolver.profile_phase('build_batches'):
+            batches = cls._build_batches(
+                evolver=evolver,
+                graph=graph,
+                tasks=tasks,
+                hinted=hinted)
+
+        cls._set_evolver_state(evolver=evolver,
+                               batches=batches,
+                               migration_executor=migration_executor,
+                               migrations_info=migrations_info)
+
+        clear_global_custom_migrations()
+
+    @classmethod
+    def get_prepared_tasks_state(
+        cls,
+        evolver: Evolver,
+        tasks: Sequence[BaseEvolutionTask],
+    ) -> dict[str, Any]:
+        """Return state computed by :py:meth:`prepare_tasks`.
+
+        This stores the batches of evolutions and migrations to apply.
+        Migrations in the batches' migration plans are stored by app label
+        and name, since they belong to the evolver's migration loader.
+
+        Version Added:
+            3.0
+
+        Args:
+            evolver (django_evolution.evolve.evolver.Evolver):
+                The evolver that prepared the tasks.
+
+            tasks (list of BaseEvolutionTask):
+                The list of tasks that were prepared.
+
+        Returns:
+            dict:
+            The state to store in the plan.
+        """
+        batches = []
+
+        for batch_info in evolver._evolve_app_task_state['batches']:
+            if batch_info['type'] == UpgradeMethod.MIGRATIONS:
+                batch_info = dict(
+                    batch_info,
+                    migration_plan=[
+                        (migration.app_label, migration.name, backwards)
+                        for migration, backwards
+                        in batch_info['migration_plan']
+                    ])
+
+            batches.append(batch_info)
+
+        return {
+            'batches': batches,
+        }
+
+    @classmethod
+    def restore_prepared_tasks(
+        cls,
+        evolver: Evolver,
+        tasks: Sequence[BaseEvolutionTask],
+        state: dict[str, Any],
+    ) -> None:
+        """Restore state computed by :py:meth:`prepare_tasks`.
+
+        This will rebuild the migration executor and migration state for
+        the evolver's database, and restore the stored batches, resolving
+        their migration plans against the new executor.
+
+        Version Added:
+            3.0
+
+        Args:
+            evolver (django_evolution.evolve.evolver.Evolver):
+                The evolver the plan is being applied to.
+
+            tasks (list of BaseEvolutionTask):
+                The list of tasks to restore.
+
+            state (dict):
+                A copy of the state returned by
+                :py:meth:`get_prepared_tasks_state`.
+
+        Raises:
+            django_evolution.errors.BaseMigrationError:
+                There was an error with the setup or validation of migrations.
+                A subclass containing additional details will be raised.
+        """
+        cls._register_custom_migrations(tasks)
+
+        migration_executor, migrations_info = cls._build_migrations_state(
             evolver=evolver,
-            migration_executor=migration_executor,
-            migrations_info=migrations_info,
             tasks=tasks)
-        batches = cls._build_batches(
-            evolver=evolver,
-            graph=graph,
-            hinted=hinted)
 
+        batches = state['batches']
+
+        for batch_info in batches:
+            if batch_info['type'] == UpgradeMethod.MIGRATIONS:
+                migration_loader = migration_executor.loader
+
+                batch_info['migration_plan'] = [
+                    (migration_loader.get_migration(app_label, name),
+                     backwards)
+                    for app_label, name, backwards
+                    in batch_info['migration_plan']
+                ]
+
+        cls._set_evolver_state(evolver=evolver,
+                               batches=batches,
+                               migration_executor=migration_executor,
+                               migrations_info=migrations_info)
+
+        clear_global_custom_migrations()
+
+    @classmethod
+    def _get_fresh_install_migrations(
+        cls,
+        evolver: Evolver,
+        tasks: Sequence[EvolveAppTask],
+    ) -> dict[str, MigrationList]:
+        """Return migrations to record as applied on a fresh install.
+
+        An app's migrations can be recorded as applied without being run
+        if they're all schema-only, and if every app they depend on can be
+        handled the same way. Otherwise, the migration history would be
+        inconsistent.
+
+        Version Added:
+            3.0
+
+        Args:
+            evolver (django_evolution.evolve.evolver.Evolver):
+                The evolver performing the fresh install.
+
+            tasks (list of EvolveAppTask):
+                The list of tasks being prepared.
+
+        Returns:
+            dict:
+            A mapping of app labels to the migrations that can be recorded
+            as applied for the app.
+        """
+        if not supports_migrations:
+            return {}
+
+        migration_graph = MigrationLoader(connection=evolver.connection).graph
+        app_labels = {
+            task.app_label
+            for task in tasks
+        }
+        migration_targets_by_app = {}
+
+        for migration_target in migration_graph.nodes:
+            app_label = migration_target[0]
+
+            if app_label in app_labels:
+                migration_targets_by_app.setdefault(app_label, []).append(
+                    migration_target)
+
+        fakeable_app_labels = {
+            app_label
+            for app_label, migration_targets
+            in migration_targets_by_app.items()
+            if all(
+                is_migration_schema_only(migration_graph.nodes[target])
+                for target in migration_targets
+            )
+        }
+
+        # Remove any apps depending on apps that can't be faked, until
+        # there's nothing left to remove.
+        changed = True
+
+        while changed:
+            changed = False
+
+            for app_label in list(fakeable_app_labels):
+                if any(
+                    parent.key[0] not in fakeable_app_labels
+                    for target in migration_targets_by_app[app_label]
+                    for parent in migration_graph.node_map[target].parents
+                ):
+                    fakeable_app_labels.remove(app_label)
+                    changed = True
+
+        result = {}
+
+        for app_label in fakeable_app_labels:
+            migrations = MigrationList()
+
+            for migration_target in migration_targets_by_app[app_label]:
+                migrations.add_migration(
+                    migration_graph.nodes[migration_target])
+
+            result[app_label] = migrations
+
+        return result
+
+    @classmethod
+    def _register_custom_migrations(
+        cls,
+        tasks: Sequence[EvolveAppTask],
+    ) -> None:
+        """Register any custom migrations provided to tasks.
+
+        These are registered for the current thread, so that evolvers for
+        different databases can be prepared concurrently. They must be
+        cleared once the tasks are prepared.
+
+        Version Added:
+            3.0
+
+        Args:
+            tasks (list of EvolveAppTask):
+                The list of tasks being prepared.
+        """
+        if supports_migrations:
+            custom_migrations = MigrationList()
+
+            for task in tasks:
+                for migration in task._migrations or []:
+                    custom_migrations.add_migration(migration)
+
+            register_global_custom_migrations(custom_migrations)
+
+    @classmethod
+    def _build_migrations_state(
+        cls,
+        evolver: Evolver,
+        tasks: Sequence[EvolveAppTask],
+    ) -> tuple[MigrationExecutor | None, dict[str, Any]]:
+        """Build the migration executor and information on migrations.
+
+        Version Added:
+            3.0
+
+        Args:
+            evolver (django_evolution.evolve.evolver.Evolver):
+                The evolver executing the tasks.
+
+            tasks (list of EvolveAppTask):
+                The list of tasks that were prepared.
+
+        Returns:
+            tuple:
+            A 2-tuple containing:
+
+            1. The migration executor (or ``None`` if migrations aren't
+               supported).
+            2. The information on migrations from
+               :py:meth:`_build_migrations_info`.
+
+        Raises:
+            django_evolution.errors.BaseMigrationError:
+                There was an error with the setup or validation of migrations.
+                A subclass containing additional details will be raised.
+        """
+        with evolver.profile_phase('build_migration_executor'):
+            migration_executor = cls._build_migration_executor(
+                evolver=evolver,
+                tasks=tasks)
+
+        with evolver.profile_phase('build_migrations_info'):
+            migrations_info = cls._build_migrations_info(
+                evolver=evolver,
+                migration_executor=migration_executor,
+                tasks=tasks)
+
+        return migration_executor, migrations_info
+
+    @classmethod
+    def _set_evolver_state(
+        cls,
+        evolver: Evolver,
+        batches: list[dict[str, Any]],
+        migration_executor: MigrationExecutor | None,
+        migrations_info: dict[str, Any],
+    ) -> None:
+        """Set state on the evolver for executing the tasks.
+
+        Version Added:
+            3.0
+
+        Args:
+            evolver (django_evolution.evolve.evolver.Evolver):
+                The evolver executing the tasks.
+
+            batches (list of dict):
+                The batches of evolutions and migrations to apply.
+
+            migration_executor (django_evolution.utils.migrations.
+                                MigrationExecutor):
+                The migration executor for the evolver's database.
+
+            migrations_info (dict):
+                The information on migrations to apply.
+        """
         # Set some state that execute_tasks() and unit tests can get to.
         evolver._evolve_app_task_state = {
             # These are used for the execution stage.
@@ -173,7 +504,64 @@ class EvolveAppTask(BaseEvolutionTask):
             'pre_migration_targets': migrations_info.get('pre_targets'),
         }
 
-        clear_global_custom_migrations()
+    @classmethod
+    def get_planned_batches(
+        cls,
+        evolver: Evolver,
+        tasks: Sequence[BaseEvolutionTask],
+    ) -> list[dict[str, Any]]:
+        """Return the batches of operations that will be executed.
+
+        This returns a batch for each batch of evolutions and model
+        creations, and each batch of migrations, in the order they'll be
+        executed.
+
+        Version Added:
+            3.0
+
+        Args:
+            evolver (django_evolution.evolve.evolver.Evolver):
+                The evolver that prepared the tasks.
+
+            tasks (list of BaseEvolutionTask):
+                The list of prepared tasks. These will match the current
+                class.
+
+        Returns:
+            list of dict:
+            The list of batches.
+        """
+        planned_batches = []
+
+        for batch_info in evolver._evolve_app_task_state['batches']:
+            batch_type = batch_info['type']
+
+            if batch_type == UpgradeMethod.EVOLUTIONS:
+                planned_batches.append({
+                    'new_models_sql': batch_info.get('new_models_sql', []),
+                    'tasks': [
+                        {
+                            'evolutions': task_info.get('evolutions', []),
+                            'mutations': task_info.get('mutations', []),
+                            'sql': task_info.get('sql', []),
+                            'task': task,
+                        }
+                        for task, task_info in (
+                            batch_info.get('task_evolutions', {}).items())
+                    ],
+                    'type': batch_type,
+                })
+            elif batch_type == UpgradeMethod.MIGRATIONS:
+                planned_batches.append({
+                    'migrations': [
+                        (migration.app_label, migration.name, backwards)
+                        for migration, backwards in (
+                            batch_info['migration_plan'])
+                    ],
+                    'type': batch_type,
+                })
+
+        return planned_batches
 
     @classmethod
     def execute_tasks(
@@ -240,9 +628,6 @@ class EvolveAppTask(BaseEvolutionTask):
                                      pre_migrate_state=migrate_state,
                                      plan=full_migration_plan)
 
-            if migrate_state:
-                migrate_state = migrate_state.clone()
-
         deferred_sql = []
 
         for batch_info in batches:
@@ -256,11 +641,13 @@ class EvolveAppTask(BaseEvolutionTask):
 
                     if new_models_sql:
                         deferred_sql += batch_info['new_models_deferred_sql']
-                        cls._create_models(
-                            sql_executor=sql_executor,
-                            evolver=evolver,
-                            tasks=batch_info['new_models_tasks'],
-                            sql=new_models_sql)
+
+                        with evolver.profile_phase('create_models'):
+                            cls._create_models(
+                                sql_executor=sql_executor,
+                                evolver=evolver,
+                                tasks=batch_info['new_models_tasks'],
+                                sql=new_models_sql)
 
                     # Process any evolutions for the apps.
                     task_evolutions = batch_info.get('task_evolutions', {})
@@ -269,18 +656,38 @@ class EvolveAppTask(BaseEvolutionTask):
                         task_sql = task_info.get('sql')
 
                         if task_sql:
-                            task.execute(sql_executor=sql_executor,
-                                         sql=task_sql,
-                                         **kwargs)
+                            with evolver.profile_phase(
+                                'execute_task',
+                                app_label=task.app_label):
+                                task.execute(sql_executor=sql_executor,
+                                             sql=task_sql,
+                                             **kwargs)
+
+                    # Record the progress so far, so that a failure in a
+                    # later batch can resume from here. This is saved in the
+                    # batch's transaction, if the database can roll back
+                    # schema changes.
+                    if 'project_sig' in batch_info:
+                        with evolver.profile_phase('save_checkpoint'):
+                            cls._save_checkpoint(evolver=evolver,
+                                                 batch_info=batch_info,
+                                                 migrating=migrating)
             elif batch_type == UpgradeMethod.MIGRATIONS:
                 assert migrating
 
                 # We have a batch of migrations to apply.
-                migrate_state = apply_migrations(
-                    executor=migration_executor,
-                    targets=batch_info['migration_targets'],
-                    plan=batch_info['migration_plan'],
-                    pre_migrate_state=migrate_state)
+                #
+                # The migration state is threaded from one batch to the
+                # next without being cloned, since cloning re-renders every
+                # model. Nothing else holds onto the state once the
+                # pre_migrate signal has been emitted.
+                with evolver.profile_phase('apply_migrations'):
+                    migrate_state = apply_migrations(
+                        executor=migration_executor,
+                        targets=batch_info['migration_targets'],
+                        plan=batch_info['migration_plan'],
+                        pre_migrate_state=migrate_state,
+                        isolate_state=False)
             else:
                 # This should never be reached.
                 raise ValueError(
@@ -292,17 +699,8 @@ class EvolveAppTask(BaseEvolutionTask):
             finalize_migrations(migrate_state)
 
             # Write the new lists of applied migrations out to the signature.
-            applied_migrations = \
-                MigrationList.from_database(evolver.connection)
-            project_sig = evolver.project_sig
-
-            for app_label in applied_migrations.get_app_labels():
-                app_sig = project_sig.get_app_sig(app_label)
-
-                if app_sig is not None:
-                    # The signature will take care of storing only the
-                    # migrations that apply to it when we assign this.
-                    app_sig.applied_migrations = applied_migrations
+            cls._update_applied_migrations(evolver=evolver,
+                                           project_sig=evolver.project_sig)
 
             # Let any listeners know that we've finished the process.
             #
@@ -319,12 +717,178 @@ class EvolveAppTask(BaseEvolutionTask):
 
         # Apply any deferred new model SQL.
         if deferred_sql:
-            with evolver.sql_executor() as sql_executor:
+            with evolver.profile_phase('apply_deferred_sql'), \
+                 evolver.sql_executor() as sql_executor:
                 EvolveAppTask._apply_deferred_sql(
                     sql_executor=sql_executor,
                     evolver=evolver,
                     sql=deferred_sql)
 
+        if evolver.fresh_install:
+            # The database was empty, so the only new tables are those for
+            # the new models and those created by migrations. Track them
+            # directly, rather than having the evolver rescan the entire
+            # database.
+            database_state = evolver.database_state
+
+            for model in new_models:
+                database_state.add_table(model._meta.db_table)
+
+                for field in model._meta.local_many_to_many:
+                    through = field.remote_field.through
+
+                    if through._meta.auto_created:
+                        database_state.add_table(through._meta.db_table)
+
+            if migrating:
+                # Apps with data migrations were migrated normally, and their
+                # migrations may create tables that don't map to any model
+                # (through RunSQL, for instance). Scan any tables we're not
+                # yet tracking.
+                with evolver.profile_phase('rescan_migrated_tables'):
+                    table_names = [
+                        table_name
+                        for table_name in
+                        evolver.connection.introspection.table_names()
+                        if not database_state.has_table(table_name)
+                    ]
+
+                    if table_names:
+                        database_state.rescan_tables(table_names=table_names)
+
+    @classmethod
+    def _save_checkpoint(
+        cls,
+        evolver: Evolver,
+        batch_info: dict[str, Any],
+        migrating: bool,
+    ) -> None:
+        """Save a checkpoint for an executed batch.
+
+        This will save the project signature as of the batch, along with
+        the evolutions applied in the batch.
+
+        Version Added:
+            3.0
+
+        Args:
+            evolver (django_evolution.evolve.evolver.Evolver):
+                The evolver executing the tasks.
+
+            batch_info (dict):
+                Information on the executed batch.
+
+            migrating (bool):
+                Whether migrations are being applied. If set, the applied
+                migrations in the signature will be updated from the
+                database.
+
+        Raises:
+            django_evolution.errors.EvolutionExecutionError:
+                There was an error saving to the database.
+        """
+        project_sig = batch_info['project_sig']
+
+        if migrating:
+            cls._update_applied_migrations(evolver=evolver,
+                                           project_sig=project_sig)
+
+        new_evolutions = []
+
+        for task, task_info in batch_info.get('task_evolutions', {}).items():
+            labels = set(task_info['evolutions'])
+
+            new_evolutions += [
+                evolution
+                for evolution in task.new_evolutions
+                if evolution.label in labels
+            ]
+
+        evolver.save_checkpoint(project_sig=project_sig,
+                                new_evolutions=new_evolutions)
+
+    @classmethod
+    def _update_applied_migrations(
+        cls,
+        evolver: Evolver,
+        project_sig: ProjectSignature,
+    ) -> None:
+        """Update a signature with the migrations applied to the database.
+
+        Version Added:
+            3.0
+
+        Args:
+            evolver (django_evolution.evolve.evolver.Evolver):
+                The evolver executing the tasks.
+
+            project_sig (django_evolution.signature.ProjectSignature):
+                The project signature to update.
+        """
+        applied_migrations = MigrationList.from_database(evolver.connection)
+
+        for app_label in applied_migrations.get_app_labels():
+            app_sig = project_sig.get_app_sig(app_label)
+
+            if app_sig is not None:
+                # The signature will take care of storing only the
+                # migrations that apply to it when we assign this.
+                app_sig.applied_migrations = applied_migrations
+
+    @classmethod
+    def _prepare_tasks_parallel(
+        cls,
+        evolver: Evolver,
+        tasks: Sequence[EvolveAppTask],
+        hinted: bool,
+    ) -> None:
+        """Prepare tasks using a pool of worker threads.
+
+        The project signature is first updated for each task in order.
+        Each app's pending mutations are then simulated and their SQL
+        generated in worker threads, against copies of the project
+        signature and database state. Finally, the remaining state is
+        recorded for each task in order, giving the same results as
+        preparing each task one at a time.
+
+        Each worker thread uses its own database connections, which are
+        closed when the thread's work is complete. This must not be used
+        while in a transaction on the evolver's connection.
+
+        The model relation tree is built before starting the worker threads,
+        so that they all share the same cached tree.
+
+        Version Added:
+            3.0
+
+        Args:
+            evolver (Evolver):
+                The evolver that's handling the tasks.
+
+            tasks (list of EvolveAppTask):
+                The list of tasks to prepare.
+
+            hinted (bool):
+                Whether to prepare the task for hinted evolutions.
+        """
+        def _prepare_mutations(task):
+            try:
+                task._prepare_mutations()
+            finally:
+                connections.close_all()
+
+        for task in tasks:
+            task._prepare_app_sig(hinted=hinted)
+
+        get_model_rel_tree()
+
+        with ThreadPoolExecutor(max_workers=evolver.prepare_workers) as pool:
+            # Consume the results, so that any exceptions are raised here.
+            list(pool.map(_prepare_mutations, tasks))
+
+        for task in tasks:
+            task._finish_prepare()
+
     @classmethod
     def _build_migration_executor(
         cls,
@@ -422,7 +986,8 @@ class EvolveAppTask(BaseEvolutionTask):
                 Executed migrations will update this state, and the state will
                 be passed in any Django signal emissions.
 
-            If migrations are to be executed, then this will also contain:
+            If migrations are to be executed or recorded as applied, then
+            this will also contain:
 
             ``full_plan`` (list of tuple):
                 The full migration plan.
@@ -503,8 +1068,9 @@ class EvolveAppTask(BaseEvolutionTask):
                 # Rebuild the migration graph, based on anything we've
                 # added to extra_applied_migrations above (which is a local
                 # reference to the variable on MigrationLoader), and re-run
-                # checks.
-                migration_loader.build_graph()
+                # checks. The migrations were just loaded, so there's no
+                # need to load them from disk again.
+                migration_loader.build_graph(reload_migrations=False)
                 migration_executor.run_checks()
 
             # Build the lists of migration targets we'll be applying. Each
@@ -598,7 +1164,8 @@ class EvolveAppTask(BaseEvolutionTask):
             post_migration_plan = None
             post_migration_targets = None
 
-        if pre_migration_plan or post_migration_plan:
+        if (pre_migration_plan or post_migration_plan or
+            extra_applied_migrations):
             result.update({
                 'full_plan': full_migration_plan,
                 'to_mark_applied': migrations_to_mark_applied,
@@ -746,6 +1313,7 @@ class EvolveAppTask(BaseEvolutionTask):
         cls,
         evolver: Evolver,
         graph: EvolutionGraph,
+        tasks: Sequence[EvolveAppTask],
         hinted: bool,
     ):
         """Return batches of evolution/migration operations to execute.
@@ -770,6 +1338,18 @@ class EvolveAppTask(BaseEvolutionTask):
 
             This will only be present if there are models to create.
 
+        ``project_sig`` (:py:class:`~django_evolution.signature.
+        ProjectSignature`):
+            The project signature after this batch is applied, which will be
+            saved as a checkpoint once the batch is executed. This only
+            includes the new models and apps created by this batch or prior
+            batches.
+
+            This will not be present for the last batch, since the final
+            project signature will be saved instead. It also won't be present
+            once any new models have deferred SQL, since that SQL is only
+            applied after all batches have been executed.
+
         ``task_evolutions`` (dict):
             A dictionary mapping a :py:class:`EvolveAppTask` instance to
             a dictionary of information containing:
@@ -806,6 +1386,9 @@ class EvolveAppTask(BaseEvolutionTask):
             graph (django_evolution.utils.graph.EvolutionGraph):
                 The finalized evolution graph.
 
+            tasks (list of EvolveAppTask):
+                The list of prepared tasks.
+
             hinted (bool):
                 Whether a hinted evolution was requested.
 
@@ -916,6 +1499,25 @@ class EvolveAppTask(BaseEvolutionTask):
         else:
             hinted_evolution = None
 
+        # Signatures for all new models and apps were added to the
+        # evolver's signature when preparing the tasks. A checkpoint must
+        # only include the models created by the time its batch has
+        # executed, so track the ones still pending, by app label and model
+        # name.
+        #
+        # Models created by migrations aren't tracked, since a rerun will
+        # create them based on the recorded migrations, not the signature.
+        pending_models = {
+            task.app_label: {
+                model._meta.model_name: model._meta.object_name
+                for model in task.new_models
+            }
+            for task in tasks
+            if task.new_models and task._new_models_sql
+        }
+        last_batch_info = batches[-1] if batches else None
+        has_deferred_sql = False
+
         for batch_info in batches:
             if batch_info['type'] == UpgradeMethod.EVOLUTIONS:
                 new_models = batch_info.pop('new_models', None)
@@ -943,6 +1545,13 @@ class EvolveAppTask(BaseEvolutionTask):
                         ),
                     })
 
+                    for model in new_models:
+                        pending_models.get(model._meta.app_label, {}).pop(
+                            model._meta.model_name, None)
+
+                    if new_models_deferred_sql:
+                        has_deferred_sql = True
+
                 # For each task introducing evolutions to apply, we need to
                 # determine the pending mutations and resulting SQL for
                 # applying those mutations. Since we have a whole batch that
@@ -1006,8 +1615,77 @@ class EvolveAppTask(BaseEvolutionTask):
                                 'sql': mutations_info['sql'],
                             })
 
+                if batch_info is not last_batch_info and not has_deferred_sql:
+                    # Keep a signature reflecting every batch up to this one,
+                    # to checkpoint once the batch has been executed. This
+                    # way, a failure in a later batch won't require applying
+                    # this one again.
+                    #
+                    # Deferred SQL for new models (such as indexes and
+                    # foreign keys) is only applied once all batches have
+                    # executed, so nothing can be checkpointed after that
+                    # point without leaving it unapplied on a rerun.
+                    batch_info['project_sig'] = cls._build_checkpoint_sig(
+                        evolver=evolver,
+                        tasks=tasks,
+                        pending_models=pending_models)
+
         return batches
 
+    @classmethod
+    def _build_checkpoint_sig(
+        cls,
+        evolver: Evolver,
+        tasks: Sequence[EvolveAppTask],
+        pending_models: dict[str, dict[str, str]],
+    ) -> ProjectSignature:
+        """Return a project signature to save as a checkpoint.
+
+        This copies the evolver's current signature, leaving out any new
+        models that have not yet been created, and any new apps that have
+        none of their models created yet.
+
+        Version Added:
+            3.0
+
+        Args:
+            evolver (django_evolution.evolve.evolver.Evolver):
+                The evolver executing the tasks.
+
+            tasks (list of EvolveAppTask):
+                The list of prepared tasks.
+
+            pending_models (dict):
+                A mapping of app labels to dictionaries of model names and
+                object names for models not yet created.
+
+        Returns:
+            django_evolution.signature.ProjectSignature:
+            The signature for the checkpoint.
+        """
+        project_sig = evolver.project_sig.clone()
+
+        for task in tasks:
+            app_pending_models = pending_models.get(task.app_label)
+
+            if not app_pending_models:
+                continue
+
+            app_id = task.app_sig.app_id
+
+            if (task.app_sig_is_new and
+                len(app_pending_models) == len(task.new_models)):
+                project_sig.remove_app_sig(app_id)
+            else:
+                app_sig = project_sig.get_app_sig(app_id, required=True)
+
+                for object_name in app_pending_models.values():
+                    # Auto-created models won't have their own signatures.
+                    if app_sig.get_model_sig(object_name) is not None:
+                        app_sig.remove_model_sig(object_name)
+
+        return project_sig
+
     @classmethod
     def _create_models(
         cls,
@@ -1058,9 +1736,17 @@ class EvolveAppTask(BaseEvolutionTask):
                                  model_names=task.new_model_names)
 
         try:
+            # SQL for new models can only be attributed to a task if there's
+            # only one.
+            if len(tasks) == 1:
+                sql_task = tasks[0]
+            else:
+                sql_task = None
+
             result = sql_executor.run_sql(sql=sql,
                                           execute=True,
-                                          capture=True)
+                                          capture=True,
+                                          task=sql_task)
         except Exception as e:
             last_sql_statement = getattr(e, 'last_sql_statement', None)
             detailed_error = str(e)
@@ -1165,10 +1851,26 @@ class EvolveAppTask(BaseEvolutionTask):
         self._new_models_sql = []
         self._new_models_deferred_sql = []
         self._evolutions = evolutions
+        self._fresh_install_migrations = None
         self._migrations = migrations
         self._mutations = None
         self._pending_mutations = None
 
+    @property
+    def can_reuse_plan(self):
+        """Whether the prepared state for this task can be reused.
+
+        This is ``False`` if custom evolutions or migrations were provided
+        to the task.
+
+        Version Added:
+            3.0
+
+        Type:
+            bool
+        """
+        return self._evolutions is None and self._migrations is None
+
     def generate_mutations_info(self, pending_mutations, update_evolver=True):
         """Generate information on a series of mutations.
 
@@ -1270,6 +1972,24 @@ class EvolveAppTask(BaseEvolutionTask):
             **kwargs (dict, unused):
                 Additional keyword arguments passed for task preparation.
         """
+        self._prepare_app_sig(hinted=hinted)
+        self._prepare_mutations()
+        self._finish_prepare()
+
+    def _prepare_app_sig(self, hinted):
+        """Prepare the app signature and state for new models.
+
+        This is the first stage of :py:meth:`prepare`. It updates the
+        evolver's project signature, and must be called for each task in
+        order.
+
+        Version Added:
+            3.0
+
+        Args:
+            hinted (bool):
+                Whether to prepare the task for hinted evolutions.
+        """
         app = self.app
         app_label = self.app_label
         evolver = self.evolver
@@ -1298,6 +2018,8 @@ class EvolveAppTask(BaseEvolutionTask):
 
         orig_upgrade_method = None
         upgrade_method = None
+        needs_mutations = False
+        pending_mutations = None
 
         target_project_sig = evolver.target_project_sig
         target_app_sig = target_project_sig.get_app_sig(app_label,
@@ -1338,8 +2060,11 @@ class EvolveAppTask(BaseEvolutionTask):
 
             if app_sig.upgrade_method != UpgradeMethod.MIGRATIONS:
                 # We're processing this as evolutions. Find out if we're
-                # applying/generating selective evolutions, hinted evolutions,
-                # or existing unapplied evolutions.
+                # applying/generating selective evolutions or hinted
+                # evolutions. Existing unapplied evolutions will be looked
+                # up when preparing mutations.
+                needs_mutations = True
+
                 if self._evolutions is not None:
                     evolutions = []
                     pending_mutations = []
@@ -1355,32 +2080,84 @@ class EvolveAppTask(BaseEvolutionTask):
 
                     self.hinted_evolution = Evolution(app_label=app_label,
                                                       label='__hinted__')
-                else:
-                    evolutions = get_unapplied_evolutions(
-                        app=app,
-                        database=database_name)
-                    pending_mutations = get_app_pending_mutations(
-                        app=app,
-                        evolution_labels=evolutions,
-                        database=database_name)
-
-                self._pending_mutations = pending_mutations
-
-                mutations_info = self.generate_mutations_info(
-                    pending_mutations,
-                    update_evolver=False)
-
-                if mutations_info:
-                    app_mutator = mutations_info['app_mutator']
-                    self.can_simulate = app_mutator.can_simulate
-                    self.sql = mutations_info['sql']
-                    self.evolution_required = True
-                    self._mutations = mutations_info['mutations']
-
-                    self.applied_migrations = MigrationList.from_names(
-                        app_label,
-                        mutations_info['applied_migrations'])
-                    upgrade_method = mutations_info['upgrade_method']
+
+        self._prepare_state = {
+            'app_sig': app_sig,
+            'evolutions': evolutions,
+            'needs_mutations': needs_mutations,
+            'orig_upgrade_method': orig_upgrade_method,
+            'pending_mutations': pending_mutations,
+            'upgrade_method': upgrade_method,
+        }
+
+    def _prepare_mutations(self):
+        """Prepare the mutations and SQL for any pending evolutions.
+
+        This is the second stage of :py:meth:`prepare`. It simulates the
+        app's pending mutations and generates SQL against copies of the
+        evolver's project signature and database state.
+
+        This only modifies state on this task, so it can be run for
+        multiple tasks in parallel, once :py:meth:`_prepare_app_sig` has
+        been called for every task.
+
+        Version Added:
+            3.0
+        """
+        prepare_state = self._prepare_state
+
+        if not prepare_state['needs_mutations']:
+            return
+
+        app = self.app
+        database_name = self.evolver.database_name
+        pending_mutations = prepare_state['pending_mutations']
+
+        if pending_mutations is None:
+            evolutions = get_unapplied_evolutions(
+                app=app,
+                database=database_name)
+            pending_mutations = get_app_pending_mutations(
+                app=app,
+                evolution_labels=evolutions,
+                database=database_name)
+            prepare_state['evolutions'] = evolutions
+
+        self._pending_mutations = pending_mutations
+
+        mutations_info = self.generate_mutations_info(
+            pending_mutations,
+            update_evolver=False)
+
+        if mutations_info:
+            app_mutator = mutations_info['app_mutator']
+            self.can_simulate = app_mutator.can_simulate
+            self.sql = mutations_info['sql']
+            self.evolution_required = True
+            self._mutations = mutations_info['mutations']
+
+            self.applied_migrations = MigrationList.from_names(
+                self.app_label,
+                mutations_info['applied_migrations'])
+            prepare_state['upgrade_method'] = \
+                mutations_info['upgrade_method']
+
+    def _finish_prepare(self):
+        """Finish preparing state for this task.
+
+        This is the final stage of :py:meth:`prepare`. It generates SQL for
+        any new models and records the resulting state on the task.
+
+        Version Added:
+            3.0
+        """
+        prepare_state = self._prepare_state
+        self._prepare_state = None
+
+        app_label = self.app_label
+        database_name = self.evolver.database_name
+        new_models = self.new_models
+        orig_upgrade_method = prepare_state['orig_upgrade_method']
 
         if new_models:
             # We're creating the models for the first time. We want to do this
@@ -1388,9 +2165,18 @@ class EvolveAppTask(BaseEvolutionTask):
             # app, which ultimately uses migrations, then we want to use
             # those migrations in order to build the models (so subsequent
             # migrations will apply on top of it cleanly).
+            #
+            # The exception is a fresh install, where schema-only migrations
+            # would only produce the final models anyway. Those models are
+            # created directly, and the migrations recorded as applied.
+            fresh_install_migrations = self._fresh_install_migrations
             use_migrations = (
                 supports_migrations and
-                orig_upgrade_method == UpgradeMethod.MIGRATIONS)
+                orig_upgrade_method == UpgradeMethod.MIGRATIONS and
+                not fresh_install_migrations)
+
+            if fresh_install_migrations:
+                self.applied_migrations = fresh_install_migrations
 
             if use_migrations:
                 logger.debug('Using migrations to create models for %s',
@@ -1408,13 +2194,14 @@ class EvolveAppTask(BaseEvolutionTask):
                                       db_name=database_name,
                                       return_deferred=True)
 
-        self.upgrade_method = upgrade_method or orig_upgrade_method
+        self.upgrade_method = (prepare_state['upgrade_method'] or
+                               orig_upgrade_method)
 
-        self.app_sig = app_sig
+        self.app_sig = prepare_state['app_sig']
         self.new_evolutions = [
             Evolution(app_label=app_label,
                       label=label)
-            for label in evolutions
+            for label in prepare_state['evolutions']
         ]
 
     def execute(self, cursor=None, sql_executor=None, sql=None,
@@ -1492,7 +2279,9 @@ class EvolveAppTask(BaseEvolutionTask):
                                     evolutions=evolutions)
 
             try:
-                sql_executor.run_sql(sql, execute=True)
+                sql_executor.run_sql(sql,
+                                     execute=True,
+                                     task=self)
             except Exception as e:
                 raise EvolutionExecutionError(
                     _('Error applying evolution for %s: %s')
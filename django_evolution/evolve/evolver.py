@@ -8,35 +8,49 @@ Version Added:
 from __future__ import annotations
 
 from collections import OrderedDict
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 from typing import TYPE_CHECKING
 
 from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
 from django.db.transaction import atomic
 from django.db.utils import DEFAULT_DB_ALIAS
 from django.utils.translation import gettext as _
 
+from django_evolution.conf import django_evolution_settings
+from django_evolution.db import EvolutionOperationsMulti
 from django_evolution.db.state import DatabaseState
 from django_evolution.diff import Diff
-from django_evolution.errors import (EvolutionException,
+from django_evolution.errors import (BlockingOperationError,
+                                     EvolutionException,
                                      EvolutionTaskAlreadyQueuedError,
                                      EvolutionExecutionError,
                                      QueueEvolverTaskError)
 from django_evolution.evolve.evolve_app_task import EvolveAppTask
+from django_evolution.evolve.plan import (EvolutionPlan,
+                                          get_evolution_fingerprint,
+                                          get_evolution_history_key)
+from django_evolution.evolve.plan_report import (get_blocking_statements,
+                                                 get_disallowed_statements,
+                                                 get_evolution_plan_report)
 from django_evolution.evolve.purge_app_task import PurgeAppTask
 from django_evolution.models import Evolution, Version
 from django_evolution.signals import evolved, evolving, evolving_failed
 from django_evolution.signature import AppSignature, ProjectSignature
 from django_evolution.utils.apps import get_app, get_app_label, get_apps
+from django_evolution.utils.db import convert_table_name
 from django_evolution.utils.sql import SQLExecutor
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Iterator, Sequence
+    from contextlib import AbstractContextManager
     from types import ModuleType
 
     from django.db.backends.utils import CursorWrapper
 
     from django_evolution.evolve.base import BaseEvolutionTask
+    from django_evolution.evolve.plan import EvolutionPlanCache
+    from django_evolution.utils.profiling import EvolutionProfiler
 
 
 class Evolver:
@@ -62,6 +76,24 @@ class Evolver:
     Django management command.
 
     Attributes:
+        allow_rewrite (bool):
+            Whether operations that would rewrite large tables or block writes
+            to them are allowed. See :py:meth:`__init__` for details.
+
+            Version Added:
+                3.0
+
+        blocking_statements (list of dict):
+            Planned statements that would rewrite large tables or block
+            writes to them, from
+            :py:func:`~django_evolution.evolve.plan_report.
+            get_blocking_statements`. This is populated when the tasks are
+            prepared, if :py:attr:`allow_rewrite` is ``False`` and the
+            ``MAX_BLOCKING_TABLE_ROWS`` setting is set.
+
+            Version Added:
+                3.0
+
         connection (django.db.backends.base.base.BaseDatabaseWrapper):
             The database connection object being used for the evolver.
 
@@ -71,10 +103,36 @@ class Evolver:
         database_state (django_evolution.db.state.DatabaseState):
             The state of the database, for evolution purposes.
 
+        disallowed_statements (list of dict):
+            Planned statements disallowed by the database's policies (such
+            as the ``'require'`` policy for the ``MYSQL_ONLINE_DDL``
+            setting), from
+            :py:func:`~django_evolution.evolve.plan_report.
+            get_disallowed_statements`. This is populated when the tasks are
+            prepared.
+
+            Version Added:
+                3.0
+
         evolved (bool):
             Whether the evolver has already performed its evolutions. These
             can only be done once per evolver.
 
+        fresh_install (bool):
+            Whether the evolver is installing into a fresh, empty database
+            using the fast path. See :py:meth:`__init__` for details.
+
+            Version Added:
+                3.0
+
+        fingerprint (str):
+            The fingerprint of the database's evolution state, used to look
+            up plans in :py:attr:`plan_cache`. This is only computed if
+            :py:attr:`plan_cache` is set.
+
+            Version Added:
+                3.0
+
         hinted (bool):
             Whether the evolver is operating against hinted evolutions. This
             may result in changes to the database without there being any
@@ -85,10 +143,37 @@ class Evolver:
             way that allows interactivity on the command line. This is
             passed along to signal emissions.
 
+        plan (django_evolution.evolve.plan.EvolutionPlan):
+            The cached plan applied to prepare the tasks, if one was reused.
+
+            Version Added:
+                3.0
+
+        plan_cache (django_evolution.evolve.plan.EvolutionPlanCache):
+            The cache used to reuse plans across databases in the same
+            state, if provided.
+
+            Version Added:
+                3.0
+
+        profiler (django_evolution.utils.profiling.EvolutionProfiler):
+            The profiler recording each phase of the evolution process, if
+            profiling.
+
+            Version Added:
+                3.0
+
         initial_diff (django_evolution.diff.Diff):
             The initial diff between the stored project signature and the
             current project signature.
 
+        prepare_workers (int):
+            The number of worker threads used to prepare evolutions for
+            apps.
+
+            Version Added:
+                3.0
+
         project_sig (django_evolution.signature.ProjectSignature):
             The project signature. This will start off as the previous
             signature stored in the database, but will be modified when
@@ -110,9 +195,19 @@ class Evolver:
         verbosity: int = 0,
         interactive: bool = False,
         database_name: str = DEFAULT_DB_ALIAS,
+        profiler: (EvolutionProfiler | None) = None,
+        prepare_workers: (int | None) = None,
+        plan_cache: (EvolutionPlanCache | None) = None,
+        fresh_install: bool = False,
+        allow_rewrite: bool = False,
     ) -> None:
         """Initialize the evolver.
 
+        Version Changed:
+            3.0:
+            Added the ``profiler``, ``prepare_workers``, ``plan_cache``,
+            ``fresh_install``, and ``allow_rewrite`` arguments.
+
         Args:
             hinted (bool, optional):
                 Whether to operate against hinted evolutions. This may
@@ -131,6 +226,44 @@ class Evolver:
             database_name (str, optional):
                 The name of the database to evolve.
 
+            profiler (django_evolution.utils.profiling.EvolutionProfiler,
+                      optional):
+                A started profiler used to record each phase of the
+                evolution process.
+
+            prepare_workers (int, optional):
+                The number of worker threads used to prepare evolutions for
+                apps. This defaults to the ``PREPARE_WORKERS`` setting.
+
+            plan_cache (django_evolution.evolve.plan.EvolutionPlanCache,
+                        optional):
+                A cache of plans shared with evolvers for other databases.
+                If a plan for a database in the same state is cached, it
+                will be applied instead of preparing the tasks. Otherwise,
+                the prepared plan will be added to the cache.
+
+            fresh_install (bool, optional):
+                Whether to use the fast path for installing into a fresh,
+                empty database.
+
+                All new models (including those for apps with schema-only
+                migrations) will be created directly from their final state
+                in one pass, and all evolutions and migrations for them will
+                be recorded as applied without being run. The database
+                state won't be rescanned after evolving.
+
+                This is ignored if the database already contains tables
+                other than those for Django Evolution and Django's
+                migration history, in which case the normal path is used.
+                Plans will not be reused or cached for fresh installs.
+
+            allow_rewrite (bool, optional):
+                Whether to allow operations that would rewrite large tables
+                or block writes to them. If ``False``, and the
+                ``MAX_BLOCKING_TABLE_ROWS`` setting is set, then
+                :py:meth:`evolve` will fail before running any SQL if such
+                operations are planned.
+
         Raises:
             django_evolution.errors.EvolutionBaselineMissingError:
                 An initial baseline for the project was not yet installed.
@@ -140,24 +273,39 @@ class Evolver:
         self.hinted = hinted
         self.verbosity = verbosity
         self.interactive = interactive
+        self.profiler = profiler
+        self.allow_rewrite = allow_rewrite
+
+        if prepare_workers is None:
+            prepare_workers = django_evolution_settings.PREPARE_WORKERS
 
+        self.prepare_workers = prepare_workers
+        self.plan_cache = plan_cache
+
+        self.blocking_statements = []
+        self.disallowed_statements = []
         self.evolved = False
+        self.fingerprint = None
         self.initial_diff = None
+        self.plan = None
         self.project_sig = None
+        self.target_project_sig = None
         self.version = None
         self.installed_new_database = False
+        self.fresh_install = False
 
         self.connection = connections[database_name]
 
         self.connection.prepare_database()
 
-        self.database_state = DatabaseState(self.database_name)
-        self.target_project_sig = \
-            ProjectSignature.from_database(database_name)
+        with self.profile_phase('scan_database_state'):
+            self.database_state = DatabaseState(self.database_name)
 
         self._tasks_by_class = OrderedDict()
         self._tasks_by_id = OrderedDict()
         self._tasks_prepared = False
+        self._saved_evolution_keys = set()
+        self._history_key = None
 
         latest_version = None
 
@@ -170,45 +318,30 @@ class Evolver:
                 pass
 
         if latest_version is None:
-            # Either the models aren't yet synced to the database, or we
-            # don't have a saved project signature, so let's set these up.
-            self.installed_new_database = True
-
-            self.project_sig = ProjectSignature()
-            app = get_app('django_evolution')
-
-            task = EvolveAppTask(evolver=self,
-                                 app=app)
-            task.prepare(hinted=False)
-
-            with self.sql_executor() as sql_executor:
-                task.execute(sql_executor=sql_executor,
-                             create_models_now=True)
+            self._build_target_project_sig()
 
-            self.database_state.rescan_tables()
+            with self.profile_phase('install_baseline'):
+                latest_version = self._install_baseline()
 
-            app_sig = AppSignature.from_app(app=app,
-                                            database=database_name)
-            self.project_sig.add_app_sig(app_sig)
+        self.project_sig = latest_version.signature
 
-            # Let's make completely sure that we've only found the models
-            # we expect. This is mostly for the benefit of unit tests.
-            model_names = {
-                model_sig.model_name
-                for model_sig in app_sig.model_sigs
-            }
-            expected_model_names = {'Evolution', 'Version'}
+        if fresh_install and self.installed_new_database:
+            self.fresh_install = self._has_only_baseline_tables()
 
-            assert model_names == expected_model_names, (
-                'Unexpected models found for django_evolution app: %s'
-                % ', '.join(model_names - expected_model_names))
+        if plan_cache is not None and not self.fresh_install:
+            with self.profile_phase('fingerprint'):
+                self.fingerprint = get_evolution_fingerprint(
+                    database_name=database_name,
+                    project_sig=self.project_sig,
+                    database_state=self.database_state)
+                self._history_key = get_evolution_history_key(database_name)
 
-            self._save_project_sig(new_evolutions=task.new_evolutions)
-            latest_version = self.version
+        if self.target_project_sig is None:
+            self._build_target_project_sig()
 
-        self.project_sig = latest_version.signature
-        self.initial_diff = Diff(self.project_sig,
-                                 self.target_project_sig)
+        with self.profile_phase('initial_diff'):
+            self.initial_diff = Diff(self.project_sig,
+                                     self.target_project_sig)
 
     @property
     def tasks(self) -> Iterable[BaseEvolutionTask]:
@@ -431,6 +564,12 @@ class Evolver:
 
             django_evolution.errors.EvolutionExecutionError:
                 A specific evolution task failed. Details are in the error.
+
+            django_evolution.errors.BlockingOperationError:
+                The evolution would rewrite, or block writes to, tables
+                larger than allowed by the ``MAX_BLOCKING_TABLE_ROWS``
+                setting, or would run statements disallowed by the
+                database's policies. No SQL was run.
         """
         if self.evolved:
             raise EvolutionException(
@@ -439,6 +578,54 @@ class Evolver:
 
         self._prepare_tasks()
 
+        if self.plan is not None:
+            # Make sure the database hasn't been evolved or migrated since
+            # its fingerprint was computed and matched to the plan, before
+            # running any of the plan's SQL. Rescanning the database for a
+            # full fingerprint would be too slow to do twice per database.
+            with self.profile_phase('check_history'):
+                history_key = get_evolution_history_key(self.database_name)
+
+            if history_key != self._history_key:
+                raise EvolutionException(
+                    _('The database "%s" has changed since its evolution '
+                      'plan was generated. Please try again.')
+                    % self.database_name)
+
+        if self.blocking_statements:
+            raise BlockingOperationError(
+                _('Evolving the database "%(database)s" would rewrite, or '
+                  'block writes to, tables with more than %(max_rows)s '
+                  'rows:\n\n%(statements)s\n\nTo allow this, pass '
+                  '--allow-rewrite when evolving, or raise '
+                  'settings.DJANGO_EVOLUTION["MAX_BLOCKING_TABLE_ROWS"].')
+                % {
+                    'database': self.database_name,
+                    'max_rows': (django_evolution_settings
+                                 .MAX_BLOCKING_TABLE_ROWS),
+                    'statements': '\n'.join(
+                        _('* %(table)s (about %(table_rows)s rows): %(cost)s, '
+                          '%(lock_level)s lock')
+                        % statement
+                        for statement in self.blocking_statements
+                    ),
+                })
+
+        if self.disallowed_statements:
+            raise BlockingOperationError(
+                _('Evolving the database "%(database)s" would run SQL '
+                  'disallowed by its policies:\n\n%(reasons)s')
+                % {
+                    'database': self.database_name,
+                    'reasons': '\n'.join(
+                        '* %s' % reason
+                        for reason in dict.fromkeys(
+                            statement['reason']
+                            for statement in self.disallowed_statements
+                        )
+                    ),
+                })
+
         evolving.send(sender=self)
 
         try:
@@ -447,16 +634,25 @@ class Evolver:
             for task_cls, tasks in self._tasks_by_class.items():
                 # Perform the evolution for the app. This is responsible
                 # for raising any exceptions.
-                task_cls.execute_tasks(evolver=self,
-                                       tasks=tasks)
+                with self.profile_phase('execute_tasks:%s'
+                                        % task_cls.__name__):
+                    task_cls.execute_tasks(evolver=self,
+                                           tasks=tasks)
 
                 for task in tasks:
                     new_evolutions += task.new_evolutions
 
-                # Things may have changed, so rescan the database.
-                self.database_state.rescan_tables()
+                # Things may have changed, so rescan the database. Fresh
+                # installs track the tables they create instead, since
+                # rescanning every new table can take longer than creating
+                # them.
+                if not self.fresh_install:
+                    with self.profile_phase('rescan_tables'):
+                        self.database_state.rescan_tables()
+
+            with self.profile_phase('save_project_sig'):
+                self._save_project_sig(new_evolutions=new_evolutions)
 
-            self._save_project_sig(new_evolutions=new_evolutions)
             self.evolved = True
         except Exception as e:
             evolving_failed.send(sender=self,
@@ -465,6 +661,164 @@ class Evolver:
 
         evolved.send(sender=self)
 
+    def save_checkpoint(
+        self,
+        project_sig: ProjectSignature,
+        new_evolutions: Sequence[Evolution],
+    ) -> None:
+        """Save the progress of the evolution.
+
+        This is called by tasks once a batch of operations has been applied
+        to the database, in order to store the project signature as of that
+        batch, along with the evolutions applied so far. If a later batch
+        fails, evolving the database again will resume after the batch,
+        instead of applying it again.
+
+        Evolutions already saved by a previous checkpoint will be skipped.
+        Once all tasks have been executed, the final project signature and
+        any remaining evolutions will be saved.
+
+        Version Added:
+            3.0
+
+        Args:
+            project_sig (django_evolution.signature.ProjectSignature):
+                The project signature reflecting the database schema as of
+                the checkpoint.
+
+            new_evolutions (list of django_evolution.models.Evolution):
+                The list of new evolutions applied since the last
+                checkpoint.
+
+        Raises:
+            django_evolution.errors.EvolutionExecutionError:
+                There was an error saving to the database.
+        """
+        self._save_project_sig(new_evolutions=new_evolutions,
+                               project_sig=project_sig)
+
+    def iter_task_classes(
+        self,
+    ) -> Iterator[tuple[type[BaseEvolutionTask],
+                        Sequence[BaseEvolutionTask]]]:
+        """Iterate through the queued tasks, grouped by class.
+
+        Task classes are returned in the order in which they'll be prepared
+        and executed.
+
+        Version Added:
+            3.0
+
+        Yields:
+            tuple:
+            A 2-tuple containing:
+
+            1. The task class.
+            2. The list of queued tasks of that class.
+        """
+        yield from self._tasks_by_class.items()
+
+    def _build_target_project_sig(self) -> None:
+        """Build the target project signature.
+
+        If a plan for this database's fingerprint is cached, its target
+        signature will be reused. Otherwise, the signature will be built
+        from the project's models.
+
+        Version Added:
+            3.0
+        """
+        plan_cache = self.plan_cache
+
+        if plan_cache is not None and self.fingerprint is not None:
+            plans = plan_cache.get_plans(self.fingerprint)
+        else:
+            plans = None
+
+        if plans:
+            self.target_project_sig = plans[0].target_project_sig.clone()
+        else:
+            with self.profile_phase('build_target_project_sig'):
+                self.target_project_sig = \
+                    ProjectSignature.from_database(self.database_name)
+
+    def _install_baseline(self) -> Version:
+        """Install the baseline models and project signature.
+
+        This is used when either the models aren't yet synced to the
+        database, or there isn't a saved project signature.
+
+        Version Added:
+            3.0
+
+        Returns:
+            django_evolution.models.Version:
+            The new saved version.
+        """
+        database_name = self.database_name
+        self.installed_new_database = True
+
+        self.project_sig = ProjectSignature()
+        app = get_app('django_evolution')
+
+        task = EvolveAppTask(evolver=self,
+                             app=app)
+        task.prepare(hinted=False)
+
+        with self.sql_executor() as sql_executor:
+            task.execute(sql_executor=sql_executor,
+                         create_models_now=True)
+
+        self.database_state.rescan_tables()
+
+        app_sig = AppSignature.from_app(app=app,
+                                        database=database_name)
+        self.project_sig.add_app_sig(app_sig)
+
+        # Let's make completely sure that we've only found the models
+        # we expect. This is mostly for the benefit of unit tests.
+        model_names = {
+            model_sig.model_name
+            for model_sig in app_sig.model_sigs
+        }
+        expected_model_names = {'Evolution', 'Version'}
+
+        assert model_names == expected_model_names, (
+            'Unexpected models found for django_evolution app: %s'
+            % ', '.join(model_names - expected_model_names))
+
+        self._save_project_sig(new_evolutions=task.new_evolutions)
+
+        return self.version
+
+    def _has_only_baseline_tables(self) -> bool:
+        """Return whether the database only contains baseline tables.
+
+        Baseline tables are those for Django Evolution's own models and for
+        Django's migration history. A database containing only these is
+        considered fresh.
+
+        Version Added:
+            3.0
+
+        Returns:
+            bool:
+            ``True`` if the database contains no other tables. ``False`` if
+            it does.
+        """
+        connection = self.connection
+        baseline_table_names = {
+            convert_table_name(connection, table_name)
+            for table_name in (Evolution._meta.db_table,
+                               Version._meta.db_table,
+                               MigrationRecorder.Migration._meta.db_table)
+        }
+
+        return all(
+            table_name in baseline_table_names
+            for table_name in connection.introspection.table_names()
+        )
+
     def _prepare_tasks(self) -> None:
         """Prepare all queued tasks for further operations.
 
@@ -474,10 +828,89 @@ class Evolver:
         if not self._tasks_prepared:
             self._tasks_prepared = True
 
-            for task_cls, tasks in self._tasks_by_class.items():
-                task_cls.prepare_tasks(evolver=self,
-                                       tasks=tasks,
-                                       hinted=self.hinted)
+            plan_cache = self.plan_cache
+
+            if plan_cache is not None and self.fingerprint is not None:
+                plan = plan_cache.get_plan(self)
+            else:
+                plan = None
+
+            if plan is not None:
+                with self.profile_phase('apply_plan'):
+                    plan.apply(self)
+
+                self.plan = plan
+            else:
+                for task_cls, tasks in self._tasks_by_class.items():
+                    with self.profile_phase('prepare_tasks:%s'
+                                            % task_cls.__name__):
+                        task_cls.prepare_tasks(evolver=self,
+                                               tasks=tasks,
+                                               hinted=self.hinted)
+
+                if plan_cache is not None and self.fingerprint is not None:
+                    with self.profile_phase('store_plan'):
+                        plan = EvolutionPlan.from_evolver(self)
+
+                    if plan is not None:
+                        plan_cache.add_plan(plan)
+
+            max_table_rows = django_evolution_settings.MAX_BLOCKING_TABLE_ROWS
+            evolver_backend = EvolutionOperationsMulti(
+                self.database_name,
+                self.database_state).get_evolver()
+            check_blocking = (max_table_rows is not None and
+                              not self.allow_rewrite)
+            check_policies = \
+                evolver_backend.get_sql_statement_policies_enabled()
+
+            if check_blocking or check_policies:
+                with self.profile_phase('plan_report'):
+                    report = get_evolution_plan_report(self)
+
+            if check_blocking:
+                # Check for operations that could take a large table out of
+                # service for a long time, before any of them can run.
+                with self.profile_phase('check_blocking_statements'):
+                    self.blocking_statements = get_blocking_statements(
+                        report=report,
+                        max_table_rows=max_table_rows)
+
+            if check_policies:
+                with self.profile_phase('check_disallowed_statements'):
+                    self.disallowed_statements = get_disallowed_statements(
+                        report=report,
+                        evolver_backend=evolver_backend)
+
+    def profile_phase(
+        self,
+        name: str,
+        app_label: (str | None) = None,
+    ) -> AbstractContextManager[None]:
+        """Return a context manager for profiling a phase of evolution.
+
+        If the evolver isn't being profiled, this will do nothing.
+
+        Version Added:
+            3.0
+
+        Args:
+            name (str):
+                The name of the phase.
+
+            app_label (str, optional):
+                The app label the phase applies to, if any.
+
+        Returns:
+            contextlib.AbstractContextManager:
+            The context manager recording the phase.
+        """
+        profiler = self.profiler
+
+        if profiler is None:
+            return nullcontext()
+
+        return profiler.phase(name, app_label=app_label)
 
     def sql_executor(
         self,
@@ -529,6 +962,7 @@ class Evolver:
     def _save_project_sig(
         self,
         new_evolutions: Sequence[Evolution],
+        project_sig: (ProjectSignature | None) = None,
     ) -> None:
         """Save the project signature and any new evolutions.
 
@@ -537,21 +971,45 @@ class Evolver:
         project version.
 
         This can be called many times for one evolver instance. After the
-        first time, the version already saved will simply be updated.
+        first time, the version already saved will simply be updated, and
+        any evolutions already saved will be skipped.
+
+        Version Changed:
+            3.0:
+            Added the ``project_sig`` argument, and skipped evolutions that
+            were already saved.
 
         Args:
             new_evolutions (list of django_evolution.models.Evolution):
                 The list of new evolutions to save to the database.
 
+            project_sig (django_evolution.signature.ProjectSignature,
+                         optional):
+                The project signature to save. This defaults to the
+                evolver's current project signature.
+
         Raises:
             django_evolution.errors.EvolutionExecutionError:
                 There was an error saving to the database.
         """
+        if project_sig is None:
+            project_sig = self.project_sig
+
         version = self.version
 
         if version is None:
-            version = Version(signature=self.project_sig)
+            version = Version(signature=project_sig)
             self.version = version
+        else:
+            version.signature = project_sig
+
+        saved_evolution_keys = self._saved_evolution_keys
+        new_evolutions = [
+            evolution
+            for evolution in new_evolutions
+            if (evolution.app_label,
+                evolution.label) not in saved_evolution_keys
+        ]
 
         try:
             version.save(using=self.database_name)
@@ -562,6 +1020,11 @@ class Evolver:
 
                 Evolution.objects.using(self.database_name).bulk_create(
                     new_evolutions)
+
+                saved_evolution_keys.update(
+                    (evolution.app_label, evolution.label)
+                    for evolution in new_evolutions
+                )
         except Exception as e:
             raise EvolutionExecutionError(
                 _('Error saving new evolution version information: %s')
@@ -0,0 +1,369 @@
+"""Evolving multiple databases concurrently.
+
+Version Added:
+    3.0
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
+
+from django.db import connections
+from django.utils.translation import gettext as _
+
+from django_evolution.consts import DatabaseEvolutionStatus
+from django_evolution.errors import SimulationFailure
+from django_evolution.evolve.evolver import Evolver
+from django_evolution.evolve.plan import EvolutionPlanCache
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseEvolutionResult:
+    """The result of evolving one database.
+
+    Version Added:
+        3.0
+
+    Attributes:
+        database_name (str):
+            The name of the database.
+
+        duration (float):
+            The number of seconds spent evolving the database.
+
+        error (Exception):
+            The error raised while evolving the database, if it failed.
+
+        evolver (django_evolution.evolve.evolver.Evolver):
+            The evolver used for the database. This will be ``None`` if the
+            database was skipped, or if the evolver could not be created.
+
+        status (str):
+            The result of the evolution. This is a value from
+            :py:class:`~django_evolution.consts.DatabaseEvolutionStatus`.
+    """
+
+    def __init__(
+        self,
+        database_name: str,
+        status: str,
+        evolver: (Evolver | None) = None,
+        error: (Exception | None) = None,
+        duration: float = 0.0,
+    ) -> None:
+        """Initialize the result.
+
+        Args:
+            database_name (str):
+                The name of the database.
+
+            status (str):
+                The result of the evolution.
+
+            evolver (django_evolution.evolve.evolver.Evolver, optional):
+                The evolver used for the database.
+
+            error (Exception, optional):
+                The error raised while evolving the database.
+
+            duration (float, optional):
+                The number of seconds spent evolving the database.
+        """
+        self.database_name = database_name
+        self.status = status
+        self.evolver = evolver
+        self.error = error
+        self.duration = duration
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether the database was evolved or already up-to-date.
+
+        Type:
+            bool
+        """
+        return self.status in (DatabaseEvolutionStatus.EVOLVED,
+                               DatabaseEvolutionStatus.UP_TO_DATE)
+
+    def __repr__(self) -> str:
+        """Return a string representation of the result.
+
+        Returns:
+            str:
+            The string representation.
+        """
+        return '<DatabaseEvolutionResult(database_name=%r, status=%r)>' % (
+            self.database_name, self.status)
+
+
+class MultiDatabaseEvolver:
+    """Evolves multiple databases concurrently.
+
+    One :py:class:`~django_evolution.evolve.evolver.Evolver` is created and
+    run for each database on a bounded pool of worker threads. Each
+    database is evolved in its own transaction, and results are reported
+    for each database once all have finished.
+
+    By default, a failure on one database will prevent any databases that
+    haven't yet started from being evolved. Databases already being evolved
+    will be allowed to finish. This can be changed by passing
+    ``fail_fast=False``, in which case all databases will be evolved.
+
+    If ``reuse_plans=True`` is passed, databases in the same evolution state
+    (such as identical shards) will share one evolution plan. The first
+    database in a given state is prepared normally, and the resulting plan
+    is applied to the others, skipping preparation. Each database is
+    checked against the plan before any changes are made to it.
+
+    Subclasses can override :py:meth:`queue_tasks` to customize the tasks
+    queued on each evolver.
+
+    Version Added:
+        3.0
+
+    Attributes:
+        database_names (list of str):
+            The names of the databases to evolve.
+
+        fail_fast (bool):
+            Whether to stop evolving databases after the first failure.
+
+        max_workers (int):
+            The maximum number of databases to evolve at once.
+
+        plan_cache (django_evolution.evolve.plan.EvolutionPlanCache):
+            The cache of plans shared between databases, if reusing plans.
+
+        purge (bool):
+            Whether to purge stale applications from each database's
+            evolution history.
+
+        results (list of DatabaseEvolutionResult):
+            The results for each database, in the order of
+            :py:attr:`database_names`. This is populated by
+            :py:meth:`evolve`.
+    """
+
+    def __init__(
+        self,
+        database_names: Sequence[str],
+        max_workers: (int | None) = None,
+        fail_fast: bool = True,
+        purge: bool = False,
+        hinted: bool = False,
+        verbosity: int = 0,
+        interactive: bool = False,
+        prepare_workers: (int | None) = None,
+        reuse_plans: bool = False,
+        allow_rewrite: bool = False,
+    ) -> None:
+        """Initialize the evolver.
+
+        Args:
+            database_names (list of str):
+                The names of the databases to evolve.
+
+            max_workers (int, optional):
+                The maximum number of databases to evolve at once. This
+                defaults to the number of databases.
+
+            fail_fast (bool, optional):
+                Whether to stop evolving databases after the first failure.
+
+            purge (bool, optional):
+                Whether to purge stale applications from each database's
+                evolution history.
+
+            hinted (bool, optional):
+                Whether to operate against hinted evolutions.
+
+            verbosity (int, optional):
+                The verbosity level for any output. This is passed along to
+                each evolver.
+
+            interactive (bool, optional):
+                Whether the evolution operations are being performed in a
+                way that allows interactivity on the command line. This is
+                passed along to each evolver.
+
+            prepare_workers (int, optional):
+                The number of worker threads each evolver uses to prepare
+                evolutions for apps.
+
+            reuse_plans (bool, optional):
+                Whether to reuse evolution plans between databases in the
+                same evolution state.
+
+            allow_rewrite (bool, optional):
+                Whether to allow operations that would rewrite large tables
+                or block writes to them. This is passed along to each
+                evolver.
+        """
+        assert database_names, 'At least one database name must be provided.'
+
+        self.database_names = list(database_names)
+        self.max_workers = max(1, max_workers or len(self.database_names))
+        self.fail_fast = fail_fast
+        self.purge = purge
+        self.results = []
+
+        if reuse_plans:
+            self.plan_cache = EvolutionPlanCache()
+        else:
+            self.plan_cache = None
+
+        self._failed = threading.Event()
+
+        self._evolver_kwargs = {
+            'allow_rewrite': allow_rewrite,
+            'hinted': hinted,
+            'interactive': interactive,
+            'prepare_workers': prepare_workers,
+            'verbosity': verbosity,
+        }
+
+    def evolve(self) -> Sequence[DatabaseEvolutionResult]:
+        """Evolve all databases.
+
+        Errors on individual databases are captured in the results, rather
+        than raised.
+
+        Returns:
+            list of DatabaseEvolutionResult:
+            The results for each database, in the order of
+            :py:attr:`database_names`.
+        """
+        self._failed = threading.Event()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(self._evolve_database,
+                                    self.database_names))
+
+        self.results = results
+
+        return results
+
+    def queue_tasks(
+        self,
+        evolver: Evolver,
+    ) -> None:
+        """Queue tasks on the evolver for a database.
+
+        By default, this queues all apps for evolution, and queues stale
+        apps for purging if :py:attr:`purge` is set.
+
+        Args:
+            evolver (django_evolution.evolve.evolver.Evolver):
+                The evolver for the database.
+        """
+        evolver.queue_evolve_all_apps()
+
+        if self.purge:
+            evolver.queue_purge_old_apps()
+
+    def _evolve_database(
+        self,
+        database_name: str,
+    ) -> DatabaseEvolutionResult:
+        """Evolve a single database.
+
+        This is run in a worker thread. Any database connections opened by
+        the thread will be closed once finished.
+
+        Args:
+            database_name (str):
+                The name of the database to evolve.
+
+        Returns:
+            DatabaseEvolutionResult:
+            The result of the evolution.
+        """
+        if self.fail_fast and self._failed.is_set():
+            return DatabaseEvolutionResult(
+                database_name=database_name,
+                status=DatabaseEvolutionStatus.SKIPPED)
+
+        start_time = time.perf_counter()
+        evolver = None
+
+        try:
+            plan_cache = self.plan_cache
+            evolver = Evolver(database_name=database_name,
+                              plan_cache=plan_cache,
+                              **self._evolver_kwargs)
+
+            if plan_cache is None:
+                planning_lock = nullcontext()
+            else:
+                # Only one database in a given state is planned at a time,
+                # so that the others can reuse its plan. Plans are only
+                # looked up once tasks are prepared, so the evolver's own
+                # fingerprint can be used for this.
+                planning_lock = plan_cache.lock_fingerprint(
+                    evolver.fingerprint)
+
+            with planning_lock:
+                self.queue_tasks(evolver)
+                evolution_required = evolver.get_evolution_required()
+
+            if not evolution_required:
+                status = DatabaseEvolutionStatus.UP_TO_DATE
+            else:
+                self._check_simulation(evolver)
+                evolver.evolve()
+                status = DatabaseEvolutionStatus.EVOLVED
+
+            error = None
+        except Exception as e:
+            logger.exception('Error evolving database "%s": %s',
+                             database_name, e)
+            status = DatabaseEvolutionStatus.FAILED
+            error = e
+            self._failed.set()
+        finally:
+            connections.close_all()
+
+        return DatabaseEvolutionResult(
+            database_name=database_name,
+            status=status,
+            evolver=evolver,
+            error=error,
+            duration=time.perf_counter() - start_time)
+
+    def _check_simulation(
+        self,
+        evolver: Evolver,
+    ) -> None:
+        """Check that the evolutions resolve all changes to the database.
+
+        Args:
+            evolver (django_evolution.evolve.evolver.Evolver):
+                The evolver for the database.
+
+        Raises:
+            django_evolution.errors.SimulationFailure:
+                The evolutions don't resolve all changes to the models.
+        """
+        if not evolver.can_simulate():
+            return
+
+        diff = evolver.diff_evolutions()
+
+        # Deleted apps are left in the signature until they're purged, so
+        # they're ignored here.
+        if not diff.is_empty():
+            raise SimulationFailure(
+                _('The stored evolutions do not completely resolve all '
+                  'model changes. The following are the changes that '
+                  'could not be resolved:\n%s')
+                % diff)
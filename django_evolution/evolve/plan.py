@@ -0,0 +1,526 @@
+"""Reusable evolution plans for databases in the same state.
+
+Version Added:
+    3.0
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import threading
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
+
+from django.apps import apps
+from django.db import connections, router
+from django.db.migrations.recorder import MigrationRecorder
+
+from django_evolution.db.state import DatabaseState
+from django_evolution.models import Evolution, Version
+
+if TYPE_CHECKING:
+    from contextlib import AbstractContextManager
+
+    from django_evolution.evolve.evolver import Evolver
+    from django_evolution.signature import ProjectSignature
+
+
+def get_evolution_fingerprint(
+    database_name: str,
+    project_sig: (ProjectSignature | None) = None,
+    database_state: (DatabaseState | None) = None,
+) -> (str | None):
+    """Return a fingerprint of a database's evolution state.
+
+    Databases with the same fingerprint have the same stored project
+    signature, applied evolutions and migrations, database backend, models
+    routed to them, and tables and indexes for those models. Evolving them
+    will produce the same plan.
+
+    Args:
+        database_name (str):
+            The name of the database.
+
+        project_sig (django_evolution.signature.ProjectSignature, optional):
+            The stored project signature for the database, if already
+            loaded. If not provided, this will be loaded from the database.
+
+        database_state (django_evolution.db.state.DatabaseState, optional):
+            The scanned state of the database's tables and indexes, if
+            already scanned. If not provided, this will be scanned from the
+            database.
+
+    Returns:
+        str:
+        The fingerprint, or ``None`` if the database doesn't yet have a
+        stored project signature.
+    """
+    connection = connections[database_name]
+
+    if project_sig is None:
+        if (Version._meta.db_table not in
+            connection.introspection.table_names()):
+            return None
+
+        try:
+            project_sig = \
+                Version.objects.current_version(using=database_name).signature
+        except Version.DoesNotExist:
+            return None
+
+    applied_evolutions, applied_migrations = \
+        _get_applied_history(database_name)
+
+    if database_state is None:
+        database_state = DatabaseState(database_name)
+
+    get_database_version = getattr(connection, 'get_database_version', None)
+    routed_models = [
+        model
+        for model in apps.get_models(include_auto_created=True)
+        if router.allow_migrate_model(database_name, model)
+    ]
+
+    # Generated SQL depends on which of the models' tables exist and on the
+    # names of their indexes and constraints, which can differ between
+    # databases with the same history (such as when created manually).
+    tables = [
+        (
+            table_name,
+            database_state.has_table(table_name),
+            sorted(
+                (index_state.name, list(index_state.columns),
+                 index_state.unique)
+                for index_state in database_state.iter_indexes(table_name)
+            ),
+        )
+        for table_name in sorted({
+            model._meta.db_table
+            for model in routed_models
+        })
+    ]
+
+    state = {
+        'applied_evolutions': applied_evolutions,
+        'applied_migrations': applied_migrations,
+        'database_version': (get_database_version()
+                             if get_database_version else None),
+        'project_sig': project_sig.serialize(),
+        'routed_models': [
+            model._meta.label
+            for model in routed_models
+        ],
+        'tables': tables,
+        'vendor': connection.vendor,
+    }
+
+    return hashlib.sha256(
+        json.dumps(state, default=repr, sort_keys=True).encode('utf-8')
+    ).hexdigest()
+
+
+def get_evolution_history_key(
+    database_name: str,
+) -> (tuple | None):
+    """Return a key for the recorded evolution history of a database.
+
+    This is a cheap check for whether a database has been evolved or
+    migrated since its fingerprint was computed, using the latest stored
+    project signature and the applied evolutions and migrations. Unlike
+    :py:func:`get_evolution_fingerprint`, the database's tables and indexes
+    aren't scanned, so changes made outside of evolutions and migrations
+    won't be detected.
+
+    Version Added:
+        3.0
+
+    Args:
+        database_name (str):
+            The name of the database.
+
+    Returns:
+        tuple:
+        The key, or ``None`` if the database doesn't yet have a stored
+        project signature.
+    """
+    # The signature is compared in its stored form, rather than
+    # deserializing it, in order to keep this cheap.
+    latest_version = list(
+        Version.objects
+        .using(database_name)
+        .order_by('-when', '-id')
+        .values_list('pk', 'signature')[:1]
+    )
+
+    if not latest_version:
+        return None
+
+    return (latest_version[0], *_get_applied_history(database_name))
+
+
+def _get_applied_history(
+    database_name: str,
+) -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
+    """Return the evolutions and migrations applied to a database.
+
+    Version Added:
+        3.0
+
+    Args:
+        database_name (str):
+            The name of the database.
+
+    Returns:
+        tuple:
+        A 2-tuple containing sorted lists of the ``(app_label, label)``
+        of each applied evolution and the ``(app_label, name)`` of each
+        applied migration.
+    """
+    recorder = MigrationRecorder(connections[database_name])
+
+    if recorder.has_table():
+        applied_migrations = sorted(recorder.applied_migrations())
+    else:
+        applied_migrations = []
+
+    applied_evolutions = sorted(
+        Evolution.objects
+        .using(database_name)
+        .values_list('app_label', 'label')
+    )
+
+    return applied_evolutions, applied_migrations
+
+
+class _PlanTaskRef:
+    """A reference to a task stored in a plan.
+
+    Plans are stored without any references to the evolver or tasks that
+    generated them. These are put in their place, and replaced with the
+    tasks of the evolver the plan is applied to.
+    """
+
+    def __init__(self, task_id):
+        """Initialize the reference.
+
+        Args:
+            task_id (str):
+                The ID of the referenced task.
+        """
+        self.task_id = task_id
+
+
+class EvolutionPlan:
+    """A prepared evolution plan that can be applied to other databases.
+
+    This contains the target project signature, the state of each task
+    after preparation (including any generated SQL), the database state
+    simulated while generating that SQL, and any state computed for each
+    class of task (such as the batches of evolutions to apply). It's
+    generated once an evolver has prepared its tasks, and can be applied to
+    any other evolver for a database with the same fingerprint and the same
+    queued tasks, skipping preparation.
+
+    State tied to a specific database connection, such as the migration
+    executor, is not stored in the plan, and will be rebuilt when applying
+    the plan.
+
+    Version Added:
+        3.0
+
+    Attributes:
+        fingerprint (str):
+            The fingerprint of the databases this plan can be applied to.
+
+        hinted (bool):
+            Whether the plan was generated for hinted evolutions.
+
+        task_ids (list of tuple):
+            The class names and IDs of the tasks in the plan, in order.
+
+        target_project_sig (django_evolution.signature.ProjectSignature):
+            The target project signature for the plan. This must not be
+            modified.
+    """
+
+    @classmethod
+    def from_evolver(
+        cls,
+        evolver: Evolver,
+    ) -> (EvolutionPlan | None):
+        """Create a plan from an evolver that has prepared its tasks.
+
+        Args:
+            evolver (django_evolution.evolve.evolver.Evolver):
+                The evolver whose plan will be stored.
+
+        Returns:
+            EvolutionPlan:
+            The new plan, or ``None`` if the plan can't be reused.
+        """
+        assert evolver.fingerprint is not None
+
+        tasks = list(evolver.tasks)
+
+        if not all(task.can_reuse_plan for task in tasks):
+            return None
+
+        # Replace any references to the evolver and tasks, so that they can
+        # be swapped for another evolver's when applied.
+        task_refs = [
+            _PlanTaskRef(task.id)
+            for task in tasks
+        ]
+        memo = {
+            id(task): task_ref
+            for task, task_ref in zip(tasks, task_refs)
+        }
+        memo[id(evolver)] = None
+
+        state = copy.deepcopy(
+            {
+                'database_state': evolver.database_state.clone(),
+                'project_sig': evolver.project_sig,
+                'task_class_states': {
+                    task_cls: task_cls.get_prepared_tasks_state(
+                        evolver=evolver,
+                        tasks=cls_tasks)
+                    for task_cls, cls_tasks in evolver.iter_task_classes()
+                },
+                'task_states': {
+                    task.id: {
+                        attr_name: getattr(task, attr_name)
+                        for attr_name in task.prepared_attrs
+                    }
+                    for task in tasks
+                },
+            },
+            memo)
+
+        return cls(fingerprint=evolver.fingerprint,
+                   hinted=evolver.hinted,
+                   task_ids=cls._get_task_ids(tasks),
+                   target_project_sig=evolver.target_project_sig.clone(),
+                   state=state,
+                   task_refs=task_refs)
+
+    @staticmethod
+    def _get_task_ids(tasks):
+        """Return the class names and IDs of tasks.
+
+        Args:
+            tasks (list of django_evolution.evolve.base.BaseEvolutionTask):
+                The tasks.
+
+        Returns:
+            list of tuple:
+            The class names and IDs of the tasks.
+        """
+        return [
+            (type(task).__name__, task.id)
+            for task in tasks
+        ]
+
+    def __init__(
+        self,
+        fingerprint: str,
+        hinted: bool,
+        task_ids: list[tuple[str, str]],
+        target_project_sig: ProjectSignature,
+        state: dict,
+        task_refs: list[_PlanTaskRef],
+    ) -> None:
+        """Initialize the plan.
+
+        Args:
+            fingerprint (str):
+                The fingerprint of the databases this plan can be applied
+                to.
+
+            hinted (bool):
+                Whether the plan was generated for hinted evolutions.
+
+            task_ids (list of tuple):
+                The class names and IDs of the tasks in the plan, in order.
+
+            target_project_sig (django_evolution.signature.ProjectSignature):
+                The target project signature for the plan.
+
+            state (dict):
+                The stored state of the evolver and tasks.
+
+            task_refs (list of _PlanTaskRef):
+                The references to tasks contained in the stored state.
+        """
+        self.fingerprint = fingerprint
+        self.hinted = hinted
+        self.task_ids = task_ids
+        self.target_project_sig = target_project_sig
+
+        self._state = state
+        self._task_refs = task_refs
+
+    def can_apply(
+        self,
+        evolver: Evolver,
+    ) -> bool:
+        """Return whether the plan can be applied to an evolver.
+
+        Args:
+            evolver (django_evolution.evolve.evolver.Evolver):
+                The evolver to check.
+
+        Returns:
+            bool:
+            ``True`` if the evolver's database and queued tasks match the
+            plan.
+        """
+        tasks = list(evolver.tasks)
+
+        return (evolver.fingerprint == self.fingerprint and
+                evolver.hinted == self.hinted and
+                self._get_task_ids(tasks) == self.task_ids and
+                all(task.can_reuse_plan for task in tasks))
+
+    def apply(
+        self,
+        evolver: Evolver,
+    ) -> None:
+        """Apply the plan to an evolver, preparing its tasks.
+
+        The evolver's project signature, database state, and each task's
+        prepared state will be replaced with copies of those in the plan.
+        Each class of task will then restore any additional state it needs.
+
+        Args:
+            evolver (django_evolution.evolve.evolver.Evolver):
+                The evolver to apply the plan to. This must have been
+                checked with :py:meth:`can_apply`.
+        """
+        state = self._state
+        tasks_by_id = {
+            task.id: task
+            for task in evolver.tasks
+        }
+
+        # Swap the stored task references for the evolver's own tasks.
+        memo = {
+            id(task_ref): tasks_by_id[task_ref.task_id]
+            for task_ref in self._task_refs
+        }
+
+        state = copy.deepcopy(state, memo)
+
+        evolver.project_sig = state['project_sig']
+        evolver.database_state = state['database_state'].clone(
+            db_name=evolver.database_name)
+
+        for task_id, task_state in state['task_states'].items():
+            task = tasks_by_id[task_id]
+
+            for attr_name, value in task_state.items():
+                setattr(task, attr_name, value)
+
+        for task_cls, cls_tasks in evolver.iter_task_classes():
+            task_cls.restore_prepared_tasks(
+                evolver=evolver,
+                tasks=cls_tasks,
+                state=state['task_class_states'][task_cls])
+
+
+class EvolutionPlanCache:
+    """A thread-safe cache of evolution plans.
+
+    Plans are stored by the fingerprint of the databases they apply to.
+    This can be shared between evolvers for several databases, so that
+    databases in the same state only need to be planned once.
+
+    Version Added:
+        3.0
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self._plans = {}
+        self._fingerprint_locks = {}
+        self._lock = threading.Lock()
+
+    def add_plan(
+        self,
+        plan: EvolutionPlan,
+    ) -> None:
+        """Add a plan to the cache.
+
+        Args:
+            plan (EvolutionPlan):
+                The plan to add.
+        """
+        with self._lock:
+            self._plans.setdefault(plan.fingerprint, []).append(plan)
+
+    def get_plans(
+        self,
+        fingerprint: (str | None),
+    ) -> list[EvolutionPlan]:
+        """Return the plans for databases with a fingerprint.
+
+        Args:
+            fingerprint (str):
+                The fingerprint of the database.
+
+        Returns:
+            list of EvolutionPlan:
+            The plans for the fingerprint.
+        """
+        with self._lock:
+            return list(self._plans.get(fingerprint, []))
+
+    def get_plan(
+        self,
+        evolver: Evolver,
+    ) -> (EvolutionPlan | None):
+        """Return a plan that can be applied to an evolver.
+
+        Args:
+            evolver (django_evolution.evolve.evolver.Evolver):
+                The evolver that will use the plan.
+
+        Returns:
+            EvolutionPlan:
+            The plan, or ``None`` if there isn't a matching plan.
+        """
+        for plan in self.get_plans(evolver.fingerprint):
+            if plan.can_apply(evolver):
+                return plan
+
+        return None
+
+    def lock_fingerprint(
+        self,
+        fingerprint: (str | None),
+    ) -> AbstractContextManager[None]:
+        """Return a context manager for planning a fingerprint.
+
+        While held, no other thread can plan for databases with the same
+        fingerprint. Those threads will wait, and can then reuse the
+        resulting plan.
+
+        Args:
+            fingerprint (str):
+                The fingerprint being planned. If ``None``, no lock will be
+                held.
+
+        Returns:
+            contextlib.AbstractContextManager:
+            The context manager for the lock.
+        """
+        if fingerprint is None:
+            return nullcontext()
+
+        with self._lock:
+            lock = self._fingerprint_locks.setdefault(fingerprint,
+                                                      threading.Lock())
+
+        return lock
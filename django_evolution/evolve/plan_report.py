@@ -0,0 +1,480 @@
+"""Machine-readable reports of evolution plans.
+
+Version Added:
+    3.0
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from django_evolution.consts import DDLCost, DDLLockLevel
+from django_evolution.db import EvolutionOperationsMulti
+from django_evolution.models import Version
+from django_evolution.utils.sql import ChunkedSQL
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    from django_evolution.db.common import BaseEvolutionOperations
+    from django_evolution.evolve.evolver import Evolver
+    from django_evolution.mutations.base import BaseMutation
+    from django_evolution.signature import ProjectSignature
+    from django_evolution.utils.sql import SQLExecutor
+
+
+def get_evolution_plan_report(
+    evolver: Evolver,
+) -> dict[str, Any]:
+    """Return a report of the operations an evolver will perform.
+
+    The report lists each batch of operations, in the order they'll be
+    executed, along with the tasks, mutations, and SQL statements in each
+    batch. Mutations and statements are annotated with the table they
+    affect, the estimated number of rows and size of that table, and the
+    cost of the operation (from :py:class:`~django_evolution.consts.DDLCost`).
+    Statements are also annotated with the access to the table they block
+    (from :py:class:`~django_evolution.consts.DDLLockLevel`). This can be
+    used to schedule maintenance windows before applying evolutions.
+
+    Estimates come from the database's own statistics, and will be ``None``
+    if unavailable.
+
+    SQL computed in chunks at execution time (such as batched backfills of
+    columns) is reported as a single statement summarizing all chunks,
+    without inspecting the table to compute them.
+
+    The report can be serialized to JSON.
+
+    Version Added:
+        3.0
+
+    Args:
+        evolver (django_evolution.evolve.evolver.Evolver):
+            The evolver to report on. Its tasks will be prepared, if they
+            haven't been already.
+
+    Returns:
+        dict:
+        The report.
+    """
+    database_name = evolver.database_name
+    evolution_required = evolver.get_evolution_required()
+    evolver_backend = EvolutionOperationsMulti(
+        database_name,
+        evolver.database_state).get_evolver()
+
+    # Mutations are mapped to tables based on the stored signature, since
+    # the evolver's signature has been updated while preparing tasks.
+    project_sigs = [evolver.target_project_sig]
+
+    try:
+        project_sigs.insert(
+            0,
+            Version.objects.current_version(using=database_name).signature)
+    except Version.DoesNotExist:
+        pass
+
+    batches = []
+    entries = []
+
+    if evolution_required:
+        with evolver.sql_executor() as sql_executor:
+            for task_cls, tasks in evolver.iter_task_classes():
+                for batch_info in task_cls.get_planned_batches(evolver=evolver,
+                                                               tasks=tasks):
+                    batches.append(_build_batch(
+                        batch_info=batch_info,
+                        sql_executor=sql_executor,
+                        evolver_backend=evolver_backend,
+                        project_sigs=project_sigs,
+                        entries=entries))
+
+    table_names = {
+        entry['table']
+        for entry in entries
+        if entry['table']
+    }
+    table_stats = evolver_backend.get_table_stats(sorted(table_names))
+
+    for entry in entries:
+        stats = table_stats.get(entry['table'], {})
+        entry.update({
+            'table_rows': stats.get('rows'),
+            'table_size': stats.get('size'),
+        })
+
+    return {
+        'batches': batches,
+        'database': database_name,
+        'evolution_required': evolution_required,
+        'vendor': evolver.connection.vendor,
+    }
+
+
+def get_blocking_statements(
+    report: dict[str, Any],
+    max_table_rows: int,
+) -> list[dict[str, Any]]:
+    """Return statements in a plan that would disrupt access to large tables.
+
+    A statement is considered disruptive if it rewrites a table, or if it
+    scans a table or builds an index while blocking writes to it. Only
+    tables with more than the given number of estimated rows are checked.
+    Tables without statistics are skipped.
+
+    Version Added:
+        3.0
+
+    Args:
+        report (dict):
+            The report from :py:func:`get_evolution_plan_report`.
+
+        max_table_rows (int):
+            The maximum estimated number of rows in a table that may be
+            disrupted.
+
+    Returns:
+        list of dict:
+        The reports for the disruptive statements, in execution order.
+    """
+    blocking_statements = []
+
+    for statement in _iter_report_statements(report):
+        table_rows = statement['table_rows']
+        cost = statement['cost']
+
+        if (table_rows is not None and
+            table_rows > max_table_rows and
+            (cost == DDLCost.REWRITE or
+             (cost in (DDLCost.SCAN, DDLCost.INDEX_BUILD) and
+              statement['lock_level'] != DDLLockLevel.NONE))):
+            blocking_statements.append(statement)
+
+    return blocking_statements
+
+
+def get_disallowed_statements(
+    report: dict[str, Any],
+    evolver_backend: BaseEvolutionOperations,
+) -> list[dict[str, Any]]:
+    """Return statements in a plan disallowed by the database's policies.
+
+    Policies are determined by the evolution operations backend. See
+    :py:meth:`BaseEvolutionOperations.get_sql_statement_policy_error()
+    <django_evolution.db.common.BaseEvolutionOperations.
+    get_sql_statement_policy_error>`.
+
+    Version Added:
+        3.0
+
+    Args:
+        report (dict):
+            The report from :py:func:`get_evolution_plan_report`.
+
+        evolver_backend (django_evolution.db.common.BaseEvolutionOperations):
+            The evolution operations backend used to check statements.
+
+    Returns:
+        list of dict:
+        The reports for the disallowed statements, in execution order. Each
+        is a copy of the statement's report, with a ``reason`` key
+        containing the reason the statement is disallowed.
+    """
+    disallowed_statements = []
+
+    for statement in _iter_report_statements(report):
+        reason = evolver_backend.get_sql_statement_policy_error(
+            statement['sql'])
+
+        if reason:
+            disallowed_statements.append(dict(statement,
+                                              reason=reason))
+
+    return disallowed_statements
+
+
+def _iter_report_statements(
+    report: dict[str, Any],
+) -> Iterator[dict[str, Any]]:
+    """Iterate through the statements in a report.
+
+    Args:
+        report (dict):
+            The report from :py:func:`get_evolution_plan_report`.
+
+    Yields:
+        dict:
+        The report for each statement, in execution order.
+    """
+    for batch in report['batches']:
+        yield from batch.get('new_models', [])
+
+        for task in batch.get('tasks', []):
+            yield from task['statements']
+
+
+def _build_batch(
+    batch_info: dict[str, Any],
+    sql_executor: SQLExecutor,
+    evolver_backend: BaseEvolutionOperations,
+    project_sigs: Sequence[ProjectSignature],
+    entries: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Return the report for a batch.
+
+    Args:
+        batch_info (dict):
+            Information on the batch, from
+            :py:meth:`BaseEvolutionTask.get_planned_batches()
+            <django_evolution.evolve.base.BaseEvolutionTask.
+            get_planned_batches>`.
+
+        sql_executor (django_evolution.utils.sql.SQLExecutor):
+            The SQL executor used to capture statements.
+
+        evolver_backend (django_evolution.db.common.BaseEvolutionOperations):
+            The evolution operations backend used to determine costs.
+
+        project_sigs (list of django_evolution.signature.ProjectSignature):
+            The signatures used to look up tables for mutations, in order
+            of preference.
+
+        entries (list of dict):
+            The list of reported entries to annotate with table statistics.
+            Mutations and statements will be added to this.
+
+    Returns:
+        dict:
+        The report for the batch.
+    """
+    batch = {
+        'type': batch_info['type'],
+    }
+
+    if 'new_models_sql' in batch_info:
+        batch['new_models'] = _build_statements(
+            sql=batch_info['new_models_sql'],
+            sql_executor=sql_executor,
+            evolver_backend=evolver_backend,
+            entries=entries)
+
+    if 'tasks' in batch_info:
+        batch['tasks'] = [
+            _build_task(
+                task_info=task_info,
+                statements=_build_statements(
+                    sql=task_info['sql'],
+                    sql_executor=sql_executor,
+                    evolver_backend=evolver_backend,
+                    entries=entries),
+                project_sigs=project_sigs,
+                entries=entries)
+            for task_info in batch_info['tasks']
+        ]
+
+    if 'migrations' in batch_info:
+        batch['migrations'] = [
+            {
+                'app_label': app_label,
+                'backwards': backwards,
+                'name': name,
+            }
+            for app_label, name, backwards in batch_info['migrations']
+        ]
+
+    return batch
+
+
+def _build_statements(
+    sql: Sequence[Any],
+    sql_executor: SQLExecutor,
+    evolver_backend: BaseEvolutionOperations,
+    entries: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Return the reports for SQL statements.
+
+    Args:
+        sql (list):
+            The SQL to report on.
+
+        sql_executor (django_evolution.utils.sql.SQLExecutor):
+            The SQL executor used to capture statements.
+
+        evolver_backend (django_evolution.db.common.BaseEvolutionOperations):
+            The evolution operations backend used to determine costs.
+
+        entries (list of dict):
+            The list of reported entries to annotate with table statistics.
+            Statements will be added to this.
+
+    Returns:
+        list of dict:
+        The reports for the statements.
+    """
+    statements = []
+    uncosted = []
+    pending_sql = []
+
+    def _add_pending_statements():
+        for statement in sql_executor.run_sql(pending_sql, capture=True):
+            report = {
+                'cost': None,
+                'lock_level': evolver_backend.get_sql_statement_lock_level(
+                    statement),
+                'sql': statement,
+                'table': None,
+            }
+            statements.append(report)
+            uncosted.append(report)
+
+        pending_sql.clear()
+
+    for sql_item in sql:
+        if isinstance(sql_item, ChunkedSQL):
+            # Chunks are computed from the table when executed, each in a
+            # transaction of its own, so they're reported together without
+            # computing them.
+            _add_pending_statements()
+
+            statements.append({
+                'cost': DDLCost.BATCHED_WRITE,
+                'lock_level': DDLLockLevel.NONE,
+                'sql': sql_executor.run_sql([sql_item.sql],
+                                            capture=True)[0],
+                'table': sql_item.table_name,
+            })
+        else:
+            pending_sql.append(sql_item)
+
+    _add_pending_statements()
+
+    # Costs are computed for all statements at once, since a statement may
+    # be cheaper due to the ones run before it.
+    costs = evolver_backend.get_sql_statement_costs([
+        statement['sql']
+        for statement in uncosted
+    ])
+
+    for statement, (table_name, cost) in zip(uncosted, costs):
+        statement.update({
+            'cost': cost,
+            'table': table_name,
+        })
+
+    entries.extend(statements)
+
+    return statements
+
+
+def _build_task(
+    task_info: dict[str, Any],
+    statements: Sequence[dict[str, Any]],
+    project_sigs: Sequence[ProjectSignature],
+    entries: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Return the report for a task in a batch.
+
+    Each mutation is given the most expensive cost of the task's statements
+    affecting its table. Statements can't be attributed to individual
+    mutations, since statements from several mutations may be merged.
+
+    Args:
+        task_info (dict):
+            Information on the task from the batch.
+
+        statements (list of dict):
+            The reports for the task's statements.
+
+        project_sigs (list of django_evolution.signature.ProjectSignature):
+            The signatures used to look up tables for mutations, in order
+            of preference.
+
+        entries (list of dict):
+            The list of reported entries to annotate with table statistics.
+            Mutations will be added to this.
+
+    Returns:
+        dict:
+        The report for the task.
+    """
+    task = task_info['task']
+    app_label = getattr(task, 'app_label', None)
+    table_costs = {}
+
+    for statement in statements:
+        table_name = statement['table']
+        cost = statement['cost']
+
+        if table_name and cost:
+            table_costs.setdefault(table_name, []).append(cost)
+
+    mutations = []
+
+    for mutation in task_info.get('mutations', []):
+        table_name = _get_mutation_table_name(mutation=mutation,
+                                              app_label=app_label,
+                                              project_sigs=project_sigs)
+        costs = table_costs.get(table_name)
+
+        if costs:
+            cost = max(costs, key=DDLCost.ORDER.index)
+        else:
+            cost = None
+
+        mutations.append({
+            'cost': cost,
+            'model': getattr(mutation, 'model_name', None),
+            'mutation': str(mutation),
+            'table': table_name,
+        })
+
+    entries.extend(mutations)
+
+    return {
+        'app_label': app_label,
+        'evolutions': list(task_info.get('evolutions', [])),
+        'mutations': mutations,
+        'statements': statements,
+        'task': str(task),
+    }
+
+
+def _get_mutation_table_name(
+    mutation: BaseMutation,
+    app_label: (str | None),
+    project_sigs: Sequence[ProjectSignature],
+) -> (str | None):
+    """Return the name of the table affected by a mutation.
+
+    Args:
+        mutation (django_evolution.mutations.base.BaseMutation):
+            The mutation.
+
+        app_label (str):
+            The label of the app being mutated.
+
+        project_sigs (list of django_evolution.signature.ProjectSignature):
+            The signatures used to look up the table, in order of
+            preference.
+
+    Returns:
+        str:
+        The name of the table, or ``None`` if the mutation doesn't apply to
+        a known model.
+    """
+    model_name = getattr(mutation, 'model_name', None)
+
+    if not app_label or not model_name:
+        return None
+
+    for project_sig in project_sigs:
+        app_sig = project_sig.get_app_sig(app_label)
+
+        if app_sig is not None:
+            model_sig = app_sig.get_model_sig(model_name)
+
+            if model_sig is not None:
+                return model_sig.table_name
+
+    return None
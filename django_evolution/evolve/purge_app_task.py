@@ -106,7 +106,9 @@ class PurgeAppTask(BaseEvolutionTask):
 
         if self.evolution_required:
             try:
-                sql_executor.run_sql(self.sql, execute=True)
+                sql_executor.run_sql(self.sql,
+                                     execute=True,
+                                     task=self)
             except Exception as e:
                 raise EvolutionExecutionError(
                     _('Error purging app "%s": %s')
@@ -0,0 +1,487 @@
+"""Snapshots of evolved database schemas.
+
+Version Added:
+    3.0
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+from typing import TYPE_CHECKING, Any
+
+from django.apps import apps as global_apps
+from django.core import serializers
+from django.core.management.color import no_style
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.transaction import atomic
+from django.utils.translation import gettext as _
+
+from django_evolution.errors import SchemaSnapshotError
+from django_evolution.evolve.evolver import Evolver
+from django_evolution.models import Evolution, Version
+from django_evolution.signature import ProjectSignature
+from django_evolution.support import supports_migrations
+from django_evolution.utils.apps import get_app_label, get_apps
+from django_evolution.utils.db import (convert_table_name,
+                                       db_router_allows_schema_upgrade,
+                                       sql_create_models)
+from django_evolution.utils.evolutions import get_evolution_sequence
+from django_evolution.utils.migrations import (MigrationList,
+                                               MigrationLoader,
+                                               record_applied_migrations)
+from django_evolution.utils.models import get_models
+from django_evolution.utils.sql import SQLExecutor
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def get_schema_snapshot_key(
+    database_name: str,
+) -> str:
+    """Return the key for schema snapshots matching a database.
+
+    The key is a hash of the target state of the database. This covers the
+    project signature for the current models, the evolutions and migrations
+    available for each app, and the database backend. It doesn't depend on
+    what has been applied to the database, so an empty database will have
+    the same key as a fully-evolved one.
+
+    Version Added:
+        3.0
+
+    Args:
+        database_name (str):
+            The name of the database.
+
+    Returns:
+        str:
+        The snapshot key.
+    """
+    connection = connections[database_name]
+    project_sig = ProjectSignature.from_database(database_name)
+
+    for app_sig in project_sig.app_sigs:
+        app_sig.applied_migrations = None
+
+    if supports_migrations:
+        migrations = sorted(MigrationLoader(connection).graph.nodes)
+    else:
+        migrations = []
+
+    state = {
+        'evolutions': {
+            get_app_label(app): get_evolution_sequence(app)
+            for app in get_apps()
+        },
+        'migrations': migrations,
+        'project_sig': project_sig.serialize(),
+        'vendor': connection.vendor,
+    }
+
+    return hashlib.sha256(
+        json.dumps(state, sort_keys=True).encode('utf-8')
+    ).hexdigest()
+
+
+class SchemaSnapshot:
+    """A snapshot of an evolved database's schema and evolution history.
+
+    Snapshots contain the SQL needed to create every table in an evolved
+    database, along with the stored project signatures, applied
+    evolutions, and applied migrations. Restoring a snapshot into an empty
+    database is much faster than evolving it from scratch, which makes
+    them useful for test and preview databases.
+
+    The SQL is a cache of the DDL for the project's current models, as
+    generated by Django, rather than a dump of the database's schema.
+    Snapshots can only be created from fully-evolved databases, whose
+    tables, indexes, and constraints match what the models would create.
+    Anything in the schema that isn't described by the models (such as
+    tables, indexes, or triggers created by custom SQL in evolutions or
+    migrations) is not included.
+
+    Snapshots are keyed by :py:func:`get_schema_snapshot_key`, and can only
+    be restored into databases with the same key.
+
+    Only the schema and evolution history is included. Any other rows
+    (such as those added by data migrations) are not. The
+    :py:data:`~django.db.models.signals.post_migrate` signal is emitted
+    after restoring, allowing apps to populate their own data.
+
+    Version Added:
+        3.0
+
+    Attributes:
+        applied_migrations (list of tuple):
+            The applied migrations, as ``(app_label, name)`` tuples.
+
+        evolutions (list of dict):
+            The serialized applied evolutions.
+
+        key (str):
+            The key for the snapshot.
+
+        model_sql (list of str):
+            The SQL statements used to create the tables for the models.
+
+        versions (list of dict):
+            The serialized project versions.
+    """
+
+    #: The version of the snapshot format.
+    FORMAT_VERSION = 1
+
+    @classmethod
+    def from_database(
+        cls,
+        database_name: str,
+    ) -> SchemaSnapshot:
+        """Create a snapshot of an evolved database.
+
+        Args:
+            database_name (str):
+                The name of the database.
+
+        Returns:
+            SchemaSnapshot:
+            The new snapshot.
+
+        Raises:
+            django_evolution.errors.SchemaSnapshotError:
+                The database has not been fully evolved.
+        """
+        connection = connections[database_name]
+        table_names = set(connection.introspection.table_names())
+
+        if (convert_table_name(connection, Version._meta.db_table) not in
+            table_names):
+            raise SchemaSnapshotError(
+                _('The database "%s" has not been evolved.')
+                % database_name)
+
+        evolver = Evolver(database_name=database_name)
+        evolver.queue_evolve_all_apps()
+
+        if evolver.get_evolution_required():
+            raise SchemaSnapshotError(
+                _('The database "%s" must be fully evolved before a '
+                  'snapshot can be created.')
+                % database_name)
+
+        # Models for a M2M field will be created automatically, so we don't
+        # want to include them here.
+        models = []
+
+        for app in get_apps():
+            app_label = get_app_label(app)
+
+            for model in get_models(app, include_auto_created=False):
+                meta = model._meta
+
+                if (meta.managed and
+                    not meta.proxy and
+                    not meta.swapped and
+                    convert_table_name(connection,
+                                       meta.db_table) in table_names and
+                    db_router_allows_schema_upgrade(database_name, app_label,
+                                                    model)):
+                    models.append(model)
+
+        recorder = MigrationRecorder(connection)
+
+        if recorder.has_table():
+            applied_migrations = list(
+                recorder.migration_qs
+                .order_by('pk')
+                .values_list('app', 'name')
+            )
+        else:
+            applied_migrations = []
+
+        return cls(
+            key=get_schema_snapshot_key(database_name),
+            model_sql=sql_create_models(models, db_name=database_name),
+            versions=cls._serialize_rows(
+                Version.objects.using(database_name).order_by('pk')),
+            evolutions=cls._serialize_rows(
+                Evolution.objects.using(database_name).order_by('pk')),
+            applied_migrations=applied_migrations)
+
+    @classmethod
+    def deserialize(
+        cls,
+        snapshot_dict: dict[str, Any],
+    ) -> SchemaSnapshot:
+        """Deserialize a snapshot.
+
+        Args:
+            snapshot_dict (dict):
+                The serialized snapshot.
+
+        Returns:
+            SchemaSnapshot:
+            The deserialized snapshot.
+
+        Raises:
+            django_evolution.errors.SchemaSnapshotError:
+                The snapshot uses an unsupported format version.
+        """
+        format_version = snapshot_dict.get('format_version')
+
+        if format_version != cls.FORMAT_VERSION:
+            raise SchemaSnapshotError(
+                _('Schema snapshot format version %r is not supported.')
+                % format_version)
+
+        return cls(
+            key=snapshot_dict['key'],
+            model_sql=snapshot_dict['model_sql'],
+            versions=snapshot_dict['versions'],
+            evolutions=snapshot_dict['evolutions'],
+            applied_migrations=[
+                tuple(migration)
+                for migration in snapshot_dict['applied_migrations']
+            ])
+
+    @classmethod
+    def load(
+        cls,
+        filename: str,
+    ) -> SchemaSnapshot:
+        """Load a snapshot from a file.
+
+        Args:
+            filename (str):
+                The path to the gzip-compressed snapshot file.
+
+        Returns:
+            SchemaSnapshot:
+            The loaded snapshot.
+
+        Raises:
+            django_evolution.errors.SchemaSnapshotError:
+                The snapshot uses an unsupported format version.
+        """
+        with gzip.open(filename, 'rt', encoding='utf-8') as fp:
+            return cls.deserialize(json.load(fp))
+
+    @classmethod
+    def get_filename(
+        cls,
+        snapshot_dir: str,
+        key: str,
+    ) -> str:
+        """Return the filename for a snapshot in a directory.
+
+        Args:
+            snapshot_dir (str):
+                The directory containing snapshots.
+
+            key (str):
+                The key for the snapshot.
+
+        Returns:
+            str:
+            The path to the snapshot file.
+        """
+        return os.path.join(snapshot_dir, '%s.json.gz' % key)
+
+    def __init__(
+        self,
+        key: str,
+        model_sql: Sequence[str],
+        versions: Sequence[dict[str, Any]],
+        evolutions: Sequence[dict[str, Any]],
+        applied_migrations: Sequence[tuple[str, str]],
+    ) -> None:
+        """Initialize the snapshot.
+
+        Args:
+            key (str):
+                The key for the snapshot.
+
+            model_sql (list of str):
+                The SQL statements used to create the tables for the models.
+
+            versions (list of dict):
+                The serialized project versions.
+
+            evolutions (list of dict):
+                The serialized applied evolutions.
+
+            applied_migrations (list of tuple):
+                The applied migrations, as ``(app_label, name)`` tuples.
+        """
+        self.key = key
+        self.model_sql = list(model_sql)
+        self.versions = list(versions)
+        self.evolutions = list(evolutions)
+        self.applied_migrations = list(applied_migrations)
+
+    def serialize(self) -> dict[str, Any]:
+        """Serialize the snapshot.
+
+        Returns:
+            dict:
+            The serialized snapshot.
+        """
+        return {
+            'applied_migrations': [
+                list(migration)
+                for migration in self.applied_migrations
+            ],
+            'evolutions': self.evolutions,
+            'format_version': self.FORMAT_VERSION,
+            'key': self.key,
+            'model_sql': self.model_sql,
+            'versions': self.versions,
+        }
+
+    def save(
+        self,
+        filename: str,
+    ) -> None:
+        """Save the snapshot to a file.
+
+        The snapshot is written to a temporary file first, so that readers
+        never see a partially-written snapshot.
+
+        Args:
+            filename (str):
+                The path to the gzip-compressed snapshot file.
+        """
+        temp_filename = '%s.%s.tmp' % (filename, os.getpid())
+
+        with gzip.open(temp_filename, 'wt', encoding='utf-8') as fp:
+            json.dump(self.serialize(), fp)
+
+        os.replace(temp_filename, filename)
+
+    def can_restore(
+        self,
+        database_name: str,
+    ) -> bool:
+        """Return whether the snapshot can be restored into a database.
+
+        The database must be empty, and must have the same key as the
+        snapshot. An empty migration history table is allowed, since
+        computing the key may create it.
+
+        Args:
+            database_name (str):
+                The name of the database.
+
+        Returns:
+            bool:
+            ``True`` if the snapshot can be restored. ``False`` if it
+            cannot.
+        """
+        key = get_schema_snapshot_key(database_name)
+        connection = connections[database_name]
+        table_names = set(connection.introspection.table_names())
+        recorder = MigrationRecorder(connection)
+        migrations_table_name = convert_table_name(
+            connection, recorder.Migration._meta.db_table)
+
+        if (migrations_table_name in table_names and
+            not recorder.migration_qs.exists()):
+            table_names.remove(migrations_table_name)
+
+        return not table_names and key == self.key
+
+    def restore(
+        self,
+        database_name: str,
+        verbosity: int = 0,
+        interactive: bool = False,
+    ) -> None:
+        """Restore the snapshot into an empty database.
+
+        This will create all tables, restore the evolution history, and
+        then emit the :py:data:`~django.db.models.signals.post_migrate`
+        signal.
+
+        Args:
+            database_name (str):
+                The name of the database.
+
+            verbosity (int, optional):
+                The verbosity level, passed along to signal emissions.
+
+            interactive (bool, optional):
+                Whether this is being performed in a way that allows
+                interactivity on the command line. This is passed along to
+                signal emissions.
+
+        Raises:
+            django_evolution.errors.SchemaSnapshotError:
+                The snapshot cannot be restored into the database.
+        """
+        if not self.can_restore(database_name):
+            raise SchemaSnapshotError(
+                _('The schema snapshot cannot be restored into the '
+                  'database "%s". The database must be empty and match '
+                  'the snapshot\'s models, evolutions, and migrations.')
+                % database_name)
+
+        connection = connections[database_name]
+
+        with atomic(using=database_name):
+            with SQLExecutor(database=database_name) as sql_executor:
+                sql_executor.run_sql(self.model_sql,
+                                     execute=True)
+
+            for row in serializers.deserialize(
+                'json',
+                json.dumps(self.versions + self.evolutions),
+                using=database_name):
+                row.save(using=database_name)
+
+            # The rows were saved with their original IDs, so any sequences
+            # need to be moved past them.
+            sequence_sql = connection.ops.sequence_reset_sql(
+                no_style(), [Version, Evolution])
+
+            if sequence_sql:
+                with connection.cursor() as cursor:
+                    for sql in sequence_sql:
+                        cursor.execute(sql)
+
+            if self.applied_migrations:
+                migrations = MigrationList()
+
+                for app_label, name in self.applied_migrations:
+                    migrations.add_migration_info(app_label=app_label,
+                                                  name=name)
+
+                record_applied_migrations(connection=connection,
+                                          migrations=migrations)
+
+        emit_post_migrate_signal(verbosity=verbosity,
+                                 interactive=interactive,
+                                 db=database_name,
+                                 apps=global_apps,
+                                 plan=[])
+
+    @classmethod
+    def _serialize_rows(
+        cls,
+        queryset,
+    ) -> list[dict[str, Any]]:
+        """Serialize the rows from a queryset.
+
+        Args:
+            queryset (django.db.models.query.QuerySet):
+                The queryset to serialize.
+
+        Returns:
+            list of dict:
+            The serialized rows.
+        """
+        return json.loads(serializers.serialize('json', queryset))
@@ -2,27 +2,38 @@
 
 from __future__ import annotations
 
+import json
 import textwrap
 import os
 
 from django.core.exceptions import ImproperlyConfigured
 from django.core.management.base import CommandError
+from django.db import connections
 from django.db.utils import DEFAULT_DB_ALIAS
 from django.dispatch import receiver
 from django.utils.translation import ngettext, gettext as _
 
 from django_evolution.compat.commands import BaseCommand
 from django_evolution.conf import django_evolution_settings
+from django_evolution.consts import DatabaseEvolutionStatus
 from django_evolution.errors import EvolutionException
-from django_evolution.evolve import EvolveAppTask, Evolver, PurgeAppTask
+from django_evolution.evolve import (EvolveAppTask,
+                                     Evolver,
+                                     MultiDatabaseEvolver,
+                                     PurgeAppTask,
+                                     SchemaSnapshot)
+from django_evolution.evolve.plan_report import get_evolution_plan_report
+from django_evolution.evolve.snapshot import get_schema_snapshot_key
 from django_evolution.signals import (applied_evolution,
                                       applied_migration,
                                       applying_evolution,
                                       applying_migration,
                                       created_models,
-                                      creating_models)
+                                      creating_models,
+                                      executed_sql_statement)
 from django_evolution.utils.apps import import_management_modules, get_app
 from django_evolution.utils.evolutions import get_evolutions_path
+from django_evolution.utils.profiling import EvolutionProfiler
 from django_evolution.utils.sql import SQLExecutor
 
 
@@ -34,6 +45,18 @@ class Command(BaseCommand):
 
     requires_model_validation = False
 
+    #: The number of statements to show when displaying SQL timings.
+    #:
+    #: Version Added:
+    #:     3.0
+    max_timings_statements = 10
+
+    #: The maximum length of SQL to show when displaying SQL timings.
+    #:
+    #: Version Added:
+    #:     3.0
+    max_timings_sql_length = 200
+
     def add_arguments(self, parser):
         """Add arguments to the command.
 
@@ -73,6 +96,17 @@ class Command(BaseCommand):
             dest='compile_sql',
             default=False,
             help=_('Display the evolutions as SQL.'))
+        parser.add_argument(
+            '--plan',
+            metavar='FORMAT',
+            choices=('json',),
+            dest='plan_format',
+            default=None,
+            help=_('Display a machine-readable report of the evolution '
+                   'plan, listing each batch, task, mutation, and SQL '
+                   'statement, along with the affected tables, their '
+                   'estimated sizes, and the cost of each operation. '
+                   'The only supported format is "json".'))
         parser.add_argument(
             '-w',
             '--write',
@@ -90,11 +124,105 @@ class Command(BaseCommand):
             dest='execute',
             default=False,
             help=_('Apply evolutions to the database.'))
+        parser.add_argument(
+            '--timings',
+            action='store_true',
+            dest='timings',
+            default=False,
+            help=_('Display a summary of the slowest SQL statements '
+                   'executed. This must be used with --execute.'))
+        parser.add_argument(
+            '--profile',
+            action='store_true',
+            dest='profile',
+            default=False,
+            help=_('Profile each phase of the evolution process, showing '
+                   'the time and number of queries used.'))
+        parser.add_argument(
+            '--profile-output',
+            metavar='FILENAME',
+            dest='profile_output',
+            default=None,
+            help=_('Profile each phase of the evolution process, writing a '
+                   'JSON report to the given file instead of showing it, '
+                   'along with a cProfile dump to a ".prof" file alongside '
+                   'it. This implies --profile.'))
+        parser.add_argument(
+            '--profile-memory',
+            action='store_true',
+            dest='profile_memory',
+            default=False,
+            help=_('Include the peak memory used by each phase when '
+                   'profiling. This slows down evolution considerably. '
+                   'This must be used with --profile or --profile-output.'))
+        parser.add_argument(
+            '--prepare-workers',
+            metavar='NUM_WORKERS',
+            type=int,
+            dest='prepare_workers',
+            default=None,
+            help=_('The number of worker threads used to generate SQL for '
+                   'apps in parallel. This defaults to the PREPARE_WORKERS '
+                   'setting.'))
+        parser.add_argument(
+            '--allow-rewrite',
+            action='store_true',
+            dest='allow_rewrite',
+            default=False,
+            help=_('Allow evolutions that would rewrite, or block writes '
+                   'to, tables larger than the MAX_BLOCKING_TABLE_ROWS '
+                   'setting.'))
+        parser.add_argument(
+            '--fresh-install',
+            action='store_true',
+            dest='fresh_install',
+            default=False,
+            help=_('When evolving an empty database, create all tables '
+                   'directly from the current models, and record all '
+                   'evolutions and schema-only migrations as applied '
+                   'instead of running them.'))
+        parser.add_argument(
+            '--snapshot-dir',
+            metavar='DIRECTORY',
+            dest='snapshot_dir',
+            default=None,
+            help=_('A directory of schema snapshots. When evolving an '
+                   'empty database, a matching snapshot will be restored '
+                   'instead, if available. Otherwise, a snapshot will be '
+                   'saved once the database is evolved. This must be used '
+                   'with --execute.'))
         parser.add_argument(
             '--database',
             action='store',
             dest='database',
-            help=_('Specify the database containing models to synchronize.'))
+            help=_('Specify the database containing models to synchronize. '
+                   'Multiple databases can be separated by commas, or '
+                   '"all" can be used for all configured databases. These '
+                   'will be evolved concurrently.'))
+        parser.add_argument(
+            '--database-workers',
+            metavar='NUM_WORKERS',
+            type=int,
+            dest='database_workers',
+            default=None,
+            help=_('The maximum number of databases to evolve at once '
+                   'when evolving multiple databases. This defaults to the '
+                   'number of databases.'))
+        parser.add_argument(
+            '--continue-on-error',
+            action='store_true',
+            dest='continue_on_error',
+            default=False,
+            help=_('Continue evolving the remaining databases if evolving '
+                   'one fails, when evolving multiple databases.'))
+        parser.add_argument(
+            '--reuse-plans',
+            action='store_true',
+            dest='reuse_plans',
+            default=False,
+            help=_('Generate one evolution plan for all databases in the '
+                   'same state, such as identical shards, when evolving '
+                   'multiple databases.'))
 
     def handle(self, *app_labels, **options):
         """Handle the command.
@@ -119,14 +247,18 @@ class Command(BaseCommand):
                 _('Django Evolution is disabled for this project. '
                   'Evolutions cannot be manually run.'))
 
+        self.plan_format = options['plan_format']
         self.purge = options['purge']
+        self.timings = options['timings']
         self.verbosity = int(options['verbosity'])
 
         hint = options['hint']
         compile_sql = options['compile_sql']
-        database_name = options['database'] or DEFAULT_DB_ALIAS
+        database_names = self._get_database_names(options['database'])
         execute = options['execute']
         interactive = options['interactive']
+        prepare_workers = options['prepare_workers']
+        snapshot_dir = options['snapshot_dir']
         write_evolution_name = options['write_evolution_name']
 
         if app_labels and self.execute:
@@ -137,13 +269,61 @@ class Command(BaseCommand):
         if write_evolution_name and not hint:
             raise CommandError(_('--write cannot be used without --hint.'))
 
+        if self.timings and not execute:
+            raise CommandError(
+                _('--timings cannot be used without --execute.'))
+
+        if prepare_workers is not None and prepare_workers < 1:
+            raise CommandError(
+                _('--prepare-workers must be at least 1.'))
+
+        if snapshot_dir and not execute:
+            raise CommandError(
+                _('--snapshot-dir cannot be used without --execute.'))
+
+        if (options['profile_memory'] and
+            not (options['profile'] or options['profile_output'])):
+            raise CommandError(
+                _('--profile-memory cannot be used without --profile or '
+                  '--profile-output.'))
+
+        if self.plan_format and execute:
+            raise CommandError(
+                _('--plan cannot be used with --execute.'))
+
         import_management_modules()
 
+        if len(database_names) > 1:
+            self._handle_multiple_databases(database_names, **options)
+            return
+
+        database_name = database_names[0]
+
+        if snapshot_dir and self._restore_snapshot(database_name,
+                                                   snapshot_dir,
+                                                   interactive):
+            return
+
+        profile_output = options['profile_output']
+
+        if options['profile'] or profile_output:
+            profiler = EvolutionProfiler(
+                database_name=database_name,
+                use_cprofile=profile_output is not None,
+                track_memory=options['profile_memory'])
+            profiler.start()
+        else:
+            profiler = None
+
         try:
             self.evolver = Evolver(database_name=database_name,
                                    hinted=hint,
                                    verbosity=self.verbosity,
-                                   interactive=interactive)
+                                   interactive=interactive,
+                                   profiler=profiler,
+                                   prepare_workers=prepare_workers,
+                                   fresh_install=options['fresh_install'],
+                                   allow_rewrite=options['allow_rewrite'])
 
             # Figure out what tasks we need to add to the evolver. This
             # must be done before we check any state (as that will finalize
@@ -168,12 +348,17 @@ class Command(BaseCommand):
             # if one or more evolutions couldn't be simulated.
             simulated = self._check_simulation()
 
-            if not self.evolver.get_evolution_required():
+            if self.plan_format:
+                self._display_plan()
+            elif not self.evolver.get_evolution_required():
                 if self.verbosity > 0:
                     self.stdout.write(_('No database upgrade required.\n'))
             elif execute:
                 if not interactive or self._confirm_execute():
                     self._perform_evolution()
+
+                    if snapshot_dir and self.evolver.installed_new_database:
+                        self._save_snapshot(database_name, snapshot_dir)
                 else:
                     self.stderr.write(_('Database upgrade cancelled.\n'))
             elif compile_sql:
@@ -195,6 +380,156 @@ class Command(BaseCommand):
                             'the evolution.\n'))
         except EvolutionException as e:
             raise CommandError(str(e))
+        finally:
+            if profiler is not None:
+                profiler.stop()
+                self._write_profile(profiler, profile_output)
+
+    def _get_database_names(self, database_option):
+        """Return the names of the databases to evolve.
+
+        Version Added:
+            3.0
+
+        Args:
+            database_option (str):
+                The value of the ``--database`` option. This may be a
+                single database, a comma-separated list of databases, or
+                ``all``.
+
+        Returns:
+            list of str:
+            The names of the databases to evolve.
+
+        Raises:
+            django.core.management.base.CommandError:
+                One or more databases were not configured.
+        """
+        if not database_option:
+            return [DEFAULT_DB_ALIAS]
+
+        if database_option == 'all':
+            return list(connections)
+
+        database_names = []
+
+        for database_name in database_option.split(','):
+            database_name = database_name.strip()
+
+            if database_name and database_name not in database_names:
+                database_names.append(database_name)
+
+        invalid_names = [
+            database_name
+            for database_name in database_names
+            if database_name not in connections
+        ]
+
+        if not database_names or invalid_names:
+            raise CommandError(
+                _('The following databases are not configured: %s')
+                % ', '.join(invalid_names or [database_option]))
+
+        return database_names
+
+    def _handle_multiple_databases(self, database_names, **options):
+        """Evolve multiple databases concurrently.
+
+        Only applying evolutions is supported when evolving multiple
+        databases. The result for each database will be displayed once all
+        databases have finished.
+
+        Version Added:
+            3.0
+
+        Args:
+            database_names (list of str):
+                The names of the databases to evolve.
+
+            **options (dict):
+                Options parsed by the argument parser.
+
+        Raises:
+            django.core.management.base.CommandError:
+                Arguments were invalid, or one or more databases failed to
+                evolve.
+        """
+        for option, option_name in (('hint', '--hint'),
+                                    ('compile_sql', '--sql'),
+                                    ('plan_format', '--plan'),
+                                    ('fresh_install', '--fresh-install'),
+                                    ('snapshot_dir', '--snapshot-dir'),
+                                    ('profile', '--profile'),
+                                    ('profile_output', '--profile-output'),
+                                    ('timings', '--timings')):
+            if options[option]:
+                raise CommandError(
+                    _('%s cannot be used with multiple databases.')
+                    % option_name)
+
+        if not options['execute']:
+            raise CommandError(
+                _('--execute must be used with multiple databases.'))
+
+        database_workers = options['database_workers']
+
+        if database_workers is not None and database_workers < 1:
+            raise CommandError(
+                _('--database-workers must be at least 1.'))
+
+        interactive = options['interactive']
+
+        if interactive and not self._confirm_execute(database_names):
+            self.stderr.write(_('Database upgrade cancelled.\n'))
+            return
+
+        multi_evolver = MultiDatabaseEvolver(
+            database_names=database_names,
+            max_workers=database_workers,
+            fail_fast=not options['continue_on_error'],
+            purge=self.purge,
+            verbosity=self.verbosity,
+            interactive=interactive,
+            prepare_workers=options['prepare_workers'],
+            reuse_plans=options['reuse_plans'],
+            allow_rewrite=options['allow_rewrite'])
+
+        self.stdout.write(
+            '\n%s\n\n'
+            % self._wrap_paragraphs(_(
+                'This may take a while. Please be patient, and DO NOT '
+                'cancel the upgrade!')))
+
+        results = multi_evolver.evolve()
+        failed_names = []
+
+        for result in results:
+            status = result.status
+
+            if status == DatabaseEvolutionStatus.EVOLVED:
+                message = _('The database upgrade was successful')
+            elif status == DatabaseEvolutionStatus.UP_TO_DATE:
+                message = _('No database upgrade required')
+            elif status == DatabaseEvolutionStatus.SKIPPED:
+                message = _('Skipped due to an earlier failure')
+            else:
+                message = _('Failed: %s') % result.error
+                failed_names.append(result.database_name)
+
+            if status == DatabaseEvolutionStatus.FAILED:
+                stream = self.stderr
+            elif self.verbosity > 0:
+                stream = self.stdout
+            else:
+                continue
+
+            stream.write('%s: %s (%.3f seconds)\n'
+                         % (result.database_name, message, result.duration))
+
+        if failed_names:
+            raise CommandError(
+                _('Evolution failed for the following databases: %s')
+                % ', '.join(failed_names))
 
     def _add_tasks(self, app_labels):
         """Add tasks to the evolver, based on the command options.
@@ -277,7 +612,13 @@ class Command(BaseCommand):
                 A simulation was performed, but changes could not be resolved.
         """
         if not self.evolver.can_simulate():
-            self.stdout.write(self.style.NOTICE(
+            # Keep plan reports on standard output parsable.
+            if self.plan_format:
+                stream = self.stderr
+            else:
+                stream = self.stdout
+
+            stream.write(self.style.NOTICE(
                 _('Evolution could not be simulated, possibly due '
                   'to raw SQL mutations\n')))
 
@@ -313,30 +654,147 @@ class Command(BaseCommand):
             'Your models contain changes that Django Evolution cannot '
             'resolve automatically.'))
 
-    def _confirm_execute(self):
+    def _restore_snapshot(self, database_name, snapshot_dir, interactive):
+        """Restore a schema snapshot into an empty database, if available.
+
+        If running interactively, the user will be asked to confirm before
+        the snapshot is restored.
+
+        Version Added:
+            3.0
+
+        Args:
+            database_name (str):
+                The name of the database to restore into.
+
+            snapshot_dir (str):
+                The directory containing schema snapshots.
+
+            interactive (bool):
+                Whether to prompt the user for confirmation.
+
+        Returns:
+            bool:
+            ``True`` if a snapshot was restored, or the user cancelled
+            restoring it. ``False`` if there was no matching snapshot, or
+            the database isn't empty.
+
+        Raises:
+            django.core.management.base.CommandError:
+                The snapshot could not be restored.
+        """
+        if connections[database_name].introspection.table_names():
+            return False
+
+        filename = SchemaSnapshot.get_filename(
+            snapshot_dir=snapshot_dir,
+            key=get_schema_snapshot_key(database_name))
+
+        if not os.path.exists(filename):
+            return False
+
+        if interactive and not self._confirm_execute([database_name]):
+            self.stderr.write(_('Database upgrade cancelled.\n'))
+            return True
+
+        try:
+            snapshot = SchemaSnapshot.load(filename)
+            snapshot.restore(database_name=database_name,
+                             verbosity=self.verbosity)
+        except EvolutionException as e:
+            raise CommandError(str(e))
+
+        if self.verbosity > 0:
+            self.stdout.write(
+                _('Restored the database from schema snapshot %s.\n')
+                % filename)
+
+        return True
+
+    def _save_snapshot(self, database_name, snapshot_dir):
+        """Save a schema snapshot of a newly-evolved database.
+
+        Version Added:
+            3.0
+
+        Args:
+            database_name (str):
+                The name of the evolved database.
+
+            snapshot_dir (str):
+                The directory to save the schema snapshot to.
+
+        Raises:
+            django.core.management.base.CommandError:
+                The snapshot could not be created.
+        """
+        try:
+            snapshot = SchemaSnapshot.from_database(database_name)
+        except EvolutionException as e:
+            raise CommandError(str(e))
+
+        filename = SchemaSnapshot.get_filename(snapshot_dir=snapshot_dir,
+                                               key=snapshot.key)
+
+        os.makedirs(snapshot_dir, exist_ok=True)
+        snapshot.save(filename)
+
+        if self.verbosity > 0:
+            self.stdout.write(_('Saved schema snapshot %s.\n') % filename)
+
+    def _confirm_execute(self, database_names=None):
         """Prompt the user to confirm execution of an evolution.
 
         This will warn the user of the risks of evolving the database and
         to recommend a backup. It will then prompt for confirmation, returning
         the result.
 
+        Version Changed:
+            3.0:
+            Added the ``database_names`` argument.
+
+        Args:
+            database_names (list of str, optional):
+                The names of the databases being evolved. This defaults to
+                the evolver's database.
+
         Returns:
             bool:
             ``True`` if the user confirmed the execution. ``False`` if the
             execution should be cancelled.
         """
+        if database_names is None:
+            database_names = [self.evolver.database_name]
+
         prompt = self._wrap_paragraphs(
-            _('You have requested a database upgrade. This will alter '
-              'tables and data currently in the "%s" database, and may '
-              'result in IRREVERSABLE DATA LOSS. Upgrades should be '
-              '*thoroughly* reviewed and tested prior to execution.\n'
-              '\n'
-              'MAKE A BACKUP OF YOUR DATABASE BEFORE YOU CONTINUE!\n'
-              '\n'
-              'Are you sure you want to execute the database upgrade?\n'
-              '\n'
-              'Type "yes" to continue, or "no" to cancel:')
-            % self.evolver.database_name)
+            ngettext(
+                'You have requested a database upgrade. This will alter '
+                'tables and data currently in the %(databases)s database, '
+                'and may result in IRREVERSABLE DATA LOSS. Upgrades should '
+                'be *thoroughly* reviewed and tested prior to execution.\n'
+                '\n'
+                'MAKE A BACKUP OF YOUR DATABASE BEFORE YOU CONTINUE!\n'
+                '\n'
+                'Are you sure you want to execute the database upgrade?\n'
+                '\n'
+                'Type "yes" to continue, or "no" to cancel:',
+                'You have requested a database upgrade. This will alter '
+                'tables and data currently in the %(databases)s databases, '
+                'and may result in IRREVERSABLE DATA LOSS. Upgrades should '
+                'be *thoroughly* reviewed and tested prior to execution.\n'
+                '\n'
+                'MAKE A BACKUP OF YOUR DATABASES BEFORE YOU CONTINUE!\n'
+                '\n'
+                'Are you sure you want to execute the database upgrades?\n'
+                '\n'
+                'Type "yes" to continue, or "no" to cancel:',
+                len(database_names))
+            % {
+                'databases': ', '.join(
+                    '"%s"' % database_name
+                    for database_name in database_names
+                ),
+            })
 
         # Note that we must append a space here, rather than above, since the
         # paragraph wrapping logic will strip trailing whitespace.
@@ -471,6 +929,15 @@ class Command(BaseCommand):
 
                 self.stdout.write(message)
 
+        sql_timings = []
+
+        if self.timings:
+            @receiver(executed_sql_statement)
+            def _on_executed_sql_statement(database, sql, duration,
+                                           app_label, **kwargs):
+                if database == evolver.database_name:
+                    sql_timings.append((duration, app_label, sql))
+
         self.stdout.write(
             '\n%s\n\n'
             % self._wrap_paragraphs(_(
@@ -488,6 +955,9 @@ class Command(BaseCommand):
                     % (e.last_sql_statement,))
 
             raise CommandError(str(e))
+        finally:
+            if self.timings:
+                self._display_sql_timings(sql_timings)
 
         if verbosity > 0:
             if evolver.installed_new_database:
@@ -495,6 +965,115 @@ class Command(BaseCommand):
             else:
                 self.stdout.write(_('The database upgrade was successful!\n'))
 
+    def _write_profile(self, profiler, profile_output):
+        """Write or display the results of profiling.
+
+        Version Added:
+            3.0
+
+        Args:
+            profiler (django_evolution.utils.profiling.EvolutionProfiler):
+                The profiler that recorded the evolution process.
+
+            profile_output (str):
+                The value of the ``--profile-output`` option. If set, the
+                report and cProfile dump will be written to files.
+                Otherwise, the report will be displayed.
+        """
+        if profile_output is not None:
+            cprofile_filename = \
+                '%s.prof' % os.path.splitext(profile_output)[0]
+
+            if cprofile_filename == profile_output:
+                cprofile_filename = '%s.prof' % profile_output
+
+            profiler.write_report(profile_output)
+            profiler.write_cprofile(cprofile_filename)
+
+            self.stdout.write(
+                _('Wrote the profiling report to %(report_filename)s and '
+                  'the cProfile dump to %(cprofile_filename)s.\n')
+                % {
+                    'cprofile_filename': cprofile_filename,
+                    'report_filename': profile_output,
+                })
+        else:
+            report = profiler.to_json()
+
+            self.stdout.write('\n')
+            self.stdout.write(
+                _('Profiled evolution in %(duration).3f seconds with '
+                  '%(queries)s queries:\n')
+                % {
+                    'duration': report['total_duration'],
+                    'queries': report['total_queries'],
+                })
+
+            for phase_info in report['phases']:
+                name = phase_info['name']
+
+                if phase_info['app_label']:
+                    name = '%s (%s)' % (name, phase_info['app_label'])
+
+                peak_memory = phase_info['peak_memory']
+
+                if peak_memory is None:
+                    memory_str = ''
+                else:
+                    memory_str = '%10.1f KiB' % (peak_memory / 1024.0)
+
+                self.stdout.write(
+                    '%-50s %9.3fs %7d queries %s\n'
+                    % ('%s%s' % ('  ' * phase_info['depth'], name),
+                       phase_info['duration'],
+                       phase_info['queries'],
+                       memory_str))
+
+    def _display_sql_timings(self, sql_timings):
+        """Display a summary of the slowest SQL statements executed.
+
+        Version Added:
+            3.0
+
+        Args:
+            sql_timings (list of tuple):
+                The SQL statements that were executed. Each is a tuple of
+                the duration in seconds, the app label (if known), and the
+                SQL statement.
+        """
+        total_duration = sum(
+            duration
+            for duration, app_label, sql in sql_timings
+        )
+
+        self.stdout.write('\n')
+        self.stdout.write(
+            _('Executed %(count)s SQL statements in %(duration).3f '
+              'seconds.\n')
+            % {
+                'count': len(sql_timings),
+                'duration': total_duration,
+            })
+
+        if not sql_timings:
+            return
+
+        slowest = sorted(sql_timings,
+                         key=lambda timing: timing[0],
+                         reverse=True)[:self.max_timings_statements]
+        max_sql_length = self.max_timings_sql_length
+
+        self.stdout.write(_('Slowest SQL statements:\n'))
+
+        for duration, app_label, sql in slowest:
+            sql = ' '.join(sql.split())
+
+            if len(sql) > max_sql_length:
+                sql = '%s...' % sql[:max_sql_length]
+
+            self.stdout.write('%9.3fs  %-20s  %s\n'
+                              % (duration, app_label or '-', sql))
+
     def _display_compiled_sql(self):
         """Display the compiled SQL for the evolution run.
 
@@ -514,6 +1093,16 @@ class Command(BaseCommand):
                     for statement in executor.run_sql(task.sql, capture=True):
                         self.stdout.write('%s\n' % statement)
 
+    def _display_plan(self):
+        """Display a machine-readable report of the evolution plan.
+
+        Version Added:
+            3.0
+        """
+        report = get_evolution_plan_report(self.evolver)
+
+        self.stdout.write('%s\n' % json.dumps(report, indent=2))
+
     def _display_available_purges(self):
         """Display the apps that can be purged."""
         purge_tasks = self.active_purge_tasks
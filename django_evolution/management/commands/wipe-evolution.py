@@ -49,15 +49,23 @@ class Command(BaseCommand):
         to_wipe_ids = []
         app_label = options['app_label']
 
-        for evolution_label in evolution_labels:
-            q = Q(label=evolution_label)
+        # Look up all the evolutions at once, rather than one query per
+        # label.
+        q = Q(label__in=evolution_labels)
+
+        if app_label:
+            q = q & Q(app_label=app_label)
 
-            if app_label:
-                q = q & Q(app_label=app_label)
+        evolution_ids_by_label = {}
 
-            evolutions = list(Evolution.objects.filter(q).values('pk'))
+        for evolution in Evolution.objects.filter(q).values('pk', 'label'):
+            evolution_ids_by_label.setdefault(evolution['label'], []).append(
+                evolution['pk'])
+
+        for evolution_label in evolution_labels:
+            evolution_ids = evolution_ids_by_label.get(evolution_label, [])
 
-            if len(evolutions) == 0:
+            if len(evolution_ids) == 0:
                 if app_label:
                     raise CommandError(
                         "Unable to find evolution '%s' for app label '%s'" %
@@ -65,7 +73,7 @@ class Command(BaseCommand):
                 else:
                     raise CommandError(
                         "Unable to find evolution '%s'" % evolution_label)
-            if len(evolutions) > 1:
+            if len(evolution_ids) > 1:
                 if app_label:
                     raise CommandError(
                         "Too many evolutions named '%s' for app label '%s'" %
@@ -74,7 +82,7 @@ class Command(BaseCommand):
                     raise CommandError(
                         "Too many evolutions named '%s'" % evolution_label)
 
-            to_wipe_ids.append(evolutions[0]['pk'])
+            to_wipe_ids.append(evolution_ids[0])
 
         if to_wipe_ids:
             if options['interactive']:
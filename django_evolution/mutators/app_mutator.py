@@ -10,6 +10,7 @@ import copy
 import logging
 from typing import TYPE_CHECKING
 
+from django_evolution.db.sql_result import SQLResult
 from django_evolution.errors import CannotSimulate
 from django_evolution.mutations import (AddField,
                                         BaseModelMutation,
@@ -58,9 +59,25 @@ class AppMutator(BaseMutator):
     to get the SQL statements needed to apply those operations. Once called,
     the mutator is finalized, and new operations cannot be added.
 
+    Version Changed:
+        3.0:
+        Added :py:attr:`mock_models`, which caches mock models for reuse by
+        each :py:class:`~django_evolution.mutators.model_mutator.
+        ModelMutator`, and :py:attr:`signature_version`, which invalidates
+        them.
+
     Version Changed:
         2.2:
         Moved into the :py:mod:`django_evolution.mutators.app_mutator` module.
+
+    Attributes:
+        mock_models (dict):
+            Mock models built for the app's models, keyed by model and by
+            the :py:attr:`signature_version` they were built from.
+
+        signature_version (int):
+            A counter bumped whenever a simulation may have changed the
+            project signature.
     """
 
     @classmethod
@@ -142,6 +159,13 @@ class AppMutator(BaseMutator):
         self.database = database
         self._last_model_mutator = None
         self._mutators = []
+
+        # Mock models built by each ModelMutator, keyed by model and by
+        # signature version. This is shared across ModelMutators, so that
+        # models can be reused until the next simulation.
+        self.mock_models = {}
+        self.signature_version = 0
+
         self._orig_project_sig = copy.deepcopy(self.project_sig)
         self._orig_database_state = self.database_state.clone()
 
@@ -188,6 +212,7 @@ class AppMutator(BaseMutator):
         # We'll now want to perform a mutate + simulate on this mutation.
         if mutator is None:
             mutation.mutate(self)
+            self.signature_version += 1
 
             try:
                 mutation.run_simulation(
@@ -232,6 +257,12 @@ class AppMutator(BaseMutator):
         The SQL will represent all the operations made by the mutator.
         Once called, no new operations can be added.
 
+        Version Changed:
+            3.0:
+            Compatible ALTER TABLE operations on a table from different
+            groups of mutations are now merged into a single statement,
+            where supported by the database.
+
         Returns:
             list:
             The list of SQL statements.
@@ -251,10 +282,30 @@ class AppMutator(BaseMutator):
         self.project_sig = self._orig_project_sig
         self.database_state = self._orig_database_state
 
-        sql = []
+        # Any mock models were built from the mutated signature, so they
+        # can't be used while replaying the simulations.
+        self.mock_models.clear()
+
+        sql_results = []
+        evolver = None
 
         for mutator in self._mutators:
-            sql.extend(mutator.to_sql())
+            if isinstance(mutator, ModelMutator):
+                evolver = mutator.evolver
+                sql_results += mutator.to_sql_results()
+            else:
+                sql_results.append(SQLResult(mutator.to_sql()))
+
+        if evolver is not None:
+            # Combine ALTER TABLE statements for tables touched by
+            # several groups of mutations. This only covers this app's
+            # mutations, since other apps have their own AppMutator.
+            sql_results = evolver.merge_alter_table_sql_results(sql_results)
+
+        sql = []
+
+        for sql_result in sql_results:
+            sql.extend(sql_result.to_sql())
 
         self.finalize()
 
@@ -165,10 +165,18 @@ class BaseAppStateMutator(BaseMutator):
 
         If simulation fails, :py:attr:`can_simulate` will be set to ``False``.
 
+        Version Changed:
+            3.0:
+            This now bumps the parent app mutator's
+            :py:attr:`~django_evolution.mutators.app_mutator.AppMutator.
+            signature_version`, invalidating any cached mock models.
+
         Args:
             mutation (django_evolution.mutations.BaseMutation):
                 The mutation to simulate.
         """
+        self.app_mutator.signature_version += 1
+
         try:
             mutation.run_simulation(app_label=self.app_label,
                                     legacy_app_label=self.legacy_app_label,
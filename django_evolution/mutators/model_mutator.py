@@ -22,6 +22,7 @@ if TYPE_CHECKING:
 
     from django.db import models
 
+    from django_evolution.db.sql_result import SQLResult
     from django_evolution.mutations import (
         ChangeField,
         ChangeMeta,
@@ -85,6 +86,7 @@ class ModelMutator(BaseAppStateMutator):
 
         self.model_name = model_name
         self._ops = []
+        self._mock_model_key = None
 
         evolution_ops = EvolutionOperationsMulti(self.database,
                                                  self.database_state)
@@ -131,6 +133,16 @@ class ModelMutator(BaseAppStateMutator):
         and passing a model instance, but can also be called whenever
         a new instance of the model is needed for any lookups.
 
+        Mock models are cached on the parent
+        :py:class:`~django_evolution.mutators.app_mutator.AppMutator`. A
+        model will be reused until a simulation is run, or until an operation
+        has finished with it.
+
+        Version Changed:
+            3.0:
+            Mock models are now cached and reused for the same signature
+            state.
+
         Returns:
             django_evolution.mock_models.MockModel:
             The resulting mock model.
@@ -139,11 +151,22 @@ class ModelMutator(BaseAppStateMutator):
             django_evolution.errors.EvolutionBaselineMissingError:
                 The model signature or parent app signature could not be found.
         """
-        return MockModel(project_sig=self.project_sig,
-                         app_name=self.app_label,
-                         model_name=self.model_name,
-                         model_sig=self.model_sig,
-                         db_name=self.database)
+        mock_models = self.app_mutator.mock_models
+        key = self._get_mock_model_key()
+
+        try:
+            model = mock_models[key]
+        except KeyError:
+            model = MockModel(project_sig=self.project_sig,
+                              app_name=self.app_label,
+                              model_name=self.model_name,
+                              model_sig=self.model_sig,
+                              db_name=self.database)
+            mock_models[key] = model
+
+        self._mock_model_key = key
+
+        return model
 
     def add_column(self, mutation, field, initial):
         """Adds a pending Add Column operation.
@@ -404,11 +427,34 @@ class ModelMutator(BaseAppStateMutator):
 
         Once called, no new operations can be added to the mutator.
         """
+        sql = []
+
+        for sql_result in self.to_sql_results():
+            sql.extend(sql_result.to_sql())
+
+        return sql
+
+    def to_sql_results(self) -> list[SQLResult]:
+        """Return SQL results for the operations added to this mutator.
+
+        This works like :py:meth:`to_sql`, but returns the SQL results
+        generated by the database operations backend without flattening
+        them, allowing them to be merged with results from other mutators.
+
+        Once called, no new operations can be added to the mutator.
+
+        Version Added:
+            3.0
+
+        Returns:
+            list of django_evolution.db.sql_result.SQLResult:
+            The SQL results for the operations.
+        """
         assert not self.finalized
 
         self.finalize()
 
-        return self.evolver.generate_table_ops_sql(self, self._ops)
+        return self.evolver.generate_table_ops_sql_results(self, self._ops)
 
     def finish_op(
         self,
@@ -427,4 +473,28 @@ class ModelMutator(BaseAppStateMutator):
             op (dict):
                 The operation that has finished.
         """
+        # The database operations backend may have modified the model while
+        # generating SQL, so it can't be reused.
+        self.app_mutator.mock_models.pop(self._mock_model_key, None)
+
         self.run_simulation(op['mutation'])
+
+    def _get_mock_model_key(self) -> tuple[str, str, int]:
+        """Return a key for caching a mock model.
+
+        The key is based on the parent app mutator's
+        :py:attr:`~django_evolution.mutators.app_mutator.AppMutator.
+        signature_version`, which is bumped by every simulation. Simulations
+        can change signatures for models other than the one being simulated
+        (for instance, when renaming a related model), so the version covers
+        the whole project signature rather than a single model.
+
+        Returns:
+            tuple:
+            The key for the mock model.
+        """
+        return (
+            self.app_label,
+            self.model_name,
+            self.app_mutator.signature_version,
+        )
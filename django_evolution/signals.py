@@ -93,3 +93,100 @@ creating_models = Signal()
 #:     model_names (list of str):
 #:         The list of models that were created.
 created_models = Signal()
+
+#: Emitted when a batch of SQL statements is about to be executed.
+#:
+#: Each batch is executed either in its own transaction or outside of a
+#: transaction.
+#:
+#: Version Added:
+#:     3.0
+#:
+#: Args:
+#:     database (str):
+#:         The name of the database the SQL is executed on.
+#:
+#:     batch_index (int):
+#:         The index of the batch within the call to
+#:         :py:meth:`~django_evolution.utils.sql.SQLExecutor.run_sql`.
+#:
+#:     num_statements (int):
+#:         The number of statements in the batch.
+#:
+#:     use_transaction (bool):
+#:         Whether the batch is executed in a transaction.
+#:
+#:     task (django_evolution.evolve.base.BaseEvolutionTask):
+#:         The task executing the SQL, if any.
+#:
+#:     app_label (str):
+#:         The label of the app the SQL was generated for, if any.
+executing_sql_batch = Signal()
+
+#: Emitted when a batch of SQL statements has been executed.
+#:
+#: Version Added:
+#:     3.0
+#:
+#: Args:
+#:     database (str):
+#:         The name of the database the SQL was executed on.
+#:
+#:     batch_index (int):
+#:         The index of the batch within the call to
+#:         :py:meth:`~django_evolution.utils.sql.SQLExecutor.run_sql`.
+#:
+#:     num_statements (int):
+#:         The number of statements in the batch.
+#:
+#:     use_transaction (bool):
+#:         Whether the batch was executed in a transaction.
+#:
+#:     duration (float):
+#:         The number of seconds spent executing the batch, including any
+#:         retries.
+#:
+#:     task (django_evolution.evolve.base.BaseEvolutionTask):
+#:         The task executing the SQL, if any.
+#:
+#:     app_label (str):
+#:         The label of the app the SQL was generated for, if any.
+executed_sql_batch = Signal()
+
+#: Emitted when an SQL statement has been executed.
+#:
+#: If multiple statements were sent to the database together (see
+#: ``settings.DJANGO_EVOLUTION['SQL_BATCH_SIZE']``), this will be emitted
+#: once for the combined SQL.
+#:
+#: Version Added:
+#:     3.0
+#:
+#: Args:
+#:     database (str):
+#:         The name of the database the SQL was executed on.
+#:
+#:     sql (str):
+#:         The SQL statement.
+#:
+#:     params (tuple):
+#:         The parameters for the SQL statement, if any.
+#:
+#:     duration (float):
+#:         The number of seconds spent executing the statement.
+#:
+#:     rowcount (int):
+#:         The number of rows affected by the statement, or -1 if not known.
+#:
+#:     batch_index (int):
+#:         The index of the batch containing the statement.
+#:
+#:     use_transaction (bool):
+#:         Whether the statement was executed in a transaction.
+#:
+#:     task (django_evolution.evolve.base.BaseEvolutionTask):
+#:         The task executing the SQL, if any.
+#:
+#:     app_label (str):
+#:         The label of the app the SQL was generated for, if any.
+executed_sql_statement = Signal()
@@ -15,18 +15,19 @@ from django_evolution.evolve import Evolver
 from django_evolution.models import Evolution, Version
 from django_evolution.mutators import AppMutator
 from django_evolution.support import supports_migrations
-from django_evolution.tests.utils import (create_test_project_sig,
+from django_evolution.tests.utils import (capture_queries,
+                                          create_test_project_sig,
                                           ensure_test_db,
                                           execute_test_sql,
                                           get_sql_mappings,
                                           register_models,
                                           unregister_test_models)
 from django_evolution.utils.migrations import (MigrationList,
+                                               clear_migration_loader_cache,
                                                record_applied_migrations,
                                                unrecord_applied_migrations)
 from django_evolution.utils.apps import get_app, unregister_app
 from django_evolution.utils.db import sql_delete
-from django_evolution.utils.models import clear_model_rel_tree
 
 
 class TestCase(DjangoTestCase):
@@ -106,7 +107,7 @@ class TestCase(DjangoTestCase):
 
         self.ensure_deleted_apps()
         unregister_test_models()
-        clear_model_rel_tree()
+        clear_migration_loader_cache()
 
     def shortDescription(self):
         """Returns the description of the current test.
@@ -339,6 +340,122 @@ class TestCase(DjangoTestCase):
                 app_label=app_label,
                 name=name))
 
+    @contextmanager
+    def assertNumQueriesByCategory(self, database=DEFAULT_DB_ALIAS,
+                                   **expected_counts):
+        """Assert the number of queries executed in each category.
+
+        Queries are categorized by
+        :py:class:`~django_evolution.tests.utils.CapturedQueries`. Only
+        the categories provided will be checked.
+
+        Version Added:
+            3.0
+
+        Args:
+            database (str, optional):
+                The name of the database to capture queries on.
+
+            **expected_counts (dict):
+                The exact number of queries expected for each category.
+
+        Context:
+            django_evolution.tests.utils.CapturedQueries:
+            The captured queries.
+
+        Raises:
+            AssertionError:
+                The query counts did not match.
+        """
+        with capture_queries(database) as captured:
+            yield captured
+
+        self._check_query_counts(
+            captured,
+            expected_counts,
+            lambda count, expected: count == expected,
+            'Expected %(expected)s %(category)s queries, but %(count)s were '
+            'executed')
+
+    @contextmanager
+    def assertQueryBudget(self, database=DEFAULT_DB_ALIAS, **max_counts):
+        """Assert that queries in each category stay within a budget.
+
+        This works like :py:meth:`assertNumQueriesByCategory`, but allows
+        fewer queries than the budget.
+
+        Version Added:
+            3.0
+
+        Args:
+            database (str, optional):
+                The name of the database to capture queries on.
+
+            **max_counts (dict):
+                The maximum number of queries allowed for each category.
+
+        Context:
+            django_evolution.tests.utils.CapturedQueries:
+            The captured queries.
+
+        Raises:
+            AssertionError:
+                A query budget was exceeded.
+        """
+        with capture_queries(database) as captured:
+            yield captured
+
+        self._check_query_counts(
+            captured,
+            max_counts,
+            lambda count, max_count: count <= max_count,
+            'Expected at most %(expected)s %(category)s queries, but '
+            '%(count)s were executed')
+
+    def _check_query_counts(self, captured, expected_counts, check_func,
+                            error_fmt):
+        """Check captured query counts against expectations.
+
+        Args:
+            captured (django_evolution.tests.utils.CapturedQueries):
+                The captured queries.
+
+            expected_counts (dict):
+                The expected counts for each category.
+
+            check_func (callable):
+                A function taking the captured count and expected count,
+                and returning whether the count is acceptable.
+
+            error_fmt (str):
+                The format string for the error message.
+
+        Raises:
+            AssertionError:
+                A query count was not acceptable.
+        """
+        counts = captured.get_counts()
+
+        for category, expected in expected_counts.items():
+            if category not in counts:
+                raise ValueError('"%s" is not a valid query category.'
+                                 % category)
+
+            count = counts[category]
+
+            if not check_func(count, expected):
+                self.fail('%s:\n\n%s' % (
+                    error_fmt % {
+                        'category': category,
+                        'count': count,
+                        'expected': expected,
+                    },
+                    '\n'.join(
+                        '%s. %s' % (i, sql)
+                        for i, sql in enumerate(captured.queries[category],
+                                                start=1)
+                    )))
+
     def assertSQLMappingEqual(self, sql, sql_mapping_name,
                               sql_mappings_key=None, database=None):
         """Assert generated SQL against database-specific mapped test SQL.
@@ -587,13 +704,22 @@ class MigrationsTestsMixin:
 
         if supports_migrations:
             connection = connections[DEFAULT_DB_ALIAS]
-
-            for app_label in ('tests',
-                              'migrations_app',
-                              'migrations_app2',
-                              'move_to_migrations_app'):
-                unrecord_applied_migrations(connection=connection,
-                                            app_label=app_label)
+            app_labels = {
+                'tests',
+                'migrations_app',
+                'migrations_app2',
+                'move_to_migrations_app',
+            }
+
+            migrations = MigrationList()
+
+            for info in MigrationList.from_database(connection):
+                if info['app_label'] in app_labels:
+                    migrations.add_migration_info(app_label=info['app_label'],
+                                                  name=info['name'])
+
+            unrecord_applied_migrations(connection=connection,
+                                        migrations=migrations)
 
 
 class EvolutionTestCase(TestCase):
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import re
+
 import django
 
 from django_evolution.compat.models import get_default_auto_field
@@ -44,8 +46,9 @@ def add_field(connection):
     generate_index_name = make_generate_index_name(connection)
     generate_unique_constraint_name = \
         make_generate_unique_constraint_name(connection)
+    is_mariadb = getattr(connection, 'mysql_is_mariadb', False)
 
-    return {
+    mappings = {
         'AddManyToManyDatabaseTableModel': [
             f'CREATE TABLE `tests_testmodel_added_field` '
             f'(`id` {pk_type} AUTO_INCREMENT NOT NULL PRIMARY KEY,'
@@ -152,6 +155,23 @@ def add_field(connection):
             ' MODIFY COLUMN `added_field` integer NOT NULL;',
         ],
 
+        'AddNonNullCallableColumnChunkedModel': [
+            'ALTER TABLE `tests_testmodel`'
+            ' ADD COLUMN `added_field` integer;',
+
+            '-- Start of a new transaction:',
+
+            re.compile(r'UPDATE `tests_testmodel`'
+                       r' SET `added_field` = `int_field`'
+                       r' WHERE `added_field` IS NULL'
+                       r' AND `id` >= \d+ AND `id` < \d+;'),
+
+            '-- Start of a new transaction:',
+
+            'ALTER TABLE `tests_testmodel`'
+            ' MODIFY COLUMN `added_field` integer NOT NULL;',
+        ],
+
         'AddNullColumnWithInitialColumnModel': [
             'ALTER TABLE `tests_testmodel`'
             ' ADD COLUMN `added_field` integer NULL DEFAULT 1;',
@@ -187,20 +207,6 @@ def add_field(connection):
             ' ALTER COLUMN `added_field` DROP DEFAULT;',
         ],
 
-        'AddDateColumnWithCallableInitialModel': [
-            'ALTER TABLE `tests_testmodel`'
-            ' ADD COLUMN `added_field` %s;'
-            % datetime_type,
-
-            'UPDATE `tests_testmodel`'
-            ' SET `added_field` = 2007-12-13 16:42:00'
-            ' WHERE `added_field` IS NULL;',
-
-            'ALTER TABLE `tests_testmodel`'
-            ' MODIFY COLUMN `added_field` %s NOT NULL;'
-            % datetime_type,
-        ],
-
         'AddDefaultColumnModel': [
             'ALTER TABLE `tests_testmodel`'
             ' ADD COLUMN `added_field` integer NOT NULL DEFAULT 42;',
@@ -279,6 +285,63 @@ def add_field(connection):
         ],
     }
 
+    if is_mariadb:
+        supports_instant_add_column = connection.mysql_version >= (10, 3, 2)
+    else:
+        supports_instant_add_column = connection.mysql_version >= (8, 0, 12)
+
+    if supports_instant_add_column:
+        # Newer versions of MySQL/MariaDB can add a column with a constant
+        # default without copying the table, so callable constants are
+        # used as defaults.
+        mappings.update({
+            'AddDefaultColumnOnlineDDLModel': [
+                'ALTER TABLE `tests_testmodel`'
+                ' ADD COLUMN `added_field` integer NOT NULL DEFAULT 42,'
+                ' ALGORITHM=INSTANT;',
+
+                'ALTER TABLE `tests_testmodel`'
+                ' ALTER COLUMN `added_field` DROP DEFAULT;',
+            ],
+
+            'AddDateColumnWithCallableInitialModel': [
+                'ALTER TABLE `tests_testmodel`'
+                ' ADD COLUMN `added_field` %s NOT NULL'
+                ' DEFAULT 2007-12-13 16:42:00;'
+                % datetime_type,
+
+                'ALTER TABLE `tests_testmodel`'
+                ' ALTER COLUMN `added_field` DROP DEFAULT;',
+            ],
+        })
+    else:
+        mappings.update({
+            'AddDefaultColumnOnlineDDLModel': [
+                'ALTER TABLE `tests_testmodel`'
+                ' ADD COLUMN `added_field` integer NOT NULL DEFAULT 42,'
+                ' ALGORITHM=INPLACE, LOCK=NONE;',
+
+                'ALTER TABLE `tests_testmodel`'
+                ' ALTER COLUMN `added_field` DROP DEFAULT;',
+            ],
+
+            'AddDateColumnWithCallableInitialModel': [
+                'ALTER TABLE `tests_testmodel`'
+                ' ADD COLUMN `added_field` %s;'
+                % datetime_type,
+
+                'UPDATE `tests_testmodel`'
+                ' SET `added_field` = 2007-12-13 16:42:00'
+                ' WHERE `added_field` IS NULL;',
+
+                'ALTER TABLE `tests_testmodel`'
+                ' MODIFY COLUMN `added_field` %s NOT NULL;'
+                % datetime_type,
+            ],
+        })
+
+    return mappings
+
 
 def change_meta_db_table_comment(connection):
     """SQL test statements for the ChangeMetaDbTableCommentTests suite.
@@ -327,6 +390,11 @@ def delete_field(connection):
             'ALTER TABLE `tests_testmodel` DROP COLUMN `int_field` CASCADE;',
         ],
 
+        'DeleteMultipleColumnsModel': [
+            'ALTER TABLE `tests_testmodel` DROP COLUMN `char_field` CASCADE;',
+            'ALTER TABLE `tests_testmodel` DROP COLUMN `int_field` CASCADE;',
+        ],
+
         'NonDefaultNamedColumnModel': [
             'ALTER TABLE `tests_testmodel`'
             ' DROP COLUMN `non-default_db_column` CASCADE;',
@@ -391,6 +459,15 @@ def change_field(connection):
             ' MODIFY COLUMN `char_field1` varchar(25) NOT NULL;',
         ],
 
+        'SetNotNullChangeModelTwoPhase': [
+            "UPDATE `tests_testmodel`"
+            " SET `char_field1` = 'abc\\'s xyz'"
+            " WHERE `char_field1` IS NULL;",
+
+            'ALTER TABLE `tests_testmodel`'
+            ' MODIFY COLUMN `char_field1` varchar(25) NOT NULL;',
+        ],
+
         'SetNotNullChangeModelWithCallable': [
             'UPDATE `tests_testmodel`'
             ' SET `char_field1` = `char_field` WHERE `char_field1` IS NULL;',
@@ -471,6 +548,11 @@ def change_field(connection):
             % generate_index_name('tests_testmodel', 'int_field2'),
         ],
 
+        'AddDBIndexConcurrentChangeModel': [
+            'CREATE INDEX `%s` ON `tests_testmodel` (`int_field2`);'
+            % generate_index_name('tests_testmodel', 'int_field2'),
+        ],
+
         'AddDBIndexNoOpChangeModel': [],
 
         'RemoveDBIndexChangeModel': [
@@ -478,6 +560,11 @@ def change_field(connection):
             % generate_index_name('tests_testmodel', 'int_field1'),
         ],
 
+        'RemoveDBIndexConcurrentChangeModel': [
+            'DROP INDEX `%s` ON `tests_testmodel`;'
+            % generate_index_name('tests_testmodel', 'int_field1'),
+        ],
+
         'RemoveDBIndexAddUniqueChangeModel': [
             'DROP INDEX `%s` ON `tests_testmodel`;'
             % generate_index_name('tests_testmodel', 'int_field1'),
@@ -1122,6 +1209,10 @@ def constraints(connection):
             ],
         })
 
+    # Constraints are always validated when added.
+    mappings['setting_from_empty_two_phase'] = \
+        mappings['setting_from_empty']
+
     return mappings
 
 
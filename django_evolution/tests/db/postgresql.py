@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import re
+
 import django
 
 from django_evolution.compat.models import get_default_auto_field
@@ -47,7 +49,7 @@ def add_field(connection):
     generate_unique_constraint_name = \
         make_generate_unique_constraint_name(connection)
 
-    return {
+    mappings = {
         'AddNonNullNonCallableColumnModel': [
             'ALTER TABLE "tests_testmodel"'
             ' ADD COLUMN "added_field" integer NOT NULL DEFAULT 1;',
@@ -66,6 +68,22 @@ def add_field(connection):
             ' ALTER COLUMN "added_field" SET NOT NULL;',
         ],
 
+        'AddNonNullCallableColumnChunkedModel': [
+            'ALTER TABLE "tests_testmodel" ADD COLUMN "added_field" integer;',
+
+            '-- Start of a new transaction:',
+
+            re.compile(r'UPDATE "tests_testmodel"'
+                       r' SET "added_field" = "int_field"'
+                       r' WHERE "added_field" IS NULL'
+                       r' AND "id" >= \d+ AND "id" < \d+;'),
+
+            '-- Start of a new transaction:',
+
+            'ALTER TABLE "tests_testmodel"'
+            ' ALTER COLUMN "added_field" SET NOT NULL;',
+        ],
+
         'AddNullColumnWithInitialColumnModel': [
             'ALTER TABLE "tests_testmodel"'
             ' ADD COLUMN "added_field" integer NULL DEFAULT 1;',
@@ -100,20 +118,15 @@ def add_field(connection):
             ' ALTER COLUMN "added_field" DROP DEFAULT;',
         ],
 
-        'AddDateColumnWithCallableInitialModel': [
+        'AddDefaultColumnModel': [
             'ALTER TABLE "tests_testmodel"'
-            ' ADD COLUMN "added_field" timestamp with'
-            ' time zone;',
-
-            'UPDATE "tests_testmodel"'
-            ' SET "added_field" = 2007-12-13 16:42:00'
-            ' WHERE "added_field" IS NULL;',
+            ' ADD COLUMN "added_field" integer NOT NULL DEFAULT 42;',
 
             'ALTER TABLE "tests_testmodel"'
-            ' ALTER COLUMN "added_field" SET NOT NULL;',
+            ' ALTER COLUMN "added_field" DROP DEFAULT;',
         ],
 
-        'AddDefaultColumnModel': [
+        'AddDefaultColumnOnlineDDLModel': [
             'ALTER TABLE "tests_testmodel"'
             ' ADD COLUMN "added_field" integer NOT NULL DEFAULT 42;',
 
@@ -321,6 +334,37 @@ def add_field(connection):
         ],
     }
 
+    if connection.pg_version >= 110000:
+        # Postgres 11+ can add a column with a constant default without
+        # rewriting the table, so callable constants are used as defaults.
+        mappings.update({
+            'AddDateColumnWithCallableInitialModel': [
+                'ALTER TABLE "tests_testmodel"'
+                ' ADD COLUMN "added_field" timestamp with'
+                ' time zone NOT NULL DEFAULT 2007-12-13 16:42:00;',
+
+                'ALTER TABLE "tests_testmodel"'
+                ' ALTER COLUMN "added_field" DROP DEFAULT;',
+            ],
+        })
+    else:
+        mappings.update({
+            'AddDateColumnWithCallableInitialModel': [
+                'ALTER TABLE "tests_testmodel"'
+                ' ADD COLUMN "added_field" timestamp with'
+                ' time zone;',
+
+                'UPDATE "tests_testmodel"'
+                ' SET "added_field" = 2007-12-13 16:42:00'
+                ' WHERE "added_field" IS NULL;',
+
+                'ALTER TABLE "tests_testmodel"'
+                ' ALTER COLUMN "added_field" SET NOT NULL;',
+            ],
+        })
+
+    return mappings
+
 
 def delete_field(connection):
     """SQL test statements for the DeleteFieldTests suite.
@@ -338,6 +382,12 @@ def delete_field(connection):
             'ALTER TABLE "tests_testmodel" DROP COLUMN "int_field" CASCADE;',
         ],
 
+        'DeleteMultipleColumnsModel': [
+            'ALTER TABLE "tests_testmodel"'
+            ' DROP COLUMN "char_field" CASCADE,'
+            ' DROP COLUMN "int_field" CASCADE;',
+        ],
+
         'NonDefaultNamedColumnModel': [
             'ALTER TABLE "tests_testmodel"'
             ' DROP COLUMN "non-default_db_column" CASCADE;',
@@ -446,6 +496,12 @@ def change_field(connection):
             % generate_index_name('tests_testmodel', 'int_field2'),
         ],
 
+        'AddDBIndexConcurrentChangeModel': [
+            'CREATE INDEX CONCURRENTLY "%s" ON "tests_testmodel"'
+            ' ("int_field2");'
+            % generate_index_name('tests_testmodel', 'int_field2'),
+        ],
+
         'AddDBIndexNoOpChangeModel': [],
 
         'RemoveDBIndexChangeModel': [
@@ -453,6 +509,11 @@ def change_field(connection):
             % generate_index_name('tests_testmodel', 'int_field1'),
         ],
 
+        'RemoveDBIndexConcurrentChangeModel': [
+            'DROP INDEX CONCURRENTLY IF EXISTS "%s";'
+            % generate_index_name('tests_testmodel', 'int_field1'),
+        ],
+
         'RemoveDBIndexAddUniqueChangeModel': [
             'ALTER TABLE "tests_testmodel"'
             ' ADD CONSTRAINT "%s" UNIQUE("int_field1");'
@@ -733,6 +794,41 @@ def change_field(connection):
             ],
         })
 
+    if connection.pg_version >= 120000:
+        # Postgres 12+ can set NOT NULL using a validated check constraint,
+        # without scanning the table.
+        mappings.update({
+            'SetNotNullChangeModelTwoPhase': [
+                'UPDATE "tests_testmodel"'
+                ' SET "char_field1" = \'abc\\\'s xyz\''
+                ' WHERE "char_field1" IS NULL;',
+
+                '-- Start of a new transaction:',
+
+                'ALTER TABLE "tests_testmodel"'
+                ' ADD CONSTRAINT "tests_testmodel_char_field1_notnull"'
+                ' CHECK ("char_field1" IS NOT NULL) NOT VALID;',
+
+                '-- Start of a new transaction:',
+
+                'ALTER TABLE "tests_testmodel"'
+                ' VALIDATE CONSTRAINT "tests_testmodel_char_field1_notnull";',
+
+                '-- Start of a new transaction:',
+
+                'ALTER TABLE "tests_testmodel"'
+                ' ALTER COLUMN "char_field1" SET NOT NULL;',
+
+                'ALTER TABLE "tests_testmodel"'
+                ' DROP CONSTRAINT "tests_testmodel_char_field1_notnull";',
+            ],
+        })
+    else:
+        mappings.update({
+            'SetNotNullChangeModelTwoPhase':
+                mappings['SetNotNullChangeModelWithConstant'],
+        })
+
     return mappings
 
 
@@ -1216,7 +1312,7 @@ def constraints(connection):
         dict:
         The dictionary of SQL mappings.
     """
-    return {
+    mappings = {
         'append_list': [
             'ALTER TABLE "tests_testmodel"'
             ' ADD CONSTRAINT "new_unique_constraint"'
@@ -1274,6 +1370,27 @@ def constraints(connection):
         ],
     }
 
+    mappings['setting_from_empty_two_phase'] = [
+        'CREATE UNIQUE INDEX "new_unique_constraint_condition"'
+        ' ON "tests_testmodel" ("int_field2")'
+        ' WHERE "int_field2" = 100;',
+
+        'ALTER TABLE "tests_testmodel"'
+        ' ADD CONSTRAINT "new_unique_constraint_plain"'
+        ' UNIQUE ("int_field1", "int_field2");',
+
+        f'ALTER TABLE "tests_testmodel"'
+        f' ADD CONSTRAINT "new_check_constraint"'
+        f' CHECK ("char_field1"::text LIKE \'test{PCT}\') NOT VALID;',
+
+        '-- Start of a new transaction:',
+
+        'ALTER TABLE "tests_testmodel"'
+        ' VALIDATE CONSTRAINT "new_check_constraint";',
+    ]
+
+    return mappings
+
 
 def indexes(connection):
     """SQL test statements for the ChangeMetaIndexesTests suite.
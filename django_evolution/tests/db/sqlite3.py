@@ -94,6 +94,23 @@ def add_field(connection):
             'ALTER TABLE "TEMP_TABLE" RENAME TO "tests_testmodel";',
         ],
 
+        'AddNonNullCallableColumnChunkedModel': [
+            'CREATE TABLE "TEMP_TABLE" '
+            '("id" integer NOT NULL PRIMARY KEY,'
+            ' "char_field" varchar(20) NOT NULL,'
+            ' "int_field" integer NOT NULL,'
+            ' "added_field" integer NOT NULL);',
+
+            'INSERT INTO "TEMP_TABLE" ("id", "char_field", "int_field",'
+            ' "added_field")'
+            ' SELECT "id", "char_field", "int_field", "int_field"'
+            ' FROM "tests_testmodel";',
+
+            'DROP TABLE "tests_testmodel";',
+
+            'ALTER TABLE "TEMP_TABLE" RENAME TO "tests_testmodel";',
+        ],
+
         'AddNullColumnWithInitialColumnModel': [
             'CREATE TABLE "TEMP_TABLE" '
             '("id" integer NOT NULL PRIMARY KEY,'
@@ -196,6 +213,23 @@ def add_field(connection):
             'ALTER TABLE "TEMP_TABLE" RENAME TO "tests_testmodel";',
         ],
 
+        'AddDefaultColumnOnlineDDLModel': [
+            'CREATE TABLE "TEMP_TABLE" '
+            '("id" integer NOT NULL PRIMARY KEY,'
+            ' "char_field" varchar(20) NOT NULL,'
+            ' "int_field" integer NOT NULL,'
+            ' "added_field" integer NOT NULL);',
+
+            'INSERT INTO "TEMP_TABLE" ("id", "char_field", "int_field",'
+            ' "added_field")'
+            ' SELECT "id", "char_field", "int_field", 42'
+            ' FROM "tests_testmodel";',
+
+            'DROP TABLE "tests_testmodel";',
+
+            'ALTER TABLE "TEMP_TABLE" RENAME TO "tests_testmodel";',
+        ],
+
         'AddMismatchInitialBoolColumnModel': [
             'CREATE TABLE "TEMP_TABLE" '
             '("id" integer NOT NULL PRIMARY KEY,'
@@ -547,6 +581,31 @@ def delete_field(connection):
                                   'fk_field1'),
         ],
 
+        'DeleteMultipleColumnsModel': [
+            f'CREATE TABLE "TEMP_TABLE" '
+            f'("my_id" integer NOT NULL PRIMARY KEY,'
+            f' "non-default_db_column" integer NOT NULL,'
+            f' "int_field3" integer NOT NULL UNIQUE,'
+            f' "fk_field1_id" {fk_type} NOT NULL'
+            f' REFERENCES "tests_deleteanchor1" ("id")'
+            f' DEFERRABLE INITIALLY DEFERRED);',
+
+            'INSERT INTO "TEMP_TABLE"'
+            ' ("my_id", "non-default_db_column", "int_field3",'
+            ' "fk_field1_id")'
+            ' SELECT "my_id", "non-default_db_column", "int_field3",'
+            ' "fk_field1_id"'
+            ' FROM "tests_testmodel";',
+
+            'DROP TABLE "tests_testmodel";',
+
+            'ALTER TABLE "TEMP_TABLE" RENAME TO "tests_testmodel";',
+
+            'CREATE INDEX "%s" ON "tests_testmodel" ("fk_field1_id");'
+            % generate_index_name('tests_testmodel', 'fk_field1_id',
+                                  'fk_field1'),
+        ],
+
         'NonDefaultNamedColumnModel': [
             f'CREATE TABLE "TEMP_TABLE" '
             f'("my_id" integer NOT NULL PRIMARY KEY,'
@@ -959,6 +1018,11 @@ def change_field(connection):
             % generate_index_name('tests_testmodel', 'int_field2'),
         ],
 
+        'AddDBIndexConcurrentChangeModel': [
+            'CREATE INDEX "%s" ON "tests_testmodel" ("int_field2");'
+            % generate_index_name('tests_testmodel', 'int_field2'),
+        ],
+
         'AddDBIndexNoOpChangeModel': [],
 
         'RemoveDBIndexChangeModel': [
@@ -966,6 +1030,11 @@ def change_field(connection):
             % generate_index_name('tests_testmodel', 'int_field1'),
         ],
 
+        'RemoveDBIndexConcurrentChangeModel': [
+            'DROP INDEX "%s";'
+            % generate_index_name('tests_testmodel', 'int_field1'),
+        ],
+
         'RemoveDBIndexAddUniqueChangeModel': [
             'DROP INDEX "%s";'
             % generate_index_name('tests_testmodel', 'int_field1'),
@@ -1730,6 +1799,10 @@ def change_field(connection):
             ],
         })
 
+    # Constraints are always validated when added.
+    mappings['SetNotNullChangeModelTwoPhase'] = \
+        mappings['SetNotNullChangeModelWithConstant']
+
     return mappings
 
 
@@ -2406,7 +2479,7 @@ def constraints(connection):
         dict:
         The dictionary of SQL mappings.
     """
-    return {
+    mappings = {
         'append_list': [
             'CREATE TABLE "TEMP_TABLE" '
             '("id" integer NOT NULL PRIMARY KEY,'
@@ -2496,6 +2569,12 @@ def constraints(connection):
         ],
     }
 
+    # Constraints are always validated when added.
+    mappings['setting_from_empty_two_phase'] = \
+        mappings['setting_from_empty']
+
+    return mappings
+
 
 def indexes(connection):
     """SQL test statements for the ChangeMetaIndexesTests suite.
@@ -3,7 +3,9 @@ from __future__ import annotations
 from datetime import datetime
 
 from django.db import connection, models
+from django.test.utils import override_settings
 
+from django_evolution.db import EvolutionOperationsMulti
 from django_evolution.errors import EvolutionException, SimulationFailure
 from django_evolution.mutations import AddField, DeleteField
 from django_evolution.signature import (AppSignature,
@@ -12,6 +14,8 @@ from django_evolution.signature import (AppSignature,
                                         ProjectSignature)
 from django_evolution.tests.base_test_case import EvolutionTestCase
 from django_evolution.tests.models import BaseTestModel
+from django_evolution.tests.utils import ensure_test_db
+from django_evolution.utils.sql import ChunkedSQL, SQLExecutor
 
 
 class AddSequenceFieldInitial:
@@ -220,6 +224,105 @@ class AddFieldTests(EvolutionTestCase):
             ],
             'AddNonNullCallableColumnModel')
 
+    def test_add_non_null_column_with_callable_initial_and_chunk_size(self):
+        """Testing AddField with non-NULL column with callable initial value
+        and BACKFILL_CHUNK_SIZE
+        """
+        class DestModel(BaseTestModel):
+            char_field = models.CharField(max_length=20)
+            int_field = models.IntegerField()
+            added_field = models.IntegerField()
+
+        with override_settings(DJANGO_EVOLUTION={
+                'BACKFILL_CHUNK_SIZE': 100,
+            }):
+            self.perform_evolution_tests(
+                DestModel,
+                [
+                    AddField('TestModel', 'added_field', models.IntegerField,
+                             initial=AddSequenceFieldInitial(
+                                 'AddNonNullCallableColumnChunkedModel')),
+                ],
+                self.DIFF_TEXT,
+                [
+                    "AddField('TestModel', 'added_field',"
+                    " models.IntegerField, initial=<<USER VALUE REQUIRED>>)",
+                ],
+                'AddNonNullCallableColumnChunkedModel')
+
+    def test_get_backfill_column_sql_with_chunk_size(self):
+        """Testing BaseEvolutionOperations.get_backfill_column_sql with
+        BACKFILL_CHUNK_SIZE
+        """
+        evolver = EvolutionOperationsMulti('default',
+                                           self.database_state).get_evolver()
+
+        with override_settings(DJANGO_EVOLUTION={
+                'BACKFILL_CHUNK_SIZE': 2,
+            }):
+            sql = evolver.get_backfill_column_sql(
+                model=AddBaseModel,
+                column_name='char_field',
+                initial='new',
+                embed_initial=False)
+
+        qn = connection.ops.quote_name
+
+        self.assertEqual(len(sql), 1)
+        self.assertIsInstance(sql[0], ChunkedSQL)
+        self.assertEqual(sql[0].table_name, 'tests_testmodel')
+        self.assertEqual(
+            sql[0].sql,
+            ('UPDATE %s SET %s = %%s WHERE %s IS NULL;'
+             % (qn('tests_testmodel'), qn('char_field'), qn('char_field')),
+             ('new',)))
+
+        with ensure_test_db(model_entries=self.start.items()):
+            min_pk = min(
+                AddBaseModel.objects.create(char_field='test',
+                                            int_field=i).pk
+                for i in range(5)
+            )
+
+            with SQLExecutor('default') as sql_executor:
+                sql = sql_executor.run_sql(sql, capture=True, execute=True)
+
+        update_sql = (
+            "UPDATE %s SET %s = 'new' WHERE %s IS NULL AND %s >= %%d"
+            " AND %s < %%d;"
+            % (qn('tests_testmodel'), qn('char_field'), qn('char_field'),
+               qn('id'), qn('id')))
+
+        self.assertEqual(
+            sql,
+            [
+                update_sql % (min_pk, min_pk + 2),
+                '-- Start of a new transaction:',
+                update_sql % (min_pk + 2, min_pk + 4),
+                '-- Start of a new transaction:',
+                update_sql % (min_pk + 4, min_pk + 6),
+            ])
+
+    def test_get_backfill_column_sql_without_chunk_size(self):
+        """Testing BaseEvolutionOperations.get_backfill_column_sql without
+        BACKFILL_CHUNK_SIZE
+        """
+        evolver = EvolutionOperationsMulti('default',
+                                           self.database_state).get_evolver()
+        qn = connection.ops.quote_name
+
+        self.assertEqual(
+            evolver.get_backfill_column_sql(model=AddBaseModel,
+                                            column_name='char_field',
+                                            initial='new',
+                                            embed_initial=False),
+            [
+                ('UPDATE %s SET %s = %%s WHERE %s IS NULL;'
+                 % (qn('tests_testmodel'), qn('char_field'),
+                    qn('char_field')),
+                 ('new',)),
+            ])
+
     def test_add_null_column(self):
         """Testing AddField with NULL column"""
         class DestModel(BaseTestModel):
@@ -360,6 +463,29 @@ class AddFieldTests(EvolutionTestCase):
             ],
             'AddDefaultColumnModel')
 
+    def test_add_with_default_and_mysql_online_ddl(self):
+        """Testing AddField with default value and MYSQL_ONLINE_DDL"""
+        class DestModel(BaseTestModel):
+            char_field = models.CharField(max_length=20)
+            int_field = models.IntegerField()
+            added_field = models.IntegerField(default=42)
+
+        with override_settings(DJANGO_EVOLUTION={
+                'MYSQL_ONLINE_DDL': 'require',
+            }):
+            self.perform_evolution_tests(
+                DestModel,
+                [
+                    AddField('TestModel', 'added_field', models.IntegerField,
+                             initial=42),
+                ],
+                self.DIFF_TEXT,
+                [
+                    "AddField('TestModel', 'added_field',"
+                    " models.IntegerField, initial=42)",
+                ],
+                'AddDefaultColumnOnlineDDLModel')
+
     def test_add_boolean_field_with_different_initial(self):
         """Testing AddField with BooleanField and initial value different from
         model definition
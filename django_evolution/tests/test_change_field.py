@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from datetime import datetime, date, timezone
 
-from django.db import connection, models
+from django.db import DEFAULT_DB_ALIAS, connection, models
+from django.test.utils import override_settings
 
 from django_evolution.db import EvolutionOperationsMulti
 from django_evolution.diff import Diff
 from django_evolution.errors import SimulationFailure
+from django_evolution.mock_models import MockModel, create_field
 from django_evolution.mutations import ChangeField
 from django_evolution.mutators import AppMutator
 from django_evolution.signature import (AppSignature,
@@ -15,6 +17,8 @@ from django_evolution.signature import (AppSignature,
 from django_evolution.tests.base_test_case import EvolutionTestCase
 from django_evolution.tests.decorators import requires_model_field
 from django_evolution.tests.models import BaseTestModel
+from django_evolution.tests.utils import get_postgres_evolver_backend
+from django_evolution.utils.sql import SQLExecutor
 
 
 class ChangeSequenceFieldInitial:
@@ -293,6 +297,105 @@ class ChangeFieldTests(EvolutionTestCase):
             ],
             'SetNotNullChangeModelWithConstant')
 
+    def test_set_null_false_with_two_phase_constraints(self):
+        """Testing ChangeField with setting null=False and initial value with
+        TWO_PHASE_CONSTRAINTS
+        """
+        class DestModel(BaseTestModel):
+            my_id = models.AutoField(primary_key=True)
+            alt_pk = models.IntegerField()
+            int_field = models.IntegerField(db_column='custom_db_column')
+            int_field1 = models.IntegerField(db_index=True)
+            int_field2 = models.IntegerField(db_index=False)
+            int_field3 = models.IntegerField(unique=True)
+            int_field4 = models.IntegerField(unique=False)
+            char_field = models.CharField(max_length=20)
+            char_field1 = models.CharField(max_length=25, null=False)
+            char_field2 = models.CharField(max_length=30, null=False)
+            dec_field = models.DecimalField(max_digits=5,
+                                            decimal_places=2)
+            dec_field1 = models.DecimalField(max_digits=6,
+                                             decimal_places=3,
+                                             null=True)
+            dec_field2 = models.DecimalField(max_digits=7,
+                                             decimal_places=4,
+                                             null=False)
+            m2m_field1 = models.ManyToManyField(
+                ChangeAnchor1, db_table='change_field_non-default_m2m_table')
+            datetime_field1 = models.DateTimeField(null=True)
+            datetime_field2 = models.DateTimeField(null=False)
+            date_field1 = models.DateField(null=True)
+            date_field2 = models.DateField(null=False)
+
+        with override_settings(DJANGO_EVOLUTION={
+            'TWO_PHASE_CONSTRAINTS': True,
+        }):
+            self.perform_evolution_tests(
+                DestModel,
+                [
+                    ChangeField('TestModel', 'char_field1', null=False,
+                                initial="abc's xyz"),
+                ],
+                ("In model tests.TestModel:\n"
+                 "    In field 'char_field1':\n"
+                 "        Property 'null' has changed"),
+                [
+                    "ChangeField('TestModel', 'char_field1',"
+                    " initial=<<USER VALUE REQUIRED>>, null=False)",
+                ],
+                'SetNotNullChangeModelTwoPhase')
+
+    def test_set_null_false_with_two_phase_constraints_transactions(self):
+        """Testing ChangeField with setting null=False and
+        TWO_PHASE_CONSTRAINTS on Postgres runs each phase in its own
+        transaction
+        """
+        evolver_backend = get_postgres_evolver_backend(self.database_state)
+        table_name = ChangeBaseModel._meta.db_table
+
+        with override_settings(DJANGO_EVOLUTION={
+            'TWO_PHASE_CONSTRAINTS': True,
+        }):
+            sql = evolver_backend.set_field_null(
+                model=ChangeBaseModel,
+                field=ChangeBaseModel._meta.get_field('char_field1'),
+                null=False).to_sql()
+
+        with SQLExecutor(DEFAULT_DB_ALIAS) as sql_executor:
+            sql = sql_executor.run_sql(
+                ['SELECT 1;'] + sql + ['SELECT 2;'],
+                capture=True)
+
+        self.assertEqual(
+            sql,
+            [
+                'SELECT 1;',
+
+                '-- Start of a new transaction:',
+
+                'ALTER TABLE "%s" ADD CONSTRAINT "%s_char_field1_notnull"'
+                ' CHECK ("char_field1" IS NOT NULL) NOT VALID;'
+                % (table_name, table_name),
+
+                '-- Start of a new transaction:',
+
+                'ALTER TABLE "%s" VALIDATE CONSTRAINT'
+                ' "%s_char_field1_notnull";'
+                % (table_name, table_name),
+
+                '-- Start of a new transaction:',
+
+                'ALTER TABLE "%s" ALTER COLUMN "char_field1" SET NOT NULL;'
+                % table_name,
+
+                'ALTER TABLE "%s" DROP CONSTRAINT "%s_char_field1_notnull";'
+                % (table_name, table_name),
+
+                '-- Start of a new transaction:',
+
+                'SELECT 2;',
+            ])
+
     def test_set_null_false_and_initial_callable(self):
         """Testing ChangeField with setting null=False and initial callable"""
         class DestModel(BaseTestModel):
@@ -783,6 +886,62 @@ class ChangeFieldTests(EvolutionTestCase):
             table_name='tests_testmodel',
             columns=['int_field2']))
 
+    def test_set_db_index_true_with_concurrent_indexes(self):
+        """Testing ChangeField with setting db_index=True and
+        CONCURRENT_INDEXES
+        """
+        class DestModel(BaseTestModel):
+            my_id = models.AutoField(primary_key=True)
+            alt_pk = models.IntegerField()
+            int_field = models.IntegerField(db_column='custom_db_column')
+            int_field1 = models.IntegerField(db_index=True)
+            int_field2 = models.IntegerField(db_index=True)
+            int_field3 = models.IntegerField(unique=True)
+            int_field4 = models.IntegerField(unique=False)
+            char_field = models.CharField(max_length=20)
+            char_field1 = models.CharField(max_length=25, null=True)
+            char_field2 = models.CharField(max_length=30, null=False)
+            dec_field = models.DecimalField(max_digits=5,
+                                            decimal_places=2)
+            dec_field1 = models.DecimalField(max_digits=6,
+                                             decimal_places=3,
+                                             null=True)
+            dec_field2 = models.DecimalField(max_digits=7,
+                                             decimal_places=4,
+                                             null=False)
+            m2m_field1 = models.ManyToManyField(
+                ChangeAnchor1, db_table='change_field_non-default_m2m_table')
+            datetime_field1 = models.DateTimeField(null=True)
+            datetime_field2 = models.DateTimeField(null=False)
+            date_field1 = models.DateField(null=True)
+            date_field2 = models.DateField(null=False)
+
+        self.assertIsNone(self.database_state.find_index(
+            table_name='tests_testmodel',
+            columns=['int_field2']))
+
+        with override_settings(DJANGO_EVOLUTION={
+                'CONCURRENT_INDEXES': True,
+            }):
+            self.perform_evolution_tests(
+                DestModel,
+                [
+                    ChangeField('TestModel', 'int_field2', initial=None,
+                                db_index=True),
+                ],
+                ("In model tests.TestModel:\n"
+                 "    In field 'int_field2':\n"
+                 "        Property 'db_index' has changed"),
+                [
+                    "ChangeField('TestModel', 'int_field2', db_index=True,"
+                    " initial=None)",
+                ],
+                'AddDBIndexConcurrentChangeModel')
+
+        self.assertIsNotNone(self.test_database_state.find_index(
+            table_name='tests_testmodel',
+            columns=['int_field2']))
+
     def test_set_db_index_true_and_existing_index(self):
         """Testing ChangeField with setting db_index=True and existing index
         in the database
@@ -898,6 +1057,62 @@ class ChangeFieldTests(EvolutionTestCase):
             table_name='tests_testmodel',
             columns=['int_field1']))
 
+    def test_set_db_index_false_with_concurrent_indexes(self):
+        """Testing ChangeField with setting db_index=False and
+        CONCURRENT_INDEXES
+        """
+        class DestModel(BaseTestModel):
+            my_id = models.AutoField(primary_key=True)
+            alt_pk = models.IntegerField()
+            int_field = models.IntegerField(db_column='custom_db_column')
+            int_field1 = models.IntegerField(db_index=False)
+            int_field2 = models.IntegerField(db_index=False)
+            int_field3 = models.IntegerField(unique=True)
+            int_field4 = models.IntegerField(unique=False)
+            char_field = models.CharField(max_length=20)
+            char_field1 = models.CharField(max_length=25, null=True)
+            char_field2 = models.CharField(max_length=30, null=False)
+            dec_field = models.DecimalField(max_digits=5,
+                                            decimal_places=2)
+            dec_field1 = models.DecimalField(max_digits=6,
+                                             decimal_places=3,
+                                             null=True)
+            dec_field2 = models.DecimalField(max_digits=7,
+                                             decimal_places=4,
+                                             null=False)
+            m2m_field1 = models.ManyToManyField(
+                ChangeAnchor1, db_table='change_field_non-default_m2m_table')
+            datetime_field1 = models.DateTimeField(null=True)
+            datetime_field2 = models.DateTimeField(null=False)
+            date_field1 = models.DateField(null=True)
+            date_field2 = models.DateField(null=False)
+
+        self.assertIsNotNone(self.database_state.find_index(
+            table_name='tests_testmodel',
+            columns=['int_field1']))
+
+        with override_settings(DJANGO_EVOLUTION={
+                'CONCURRENT_INDEXES': True,
+            }):
+            self.perform_evolution_tests(
+                DestModel,
+                [
+                    ChangeField('TestModel', 'int_field1', initial=None,
+                                db_index=False),
+                ],
+                ("In model tests.TestModel:\n"
+                 "    In field 'int_field1':\n"
+                 "        Property 'db_index' has changed"),
+                [
+                    "ChangeField('TestModel', 'int_field1', db_index=False,"
+                    " initial=None)",
+                ],
+                'RemoveDBIndexConcurrentChangeModel')
+
+        self.assertIsNone(self.test_database_state.find_index(
+            table_name='tests_testmodel',
+            columns=['int_field1']))
+
     def test_set_unique_true(self):
         """Testing ChangeField with setting unique=True"""
         class DestModel(BaseTestModel):
@@ -1784,6 +1999,53 @@ class ChangeFieldTests(EvolutionTestCase):
             ],
             'field_type_primary_key_smallintegerfield')
 
+    def test_change_field_type_with_primary_key_binds_field_refs(self):
+        """Testing ChangeField with field type and primary key changes
+        referencing columns based on the old and new fields, rather than on
+        the registered models
+        """
+        self.database_state.add_table('change_field_non-default_m2m_table')
+
+        evolver_backend = get_postgres_evolver_backend(self.database_state)
+        model = MockModel(
+            project_sig=self.start_sig,
+            app_name='tests',
+            model_name='TestModel',
+            model_sig=(
+                self.start_sig
+                .get_app_sig('tests')
+                .get_model_sig('TestModel')
+            ))
+        old_field = model._meta.get_field('my_id')
+        new_field = create_field(project_sig=self.start_sig,
+                                 field_name='my_id',
+                                 field_type=models.SmallIntegerField,
+                                 field_attrs={
+                                     'primary_key': True,
+                                 },
+                                 parent_model=model)
+
+        pre_sql, stash = evolver_backend.stash_field_ref_constraints(
+            model=model,
+            replaced_fields={
+                old_field: new_field,
+            })
+
+        self.assertEqual(
+            [
+                (ref_model._meta.db_table,
+                 old_ref_field.column,
+                 old_ref_field.target_field,
+                 new_ref_field.target_field,
+                 new_ref_field.db_type(connection=connection))
+                for ref_model, old_ref_field, new_ref_field in
+                stash['replaced_field_refs']
+            ],
+            [
+                ('change_field_non-default_m2m_table', 'testmodel_id',
+                 old_field, new_field, 'smallint'),
+            ])
+
     def test_change_field_type_same_internal_type(self):
         """Testing ChangeField with field type using same internal_type"""
         class MyIntegerField(models.IntegerField):
@@ -6,6 +6,7 @@ from unittest import skipUnless
 
 from django.db import models
 from django.db.models import CheckConstraint, Index, F, Q, UniqueConstraint
+from django.test.utils import override_settings
 
 from django_evolution.mutations import ChangeMeta
 from django_evolution.support import (
@@ -251,6 +252,78 @@ class ChangeMetaConstraintsTests(BaseChangeMetaTestCase):
             ],
             sql_name='setting_from_empty')
 
+    def test_setting_valid_list_with_two_phase_constraints(self):
+        """Testing ChangeMeta(constraints) and setting to valid list with
+        TWO_PHASE_CONSTRAINTS
+        """
+        check_constraint_kwargs = {
+            CHECK_CONSTRAINT_KEY: Q(char_field1__startswith='test'),
+        }
+
+        class DestModel(BaseTestModel):
+            int_field1 = models.IntegerField()
+            int_field2 = models.IntegerField()
+            char_field1 = models.CharField(max_length=20)
+            char_field2 = models.CharField(max_length=40)
+
+            class Meta(BaseTestModel.Meta):
+                constraints = [
+                    CheckConstraint(name='new_check_constraint',
+                                    **check_constraint_kwargs),
+                    UniqueConstraint(name='new_unique_constraint_condition',
+                                     fields=['int_field2'],
+                                     condition=Q(int_field2=100)),
+                    UniqueConstraint(name='new_unique_constraint_plain',
+                                     fields=['int_field1', 'int_field2']),
+                ]
+
+        self.set_base_model(ChangeMetaPlainBaseModel)
+
+        with override_settings(DJANGO_EVOLUTION={
+            'TWO_PHASE_CONSTRAINTS': True,
+        }):
+            self.perform_evolution_tests(
+                dest_model=DestModel,
+                evolutions=[
+                    ChangeMeta(
+                        'TestModel',
+                        'constraints',
+                        [
+                            {
+                                'type': CheckConstraint,
+                                'name': 'new_check_constraint',
+                                **check_constraint_kwargs,
+                            },
+                            {
+                                'type': UniqueConstraint,
+                                'name': 'new_unique_constraint_condition',
+                                'condition': Q(int_field2=100),
+                                'fields': ['int_field2'],
+                            },
+                            {
+                                'type': UniqueConstraint,
+                                'name': 'new_unique_constraint_plain',
+                                'fields': ['int_field1', 'int_field2'],
+                            },
+                        ]),
+                ],
+                diff_text=self.DIFF_TEXT,
+                expected_hint=[
+                    f"ChangeMeta('TestModel', 'constraints',"
+                    f" [{{'{CHECK_CONSTRAINT_KEY}': "
+                    f"models.Q(char_field1__startswith='test'),"
+                    f" 'name': 'new_check_constraint',"
+                    f" 'type': models.CheckConstraint}},"
+                    f" {{'condition': models.Q(int_field2=100),"
+                    f" 'fields': ['int_field2'],"
+                    f" 'name': 'new_unique_constraint_condition',"
+                    f" 'type': models.UniqueConstraint}},"
+                    f" {{'fields': ['int_field1', 'int_field2'],"
+                    f" 'name': 'new_unique_constraint_plain',"
+                    f" 'type': models.UniqueConstraint}}])"
+                ],
+                sql_name='setting_from_empty_two_phase')
+
     def test_replace_list(self):
         """Testing ChangeMeta(indexes) and replacing list"""
         check_constraint_kwargs = {
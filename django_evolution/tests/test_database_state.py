@@ -75,6 +75,17 @@ class DatabaseStateTests(TestCase):
         database_state.rescan_tables()
         self.assertTrue(database_state.has_model(model))
 
+    def test_rescan_tables_with_table_names(self):
+        """Testing DatabaseState.rescan_tables with table_names="""
+        database_state = DatabaseState(db_name='default', scan=False)
+        database_state.rescan_tables(table_names=['django_evolution'])
+
+        self.assertTrue(database_state.has_table('django_evolution'))
+        self.assertFalse(database_state.has_table('django_project_version'))
+        self.assertIsNotNone(database_state.find_index(
+            table_name='django_evolution',
+            columns=['version_id']))
+
     def test_add_index(self):
         """Testing DatabaseState.add_index"""
         database_state = DatabaseState(db_name='default', scan=False)
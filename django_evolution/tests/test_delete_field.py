@@ -162,6 +162,36 @@ class DeleteFieldTests(EvolutionTestCase):
             ],
             'DefaultNamedColumnModel')
 
+    def test_delete_multiple(self):
+        """Testing DeleteField with multiple columns merges the operations
+        into one ALTER TABLE
+        """
+        class DestModel(BaseTestModel):
+            my_id = models.AutoField(primary_key=True)
+            int_field2 = models.IntegerField(db_column='non-default_db_column')
+            int_field3 = models.IntegerField(unique=True)
+            fk_field1 = models.ForeignKey(DeleteAnchor1,
+                                          on_delete=models.CASCADE)
+            m2m_field1 = models.ManyToManyField(DeleteAnchor3)
+            m2m_field2 = models.ManyToManyField(
+                DeleteAnchor4,
+                db_table='non-default_m2m_table')
+
+        self.perform_evolution_tests(
+            DestModel,
+            [
+                DeleteField('TestModel', 'char_field'),
+                DeleteField('TestModel', 'int_field'),
+            ],
+            ("In model tests.TestModel:\n"
+             "    Field 'char_field' has been deleted\n"
+             "    Field 'int_field' has been deleted"),
+            [
+                "DeleteField('TestModel', 'char_field')",
+                "DeleteField('TestModel', 'int_field')",
+            ],
+            'DeleteMultipleColumnsModel')
+
     def test_delete_with_custom_column_name(self):
         """Testing DeleteField with custom column name"""
         class DestModel(BaseTestModel):
@@ -3,12 +3,16 @@
 from __future__ import annotations
 
 from collections import OrderedDict
+from contextlib import contextmanager
 
-from django.db import DEFAULT_DB_ALIAS, migrations, models
+from django.db import (DEFAULT_DB_ALIAS, connection, migrations, models,
+                       transaction)
+from django.test.utils import override_settings
 
-from django_evolution.consts import UpgradeMethod
+from django_evolution.consts import DDLCost, UpgradeMethod
 from django_evolution.db.state import DatabaseState
-from django_evolution.errors import (EvolutionTaskAlreadyQueuedError,
+from django_evolution.errors import (BlockingOperationError,
+                                     EvolutionTaskAlreadyQueuedError,
                                      QueueEvolverTaskError)
 from django_evolution.evolve import (BaseEvolutionTask, EvolveAppTask,
                                      Evolver, PurgeAppTask)
@@ -51,6 +55,7 @@ from django_evolution.utils.apps import (
 from django_evolution.utils.db import sql_create_app, sql_delete
 from django_evolution.utils.migrations import (MigrationList,
                                                record_applied_migrations)
+from django_evolution.utils.profiling import EvolutionProfiler
 
 
 class DummyTask(BaseEvolutionTask):
@@ -119,6 +124,26 @@ class EvolverTests(BaseEvolverTestCase):
         self.assertEqual(len(app_sigs), 1)
         self.assertEqual(app_sigs[0].app_id, 'django_evolution')
 
+    def test_init_with_fresh_install_and_existing_tables(self):
+        """Testing Evolver.__init__ with fresh_install=True and existing
+        tables
+        """
+        Version.objects.all().delete()
+
+        evolver = Evolver(fresh_install=True)
+
+        self.assertTrue(evolver.installed_new_database)
+        self.assertFalse(evolver.fresh_install)
+
+    def test_init_with_fresh_install_and_baseline(self):
+        """Testing Evolver.__init__ with fresh_install=True and existing
+        baseline
+        """
+        evolver = Evolver(fresh_install=True)
+
+        self.assertFalse(evolver.installed_new_database)
+        self.assertFalse(evolver.fresh_install)
+
     def test_can_simulate_with_all_can_simulate_true_evolution_true(self):
         """Testing Evolver.can_simulate with all tasks having can_simulate=True
         """
@@ -548,6 +573,166 @@ class EvolverTests(BaseEvolverTestCase):
             200)
         self.assertIsNotNone(model_sig.get_field_sig('new_field'))
 
+    def test_evolve_with_profiler(self):
+        """Testing Evolver.evolve with profiler"""
+        model_sig = ModelSignature.from_model(EvolverTestModel)
+        model_sig.get_field_sig('value').field_attrs['max_length'] = 50
+
+        app_sig = AppSignature(app_id='tests')
+        app_sig.add_model_sig(model_sig)
+
+        orig_version = Version.objects.current_version()
+        orig_version.signature.add_app_sig(app_sig)
+        orig_version.save()
+
+        with ensure_test_db(model_entries=[('TestModel', EvolverTestModel)]):
+            with EvolutionProfiler(track_memory=False) as profiler:
+                evolver = Evolver(profiler=profiler)
+                evolver.queue_task(EvolveAppTask(
+                    evolver=evolver,
+                    app=evo_test,
+                    evolutions=[
+                        {
+                            'label': 'my_evolution1',
+                            'mutations': [
+                                ChangeField('TestModel', 'value',
+                                            max_length=200),
+                            ],
+                        },
+                    ]))
+                evolver.evolve()
+
+        self.assertTrue(evolver.evolved)
+        self.assertEqual(
+            [
+                (phase_info['name'], phase_info['app_label'],
+                 phase_info['depth'])
+                for phase_info in profiler.phases
+            ],
+            [
+                ('scan_database_state', None, 0),
+                ('build_target_project_sig', None, 0),
+                ('initial_diff', None, 0),
+                ('prepare_tasks:EvolveAppTask', None, 0),
+                ('prepare_task', 'tests', 1),
+                ('build_migration_executor', None, 1),
+                ('build_migrations_info', None, 1),
+                ('build_evolutions_graph', None, 1),
+                ('build_batches', None, 1),
+                ('execute_tasks:EvolveAppTask', None, 0),
+                ('execute_task', 'tests', 1),
+                ('rescan_tables', None, 0),
+                ('save_project_sig', None, 0),
+            ])
+
+        execute_phase = profiler.phases[-3]
+        self.assertGreater(execute_phase['queries'], 0)
+        self.assertGreater(execute_phase['duration'], 0)
+
+    def test_evolve_with_max_blocking_table_rows(self):
+        """Testing Evolver.evolve with MAX_BLOCKING_TABLE_ROWS and table
+        rewrite on a large table
+        """
+        with override_settings(DJANGO_EVOLUTION={
+                'MAX_BLOCKING_TABLE_ROWS': 2,
+            }):
+            evolver = self._evolve_with_table_rewrite(num_rows=3,
+                                                      expect_blocked=True)
+
+        self.assertFalse(evolver.evolved)
+        self.assertEqual(len(evolver.blocking_statements), 1)
+
+        statement = evolver.blocking_statements[0]
+        self.assertEqual(statement['table'], 'tests_testmodel')
+        self.assertEqual(statement['table_rows'], 3)
+        self.assertEqual(statement['cost'], DDLCost.REWRITE)
+
+        model_sig = (
+            Version.objects.current_version().signature
+            .get_app_sig('tests')
+            .get_model_sig('TestModel')
+        )
+        self.assertEqual(
+            model_sig.get_field_sig('value').field_attrs['max_length'],
+            50)
+
+    def test_evolve_with_max_blocking_table_rows_and_allow_rewrite(self):
+        """Testing Evolver.evolve with MAX_BLOCKING_TABLE_ROWS and table
+        rewrite on a large table with allow_rewrite=True
+        """
+        with override_settings(DJANGO_EVOLUTION={
+                'MAX_BLOCKING_TABLE_ROWS': 2,
+            }):
+            evolver = self._evolve_with_table_rewrite(num_rows=3,
+                                                      allow_rewrite=True)
+
+        self.assertTrue(evolver.evolved)
+        self.assertEqual(evolver.blocking_statements, [])
+
+    def test_evolve_with_max_blocking_table_rows_and_small_table(self):
+        """Testing Evolver.evolve with MAX_BLOCKING_TABLE_ROWS and table
+        rewrite on a small table
+        """
+        with override_settings(DJANGO_EVOLUTION={
+                'MAX_BLOCKING_TABLE_ROWS': 2,
+            }):
+            evolver = self._evolve_with_table_rewrite(num_rows=2)
+
+        self.assertTrue(evolver.evolved)
+        self.assertEqual(evolver.blocking_statements, [])
+
+    def test_evolve_with_disallowed_statements(self):
+        """Testing Evolver.evolve with statements disallowed by the
+        database's policies
+        """
+        model_sig = ModelSignature.from_model(EvolverTestModel)
+        model_sig.get_field_sig('value').field_attrs['max_length'] = 50
+
+        app_sig = AppSignature(app_id='tests')
+        app_sig.add_model_sig(model_sig)
+
+        orig_version = Version.objects.current_version()
+        orig_version.signature.add_app_sig(app_sig)
+        orig_version.save()
+
+        with ensure_test_db(model_entries=[('TestModel', EvolverTestModel)]):
+            evolver = Evolver()
+            evolver.queue_evolve_app(evo_test)
+
+            # Prepare the tasks, and then simulate the backend's policies
+            # disallowing the generated SQL.
+            self.assertTrue(list(evolver.tasks))
+            self.assertEqual(evolver.disallowed_statements, [])
+
+            evolver.disallowed_statements = [
+                {
+                    'reason': 'Reason 1',
+                    'sql': 'SQL 1',
+                },
+                {
+                    'reason': 'Reason 2',
+                    'sql': 'SQL 2',
+                },
+                {
+                    'reason': 'Reason 1',
+                    'sql': 'SQL 3',
+                },
+            ]
+
+            message = (
+                'Evolving the database "default" would run SQL disallowed '
+                'by its policies:\n'
+                '\n'
+                '* Reason 1\n'
+                '* Reason 2'
+            )
+
+            with self.assertRaisesMessage(BlockingOperationError, message):
+                evolver.evolve()
+
+        self.assertFalse(evolver.evolved)
+        self.assertEqual(Version.objects.current_version(), orig_version)
+
     def test_evolve_with_hinted(self):
         """Testing Evolver.evolve with hinting"""
         model_sig = ModelSignature.from_model(EvolverTestModel)
@@ -580,6 +765,275 @@ class EvolverTests(BaseEvolverTestCase):
             model_sig.get_field_sig('value').field_attrs['max_length'],
             100)
 
+    def _evolve_with_table_rewrite(self, num_rows, expect_blocked=False,
+                                   **kwargs):
+        """Evolve a populated table using a mutation that rewrites it.
+
+        Args:
+            num_rows (int):
+                The number of rows to add to the table.
+
+            expect_blocked (bool, optional):
+                Whether the evolution is expected to be blocked.
+
+            **kwargs (dict):
+                Additional keyword arguments for the evolver.
+
+        Returns:
+            django_evolution.evolve.Evolver:
+            The evolver.
+        """
+        model_sig = ModelSignature.from_model(EvolverTestModel)
+        model_sig.get_field_sig('value').field_attrs['max_length'] = 50
+
+        app_sig = AppSignature(app_id='tests')
+        app_sig.add_model_sig(model_sig)
+
+        orig_version = Version.objects.current_version()
+        orig_version.signature.add_app_sig(app_sig)
+        orig_version.save()
+
+        with ensure_test_db(model_entries=[('TestModel', EvolverTestModel)]):
+            with connection.cursor() as cursor:
+                for i in range(num_rows):
+                    cursor.execute(
+                        'INSERT INTO tests_testmodel (value) VALUES (%s)',
+                        ['value%s' % i])
+
+            evolver = Evolver(**kwargs)
+            evolver.queue_task(EvolveAppTask(
+                evolver=evolver,
+                app=evo_test,
+                evolutions=[
+                    {
+                        'label': 'my_evolution1',
+                        'mutations': [
+                            ChangeField('TestModel', 'value',
+                                        max_length=200),
+                        ],
+                    },
+                ]))
+
+            if expect_blocked:
+                with self.assertRaises(BlockingOperationError):
+                    evolver.evolve()
+            else:
+                evolver.evolve()
+
+        return evolver
+
+
+class EvolverQueryCountTests(MigrationsTestsMixin, BaseEvolverTestCase):
+    """Query count regression tests for Evolver.
+
+    These pin the number of queries needed to construct an evolver and
+    perform a no-op evolution, making sure that the number of queries
+    doesn't grow unexpectedly as the number of apps and tables grows.
+
+    Introspection query counts depend on the database backend, so only the
+    growth in those counts is checked, outside of SQLite.
+    """
+
+    # The number of introspection queries needed to scan a table with a
+    # single index on SQLite.
+    SQLITE_INTROSPECTION_QUERIES_PER_TABLE = 10
+
+    # The number of stored evolution/version/migration queries needed to
+    # construct an evolver.
+    INIT_BOOKKEEPING_QUERIES = 7
+
+    # The number of stored evolution/version/migration queries needed to
+    # perform a no-op evolution, based on the number of apps being evolved.
+    #
+    # Each app using evolutions currently builds a project signature from
+    # the database in order to check for pending mutations, which looks up
+    # the applied migrations for every installed app.
+    EVOLVE_BOOKKEEPING_QUERIES = {
+        1: 14,
+        2: 15,
+        4: 25,
+    }
+
+    evolved_app_labels = [
+        'evolutions_app',
+        'migrations_app',
+        'evolutions_app2',
+        'migrations_app2',
+    ]
+
+    def setUp(self):
+        # Make sure the test apps' tables are created by the tests, rather
+        # than being left over from another test suite, so that the stored
+        # signature reflects them.
+        self.ensure_deleted_apps()
+
+        super().setUp()
+
+    def test_init_with_tables(self):
+        """Testing Evolver.__init__ query counts as tables are added"""
+        introspection_counts = []
+
+        for num_tables in (0, 5, 10):
+            with self._create_extra_tables(num_tables):
+                with self.assertNumQueriesByCategory(
+                    bookkeeping=self.INIT_BOOKKEEPING_QUERIES,
+                    ddl=0) as captured:
+                    Evolver()
+
+            introspection_counts.append(
+                captured.get_counts()['introspection'])
+
+        self._check_introspection_growth(introspection_counts,
+                                         tables_per_step=5)
+
+    def test_init_with_apps(self):
+        """Testing Evolver.__init__ query counts as apps are evolved"""
+        for num_apps in (1, 2, 4):
+            self.ensure_evolved_apps(self._get_evolved_apps(num_apps))
+
+            with self.assertNumQueriesByCategory(
+                bookkeeping=self.INIT_BOOKKEEPING_QUERIES,
+                ddl=0):
+                Evolver()
+
+    def test_evolve_noop_with_tables(self):
+        """Testing Evolver.evolve query counts with no changes as tables are
+        added
+        """
+        apps = self._get_evolved_apps(1)
+        self.ensure_evolved_apps(apps)
+
+        introspection_counts = []
+
+        for num_tables in (0, 5, 10):
+            with self._create_extra_tables(num_tables):
+                evolver = self._create_evolver(apps)
+
+                with self.assertNumQueriesByCategory(
+                    bookkeeping=self.EVOLVE_BOOKKEEPING_QUERIES[1],
+                    ddl=0) as captured:
+                    evolver.evolve()
+
+            introspection_counts.append(
+                captured.get_counts()['introspection'])
+
+        self._check_introspection_growth(introspection_counts,
+                                         tables_per_step=5)
+
+    def test_evolve_noop_with_apps(self):
+        """Testing Evolver.evolve query counts with no changes as apps are
+        added
+        """
+        for num_apps in (1, 2, 4):
+            apps = self._get_evolved_apps(num_apps)
+            self.ensure_evolved_apps(apps)
+
+            evolver = self._create_evolver(apps)
+
+            with self.assertNumQueriesByCategory(
+                bookkeeping=self.EVOLVE_BOOKKEEPING_QUERIES[num_apps],
+                ddl=0):
+                evolver.evolve()
+
+    def _get_evolved_apps(self, num_apps):
+        """Return apps to evolve for a test.
+
+        Args:
+            num_apps (int):
+                The number of apps to return.
+
+        Returns:
+            list of module:
+            The apps to evolve.
+        """
+        return [
+            get_app(app_label)
+            for app_label in self.evolved_app_labels[:num_apps]
+        ]
+
+    def _create_evolver(self, apps):
+        """Return an evolver with tasks queued for apps.
+
+        Args:
+            apps (list of module):
+                The apps to queue for evolution.
+
+        Returns:
+            django_evolution.evolve.Evolver:
+            The new evolver.
+        """
+        evolver = Evolver()
+
+        for app in apps:
+            evolver.queue_evolve_app(app)
+
+        return evolver
+
+    @contextmanager
+    def _create_extra_tables(self, num_tables):
+        """Create unmanaged tables in the database for a test.
+
+        Each table will contain a primary key and an indexed column.
+
+        Args:
+            num_tables (int):
+                The number of tables to create.
+
+        Context:
+            The tables will exist for the duration of the context.
+        """
+        table_names = [
+            'tests_extra_table_%s' % i
+            for i in range(num_tables)
+        ]
+
+        sql = []
+
+        for table_name in table_names:
+            sql += [
+                'CREATE TABLE %s (id integer PRIMARY KEY, value integer);'
+                % table_name,
+                'CREATE INDEX %s_value ON %s (value);'
+                % (table_name, table_name),
+            ]
+
+        execute_test_sql(sql)
+
+        try:
+            yield
+        finally:
+            execute_test_sql([
+                'DROP TABLE %s;' % table_name
+                for table_name in table_names
+            ])
+
+    def _check_introspection_growth(self, introspection_counts,
+                                    tables_per_step):
+        """Check that introspection queries grow linearly with tables.
+
+        Args:
+            introspection_counts (list of int):
+                The number of introspection queries for each step.
+
+            tables_per_step (int):
+                The number of tables added at each step.
+
+        Raises:
+            AssertionError:
+                The number of introspection queries did not grow linearly.
+        """
+        steps = [
+            count2 - count1
+            for count1, count2 in zip(introspection_counts,
+                                      introspection_counts[1:])
+        ]
+        self.assertEqual(len(set(steps)), 1)
+
+        if connection.vendor == 'sqlite':
+            self.assertEqual(
+                steps[0],
+                tables_per_step * self.SQLITE_INTROSPECTION_QUERIES_PER_TABLE)
+
 
 class EvolveAppTaskTests(MigrationsTestsMixin, BaseEvolverTestCase):
     """Unit tests for django_evolution.evolve.EvolveAppTask."""
@@ -1233,6 +1687,91 @@ class EvolveAppTaskTests(MigrationsTestsMixin, BaseEvolverTestCase):
                                               field2='foo',
                                               field3=True)
 
+    @requires_migrations
+    def test_execute_tasks_with_fresh_install_and_data_migrations(self):
+        """Testing EvolveAppTask.execute_tasks with fresh install and apps
+        with data migrations
+        """
+        class MigrationTestModel(BaseTestModel):
+            field1 = models.IntegerField()
+
+        class InitialMigration(migrations.Migration):
+            operations = [
+                migrations.CreateModel(
+                    name='TestModel',
+                    fields=[
+                        ('id', models.AutoField(verbose_name='ID',
+                                                serialize=False,
+                                                auto_created=True,
+                                                primary_key=True)),
+                        ('field1', models.IntegerField()),
+                    ],
+                ),
+            ]
+
+        class DataMigration(migrations.Migration):
+            dependencies = [
+                ('tests', '0001_initial'),
+            ]
+
+            operations = [
+                migrations.RunSQL(
+                    [
+                        'CREATE TABLE tests_extra (id integer PRIMARY KEY,'
+                        ' value integer)',
+                        'CREATE INDEX tests_extra_value ON tests_extra'
+                        ' (value)',
+                    ],
+                    'DROP TABLE tests_extra'),
+            ]
+
+        self.set_base_model(MigrationTestModel)
+        self.addCleanup(execute_test_sql,
+                        ['DROP TABLE IF EXISTS tests_extra'])
+
+        with ensure_test_db():
+            evolver = Evolver()
+            evolver.project_sig.get_app_sig('tests').upgrade_method = \
+                UpgradeMethod.MIGRATIONS
+
+            # The test database isn't empty, so force the fast path.
+            evolver.fresh_install = True
+
+            app_migrations = [
+                InitialMigration('0001_initial', 'tests'),
+                DataMigration('0002_data', 'tests'),
+            ]
+
+            task = EvolveAppTask(evolver=evolver,
+                                 app=evo_test,
+                                 migrations=app_migrations)
+            evolver.queue_task(task)
+
+            EvolveAppTask.prepare_tasks(evolver, [task])
+            EvolveAppTask.execute_tasks(evolver, [task])
+
+            # The app's migrations couldn't be faked, so they were run.
+            self.assertEqual(
+                [
+                    signal_name
+                    for signal_name, info in self.saw_signals
+                ],
+                [
+                    'applying_migration',
+                    'applied_migration',
+                    'applying_migration',
+                    'applied_migration',
+                ])
+
+            # The tables created by the migrations should be tracked,
+            # along with their indexes.
+            database_state = evolver.database_state
+            self.assertTrue(database_state.has_model(MigrationTestModel))
+            self.assertTrue(database_state.has_table('tests_extra'))
+            self.assertIsNotNone(database_state.find_index(
+                table_name='tests_extra',
+                columns=['value']))
+
     @requires_migrations
     def test_execute_tasks_with_evolutions_and_migrations(self):
         """Testing EvolveAppTask.execute_tasks with evolutions and migrations
@@ -1530,6 +2069,239 @@ class EvolveAppTaskTests(MigrationsTestsMixin, BaseEvolverTestCase):
                 added_field=True,
                 added_field2=123)
 
+    def test_execute_tasks_with_fresh_install(self):
+        """Testing EvolveAppTask.execute_tasks with fresh install"""
+        self.ensure_deleted_apps()
+
+        evolver = Evolver()
+
+        # The test database isn't empty, so force the fast path.
+        evolver.fresh_install = True
+
+        tasks = self._get_test_apps_tasks(evolver)
+        EvolveAppTask.prepare_tasks(evolver, tasks)
+        EvolveAppTask.execute_tasks(evolver, tasks)
+
+        # All models should be created at once, and no migrations should
+        # have been run.
+        self.assertEqual(
+            [
+                (signal_name, info['app_label'])
+                for signal_name, info in self.saw_signals
+            ],
+            [
+                ('creating_models', 'evolutions_app2'),
+                ('creating_models', 'evolutions_app'),
+                ('creating_models', 'migrations_app'),
+                ('creating_models', 'migrations_app2'),
+                ('creating_models', 'move_to_migrations_app'),
+                ('created_models', 'evolutions_app2'),
+                ('created_models', 'evolutions_app'),
+                ('created_models', 'migrations_app'),
+                ('created_models', 'migrations_app2'),
+                ('created_models', 'move_to_migrations_app'),
+            ])
+
+        # Make sure all migrations are recorded as applied.
+        self.assertAppliedMigrations([
+            ('migrations_app', '0001_initial'),
+            ('migrations_app', '0002_add_field'),
+            ('migrations_app2', '0001_initial'),
+            ('migrations_app2', '0002_add_field'),
+            ('move_to_migrations_app', '0001_initial'),
+            ('move_to_migrations_app', '0002_add_field2'),
+        ])
+
+        # The new tables should be tracked without a rescan.
+        database_state = evolver.database_state
+        self.assertTrue(database_state.has_model(EvolutionsAppTestModel))
+        self.assertTrue(database_state.has_model(MigrationsAppTestModel))
+
+        # Make sure we can now use the models.
+        model1 = EvolutionsAppTestModel.objects.create(char_field='abc123')
+        model2 = EvolutionsApp2TestModel.objects.create(char_field='def456',
+                                                        fkey=model1)
+        EvolutionsApp2TestModel2.objects.create(int_field=42,
+                                                fkey=model2)
+        MigrationsAppTestModel.objects.create(char_field='abc123',
+                                              added_field=100)
+        MigrationsApp2TestModel.objects.create(char_field='def456',
+                                               added_field=True)
+
+        from django_evolution.tests.move_to_migrations_app.models import \
+            MoveToMigrationsAppTestModel
+
+        MoveToMigrationsAppTestModel.objects.create(
+            char_field='test',
+            added_field=True,
+            added_field2=123)
+
+    @requires_migrations
+    def test_execute_tasks_with_checkpoints(self):
+        """Testing EvolveAppTask.execute_tasks saves checkpoints after each
+        batch of evolutions and resumes from them after a failure
+        """
+        self._setup_pre_upgrade()
+
+        # migrations_app2 is a new app, created in the last batch.
+        def _on_applying_migration(migration, **kwargs):
+            if (migration.app_label == 'migrations_app2' and
+                migration.name == '0002_add_field'):
+                raise Exception('Oh no!')
+
+        evolver = Evolver()
+
+        for task in self._get_test_apps_tasks(evolver):
+            evolver.queue_task(task)
+
+        applying_migration.connect(_on_applying_migration)
+
+        try:
+            with self.assertRaisesMessage(Exception, 'Oh no!'):
+                evolver.evolve()
+        finally:
+            applying_migration.disconnect(_on_applying_migration)
+
+        self.assertFalse(evolver.evolved)
+
+        # Only batches of evolutions followed by more work should have
+        # checkpoints.
+        batches = evolver._evolve_app_task_state['batches']
+        self.assertEqual(
+            [
+                (batch_info['type'], 'project_sig' in batch_info)
+                for batch_info in batches
+            ],
+            [
+                (UpgradeMethod.EVOLUTIONS, True),
+                (UpgradeMethod.MIGRATIONS, False),
+            ])
+
+        # The evolutions and signature from the batch of evolutions should
+        # have been saved. The new app is managed by migrations, so its
+        # signature is kept, with the recorded migrations determining what
+        # still needs to be applied.
+        version = Version.objects.current_version()
+        project_sig = version.signature
+        self.assertIsNotNone(project_sig.get_app_sig('migrations_app2'))
+        self.assertEqual(
+            project_sig.get_app_sig('evolutions_app2')
+            .get_model_sig('EvolutionsApp2TestModel')
+            .get_field_sig('char_field')
+            .field_attrs['max_length'],
+            10)
+
+        self.assertAppliedEvolutions(
+            [
+                ('evolutions_app', 'second_evolution'),
+                ('evolutions_app2', 'test_evolution'),
+            ],
+            version=version)
+
+        # Evolving again should pick up where the last run failed.
+        evolver = Evolver()
+
+        for task in self._get_test_apps_tasks(evolver):
+            evolver.queue_task(task)
+
+        evolver.evolve()
+
+        self.assertTrue(evolver.evolved)
+        self.assertEqual(
+            Version.objects.current_version().signature
+            .get_app_sig('migrations_app2')
+            .applied_migrations,
+            {'0001_initial', '0002_add_field'})
+        self.assertAppliedMigrations([
+            ('migrations_app', '0001_initial'),
+            ('migrations_app', '0002_add_field'),
+            ('migrations_app2', '0001_initial'),
+            ('migrations_app2', '0002_add_field'),
+            ('move_to_migrations_app', '0001_initial'),
+            ('move_to_migrations_app', '0002_add_field2'),
+        ])
+        self.assertAppliedEvolutions([
+            ('evolutions_app', 'first_evolution'),
+            ('evolutions_app', 'second_evolution'),
+            ('evolutions_app2', 'test_evolution'),
+        ])
+
+        # No evolutions should have been recorded twice.
+        evolutions = list(
+            Evolution.objects.values_list('app_label', 'label'))
+        self.assertEqual(len(evolutions), len(set(evolutions)))
+
+        # Make sure we can now use the new model.
+        MigrationsApp2TestModel.objects.create(char_field='def456',
+                                               added_field=True)
+
+    def test_build_checkpoint_sig_with_pending_models(self):
+        """Testing EvolveAppTask._build_checkpoint_sig leaves out new models
+        and apps not yet created
+        """
+        self._setup_pre_upgrade(ignored_apps={
+            'evolutions_app2',
+            'migrations_app2',
+        })
+
+        evolver = Evolver()
+        tasks = self._get_test_apps_tasks(evolver)
+        EvolveAppTask.prepare_tasks(evolver, tasks)
+
+        # None of the new app's models have been created yet.
+        project_sig = EvolveAppTask._build_checkpoint_sig(
+            evolver=evolver,
+            tasks=tasks,
+            pending_models={
+                'evolutions_app2': {
+                    'evolutionsapp2testmodel': 'EvolutionsApp2TestModel',
+                    'evolutionsapp2testmodel2': 'EvolutionsApp2TestModel2',
+                },
+            })
+
+        self.assertIsNone(project_sig.get_app_sig('evolutions_app2'))
+        self.assertIsNotNone(project_sig.get_app_sig('migrations_app2'))
+        self.assertIsNotNone(
+            evolver.project_sig.get_app_sig('evolutions_app2'))
+
+        # Only some of the new app's models have been created.
+        project_sig = EvolveAppTask._build_checkpoint_sig(
+            evolver=evolver,
+            tasks=tasks,
+            pending_models={
+                'evolutions_app2': {
+                    'evolutionsapp2testmodel2': 'EvolutionsApp2TestModel2',
+                },
+            })
+
+        app_sig = project_sig.get_app_sig('evolutions_app2')
+        self.assertIsNotNone(app_sig)
+        self.assertIsNotNone(app_sig.get_model_sig('EvolutionsApp2TestModel'))
+        self.assertIsNone(app_sig.get_model_sig('EvolutionsApp2TestModel2'))
+        self.assertIsNotNone(
+            evolver.project_sig.get_app_sig('evolutions_app2')
+            .get_model_sig('EvolutionsApp2TestModel2'))
+
+    def test_execute_tasks_with_checkpoints_and_deferred_sql(self):
+        """Testing EvolveAppTask.execute_tasks does not save checkpoints
+        once new models have deferred SQL
+        """
+        self.ensure_deleted_apps()
+
+        evolver = Evolver()
+        tasks = self._get_test_apps_tasks(evolver)
+        EvolveAppTask.prepare_tasks(evolver, tasks)
+
+        batches = evolver._evolve_app_task_state['batches']
+        self.assertGreater(len(batches), 1)
+        self.assertTrue(any(
+            batch_info.get('new_models_deferred_sql')
+            for batch_info in batches
+        ))
+
+        for batch_info in batches:
+            self.assertNotIn('project_sig', batch_info)
+
     def test_execute_tasks_with_dependencies_and_upgrade_db(self):
         """Testing EvolveAppTask.execute_tasks with complex dependencies and
         upgrading database
@@ -1703,6 +2475,87 @@ class EvolveAppTaskTests(MigrationsTestsMixin, BaseEvolverTestCase):
 
         self.assertSQLMappingEqual(sql, 'create_tables_with_deferred_refs')
 
+    def test_prepare_tasks_with_prepare_workers(self):
+        """Testing EvolveAppTask.prepare_tasks with prepare_workers matches
+        sequential preparation
+        """
+        self._setup_pre_upgrade()
+
+        results = []
+
+        for prepare_workers in (1, 4):
+            with EvolutionProfiler(track_memory=False) as profiler:
+                evolver = Evolver(prepare_workers=prepare_workers,
+                                  profiler=profiler)
+                self.assertEqual(evolver.prepare_workers, prepare_workers)
+
+                tasks = self._get_test_apps_tasks(evolver)
+                EvolveAppTask.prepare_tasks(evolver, tasks)
+
+            self.assertEqual(
+                'prepare_tasks_parallel' in [
+                    phase_info['name']
+                    for phase_info in profiler.phases
+                ],
+                prepare_workers > 1)
+
+            results.append((
+                [
+                    (task.app_label,
+                     task.evolution_required,
+                     task.can_simulate,
+                     task.upgrade_method,
+                     task.new_model_names,
+                     task.sql,
+                     task._new_models_sql,
+                     [
+                         evolution.label
+                         for evolution in task.new_evolutions
+                     ])
+                    for task in tasks
+                ],
+                [
+                    (batch['type'],
+                     [
+                         task.app_label
+                         for task in batch.get('task_evolutions', [])
+                     ],
+                     [
+                         task.app_label
+                         for task in batch.get('new_models_tasks', [])
+                     ])
+                    for batch in evolver._evolve_app_task_state['batches']
+                ],
+                evolver.project_sig.serialize(),
+            ))
+
+        self.assertEqual(results[0], results[1])
+
+    def test_prepare_tasks_with_prepare_workers_in_transaction(self):
+        """Testing EvolveAppTask.prepare_tasks with prepare_workers in a
+        transaction prepares tasks sequentially
+        """
+        self._setup_pre_upgrade()
+
+        with EvolutionProfiler(track_memory=False) as profiler:
+            evolver = Evolver(prepare_workers=4,
+                              profiler=profiler)
+            tasks = self._get_test_apps_tasks(evolver)
+
+            with transaction.atomic():
+                EvolveAppTask.prepare_tasks(evolver, tasks)
+
+        self.assertNotIn(
+            'prepare_tasks_parallel',
+            [
+                phase_info['name']
+                for phase_info in profiler.phases
+            ])
+        self.assertTrue(any(
+            task.evolution_required
+            for task in tasks
+        ))
+
     def test_prepare_with_hinted_false(self):
         """Testing EvolveAppTask.prepare with hinted=False"""
         register_app_models('tests', [('TestModel', EvolverTestModel)],
@@ -1967,7 +2820,7 @@ class EvolveAppTaskTests(MigrationsTestsMixin, BaseEvolverTestCase):
             for app in self._get_test_apps()
         ]
 
-    def _setup_pre_upgrade(self):
+    def _setup_pre_upgrade(self, ignored_apps=None):
         """Set up database and signature state before an upgrade test.
 
         This will register some models that contain a
@@ -1975,7 +2828,16 @@ class EvolveAppTaskTests(MigrationsTestsMixin, BaseEvolverTestCase):
         database as the current verson, and create the matching tables in the
         database. Upgrades can then be performed against the database and
         signature state.
+
+        Args:
+            ignored_apps (set of str, optional):
+                The labels of apps to leave out of the signature and
+                database, letting the upgrade populate them for the first
+                time. This defaults to ``migrations_app2``.
         """
+        if ignored_apps is None:
+            ignored_apps = {'migrations_app2'}
+
         self.ensure_deleted_apps()
 
         class InitialEvolutionsAppTestModel(models.Model):
@@ -2024,11 +2886,6 @@ class EvolveAppTaskTests(MigrationsTestsMixin, BaseEvolverTestCase):
             ],
         }
 
-        # Apps we want to let the upgrade populate for the first time.
-        ignored_apps = {
-            'migrations_app2',
-        }
-
         version = Version.objects.current_version()
         project_sig = version.signature
 
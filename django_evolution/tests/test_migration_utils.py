@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import os
+
 from django.db import DEFAULT_DB_ALIAS, connections, migrations, models
 from django.db.migrations.recorder import MigrationRecorder
 
@@ -22,11 +24,13 @@ from django_evolution.utils.migrations import (MigrationExecutor,
                                                MigrationList,
                                                MigrationLoader,
                                                apply_migrations,
+                                               clear_migration_loader_cache,
                                                create_pre_migrate_state,
                                                filter_migration_targets,
                                                finalize_migrations,
                                                has_migrations_module,
                                                is_migration_initial,
+                                               is_migration_schema_only,
                                                record_applied_migrations,
                                                unrecord_applied_migrations)
 
@@ -679,6 +683,94 @@ class MigrationLoadTests(MigrationsTestsMixin, TestCase):
         self.assertIs(loader.get_migration('auth', '0001_initial'),
                       migration)
 
+    @requires_migrations
+    def test_init_with_cache(self):
+        """Testing MigrationLoader.__init__ with cached migrations"""
+        connection = connections[DEFAULT_DB_ALIAS]
+
+        loader1 = MigrationLoader(connection=connection)
+        loader2 = MigrationLoader(connection=connection)
+
+        self.assertIs(loader2.graph, loader1.graph)
+        self.assertIs(loader2.get_migration('auth', '0001_initial'),
+                      loader1.get_migration('auth', '0001_initial'))
+        self.assertEqual(loader2.disk_migrations, loader1.disk_migrations)
+        self.assertIsNot(loader2.disk_migrations, loader1.disk_migrations)
+        self.assertEqual(loader2.migrated_apps, loader1.migrated_apps)
+        self.assertEqual(loader2.unmigrated_apps, loader1.unmigrated_apps)
+        self.assertEqual(loader2.applied_migrations,
+                         loader1.applied_migrations)
+
+    @requires_migrations
+    def test_init_with_cache_and_use_cache_false(self):
+        """Testing MigrationLoader.__init__ with cached migrations and
+        use_cache=False
+        """
+        connection = connections[DEFAULT_DB_ALIAS]
+
+        loader1 = MigrationLoader(connection=connection)
+        loader2 = MigrationLoader(connection=connection,
+                                  use_cache=False)
+
+        self.assertIsNot(loader2.graph, loader1.graph)
+        self.assertIsNot(loader2.get_migration('auth', '0001_initial'),
+                         loader1.get_migration('auth', '0001_initial'))
+
+    @requires_migrations
+    def test_init_with_cache_and_changed_custom_migrations(self):
+        """Testing MigrationLoader.__init__ with cached migrations and
+        different custom migrations
+        """
+        connection = connections[DEFAULT_DB_ALIAS]
+
+        loader1 = MigrationLoader(connection=connection)
+
+        custom_migrations = MigrationList()
+        custom_migrations.add_migration(
+            InitialMigration('0001_initial', 'tests'))
+
+        loader2 = MigrationLoader(connection=connection,
+                                  custom_migrations=custom_migrations)
+
+        self.assertIsNot(loader2.graph, loader1.graph)
+        self.assertNotIn(('tests', '0001_initial'), loader1.graph.nodes)
+        self.assertIn(('tests', '0001_initial'), loader2.graph.nodes)
+
+    @requires_migrations
+    def test_init_with_cache_and_changed_migration_file(self):
+        """Testing MigrationLoader.__init__ with cached migrations and
+        modified migration file
+        """
+        connection = connections[DEFAULT_DB_ALIAS]
+        loader1 = MigrationLoader(connection=connection)
+
+        path = os.path.join(os.path.dirname(__file__), 'migrations_app',
+                            'migrations', '0001_initial.py')
+        st = os.stat(path)
+
+        try:
+            os.utime(path, ns=(st.st_atime_ns,
+                               st.st_mtime_ns + 1_000_000_000))
+
+            loader2 = MigrationLoader(connection=connection)
+        finally:
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        self.assertIsNot(loader2.graph, loader1.graph)
+
+    @requires_migrations
+    def test_clear_migration_loader_cache(self):
+        """Testing clear_migration_loader_cache"""
+        connection = connections[DEFAULT_DB_ALIAS]
+
+        loader1 = MigrationLoader(connection=connection)
+        clear_migration_loader_cache()
+        loader2 = MigrationLoader(connection=connection)
+
+        self.assertIsNot(loader2.graph, loader1.graph)
+        self.assertIsNot(loader2.get_migration('auth', '0001_initial'),
+                         loader1.get_migration('auth', '0001_initial'))
+
 
 class MigrationExecutorTests(MigrationsTestsMixin, TestCase):
     """Unit tests for django_evolution.utils.migrations.MigrationExecutor."""
@@ -788,6 +880,46 @@ class MigrationUtilsTests(MigrationsTestsMixin, TestCase):
         self.assertNotIn(('tests', '0001_initial'), applied_migrations)
         self.assertNotIn(('tests', '0002_stuff'), applied_migrations)
 
+    @requires_migrations
+    def test_unrecord_applied_migrations_with_migrations(self):
+        """Testing unrecord_applied_migrations with migrations=..."""
+        connection = connections[DEFAULT_DB_ALIAS]
+
+        migrations = MigrationList()
+        migrations.add_migration_info(app_label='tests',
+                                      name='0001_initial')
+        migrations.add_migration_info(app_label='tests',
+                                      name='0002_stuff')
+        migrations.add_migration_info(app_label='migrations_app',
+                                      name='0001_initial')
+        migrations.add_migration_info(app_label='migrations_app2',
+                                      name='0001_initial')
+
+        record_applied_migrations(connection=connection,
+                                  migrations=migrations)
+
+        to_unrecord = MigrationList()
+        to_unrecord.add_migration_info(app_label='tests',
+                                       name='0002_stuff')
+        to_unrecord.add_migration_info(app_label='migrations_app',
+                                       name='0001_initial')
+        to_unrecord.add_migration_info(app_label='migrations_app2',
+                                       name='0001_initial')
+
+        with self.assertNumQueriesByCategory(bookkeeping=1):
+            unrecord_applied_migrations(connection=connection,
+                                        migrations=to_unrecord)
+
+        recorder = MigrationRecorder(connection)
+        applied_migrations = recorder.applied_migrations()
+
+        self.assertIn(('tests', '0001_initial'), applied_migrations)
+        self.assertNotIn(('tests', '0002_stuff'), applied_migrations)
+        self.assertNotIn(('migrations_app', '0001_initial'),
+                         applied_migrations)
+        self.assertNotIn(('migrations_app2', '0001_initial'),
+                         applied_migrations)
+
     def test_filter_migration_targets_with_app_labels(self):
         """Testing filter_migration_targets with app_labels=..."""
         targets = [
@@ -876,6 +1008,66 @@ class MigrationUtilsTests(MigrationsTestsMixin, TestCase):
         self.assertFalse(is_migration_initial(MyMigration('0001_initial',
                                                           'tests')))
 
+    @requires_migrations
+    def test_is_migration_schema_only(self):
+        """Testing is_migration_schema_only with schema operations"""
+        self.assertTrue(is_migration_schema_only(
+            AddFieldMigration('0002_add_field', 'tests')))
+
+    @requires_migrations
+    def test_is_migration_schema_only_with_run_python(self):
+        """Testing is_migration_schema_only with RunPython"""
+        class MyMigration(migrations.Migration):
+            operations = [
+                migrations.RunPython(lambda apps, schema_editor: None),
+            ]
+
+        self.assertFalse(is_migration_schema_only(
+            MyMigration('0002_data', 'tests')))
+
+    @requires_migrations
+    def test_is_migration_schema_only_with_run_python_noop(self):
+        """Testing is_migration_schema_only with no-op and elidable
+        RunPython
+        """
+        class MyMigration(migrations.Migration):
+            operations = [
+                migrations.RunPython(migrations.RunPython.noop,
+                                     lambda apps, schema_editor: None),
+                migrations.RunPython(lambda apps, schema_editor: None,
+                                     elidable=True),
+            ]
+
+        self.assertTrue(is_migration_schema_only(
+            MyMigration('0002_data', 'tests')))
+
+    @requires_migrations
+    def test_is_migration_schema_only_with_run_sql(self):
+        """Testing is_migration_schema_only with RunSQL"""
+        class MyMigration(migrations.Migration):
+            operations = [
+                migrations.SeparateDatabaseAndState(database_operations=[
+                    migrations.RunSQL('INSERT INTO foo VALUES (1);'),
+                ]),
+            ]
+
+        self.assertFalse(is_migration_schema_only(
+            MyMigration('0002_data', 'tests')))
+
+    @requires_migrations
+    def test_is_migration_schema_only_with_custom_operation(self):
+        """Testing is_migration_schema_only with custom operation"""
+        class MyOperation(migrations.operations.base.Operation):
+            pass
+
+        class MyMigration(migrations.Migration):
+            operations = [
+                MyOperation(),
+            ]
+
+        self.assertFalse(is_migration_schema_only(
+            MyMigration('0002_custom', 'tests')))
+
     @requires_migrations
     def test_apply_migrations(self):
         """Testing apply_migrations"""
@@ -901,6 +1093,7 @@ class MigrationUtilsTests(MigrationsTestsMixin, TestCase):
         executor = MigrationExecutor(connection,
                                      custom_migrations=custom_migrations)
 
+        pre_migrate_state = create_pre_migrate_state(executor)
         migrate_state = apply_migrations(
             executor=executor,
             targets=targets,
@@ -908,7 +1101,59 @@ class MigrationUtilsTests(MigrationsTestsMixin, TestCase):
                 (app_migrations[0], False),
                 (app_migrations[1], False),
             ],
-            pre_migrate_state=create_pre_migrate_state(executor))
+            pre_migrate_state=pre_migrate_state)
+        self.assertIsNot(migrate_state, pre_migrate_state)
+        self.assertNotIn(('tests', 'migrationtestmodel'),
+                         pre_migrate_state.models)
+
+        finalize_migrations(migrate_state)
+
+        # Make sure this is in the database now.
+        MigrationTestModel.objects.create(field1=123,
+                                          field2='abc',
+                                          field3=True)
+
+    @requires_migrations
+    def test_apply_migrations_with_isolate_state_false(self):
+        """Testing apply_migrations with isolate_state=False threading state
+        between batches
+        """
+        database_state = DatabaseState(db_name=DEFAULT_DB_ALIAS)
+        register_models(database_state=database_state,
+                        models=[('MigrationTestModel', MigrationTestModel)])
+
+        app_migrations = [
+            InitialMigration('0001_initial', 'tests'),
+            AddFieldMigration('0002_add_field', 'tests'),
+        ]
+
+        custom_migrations = MigrationList()
+        custom_migrations.add_migration(app_migrations[0])
+        custom_migrations.add_migration(app_migrations[1])
+
+        connection = connections[DEFAULT_DB_ALIAS]
+        executor = MigrationExecutor(connection,
+                                     custom_migrations=custom_migrations)
+
+        pre_migrate_state = create_pre_migrate_state(executor)
+        migrate_state = apply_migrations(
+            executor=executor,
+            targets=[('tests', '0001_initial')],
+            plan=[(app_migrations[0], False)],
+            pre_migrate_state=pre_migrate_state,
+            isolate_state=False)
+        self.assertIs(migrate_state, pre_migrate_state)
+        self.assertIn(('tests', 'migrationtestmodel'),
+                      migrate_state.models)
+
+        migrate_state = apply_migrations(
+            executor=executor,
+            targets=[('tests', '0002_add_field')],
+            plan=[(app_migrations[1], False)],
+            pre_migrate_state=migrate_state,
+            isolate_state=False)
+        self.assertIs(migrate_state, pre_migrate_state)
+
         finalize_migrations(migrate_state)
 
         # Make sure this is in the database now.
@@ -5,6 +5,7 @@ from __future__ import annotations
 from django.db import models
 
 from django_evolution.errors import EvolutionBaselineMissingError
+from django_evolution.mutations import AddField, ChangeField
 from django_evolution.mutators import AppMutator, ModelMutator
 from django_evolution.tests.base_test_case import EvolutionTestCase
 from django_evolution.tests.models import BaseTestModel
@@ -29,6 +30,7 @@ class ModelMutatorTests(EvolutionTestCase):
                                  project_sig=project_sig,
                                  database_state=database_state,
                                  database=self.default_database_name)
+        self.app_mutator = app_mutator
         self.model_mutator = ModelMutator(app_mutator=app_mutator,
                                           model_name=self.default_model_name)
 
@@ -67,3 +69,72 @@ class ModelMutatorTests(EvolutionTestCase):
 
         with self.assertRaisesMessage(EvolutionBaselineMissingError, message):
             self.model_mutator.model_sig
+
+    def test_create_model(self):
+        """Testing ModelMutator.create_model"""
+        model = self.model_mutator.create_model()
+
+        self.assertEqual(model._meta.db_table, 'tests_testmodel')
+        self.assertEqual(model._meta.get_field('value').max_length, 100)
+        self.assertIs(self.model_mutator.create_model(), model)
+
+        # Other ModelMutators for the same model share the cached model.
+        model_mutator = ModelMutator(app_mutator=self.app_mutator,
+                                     model_name=self.default_model_name)
+        self.assertIs(model_mutator.create_model(), model)
+
+    def test_create_model_after_simulation(self):
+        """Testing ModelMutator.create_model after a simulation changes the
+        model signature
+        """
+        model = self.model_mutator.create_model()
+
+        self.model_mutator.run_simulation(
+            ChangeField('TestModel', 'value', max_length=200))
+
+        new_model = self.model_mutator.create_model()
+        self.assertIsNot(new_model, model)
+        self.assertEqual(new_model._meta.get_field('value').max_length, 200)
+
+        self.model_mutator.run_simulation(
+            AddField('TestModel', 'added_field', models.IntegerField,
+                     null=True))
+
+        new_model2 = self.model_mutator.create_model()
+        self.assertIsNot(new_model2, new_model)
+        self.assertIsNotNone(new_model2._meta.get_field('added_field'))
+
+    def test_create_model_after_simulation_by_other_mutator(self):
+        """Testing ModelMutator.create_model after another mutator runs a
+        simulation
+        """
+        model = self.model_mutator.create_model()
+
+        # Simulations may change signatures for other models (such as when
+        # renaming a related model), so any simulation invalidates the model.
+        model_mutator = ModelMutator(app_mutator=self.app_mutator,
+                                     model_name=self.default_model_name)
+        model_mutator.run_simulation(
+            ChangeField('TestModel', 'value', max_length=200))
+
+        new_model = self.model_mutator.create_model()
+        self.assertIsNot(new_model, model)
+        self.assertEqual(new_model._meta.get_field('value').max_length, 200)
+
+    def test_create_model_after_finish_op(self):
+        """Testing ModelMutator.create_model after an operation has finished
+        with the model
+        """
+        mutation = ChangeField('TestModel', 'value', max_length=200)
+        model = self.model_mutator.create_model()
+
+        self.model_mutator.finish_op({
+            'type': 'change_column',
+            'mutation': mutation,
+        })
+
+        self.assertEqual(self.app_mutator.mock_models, {})
+
+        new_model = self.model_mutator.create_model()
+        self.assertIsNot(new_model, model)
+        self.assertEqual(new_model._meta.get_field('value').max_length, 200)
@@ -0,0 +1,235 @@
+"""Unit tests for django_evolution.evolve.multi_database."""
+
+from __future__ import annotations
+
+from django.db import DEFAULT_DB_ALIAS
+
+from django_evolution.consts import DatabaseEvolutionStatus
+from django_evolution.errors import QueueEvolverTaskError
+from django_evolution.evolve import MultiDatabaseEvolver
+from django_evolution.models import Version
+from django_evolution.signature import AppSignature
+from django_evolution.tests.base_test_case import EvolutionTestCase
+
+
+class PurgeOnlyMultiDatabaseEvolver(MultiDatabaseEvolver):
+    """A multi-database evolver that only purges stale apps.
+
+    This can also be configured to fail when queueing tasks for specific
+    databases.
+    """
+
+    def __init__(self, *args, failing_database_names=None, **kwargs):
+        super().__init__(*args, purge=True, **kwargs)
+
+        self.failing_database_names = failing_database_names or []
+
+    def queue_tasks(self, evolver):
+        if evolver.database_name in self.failing_database_names:
+            raise QueueEvolverTaskError('Oh no.')
+
+        evolver.queue_purge_old_apps()
+
+
+class MultiDatabaseEvolverTests(EvolutionTestCase):
+    """Unit tests for django_evolution.evolve.MultiDatabaseEvolver."""
+
+    needs_evolution_models = True
+
+    database_names = [DEFAULT_DB_ALIAS, 'db_multi']
+
+    def setUp(self):
+        super().setUp()
+
+        # Make sure each database has a baseline to work from.
+        for database_name in self.database_names:
+            PurgeOnlyMultiDatabaseEvolver([database_name]).evolve()
+
+    def tearDown(self):
+        for database_name in self.database_names:
+            version = Version.objects.current_version(using=database_name)
+
+            if version.signature.get_app_sig('stale_app') is not None:
+                version.signature.remove_app_sig('stale_app')
+                version.save(using=database_name)
+
+        super().tearDown()
+
+    def test_evolve(self):
+        """Testing MultiDatabaseEvolver.evolve"""
+        for database_name in self.database_names:
+            self._add_stale_app_sig(database_name)
+
+        version_counts = self._get_version_counts()
+
+        multi_evolver = PurgeOnlyMultiDatabaseEvolver(self.database_names)
+        results = multi_evolver.evolve()
+
+        self.assertEqual(multi_evolver.results, results)
+        self.assertEqual(
+            [
+                (result.database_name, result.status, result.error)
+                for result in results
+            ],
+            [
+                (DEFAULT_DB_ALIAS, DatabaseEvolutionStatus.EVOLVED, None),
+                ('db_multi', DatabaseEvolutionStatus.EVOLVED, None),
+            ])
+
+        for result in results:
+            self.assertTrue(result.succeeded)
+            self.assertEqual(result.evolver.database_name,
+                             result.database_name)
+            self.assertTrue(result.evolver.evolved)
+
+        self.assertEqual(
+            self._get_version_counts(),
+            {
+                database_name: count + 1
+                for database_name, count in version_counts.items()
+            })
+
+    def test_evolve_with_up_to_date(self):
+        """Testing MultiDatabaseEvolver.evolve with databases already
+        up-to-date
+        """
+        self._add_stale_app_sig('db_multi')
+
+        results = PurgeOnlyMultiDatabaseEvolver(self.database_names).evolve()
+
+        self.assertEqual(
+            [
+                (result.database_name, result.status)
+                for result in results
+            ],
+            [
+                (DEFAULT_DB_ALIAS, DatabaseEvolutionStatus.UP_TO_DATE),
+                ('db_multi', DatabaseEvolutionStatus.EVOLVED),
+            ])
+        self.assertFalse(results[0].evolver.evolved)
+
+    def test_evolve_with_failure_and_fail_fast(self):
+        """Testing MultiDatabaseEvolver.evolve with failure and
+        fail_fast=True
+        """
+        self._add_stale_app_sig('db_multi')
+
+        version_counts = self._get_version_counts()
+
+        multi_evolver = PurgeOnlyMultiDatabaseEvolver(
+            self.database_names,
+            max_workers=1,
+            failing_database_names=[DEFAULT_DB_ALIAS])
+        results = multi_evolver.evolve()
+
+        self.assertEqual(
+            [
+                (result.database_name, result.status)
+                for result in results
+            ],
+            [
+                (DEFAULT_DB_ALIAS, DatabaseEvolutionStatus.FAILED),
+                ('db_multi', DatabaseEvolutionStatus.SKIPPED),
+            ])
+
+        self.assertFalse(results[0].succeeded)
+        self.assertIsInstance(results[0].error, QueueEvolverTaskError)
+        self.assertIsNotNone(results[0].evolver)
+
+        self.assertFalse(results[1].succeeded)
+        self.assertIsNone(results[1].error)
+        self.assertIsNone(results[1].evolver)
+        self.assertEqual(self._get_version_counts(), version_counts)
+
+    def test_evolve_with_failure_and_continue(self):
+        """Testing MultiDatabaseEvolver.evolve with failure and
+        fail_fast=False
+        """
+        self._add_stale_app_sig('db_multi')
+
+        version_counts = self._get_version_counts()
+
+        multi_evolver = PurgeOnlyMultiDatabaseEvolver(
+            self.database_names,
+            max_workers=1,
+            fail_fast=False,
+            failing_database_names=[DEFAULT_DB_ALIAS])
+        results = multi_evolver.evolve()
+
+        self.assertEqual(
+            [
+                (result.database_name, result.status)
+                for result in results
+            ],
+            [
+                (DEFAULT_DB_ALIAS, DatabaseEvolutionStatus.FAILED),
+                ('db_multi', DatabaseEvolutionStatus.EVOLVED),
+            ])
+        self.assertEqual(
+            self._get_version_counts(),
+            {
+                DEFAULT_DB_ALIAS: version_counts[DEFAULT_DB_ALIAS],
+                'db_multi': version_counts['db_multi'] + 1,
+            })
+
+    def test_evolve_with_reuse_plans(self):
+        """Testing MultiDatabaseEvolver.evolve with reuse_plans=True"""
+        for database_name in self.database_names:
+            self._add_stale_app_sig(database_name)
+
+        version_counts = self._get_version_counts()
+
+        multi_evolver = PurgeOnlyMultiDatabaseEvolver(self.database_names,
+                                                      reuse_plans=True)
+        plan_cache = multi_evolver.plan_cache
+        self.assertIsNotNone(plan_cache)
+
+        results = multi_evolver.evolve()
+
+        self.assertEqual(
+            [
+                (result.database_name, result.status, result.error)
+                for result in results
+            ],
+            [
+                (DEFAULT_DB_ALIAS, DatabaseEvolutionStatus.EVOLVED, None),
+                ('db_multi', DatabaseEvolutionStatus.EVOLVED, None),
+            ])
+
+        for result in results:
+            evolver = result.evolver
+
+            self.assertIs(evolver.plan_cache, plan_cache)
+            self.assertIsNotNone(evolver.fingerprint)
+            self.assertEqual(len(plan_cache.get_plans(evolver.fingerprint)),
+                             1)
+
+        self.assertEqual(
+            self._get_version_counts(),
+            {
+                database_name: count + 1
+                for database_name, count in version_counts.items()
+            })
+
+    def _add_stale_app_sig(self, database_name):
+        """Add a signature for a stale app to a database's version.
+
+        Args:
+            database_name (str):
+                The name of the database.
+        """
+        version = Version.objects.current_version(using=database_name)
+        version.signature.add_app_sig(AppSignature(app_id='stale_app'))
+        version.save(using=database_name)
+
+    def _get_version_counts(self):
+        """Return the number of saved versions in each database.
+
+        Returns:
+            dict:
+            A mapping of database names to version counts.
+        """
+        return {
+            database_name: Version.objects.using(database_name).count()
+            for database_name in self.database_names
+        }
@@ -0,0 +1,307 @@
+"""Unit tests for django_evolution.evolve.plan."""
+
+from __future__ import annotations
+
+from django.db import DEFAULT_DB_ALIAS
+
+from django_evolution.db.state import DatabaseState
+from django_evolution.errors import EvolutionException
+from django_evolution.evolve import (EvolutionPlan, EvolutionPlanCache,
+                                     EvolveAppTask, Evolver)
+from django_evolution.evolve.plan import (get_evolution_fingerprint,
+                                          get_evolution_history_key)
+from django_evolution.models import Evolution, Version
+from django_evolution.signature import AppSignature
+from django_evolution.tests.base_test_case import EvolutionTestCase
+from django_evolution.utils.apps import get_app
+from django_evolution.utils.profiling import EvolutionProfiler
+
+
+class EvolutionPlanTests(EvolutionTestCase):
+    """Unit tests for django_evolution.evolve.plan.EvolutionPlan."""
+
+    needs_evolution_models = True
+
+    def setUp(self):
+        super().setUp()
+
+        # Make sure there's a baseline to work from.
+        Evolver()
+
+    def tearDown(self):
+        version = Version.objects.current_version()
+
+        for app_id in ('stale_app', 'stale_app2'):
+            if version.signature.get_app_sig(app_id) is not None:
+                version.signature.remove_app_sig(app_id)
+                version.save()
+
+        super().tearDown()
+
+    def test_get_evolution_fingerprint(self):
+        """Testing get_evolution_fingerprint"""
+        fingerprint = get_evolution_fingerprint(DEFAULT_DB_ALIAS)
+
+        self.assertIsNotNone(fingerprint)
+        self.assertEqual(get_evolution_fingerprint(DEFAULT_DB_ALIAS),
+                         fingerprint)
+        self.assertEqual(
+            get_evolution_fingerprint(
+                DEFAULT_DB_ALIAS,
+                project_sig=Version.objects.current_version().signature),
+            fingerprint)
+
+        self._add_stale_app_sig()
+
+        self.assertNotEqual(get_evolution_fingerprint(DEFAULT_DB_ALIAS),
+                            fingerprint)
+
+    def test_get_evolution_fingerprint_with_database_state(self):
+        """Testing get_evolution_fingerprint with changed tables and indexes
+        """
+        database_state = DatabaseState(DEFAULT_DB_ALIAS)
+        fingerprint = get_evolution_fingerprint(DEFAULT_DB_ALIAS)
+
+        self.assertEqual(
+            get_evolution_fingerprint(DEFAULT_DB_ALIAS,
+                                      database_state=database_state),
+            fingerprint)
+
+        # A differently-named index will generate different SQL.
+        changed_state = database_state.clone()
+        changed_state.add_index(table_name=Version._meta.db_table,
+                                index_name='test_version_idx',
+                                columns=['when'])
+
+        self.assertNotEqual(
+            get_evolution_fingerprint(DEFAULT_DB_ALIAS,
+                                      database_state=changed_state),
+            fingerprint)
+
+        # So will a missing table.
+        changed_state = DatabaseState(DEFAULT_DB_ALIAS, scan=False)
+
+        self.assertNotEqual(
+            get_evolution_fingerprint(DEFAULT_DB_ALIAS,
+                                      database_state=changed_state),
+            fingerprint)
+
+    def test_get_evolution_history_key(self):
+        """Testing get_evolution_history_key"""
+        history_key = get_evolution_history_key(DEFAULT_DB_ALIAS)
+
+        self.assertIsNotNone(history_key)
+        self.assertEqual(get_evolution_history_key(DEFAULT_DB_ALIAS),
+                         history_key)
+
+        # A signature changed in place will be detected.
+        self._add_stale_app_sig()
+        history_key2 = get_evolution_history_key(DEFAULT_DB_ALIAS)
+
+        self.assertNotEqual(history_key2, history_key)
+
+        # So will a newly-applied evolution.
+        Evolution.objects.create(version=Version.objects.current_version(),
+                                 app_label='tests',
+                                 label='test_evolution')
+
+        self.assertNotEqual(get_evolution_history_key(DEFAULT_DB_ALIAS),
+                            history_key2)
+
+    def test_from_evolver(self):
+        """Testing EvolutionPlan.from_evolver"""
+        self._add_stale_app_sig()
+
+        plan_cache = EvolutionPlanCache()
+        evolver = Evolver(plan_cache=plan_cache)
+        evolver.queue_purge_old_apps()
+
+        self.assertTrue(evolver.get_evolution_required())
+        self.assertIsNone(evolver.plan)
+
+        plans = plan_cache.get_plans(evolver.fingerprint)
+        self.assertEqual(len(plans), 1)
+
+        plan = plans[0]
+        self.assertEqual(plan.fingerprint, evolver.fingerprint)
+        self.assertFalse(plan.hinted)
+        self.assertEqual(plan.task_ids,
+                         [('PurgeAppTask', 'purge-app:stale_app')])
+        self.assertIsNot(plan.target_project_sig,
+                         evolver.target_project_sig)
+        self.assertEqual(plan.target_project_sig,
+                         evolver.target_project_sig)
+
+    def test_from_evolver_with_custom_evolutions(self):
+        """Testing EvolutionPlan.from_evolver with tasks using custom
+        evolutions
+        """
+        evolver = Evolver(plan_cache=EvolutionPlanCache())
+        evolver.queue_task(EvolveAppTask(evolver=evolver,
+                                         app=get_app('django_evolution'),
+                                         evolutions=[]))
+
+        self.assertIsNone(EvolutionPlan.from_evolver(evolver))
+        self.assertEqual(
+            evolver.plan_cache.get_plans(evolver.fingerprint),
+            [])
+
+    def test_apply(self):
+        """Testing EvolutionPlan.apply with Evolver and PurgeAppTask"""
+        self._add_stale_app_sig()
+
+        plan_cache = EvolutionPlanCache()
+
+        evolver1 = Evolver(plan_cache=plan_cache)
+        evolver1.queue_purge_old_apps()
+
+        # Simulate state changed while generating SQL for the plan.
+        evolver1.database_state.add_index(table_name=Version._meta.db_table,
+                                          index_name='test_version_idx',
+                                          columns=['when'])
+
+        tasks1 = list(evolver1.tasks)
+
+        version_count = Version.objects.count()
+
+        evolver2 = Evolver(plan_cache=plan_cache)
+        evolver2.queue_purge_old_apps()
+        tasks2 = list(evolver2.tasks)
+
+        self.assertEqual(evolver2.fingerprint, evolver1.fingerprint)
+        self.assertIs(evolver2.plan,
+                      plan_cache.get_plans(evolver1.fingerprint)[0])
+        self.assertEqual(len(tasks2), 1)
+        self.assertIs(tasks2[0].evolver, evolver2)
+        self.assertTrue(tasks2[0].evolution_required)
+        self.assertEqual(tasks2[0].sql, tasks1[0].sql)
+        self.assertIsNot(evolver2.project_sig, evolver1.project_sig)
+        self.assertEqual(evolver2.project_sig, evolver1.project_sig)
+        self.assertIsNot(evolver2.database_state, evolver1.database_state)
+        self.assertEqual(evolver2.database_state.db_name, DEFAULT_DB_ALIAS)
+        self.assertIsNotNone(evolver2.database_state.get_index(
+            table_name=Version._meta.db_table,
+            index_name='test_version_idx'))
+
+        evolver2.evolve()
+
+        self.assertTrue(evolver2.evolved)
+        self.assertEqual(Version.objects.count(), version_count + 1)
+
+    def test_apply_with_evolve_app_tasks(self):
+        """Testing EvolutionPlan.apply with EvolveAppTask"""
+        plan_cache = EvolutionPlanCache()
+
+        evolver1 = Evolver(plan_cache=plan_cache)
+        self._queue_evolve_apps(evolver1)
+        tasks1 = list(evolver1.tasks)
+        state1 = evolver1._evolve_app_task_state
+
+        evolver2 = Evolver(plan_cache=plan_cache)
+        self._queue_evolve_apps(evolver2)
+        tasks2 = list(evolver2.tasks)
+        state2 = evolver2._evolve_app_task_state
+
+        self.assertIsNotNone(evolver2.plan)
+        self.assertEqual(len(tasks2), len(tasks1))
+        self.assertEqual(state2['batches'], state1['batches'])
+        self.assertIsNot(state2['migration_executor'],
+                         state1['migration_executor'])
+        self.assertEqual(state2['full_migration_plan'],
+                         state1['full_migration_plan'])
+
+        for task1, task2 in zip(tasks1, tasks2):
+            self.assertEqual(task2.id, task1.id)
+            self.assertIs(task2.evolver, evolver2)
+            self.assertEqual(task2.evolution_required,
+                             task1.evolution_required)
+            self.assertEqual(task2.upgrade_method, task1.upgrade_method)
+            self.assertEqual(task2.sql, task1.sql)
+
+            if task1.app_sig is None:
+                self.assertIsNone(task2.app_sig)
+            else:
+                self.assertIs(
+                    task2.app_sig,
+                    evolver2.project_sig.get_app_sig(task2.app_label))
+
+    def test_evolve_with_reused_plan_and_profiler(self):
+        """Testing Evolver.evolve with a reused plan computes the fingerprint
+        once
+        """
+        self._add_stale_app_sig()
+
+        plan_cache = EvolutionPlanCache()
+
+        evolver1 = Evolver(plan_cache=plan_cache)
+        evolver1.queue_purge_old_apps()
+        evolver1.get_evolution_required()
+
+        with EvolutionProfiler(track_memory=False) as profiler:
+            evolver2 = Evolver(plan_cache=plan_cache,
+                               profiler=profiler)
+            evolver2.queue_purge_old_apps()
+            evolver2.evolve()
+
+        self.assertIsNotNone(evolver2.plan)
+        self.assertTrue(evolver2.evolved)
+        self.assertEqual(
+            [
+                phase_info['name']
+                for phase_info in profiler.phases
+                if phase_info['name'] in ('check_history', 'fingerprint')
+            ],
+            ['fingerprint', 'check_history'])
+
+    def test_evolve_with_changed_database(self):
+        """Testing Evolver.evolve with a reused plan and a database changed
+        after the plan was applied
+        """
+        self._add_stale_app_sig()
+
+        plan_cache = EvolutionPlanCache()
+
+        evolver1 = Evolver(plan_cache=plan_cache)
+        evolver1.queue_purge_old_apps()
+        evolver1.get_evolution_required()
+
+        evolver2 = Evolver(plan_cache=plan_cache)
+        evolver2.queue_purge_old_apps()
+        evolver2.get_evolution_required()
+
+        self.assertIsNotNone(evolver2.plan)
+
+        self._add_stale_app_sig('stale_app2')
+        version_count = Version.objects.count()
+
+        message = (
+            'The database "default" has changed since its evolution plan '
+            'was generated. Please try again.'
+        )
+
+        with self.assertRaisesMessage(EvolutionException, message):
+            evolver2.evolve()
+
+        self.assertFalse(evolver2.evolved)
+        self.assertEqual(Version.objects.count(), version_count)
+
+    def _add_stale_app_sig(self, app_id='stale_app'):
+        """Add a signature for a stale app to the stored version.
+
+        Args:
+            app_id (str, optional):
+                The ID of the stale app.
+        """
+        version = Version.objects.current_version()
+        version.signature.add_app_sig(AppSignature(app_id=app_id))
+        version.save()
+
+    def _queue_evolve_apps(self, evolver):
+        """Queue evolutions for installed apps on an evolver.
+
+        Args:
+            evolver (django_evolution.evolve.evolver.Evolver):
+                The evolver to queue evolutions on.
+        """
+        for app_label in ('auth', 'contenttypes', 'django_evolution'):
+            evolver.queue_evolve_app(get_app(app_label))
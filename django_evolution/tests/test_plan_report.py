@@ -0,0 +1,627 @@
+"""Unit tests for django_evolution.evolve.plan_report."""
+
+from __future__ import annotations
+
+import json
+
+from django.db import DEFAULT_DB_ALIAS, connection, models
+from django.test.utils import override_settings
+
+from django_evolution.consts import DDLCost, DDLLockLevel
+from django_evolution.db import EvolutionOperationsMulti
+from django_evolution.evolve import EvolveAppTask, Evolver
+from django_evolution.evolve.plan_report import (_build_statements,
+                                                 get_blocking_statements,
+                                                 get_disallowed_statements,
+                                                 get_evolution_plan_report)
+from django_evolution.models import Version
+from django_evolution.mutations import AddField, ChangeField, SQLMutation
+from django_evolution.signature import AppSignature, ModelSignature
+from django_evolution.tests import models as evo_test
+from django_evolution.tests.base_test_case import EvolutionTestCase
+from django_evolution.tests.models import BaseTestModel
+from django_evolution.tests.utils import (ensure_test_db,
+                                          get_postgres_evolver_backend)
+from django_evolution.utils.sql import ChunkedSQL, SQLExecutor
+
+
+class PlanReportTestModel(BaseTestModel):
+    value = models.CharField(max_length=100)
+
+
+class GetEvolutionPlanReportTests(EvolutionTestCase):
+    """Unit tests for get_evolution_plan_report."""
+
+    default_base_model = PlanReportTestModel
+    needs_evolution_models = True
+
+    def test_with_evolution_not_required(self):
+        """Testing get_evolution_plan_report with no evolution required"""
+        report = get_evolution_plan_report(Evolver())
+
+        self.assertEqual(
+            report,
+            {
+                'batches': [],
+                'database': DEFAULT_DB_ALIAS,
+                'evolution_required': False,
+                'vendor': connection.vendor,
+            })
+
+    def test_with_evolutions(self):
+        """Testing get_evolution_plan_report with evolutions"""
+        model_sig = ModelSignature.from_model(PlanReportTestModel)
+        model_sig.get_field_sig('value').field_attrs['max_length'] = 50
+
+        app_sig = AppSignature(app_id='tests')
+        app_sig.add_model_sig(model_sig)
+
+        version = Version.objects.current_version()
+        version.signature.add_app_sig(app_sig)
+        version.save()
+
+        with ensure_test_db(model_entries=[('TestModel',
+                                            PlanReportTestModel)]):
+            evolver = Evolver()
+            evolver.queue_task(EvolveAppTask(
+                evolver=evolver,
+                app=evo_test,
+                evolutions=[
+                    {
+                        'label': 'my_evolution1',
+                        'mutations': [
+                            ChangeField('TestModel', 'value', max_length=200),
+                        ],
+                    },
+                    {
+                        'label': 'my_evolution2',
+                        'mutations': [
+                            AddField('TestModel', 'new_field',
+                                     models.BooleanField, null=True),
+                        ],
+                    },
+                ]))
+
+            report = get_evolution_plan_report(evolver)
+
+        # Reports must be serializable.
+        json.dumps(report)
+
+        self.assertFalse(evolver.evolved)
+        self.assertEqual(report['database'], DEFAULT_DB_ALIAS)
+        self.assertTrue(report['evolution_required'])
+        self.assertEqual(report['vendor'], connection.vendor)
+
+        batches = report['batches']
+        self.assertEqual(len(batches), 1)
+
+        batch = batches[0]
+        self.assertEqual(batch['type'], 'evolutions')
+        self.assertEqual(batch['new_models'], [])
+        self.assertEqual(len(batch['tasks']), 1)
+
+        task = batch['tasks'][0]
+        self.assertEqual(task['app_label'], 'tests')
+        self.assertEqual(task['evolutions'],
+                         ['my_evolution1', 'my_evolution2'])
+        self.assertEqual(task['task'], str(list(evolver.tasks)[0]))
+        self.assertTrue(task['statements'])
+
+        for statement in task['statements']:
+            self.assertIn('cost', statement)
+            self.assertIn('lock_level', statement)
+            self.assertIn('table', statement)
+            self.assertIn('table_rows', statement)
+            self.assertIn('table_size', statement)
+
+        mutations = task['mutations']
+        self.assertEqual(len(mutations), 2)
+
+        self.assertEqual(mutations[0]['model'], 'TestModel')
+        self.assertEqual(
+            mutations[0]['mutation'],
+            "ChangeField('TestModel', 'value', initial=None,"
+            " max_length=200)")
+        self.assertEqual(mutations[0]['table'], 'tests_testmodel')
+        self.assertIn(mutations[0]['cost'], DDLCost.ORDER)
+
+        self.assertEqual(mutations[1]['model'], 'TestModel')
+        self.assertEqual(mutations[1]['table'], 'tests_testmodel')
+        self.assertIn(mutations[1]['cost'], DDLCost.ORDER)
+
+    def test_with_chunked_sql(self):
+        """Testing get_evolution_plan_report with SQL computed in chunks"""
+        def _build_chunks(cursor):
+            raise Exception('Chunks should not be computed')
+
+        qn = connection.ops.quote_name
+        update_sql = ('UPDATE %s SET %s = %%s WHERE %s IS NULL;'
+                      % (qn('tests_testmodel'), qn('value'), qn('value')))
+
+        app_sig = AppSignature(app_id='tests')
+        app_sig.add_model_sig(ModelSignature.from_model(PlanReportTestModel))
+
+        version = Version.objects.current_version()
+        version.signature.add_app_sig(app_sig)
+        version.save()
+
+        with ensure_test_db(model_entries=[('TestModel',
+                                            PlanReportTestModel)]):
+            evolver = Evolver()
+            evolver.queue_task(EvolveAppTask(
+                evolver=evolver,
+                app=evo_test,
+                evolutions=[
+                    {
+                        'label': 'my_evolution',
+                        'mutations': [
+                            SQLMutation(
+                                'backfill',
+                                [
+                                    ChunkedSQL(
+                                        sql=(update_sql, ('foo',)),
+                                        table_name='tests_testmodel',
+                                        build_chunks=_build_chunks),
+                                ],
+                                update_func=lambda simulation: None),
+                        ],
+                    },
+                ]))
+
+            report = get_evolution_plan_report(evolver)
+
+        # Reports must be serializable.
+        json.dumps(report)
+
+        statements = report['batches'][0]['tasks'][0]['statements']
+        self.assertEqual(len(statements), 1)
+
+        statement = statements[0]
+        self.assertEqual(statement['cost'], DDLCost.BATCHED_WRITE)
+        self.assertEqual(statement['lock_level'], DDLLockLevel.NONE)
+        self.assertEqual(statement['sql'], update_sql % "'foo'")
+        self.assertEqual(statement['table'], 'tests_testmodel')
+        self.assertIn('table_rows', statement)
+
+
+class GetBlockingStatementsTests(EvolutionTestCase):
+    """Unit tests for get_blocking_statements."""
+
+    def test_get_blocking_statements(self):
+        """Testing get_blocking_statements"""
+        statements = [
+            self._make_statement(cost=DDLCost.REWRITE,
+                                 lock_level=DDLLockLevel.NONE),
+            self._make_statement(cost=DDLCost.INDEX_BUILD,
+                                 lock_level=DDLLockLevel.WRITE),
+            self._make_statement(cost=DDLCost.INDEX_BUILD,
+                                 lock_level=DDLLockLevel.NONE),
+            self._make_statement(cost=DDLCost.METADATA_ONLY,
+                                 lock_level=DDLLockLevel.EXCLUSIVE),
+            self._make_statement(cost=DDLCost.REWRITE,
+                                 lock_level=DDLLockLevel.EXCLUSIVE,
+                                 table_rows=100),
+            self._make_statement(cost=DDLCost.REWRITE,
+                                 lock_level=DDLLockLevel.EXCLUSIVE,
+                                 table_rows=None),
+            self._make_statement(cost=DDLCost.BATCHED_WRITE,
+                                 lock_level=DDLLockLevel.NONE),
+        ]
+
+        report = {
+            'batches': [
+                {
+                    'new_models': statements[:1],
+                    'tasks': [
+                        {
+                            'statements': statements[1:],
+                        },
+                    ],
+                    'type': 'evolutions',
+                },
+                {
+                    'migrations': [],
+                    'type': 'migrations',
+                },
+            ],
+        }
+
+        self.assertEqual(get_blocking_statements(report=report,
+                                                 max_table_rows=100),
+                         statements[:2])
+
+    def test_get_blocking_statements_with_two_phase_not_null(self):
+        """Testing get_blocking_statements with MAX_BLOCKING_TABLE_ROWS and
+        setting NOT NULL with TWO_PHASE_CONSTRAINTS on Postgres 12+
+        """
+        with override_settings(DJANGO_EVOLUTION={
+            'MAX_BLOCKING_TABLE_ROWS': 100,
+            'TWO_PHASE_CONSTRAINTS': True,
+        }):
+            report = self._build_set_not_null_report(pg_version=120000)
+            blocking_statements = get_blocking_statements(
+                report=report,
+                max_table_rows=100)
+
+        self.assertEqual(blocking_statements, [])
+
+        costs = [
+            statement['cost']
+            for statement in report['batches'][0]['tasks'][0]['statements']
+            if statement['table'] is not None
+        ]
+        self.assertEqual(
+            costs,
+            [
+                DDLCost.METADATA_ONLY,
+                DDLCost.SCAN,
+                DDLCost.METADATA_ONLY,
+                DDLCost.METADATA_ONLY,
+            ])
+
+    def test_get_blocking_statements_with_two_phase_not_null_pg11(self):
+        """Testing get_blocking_statements with MAX_BLOCKING_TABLE_ROWS and
+        setting NOT NULL with TWO_PHASE_CONSTRAINTS on Postgres 11
+        """
+        with override_settings(DJANGO_EVOLUTION={
+            'MAX_BLOCKING_TABLE_ROWS': 100,
+            'TWO_PHASE_CONSTRAINTS': True,
+        }):
+            report = self._build_set_not_null_report(pg_version=110000)
+            blocking_statements = get_blocking_statements(
+                report=report,
+                max_table_rows=100)
+
+        self.assertEqual(len(blocking_statements), 1)
+        self.assertEqual(blocking_statements[0]['cost'], DDLCost.SCAN)
+        self.assertIn('SET NOT NULL', blocking_statements[0]['sql'])
+
+    def _build_set_not_null_report(self, pg_version):
+        """Return a report for setting a column NOT NULL on Postgres.
+
+        The table is reported as having 1000 rows.
+
+        Args:
+            pg_version (int):
+                The Postgres version to simulate.
+
+        Returns:
+            dict:
+            The report.
+        """
+        evolver_backend = get_postgres_evolver_backend(self.database_state,
+                                                       pg_version=pg_version)
+        sql = evolver_backend.set_field_null(
+            model=PlanReportTestModel,
+            field=PlanReportTestModel._meta.get_field('value'),
+            null=False).to_sql()
+
+        with SQLExecutor(DEFAULT_DB_ALIAS) as sql_executor:
+            statements = _build_statements(sql=sql,
+                                           sql_executor=sql_executor,
+                                           evolver_backend=evolver_backend,
+                                           entries=[])
+
+        for statement in statements:
+            statement.update({
+                'table_rows': 1000,
+                'table_size': None,
+            })
+
+        return {
+            'batches': [
+                {
+                    'new_models': [],
+                    'tasks': [
+                        {
+                            'statements': statements,
+                        },
+                    ],
+                    'type': 'evolutions',
+                },
+            ],
+        }
+
+    def _make_statement(self, cost, lock_level, table_rows=1000):
+        """Return a statement report.
+
+        Args:
+            cost (str):
+                The cost of the statement.
+
+            lock_level (str):
+                The lock level of the statement.
+
+            table_rows (int, optional):
+                The estimated number of rows in the table.
+
+        Returns:
+            dict:
+            The statement report.
+        """
+        return {
+            'cost': cost,
+            'lock_level': lock_level,
+            'sql': 'SQL',
+            'table': 'foo',
+            'table_rows': table_rows,
+            'table_size': None,
+        }
+
+
+class GetDisallowedStatementsTests(EvolutionTestCase):
+    """Unit tests for get_disallowed_statements."""
+
+    def test_get_disallowed_statements(self):
+        """Testing get_disallowed_statements"""
+        evolver_cls = type(
+            EvolutionOperationsMulti(DEFAULT_DB_ALIAS,
+                                     self.database_state).get_evolver())
+
+        class PolicyEvolutionOperations(evolver_cls):
+            def get_sql_statement_policy_error(self, sql):
+                if sql.startswith('DISALLOWED'):
+                    return 'Not allowed: %s' % sql
+
+                return None
+
+        evolver_backend = PolicyEvolutionOperations(
+            database_state=self.database_state,
+            connection=connection)
+
+        statements = [
+            {
+                'sql': 'DISALLOWED 1',
+            },
+            {
+                'sql': 'ALLOWED',
+            },
+            {
+                'sql': 'DISALLOWED 2',
+            },
+        ]
+
+        report = {
+            'batches': [
+                {
+                    'new_models': statements[:1],
+                    'tasks': [
+                        {
+                            'statements': statements[1:],
+                        },
+                    ],
+                    'type': 'evolutions',
+                },
+                {
+                    'migrations': [],
+                    'type': 'migrations',
+                },
+            ],
+        }
+
+        self.assertEqual(
+            get_disallowed_statements(report=report,
+                                      evolver_backend=evolver_backend),
+            [
+                {
+                    'reason': 'Not allowed: DISALLOWED 1',
+                    'sql': 'DISALLOWED 1',
+                },
+                {
+                    'reason': 'Not allowed: DISALLOWED 2',
+                    'sql': 'DISALLOWED 2',
+                },
+            ])
+
+        # The statements in the report must not be modified.
+        self.assertNotIn('reason', statements[0])
+
+    def test_get_disallowed_statements_without_policies(self):
+        """Testing get_disallowed_statements without backend policies"""
+        evolver_backend = EvolutionOperationsMulti(
+            DEFAULT_DB_ALIAS,
+            self.database_state).get_evolver()
+
+        self.assertFalse(evolver_backend.get_sql_statement_policies_enabled())
+        self.assertEqual(
+            get_disallowed_statements(
+                report={
+                    'batches': [
+                        {
+                            'tasks': [
+                                {
+                                    'statements': [
+                                        {
+                                            'sql': 'ALTER TABLE foo ...',
+                                        },
+                                    ],
+                                },
+                            ],
+                            'type': 'evolutions',
+                        },
+                    ],
+                },
+                evolver_backend=evolver_backend),
+            [])
+
+
+class SQLStatementCostTests(EvolutionTestCase):
+    """Unit tests for BaseEvolutionOperations.get_sql_statement_cost."""
+
+    def setUp(self):
+        super().setUp()
+
+        self.evolver_backend = EvolutionOperationsMulti(
+            DEFAULT_DB_ALIAS,
+            self.database_state).get_evolver()
+
+    def test_with_create_table(self):
+        """Testing BaseEvolutionOperations.get_sql_statement_cost with
+        CREATE TABLE
+        """
+        self.assertEqual(
+            self.evolver_backend.get_sql_statement_cost(
+                'CREATE TABLE "foo" ("id" integer NOT NULL);'),
+            ('foo', DDLCost.METADATA_ONLY))
+
+    def test_with_create_index(self):
+        """Testing BaseEvolutionOperations.get_sql_statement_cost with
+        CREATE INDEX
+        """
+        self.assertEqual(
+            self.evolver_backend.get_sql_statement_cost(
+                'CREATE UNIQUE INDEX "foo_abc" ON "foo" ("id");'),
+            ('foo', DDLCost.INDEX_BUILD))
+
+    def test_with_insert_select(self):
+        """Testing BaseEvolutionOperations.get_sql_statement_cost with
+        INSERT INTO ... SELECT
+        """
+        self.assertEqual(
+            self.evolver_backend.get_sql_statement_cost(
+                'INSERT INTO "TEMP_TABLE" ("id") SELECT "id" FROM "foo";'),
+            ('foo', DDLCost.REWRITE))
+
+    def test_with_update(self):
+        """Testing BaseEvolutionOperations.get_sql_statement_cost with
+        UPDATE
+        """
+        self.assertEqual(
+            self.evolver_backend.get_sql_statement_cost(
+                'UPDATE "foo" SET "value" = 1 WHERE "value" IS NULL;'),
+            ('foo', DDLCost.REWRITE))
+
+    def test_with_alter_table_multiple_clauses(self):
+        """Testing BaseEvolutionOperations.get_sql_statement_cost with
+        ALTER TABLE and multiple clauses uses the most expensive cost
+        """
+        self.assertEqual(
+            self.evolver_backend.get_sql_statement_cost(
+                'ALTER TABLE "foo" RENAME COLUMN "a" TO "b",'
+                ' ALTER COLUMN "c" TYPE varchar(10),'
+                ' ALTER COLUMN "d" SET NOT NULL;'),
+            ('foo', DDLCost.REWRITE))
+
+    def test_with_unknown(self):
+        """Testing BaseEvolutionOperations.get_sql_statement_cost with
+        unknown statement
+        """
+        self.assertEqual(
+            self.evolver_backend.get_sql_statement_cost('SELECT 1;'),
+            (None, None))
+
+    def test_get_table_stats_with_unknown_table(self):
+        """Testing BaseEvolutionOperations.get_table_stats with unknown
+        table
+        """
+        self.assertNotIn(
+            'unknown_table',
+            self.evolver_backend.get_table_stats(['unknown_table']))
+
+    def test_get_sql_statement_lock_level_with_alter_table(self):
+        """Testing BaseEvolutionOperations.get_sql_statement_lock_level with
+        ALTER TABLE
+        """
+        self.assertIn(
+            self.evolver_backend.get_sql_statement_lock_level(
+                'ALTER TABLE "foo" ADD COLUMN "bar" integer NULL;'),
+            (DDLLockLevel.NONE, DDLLockLevel.EXCLUSIVE))
+
+    def test_get_sql_statement_lock_level_with_create_table(self):
+        """Testing BaseEvolutionOperations.get_sql_statement_lock_level with
+        CREATE TABLE
+        """
+        self.assertEqual(
+            self.evolver_backend.get_sql_statement_lock_level(
+                'CREATE TABLE "foo" ("id" integer NOT NULL);'),
+            DDLLockLevel.NONE)
+
+    def test_get_sql_statement_lock_level_with_update(self):
+        """Testing BaseEvolutionOperations.get_sql_statement_lock_level with
+        UPDATE
+        """
+        self.assertEqual(
+            self.evolver_backend.get_sql_statement_lock_level(
+                'UPDATE "foo" SET "value" = 1 WHERE "value" IS NULL;'),
+            DDLLockLevel.WRITE)
+
+    def test_get_sql_statement_costs(self):
+        """Testing BaseEvolutionOperations.get_sql_statement_costs"""
+        self.assertEqual(
+            self.evolver_backend.get_sql_statement_costs([
+                'CREATE TABLE "foo" ("id" integer NOT NULL);',
+                'UPDATE "foo" SET "value" = 1 WHERE "value" IS NULL;',
+                'SELECT 1;',
+            ]),
+            [
+                ('foo', DDLCost.METADATA_ONLY),
+                ('foo', DDLCost.REWRITE),
+                (None, None),
+            ])
+
+    def test_get_sql_statement_costs_with_postgres_not_null_check(self):
+        """Testing postgresql.EvolutionOperations.get_sql_statement_costs
+        with SET NOT NULL after validating a NOT NULL check constraint
+        """
+        evolver_backend = get_postgres_evolver_backend(self.database_state)
+
+        self.assertEqual(
+            evolver_backend.get_sql_statement_costs([
+                'ALTER TABLE "foo" ADD CONSTRAINT "foo_a_notnull"'
+                ' CHECK ("a" IS NOT NULL) NOT VALID;',
+                'ALTER TABLE "foo" VALIDATE CONSTRAINT "foo_a_notnull";',
+                'ALTER TABLE "foo" ALTER COLUMN "a" SET NOT NULL;',
+                'ALTER TABLE "foo" ALTER COLUMN "a" SET NOT NULL,'
+                ' ALTER COLUMN "b" SET NOT NULL;',
+                'ALTER TABLE "bar" ALTER COLUMN "a" SET NOT NULL;',
+                'ALTER TABLE "foo" DROP CONSTRAINT "foo_a_notnull";',
+                'ALTER TABLE "foo" ALTER COLUMN "a" SET NOT NULL;',
+            ]),
+            [
+                ('foo', DDLCost.METADATA_ONLY),
+                ('foo', DDLCost.SCAN),
+                ('foo', DDLCost.METADATA_ONLY),
+                ('foo', DDLCost.SCAN),
+                ('bar', DDLCost.SCAN),
+                ('foo', DDLCost.METADATA_ONLY),
+                ('foo', DDLCost.SCAN),
+            ])
+
+    def test_get_sql_statement_costs_with_postgres_not_valid_check(self):
+        """Testing postgresql.EvolutionOperations.get_sql_statement_costs
+        with SET NOT NULL after a NOT VALID check constraint that wasn't
+        validated
+        """
+        evolver_backend = get_postgres_evolver_backend(self.database_state)
+
+        self.assertEqual(
+            evolver_backend.get_sql_statement_costs([
+                'ALTER TABLE "foo" ADD CONSTRAINT "foo_a_notnull"'
+                ' CHECK ("a" IS NOT NULL) NOT VALID;',
+                'ALTER TABLE "foo" ALTER COLUMN "a" SET NOT NULL;',
+            ]),
+            [
+                ('foo', DDLCost.METADATA_ONLY),
+                ('foo', DDLCost.SCAN),
+            ])
+
+    def test_get_sql_statement_costs_with_postgres_dropped_check(self):
+        """Testing postgresql.EvolutionOperations.get_sql_statement_costs
+        with SET NOT NULL in the same statement that drops the validated
+        check constraint
+        """
+        evolver_backend = get_postgres_evolver_backend(self.database_state)
+
+        self.assertEqual(
+            evolver_backend.get_sql_statement_costs([
+                'ALTER TABLE "foo" ADD CONSTRAINT "foo_a_notnull"'
+                ' CHECK ("a" IS NOT NULL) NOT VALID;',
+                'ALTER TABLE "foo" VALIDATE CONSTRAINT "foo_a_notnull";',
+                'ALTER TABLE "foo" ALTER COLUMN "a" SET NOT NULL,'
+                ' DROP CONSTRAINT "foo_a_notnull";',
+            ]),
+            [
+                ('foo', DDLCost.METADATA_ONLY),
+                ('foo', DDLCost.SCAN),
+                ('foo', DDLCost.SCAN),
+            ])
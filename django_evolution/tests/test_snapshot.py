@@ -0,0 +1,242 @@
+"""Unit tests for django_evolution.evolve.snapshot."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from django_evolution.errors import SchemaSnapshotError
+from django_evolution.evolve import Evolver, SchemaSnapshot
+from django_evolution.evolve.snapshot import get_schema_snapshot_key
+from django_evolution.models import Evolution, Version
+from django_evolution.tests.base_test_case import (EvolutionTestCase,
+                                                   MigrationsTestsMixin)
+
+
+class SchemaSnapshotTests(MigrationsTestsMixin, EvolutionTestCase):
+    """Unit tests for django_evolution.evolve.snapshot.SchemaSnapshot."""
+
+    def setUp(self):
+        super().setUp()
+
+        self.tempdir = tempfile.mkdtemp(prefix='django-evolution-')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+        super().tearDown()
+
+    def test_init(self):
+        """Testing SchemaSnapshot.__init__"""
+        snapshot = self._create_snapshot()
+
+        self.assertEqual(snapshot.key,
+                         get_schema_snapshot_key(DEFAULT_DB_ALIAS))
+        self.assertEqual(snapshot.model_sql,
+                         ['CREATE TABLE foo (id integer);'])
+        self.assertEqual(snapshot.versions, [])
+        self.assertEqual(snapshot.evolutions, [])
+        self.assertEqual(snapshot.applied_migrations,
+                         [('contenttypes', '0001_initial')])
+
+    def test_get_schema_snapshot_key(self):
+        """Testing get_schema_snapshot_key"""
+        key = get_schema_snapshot_key(DEFAULT_DB_ALIAS)
+
+        self.assertEqual(len(key), 64)
+        self.assertEqual(get_schema_snapshot_key(DEFAULT_DB_ALIAS), key)
+
+    def test_from_database(self):
+        """Testing SchemaSnapshot.from_database"""
+        evolver = Evolver()
+        evolver.queue_evolve_all_apps()
+        evolver.evolve()
+
+        snapshot = SchemaSnapshot.from_database(DEFAULT_DB_ALIAS)
+
+        self.assertEqual(snapshot.key,
+                         get_schema_snapshot_key(DEFAULT_DB_ALIAS))
+        self.assertTrue(snapshot.model_sql)
+        self.assertEqual(len(snapshot.versions), Version.objects.count())
+        self.assertEqual(len(snapshot.evolutions),
+                         Evolution.objects.count())
+        self.assertIn(('contenttypes', '0001_initial'),
+                      snapshot.applied_migrations)
+
+    def test_from_database_with_evolution_required(self):
+        """Testing SchemaSnapshot.from_database with evolution required"""
+        version = Version.objects.current_version()
+        model_sig = (
+            version.signature
+            .get_app_sig('django_evolution')
+            .get_model_sig('Evolution')
+        )
+        model_sig.get_field_sig('label').field_attrs['max_length'] = 50
+        version.save()
+
+        message = (
+            'The database "default" must be fully evolved before a snapshot '
+            'can be created.'
+        )
+
+        with self.assertRaisesMessage(SchemaSnapshotError, message):
+            SchemaSnapshot.from_database(DEFAULT_DB_ALIAS)
+
+    def test_serialize_and_deserialize(self):
+        """Testing SchemaSnapshot.serialize and deserialize round-trip"""
+        snapshot = self._create_snapshot()
+        new_snapshot = SchemaSnapshot.deserialize(snapshot.serialize())
+
+        self.assertEqual(new_snapshot.key, snapshot.key)
+        self.assertEqual(new_snapshot.model_sql, snapshot.model_sql)
+        self.assertEqual(new_snapshot.versions, snapshot.versions)
+        self.assertEqual(new_snapshot.evolutions, snapshot.evolutions)
+        self.assertEqual(new_snapshot.applied_migrations,
+                         snapshot.applied_migrations)
+
+    def test_deserialize_with_bad_format_version(self):
+        """Testing SchemaSnapshot.deserialize with unsupported format
+        version
+        """
+        snapshot_dict = self._create_snapshot().serialize()
+        snapshot_dict['format_version'] = 999
+
+        message = 'Schema snapshot format version 999 is not supported.'
+
+        with self.assertRaisesMessage(SchemaSnapshotError, message):
+            SchemaSnapshot.deserialize(snapshot_dict)
+
+    def test_save_and_load(self):
+        """Testing SchemaSnapshot.save and load"""
+        snapshot = self._create_snapshot()
+        filename = SchemaSnapshot.get_filename(snapshot_dir=self.tempdir,
+                                               key=snapshot.key)
+
+        self.assertEqual(filename,
+                         os.path.join(self.tempdir,
+                                      '%s.json.gz' % snapshot.key))
+
+        snapshot.save(filename)
+
+        self.assertEqual(os.listdir(self.tempdir),
+                         ['%s.json.gz' % snapshot.key])
+
+        new_snapshot = SchemaSnapshot.load(filename)
+
+        self.assertEqual(new_snapshot.serialize(), snapshot.serialize())
+
+    def test_can_restore_with_tables(self):
+        """Testing SchemaSnapshot.can_restore with existing tables"""
+        snapshot = self._create_snapshot()
+
+        self.assertFalse(snapshot.can_restore(DEFAULT_DB_ALIAS))
+
+    def test_restore_with_tables(self):
+        """Testing SchemaSnapshot.restore with existing tables"""
+        snapshot = self._create_snapshot()
+
+        message = (
+            'The schema snapshot cannot be restored into the database '
+            '"default".'
+        )
+
+        with self.assertRaisesMessage(SchemaSnapshotError, message):
+            snapshot.restore(DEFAULT_DB_ALIAS)
+
+    def test_restore_matches_evolved_schema(self):
+        """Testing SchemaSnapshot.restore creates the same indexes and
+        constraints as evolving the database
+        """
+        database_name = 'db_multi'
+
+        evolver = Evolver(database_name=database_name)
+        evolver.queue_evolve_all_apps()
+        evolver.evolve()
+
+        snapshot = SchemaSnapshot.from_database(database_name)
+        evolved_schema = self._get_schema(database_name)
+
+        self._drop_tables(database_name)
+        snapshot.restore(database_name)
+
+        self.assertEqual(self._get_schema(database_name), evolved_schema)
+
+    def _get_schema(self, database_name):
+        """Return the introspected indexes and constraints for a database.
+
+        Indexes are compared by name. Other constraints are compared
+        without their names, since some databases (such as SQLite) number
+        unnamed constraints by their position.
+
+        Args:
+            database_name (str):
+                The name of the database.
+
+        Returns:
+            dict:
+            The indexes and constraints for each table.
+        """
+        connection = connections[database_name]
+        schema = {}
+
+        with connection.cursor() as cursor:
+            for table_name in connection.introspection.table_names(cursor):
+                constraints = connection.introspection.get_constraints(
+                    cursor, table_name)
+
+                schema[table_name] = {
+                    'constraints': sorted(
+                        (info['columns'], bool(info['unique']),
+                         bool(info['primary_key']),
+                         list(info['foreign_key'] or []),
+                         bool(info['check']))
+                        for info in constraints.values()
+                        if not info['index']
+                    ),
+                    'indexes': sorted(
+                        (name, info['columns'], bool(info['unique']))
+                        for name, info in constraints.items()
+                        if info['index']
+                    ),
+                }
+
+        return schema
+
+    def _drop_tables(self, database_name):
+        """Drop all tables from a database.
+
+        Args:
+            database_name (str):
+                The name of the database.
+        """
+        connection = connections[database_name]
+        qn = connection.ops.quote_name
+
+        if connection.vendor == 'postgresql':
+            suffix = ' CASCADE'
+        else:
+            suffix = ''
+
+        with connection.constraint_checks_disabled():
+            with connection.cursor() as cursor:
+                for table_name in connection.introspection.table_names(
+                    cursor):
+                    cursor.execute('DROP TABLE %s%s'
+                                   % (qn(table_name), suffix))
+
+    def _create_snapshot(self):
+        """Return a snapshot matching the current database.
+
+        Returns:
+            django_evolution.evolve.snapshot.SchemaSnapshot:
+            The new snapshot.
+        """
+        return SchemaSnapshot(
+            key=get_schema_snapshot_key(DEFAULT_DB_ALIAS),
+            model_sql=['CREATE TABLE foo (id integer);'],
+            versions=[],
+            evolutions=[],
+            applied_migrations=[('contenttypes', '0001_initial')])
@@ -0,0 +1,284 @@
+"""Unit tests for merging django_evolution.db.sql_result results."""
+
+from __future__ import annotations
+
+from django.db import models
+from django.test.testcases import TestCase
+
+from django_evolution.db import EvolutionOperationsMulti
+from django_evolution.db.sql_result import AlterTableSQLResult, SQLResult
+from django_evolution.db.state import DatabaseState
+from django_evolution.tests.models import BaseTestModel
+
+
+class MergeTableModel1(BaseTestModel):
+    char_field = models.CharField(max_length=20)
+
+
+class MergeTableModel2(BaseTestModel):
+    char_field = models.CharField(max_length=20)
+
+
+class MergeAlterTableSQLResultsTests(TestCase):
+    """Unit tests for merging ALTER TABLE operations across SQL results."""
+
+    def setUp(self):
+        super().setUp()
+
+        self.evolver = EvolutionOperationsMulti(
+            'default',
+            DatabaseState('default', scan=False)).get_evolver()
+
+        # Test using the generic ALTER TABLE support, regardless of the
+        # database being tested.
+        self.evolver.supports_alter_table_merging = True
+
+    def test_merge_across_tables(self):
+        """Testing BaseEvolutionOperations.merge_alter_table_sql_results
+        merges operations separated by operations on other tables
+        """
+        sql_results = self.evolver.merge_alter_table_sql_results([
+            self._add_column(MergeTableModel1, 'field1'),
+            self._add_column(MergeTableModel2, 'field2'),
+            self._add_column(MergeTableModel1, 'field3'),
+            self._add_column(MergeTableModel1, 'field4'),
+        ])
+
+        self.assertEqual(
+            self._to_sql(sql_results),
+            [
+                'ALTER TABLE "tests_mergetablemodel1"'
+                ' ADD COLUMN "field1" integer NULL,'
+                ' ADD COLUMN "field3" integer NULL,'
+                ' ADD COLUMN "field4" integer NULL;',
+
+                'ALTER TABLE "tests_mergetablemodel2"'
+                ' ADD COLUMN "field2" integer NULL;',
+            ])
+
+    def test_merge_keeps_sql_in_place(self):
+        """Testing BaseEvolutionOperations.merge_alter_table_sql_results
+        leaves remaining SQL from merged results in place
+        """
+        sql_result = self._add_column(MergeTableModel1, 'field3')
+        sql_result.add_sql(['UPDATE "tests_mergetablemodel1" SET x=1;'])
+        sql_result.add_post_sql(['SELECT 1;'])
+
+        sql_results = self.evolver.merge_alter_table_sql_results([
+            self._add_column(MergeTableModel1, 'field1'),
+            self._add_column(MergeTableModel2, 'field2'),
+            sql_result,
+        ])
+
+        self.assertEqual(
+            self._to_sql(sql_results),
+            [
+                'ALTER TABLE "tests_mergetablemodel1"'
+                ' ADD COLUMN "field1" integer NULL,'
+                ' ADD COLUMN "field3" integer NULL;',
+
+                'ALTER TABLE "tests_mergetablemodel2"'
+                ' ADD COLUMN "field2" integer NULL;',
+
+                'UPDATE "tests_mergetablemodel1" SET x=1;',
+                'SELECT 1;',
+            ])
+
+    def test_merge_with_independent(self):
+        """Testing BaseEvolutionOperations.merge_alter_table_sql_results
+        with independent operations
+        """
+        sql_result = self._add_column(MergeTableModel1, 'field2')
+        sql_result.alter_table[0]['independent'] = True
+
+        sql_results = self.evolver.merge_alter_table_sql_results([
+            self._add_column(MergeTableModel1, 'field1'),
+            sql_result,
+        ])
+
+        self.assertEqual(
+            self._to_sql(sql_results),
+            [
+                'ALTER TABLE "tests_mergetablemodel1"'
+                ' ADD COLUMN "field1" integer NULL;',
+
+                'ALTER TABLE "tests_mergetablemodel1"'
+                ' ADD COLUMN "field2" integer NULL;',
+            ])
+
+    def test_merge_with_pre_sql(self):
+        """Testing BaseEvolutionOperations.merge_alter_table_sql_results
+        with operations requiring SQL to run first
+        """
+        sql_result = self._add_column(MergeTableModel1, 'field2')
+        sql_result.add_pre_sql(['SELECT 1;'])
+
+        sql_results = self.evolver.merge_alter_table_sql_results([
+            self._add_column(MergeTableModel1, 'field1'),
+            sql_result,
+        ])
+
+        self.assertEqual(
+            self._to_sql(sql_results),
+            [
+                'ALTER TABLE "tests_mergetablemodel1"'
+                ' ADD COLUMN "field1" integer NULL;',
+
+                'SELECT 1;',
+
+                'ALTER TABLE "tests_mergetablemodel1"'
+                ' ADD COLUMN "field2" integer NULL;',
+            ])
+
+    def test_merge_with_same_column(self):
+        """Testing BaseEvolutionOperations.merge_alter_table_sql_results
+        with operations on a column already being changed
+        """
+        sql_results = self.evolver.merge_alter_table_sql_results([
+            self._add_column(MergeTableModel1, 'field1'),
+            self._add_column(MergeTableModel2, 'field2'),
+            AlterTableSQLResult(self.evolver, MergeTableModel1, [{
+                'op': 'DROP COLUMN',
+                'column': 'field1',
+            }]),
+        ])
+
+        self.assertEqual(
+            self._to_sql(sql_results),
+            [
+                'ALTER TABLE "tests_mergetablemodel1"'
+                ' ADD COLUMN "field1" integer NULL;',
+
+                'ALTER TABLE "tests_mergetablemodel2"'
+                ' ADD COLUMN "field2" integer NULL;',
+
+                'ALTER TABLE "tests_mergetablemodel1"'
+                ' DROP COLUMN "field1";',
+            ])
+
+    def test_merge_with_referencing_sql(self):
+        """Testing BaseEvolutionOperations.merge_alter_table_sql_results
+        with SQL in between referencing the table
+        """
+        sql_result = self._add_column(MergeTableModel2, 'field2')
+        sql_result.add_post_sql([
+            'ALTER TABLE "tests_mergetablemodel2" ADD CONSTRAINT "c"'
+            ' FOREIGN KEY ("field2")'
+            ' REFERENCES "tests_mergetablemodel1" ("id");',
+        ])
+
+        sql_results = self.evolver.merge_alter_table_sql_results([
+            self._add_column(MergeTableModel1, 'field1'),
+            sql_result,
+            self._add_column(MergeTableModel1, 'field3'),
+        ])
+
+        self.assertEqual(len(self._to_sql(sql_results)), 4)
+        self.assertEqual(
+            self._to_sql(sql_results)[-1],
+            'ALTER TABLE "tests_mergetablemodel1"'
+            ' ADD COLUMN "field3" integer NULL;')
+
+    def test_merge_with_table_name_in_column(self):
+        """Testing BaseEvolutionOperations.merge_alter_table_sql_results
+        with a column named after a table changed in between
+        """
+        sql_results = self.evolver.merge_alter_table_sql_results([
+            self._add_column(MergeTableModel1, 'field1'),
+            self._add_column(MergeTableModel2, 'field2'),
+            self._add_column(MergeTableModel1, 'tests_mergetablemodel2_id'),
+        ])
+
+        # References are found by name, so this is conservatively treated
+        # as depending on the other table.
+        self.assertEqual(
+            self._to_sql(sql_results),
+            [
+                'ALTER TABLE "tests_mergetablemodel1"'
+                ' ADD COLUMN "field1" integer NULL;',
+
+                'ALTER TABLE "tests_mergetablemodel2"'
+                ' ADD COLUMN "field2" integer NULL;',
+
+                'ALTER TABLE "tests_mergetablemodel1"'
+                ' ADD COLUMN "tests_mergetablemodel2_id" integer NULL;',
+            ])
+
+    def test_merge_with_unknown_sql(self):
+        """Testing BaseEvolutionOperations.merge_alter_table_sql_results
+        with non-ALTER TABLE results in between
+        """
+        sql_results = self.evolver.merge_alter_table_sql_results([
+            self._add_column(MergeTableModel1, 'field1'),
+            SQLResult(['UPDATE foo SET bar=1;']),
+            self._add_column(MergeTableModel1, 'field2'),
+        ])
+
+        self.assertEqual(
+            self._to_sql(sql_results),
+            [
+                'ALTER TABLE "tests_mergetablemodel1"'
+                ' ADD COLUMN "field1" integer NULL;',
+
+                'UPDATE foo SET bar=1;',
+
+                'ALTER TABLE "tests_mergetablemodel1"'
+                ' ADD COLUMN "field2" integer NULL;',
+            ])
+
+    def test_merge_with_unsupported(self):
+        """Testing BaseEvolutionOperations.merge_alter_table_sql_results
+        with supports_alter_table_merging=False
+        """
+        self.evolver.supports_alter_table_merging = False
+
+        sql_results = [
+            self._add_column(MergeTableModel1, 'field1'),
+            self._add_column(MergeTableModel2, 'field2'),
+            self._add_column(MergeTableModel1, 'field3'),
+        ]
+
+        self.assertEqual(
+            self.evolver.merge_alter_table_sql_results(sql_results),
+            sql_results)
+
+    def _add_column(self, model, column):
+        """Return a result for adding a column.
+
+        Args:
+            model (type):
+                The model owning the table.
+
+            column (str):
+                The name of the column.
+
+        Returns:
+            django_evolution.db.sql_result.AlterTableSQLResult:
+            The resulting SQL result.
+        """
+        return AlterTableSQLResult(self.evolver, model, [{
+            'op': 'ADD COLUMN',
+            'column': column,
+            'db_type': 'integer',
+            'params': ['NULL'],
+        }])
+
+    def _to_sql(self, sql_results):
+        """Return flattened SQL for a list of results.
+
+        This uses the generic ALTER TABLE rendering for all results.
+
+        Args:
+            sql_results (list of django_evolution.db.sql_result.SQLResult):
+                The SQL results to flatten.
+
+        Returns:
+            list:
+            The list of SQL statements.
+        """
+        sql = []
+
+        for sql_result in sql_results:
+            sql += sql_result.to_sql()
+
+        return sql
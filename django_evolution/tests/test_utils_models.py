@@ -8,7 +8,10 @@ from django_evolution.db.state import DatabaseState
 from django_evolution.tests.base_test_case import TestCase
 from django_evolution.tests.models import BaseTestModel
 from django_evolution.tests.utils import register_models
-from django_evolution.utils.models import (clear_model_rel_tree,
+from django_evolution.utils.apps import (register_app_models,
+                                         unregister_app_model)
+from django_evolution.utils.models import (ModelRelTree,
+                                           clear_model_rel_tree,
                                            get_model_rel_tree,
                                            iter_model_fields,
                                            iter_non_m2m_reverse_relations,
@@ -78,6 +81,130 @@ class UtilsTests(TestCase):
                 m2m_through._meta.get_field('utilsmodelsanchor'),
             })
 
+    def test_get_model_rel_tree_after_unregister_app_model(self):
+        """Testing get_model_rel_tree after unregister_app_model"""
+        rel_tree = get_model_rel_tree()
+        fkey_field = UtilsModelsTestModel2._meta.get_field('test2_fkey_field')
+
+        self.assertIn(fkey_field, rel_tree['tests_utilsmodelstestmodel1'])
+
+        unregister_app_model('tests', 'utilsmodelstestmodel2')
+
+        self.assertIs(get_model_rel_tree(), rel_tree)
+        self.assertNotIn(fkey_field,
+                         rel_tree['tests_utilsmodelstestmodel1'])
+
+        register_app_models('tests',
+                            [('utilsmodelstestmodel2', UtilsModelsTestModel2)])
+
+        self.assertIs(get_model_rel_tree(), rel_tree)
+        self.assertIn(fkey_field, rel_tree['tests_utilsmodelstestmodel1'])
+
+    def test_get_model_rel_tree_after_model_class_created(self):
+        """Testing get_model_rel_tree after a model class is created"""
+        rel_tree = get_model_rel_tree()
+
+        try:
+            class UtilsModelsRelTreeModel(BaseTestModel):
+                anchor = models.ForeignKey(UtilsModelsAnchor,
+                                           on_delete=models.CASCADE)
+                anchors = models.ManyToManyField(UtilsModelsAnchor,
+                                                 related_name='+')
+
+            fkey_field = UtilsModelsRelTreeModel._meta.get_field('anchor')
+            m2m_through = (
+                UtilsModelsRelTreeModel._meta.get_field('anchors')
+                .remote_field.through
+            )
+            through_fkey_field = \
+                m2m_through._meta.get_field('utilsmodelsreltreemodel')
+
+            self.assertIs(get_model_rel_tree(), rel_tree)
+            self.assertIn(fkey_field, rel_tree['tests_utilsmodelsanchor'])
+
+            # The intermediary model is created before the model it points
+            # to is ready, so this must have been resolved afterward.
+            self.assertEqual(rel_tree['tests_utilsmodelsreltreemodel'],
+                             [through_fkey_field])
+            self.assertEqual(
+                rel_tree.get_field_refs(
+                    db_table='tests_utilsmodelsreltreemodel',
+                    field_name='id',
+                    is_primary_key=True),
+                [through_fkey_field])
+
+            # Creating a model class with the same name replaces the model.
+            with self.assertWarns(RuntimeWarning):
+                class UtilsModelsRelTreeModel(BaseTestModel):
+                    pass
+
+            self.assertNotIn(fkey_field, rel_tree['tests_utilsmodelsanchor'])
+        finally:
+            unregister_app_model('tests', 'utilsmodelsreltreemodel')
+            unregister_app_model('tests',
+                                 'utilsmodelsreltreemodel_anchors')
+
+    def test_model_rel_tree_add_model(self):
+        """Testing ModelRelTree.add_model"""
+        rel_tree = ModelRelTree()
+        rel_tree.add_model(UtilsModelsTestModel2)
+
+        fkey_field = UtilsModelsTestModel2._meta.get_field('test2_fkey_field')
+
+        self.assertEqual(rel_tree, {
+            'tests_utilsmodelstestmodel1': [fkey_field],
+        })
+        self.assertEqual(
+            rel_tree.get_field_refs(db_table='tests_utilsmodelstestmodel1',
+                                    field_name='id',
+                                    is_primary_key=True),
+            [fkey_field])
+        self.assertEqual(
+            rel_tree.get_field_refs(db_table='tests_utilsmodelstestmodel1',
+                                    field_name='test1_fkey_field'),
+            [])
+
+    def test_model_rel_tree_remove_model(self):
+        """Testing ModelRelTree.remove_model"""
+        rel_tree = ModelRelTree([UtilsModelsTestModel1,
+                                 UtilsModelsTestModel2])
+        rel_tree.remove_model(UtilsModelsTestModel1)
+
+        fkey_field = UtilsModelsTestModel2._meta.get_field('test2_fkey_field')
+
+        self.assertEqual(rel_tree, {
+            'tests_utilsmodelstestmodel1': [fkey_field],
+        })
+        self.assertEqual(
+            rel_tree.get_field_refs(db_table='tests_utilsmodelsanchor',
+                                    field_name='id',
+                                    is_primary_key=True),
+            [])
+
+    def test_model_rel_tree_replace_model_with_new_table(self):
+        """Testing ModelRelTree.replace_model with a model's table changed"""
+        rel_tree = ModelRelTree([UtilsModelsTestModel1,
+                                 UtilsModelsTestModel2])
+        fkey_field = UtilsModelsTestModel2._meta.get_field('test2_fkey_field')
+        meta = UtilsModelsTestModel1._meta
+        old_db_table = meta.db_table
+
+        meta.db_table = 'tests_new_table'
+
+        try:
+            rel_tree.replace_model(UtilsModelsTestModel1,
+                                   UtilsModelsTestModel1)
+        finally:
+            meta.db_table = old_db_table
+
+        self.assertNotIn('tests_utilsmodelstestmodel1', rel_tree)
+        self.assertEqual(rel_tree['tests_new_table'], [fkey_field])
+        self.assertEqual(
+            rel_tree.get_field_refs(db_table='tests_new_table',
+                                    field_name='id',
+                                    is_primary_key=True),
+            [fkey_field])
+
     def test_iter_model_fields_with_include_forward_fields(self):
         """Testing iter_model_fields with include_forward_fields=True"""
         fields = set(iter_model_fields(UtilsModelsTestModel1,
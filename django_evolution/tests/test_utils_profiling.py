@@ -0,0 +1,134 @@
+"""Unit tests for django_evolution.utils.profiling."""
+
+from __future__ import annotations
+
+import json
+import os
+import pstats
+import shutil
+import tempfile
+
+from django.db import connection
+
+from django_evolution.tests.base_test_case import TestCase
+from django_evolution.utils.profiling import EvolutionProfiler
+
+
+class EvolutionProfilerTests(TestCase):
+    """Unit tests for django_evolution.utils.profiling.EvolutionProfiler."""
+
+    def test_phase(self):
+        """Testing EvolutionProfiler.phase"""
+        with EvolutionProfiler(track_memory=True) as profiler:
+            with profiler.phase('outer'):
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+
+                with profiler.phase('inner', app_label='tests'):
+                    data = [0] * 100000
+
+                    with connection.cursor() as cursor:
+                        cursor.execute('SELECT 2')
+                        cursor.execute('SELECT 3')
+
+                    del data
+
+        phases = profiler.phases
+        self.assertEqual(len(phases), 2)
+
+        outer_phase, inner_phase = phases
+        self.assertEqual(outer_phase['name'], 'outer')
+        self.assertIsNone(outer_phase['app_label'])
+        self.assertEqual(outer_phase['depth'], 0)
+        self.assertEqual(outer_phase['queries'], 3)
+
+        self.assertEqual(inner_phase['name'], 'inner')
+        self.assertEqual(inner_phase['app_label'], 'tests')
+        self.assertEqual(inner_phase['depth'], 1)
+        self.assertEqual(inner_phase['queries'], 2)
+
+        # The peak memory for the inner phase must be accounted for in the
+        # outer phase.
+        self.assertGreaterEqual(inner_phase['peak_memory'], 800000)
+        self.assertGreaterEqual(outer_phase['peak_memory'],
+                                inner_phase['peak_memory'])
+        self.assertGreaterEqual(outer_phase['duration'],
+                                inner_phase['duration'])
+
+    def test_phase_without_track_memory(self):
+        """Testing EvolutionProfiler.phase with track_memory=False"""
+        with EvolutionProfiler(track_memory=False) as profiler:
+            with profiler.phase('test'):
+                pass
+
+        self.assertIsNone(profiler.phases[0]['peak_memory'])
+        self.assertNotIn('_start_memory', profiler.phases[0])
+
+    def test_phase_with_default_track_memory(self):
+        """Testing EvolutionProfiler.phase doesn't track memory by default"""
+        with EvolutionProfiler() as profiler:
+            with profiler.phase('test'):
+                pass
+
+        self.assertIsNone(profiler.phases[0]['peak_memory'])
+
+    def test_stop_removes_query_counting(self):
+        """Testing EvolutionProfiler.stop stops counting queries"""
+        with EvolutionProfiler(track_memory=False) as profiler:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 2')
+
+        self.assertEqual(profiler.to_json()['total_queries'], 1)
+
+    def test_write_report(self):
+        """Testing EvolutionProfiler.write_report"""
+        with EvolutionProfiler(track_memory=False) as profiler:
+            with profiler.phase('test', app_label='tests'):
+                pass
+
+        tempdir = tempfile.mkdtemp()
+
+        try:
+            filename = os.path.join(tempdir, 'report.json')
+            profiler.write_report(filename)
+
+            with open(filename) as fp:
+                report = json.load(fp)
+        finally:
+            shutil.rmtree(tempdir)
+
+        self.assertEqual(report['database'], 'default')
+        self.assertEqual(report['total_queries'], 0)
+        self.assertGreaterEqual(report['total_duration'], 0)
+        self.assertEqual(len(report['phases']), 1)
+        self.assertEqual(report['phases'][0]['name'], 'test')
+        self.assertEqual(report['phases'][0]['app_label'], 'tests')
+
+    def test_write_cprofile(self):
+        """Testing EvolutionProfiler.write_cprofile"""
+        def _profiled_func():
+            pass
+
+        with EvolutionProfiler(use_cprofile=True,
+                               track_memory=False) as profiler:
+            _profiled_func()
+
+        tempdir = tempfile.mkdtemp()
+
+        try:
+            filename = os.path.join(tempdir, 'report.prof')
+            profiler.write_cprofile(filename)
+
+            stats = pstats.Stats(filename)
+        finally:
+            shutil.rmtree(tempdir)
+
+        self.assertIn(
+            '_profiled_func',
+            {
+                func_name
+                for filename, lineno, func_name in stats.stats
+            })
@@ -0,0 +1,825 @@
+"""Unit tests for django_evolution.utils.sql."""
+
+from __future__ import annotations
+
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connection, connections
+from django.test.testcases import TransactionTestCase
+from django.test.utils import override_settings
+
+from django_evolution.db.mysql import \
+    EvolutionOperations as MySQLEvolutionOperations
+from django_evolution.db.state import DatabaseState
+from django_evolution.signals import (executed_sql_batch,
+                                      executed_sql_statement,
+                                      executing_sql_batch)
+from django_evolution.tests.base_test_case import TestCase
+from django_evolution.utils.sql import (NewTransactionSQL,
+                                        NoTransactionSQL,
+                                        SQLExecutor)
+
+
+class LockTimeoutError(DatabaseError):
+    """A simulated lock timeout error from the database."""
+
+
+class UnsupportedAlgorithmError(DatabaseError):
+    """A simulated error for an unsupported ALTER TABLE algorithm."""
+
+
+class SQLExecutorTestsMixin:
+    """Mixin for tests executing SQL through SQLExecutor."""
+
+    #: The table created by the tests, to drop after each test.
+    test_table_name = None
+
+    def setUp(self):
+        super().setUp()
+
+        self.executed_sql = []
+
+    def tearDown(self):
+        if self.test_table_name:
+            with connection.cursor() as cursor:
+                cursor.execute('DROP TABLE IF EXISTS %s'
+                               % connection.ops.quote_name(
+                                   self.test_table_name))
+
+        super().tearDown()
+
+
+class LockTimeoutTestsMixin(SQLExecutorTestsMixin):
+    """Mixin for simulating lock timeouts when executing SQL."""
+
+    test_table_name = 'lock_test'
+
+    def _prepare_executor(self, executor, lock_sql, num_failures):
+        """Prepare an executor to simulate lock timeouts.
+
+        Args:
+            executor (django_evolution.utils.sql.SQLExecutor):
+                The executor to prepare.
+
+            lock_sql (str):
+                The SQL statement that will fail to acquire a lock.
+
+            num_failures (int):
+                The number of times the statement will fail.
+        """
+        cursor = executor._cursor
+        evolver_backend = executor._evolver_backend
+        orig_execute = cursor.execute
+        failures = [num_failures]
+
+        def _execute(sql, params=None):
+            self.executed_sql.append(sql)
+
+            if sql == lock_sql and failures[0] > 0:
+                failures[0] -= 1
+
+                raise LockTimeoutError('Lock timeout')
+
+            return orig_execute(sql, params)
+
+        cursor.execute = _execute
+        evolver_backend.is_lock_timeout_error = \
+            lambda e: isinstance(e, LockTimeoutError)
+        evolver_backend.get_lock_timeout_sql = \
+            lambda timeout, use_transaction: ['SELECT %d' % (timeout * 10)]
+
+
+@override_settings(DJANGO_EVOLUTION={
+    'LOCK_TIMEOUT': 0.5,
+    'LOCK_TIMEOUT_RETRIES': 2,
+    'LOCK_TIMEOUT_RETRY_DELAY': 0,
+})
+class SQLExecutorLockTimeoutTests(LockTimeoutTestsMixin, TestCase):
+    """Unit tests for lock timeouts in SQLExecutor."""
+
+    def test_run_sql_retries_transaction(self):
+        """Testing SQLExecutor.run_sql with lock timeout retries a full
+        transaction
+        """
+        with SQLExecutor(DEFAULT_DB_ALIAS) as executor:
+            self._prepare_executor(executor,
+                                   lock_sql='SELECT 2',
+                                   num_failures=2)
+            executor.run_sql(
+                [
+                    'CREATE TABLE lock_test (id integer)',
+                    'SELECT 2',
+                ],
+                execute=True)
+
+            self.assertEqual(
+                executor.lock_retries,
+                [{
+                    'params': None,
+                    'retries': 2,
+                    'sql': 'SELECT 2',
+                    'wait_time': 0.0,
+                }])
+
+        # If the transaction wasn't rolled back, creating the table again
+        # would have failed.
+        self.assertEqual(
+            self.executed_sql,
+            [
+                'SELECT 5',
+                'CREATE TABLE lock_test (id integer)',
+                'SELECT 2',
+            ] * 3)
+
+    def test_run_sql_exceeds_retries(self):
+        """Testing SQLExecutor.run_sql with lock timeout exceeding
+        LOCK_TIMEOUT_RETRIES
+        """
+        with SQLExecutor(DEFAULT_DB_ALIAS) as executor:
+            self._prepare_executor(executor,
+                                   lock_sql='SELECT 2',
+                                   num_failures=3)
+
+            with self.assertRaises(LockTimeoutError) as ctx:
+                executor.run_sql(['SELECT 1', 'SELECT 2'],
+                                 execute=True)
+
+            self.assertEqual(ctx.exception.last_sql_statement,
+                             ('SELECT 2', None))
+            self.assertEqual(executor.lock_retries[0]['retries'], 2)
+
+        self.assertEqual(self.executed_sql.count('SELECT 2'), 3)
+
+    @override_settings(DJANGO_EVOLUTION={
+        'LOCK_TIMEOUT_RETRIES': 2,
+    })
+    def test_run_sql_without_lock_timeout(self):
+        """Testing SQLExecutor.run_sql without LOCK_TIMEOUT does not retry"""
+        with SQLExecutor(DEFAULT_DB_ALIAS) as executor:
+            self._prepare_executor(executor,
+                                   lock_sql='SELECT 2',
+                                   num_failures=1)
+
+            with self.assertRaises(LockTimeoutError):
+                executor.run_sql(['SELECT 1', 'SELECT 2'],
+                                 execute=True)
+
+            self.assertEqual(executor.lock_retries, [])
+
+        self.assertEqual(self.executed_sql, ['SELECT 1', 'SELECT 2'])
+
+    def test_run_sql_with_other_error(self):
+        """Testing SQLExecutor.run_sql with lock timeout does not retry other
+        errors
+        """
+        with SQLExecutor(DEFAULT_DB_ALIAS) as executor:
+            self._prepare_executor(executor,
+                                   lock_sql='SELECT 2',
+                                   num_failures=0)
+
+            with self.assertRaises(Exception) as ctx:
+                executor.run_sql(['SELECT 1', 'INVALID SQL'],
+                                 execute=True)
+
+            self.assertEqual(ctx.exception.last_sql_statement,
+                             ('INVALID SQL', None))
+            self.assertEqual(executor.lock_retries, [])
+
+        self.assertEqual(self.executed_sql,
+                         ['SELECT 5', 'SELECT 1', 'INVALID SQL'])
+
+    def test_run_sql_capture(self):
+        """Testing SQLExecutor.run_sql with lock timeout and capture=True
+        does not include lock timeout SQL
+        """
+        with SQLExecutor(DEFAULT_DB_ALIAS) as executor:
+            self._prepare_executor(executor,
+                                   lock_sql='SELECT 2',
+                                   num_failures=1)
+
+            self.assertEqual(
+                executor.run_sql(['SELECT 1', 'SELECT 2'],
+                                 capture=True,
+                                 execute=True),
+                ['SELECT 1', 'SELECT 2'])
+
+        self.assertEqual(self.executed_sql,
+                         ['SELECT 5', 'SELECT 1', 'SELECT 2'] * 2)
+
+
+@override_settings(DJANGO_EVOLUTION={
+    'LOCK_TIMEOUT': 0.5,
+    'LOCK_TIMEOUT_RETRIES': 2,
+    'LOCK_TIMEOUT_RETRY_DELAY': 0,
+})
+class SQLExecutorNoTransactionLockTimeoutTests(LockTimeoutTestsMixin,
+                                               TransactionTestCase):
+    """Unit tests for lock timeouts in SQLExecutor outside of transactions."""
+
+    def test_run_sql_retries_statement(self):
+        """Testing SQLExecutor.run_sql with lock timeout outside of a
+        transaction retries only the failed statement
+        """
+        self.assertFalse(connection.in_atomic_block)
+
+        with SQLExecutor(DEFAULT_DB_ALIAS) as executor:
+            self._prepare_executor(executor,
+                                   lock_sql='SELECT 2',
+                                   num_failures=1)
+            executor.run_sql(
+                [NoTransactionSQL(['SELECT 1', 'SELECT 2', 'SELECT 3'])],
+                execute=True)
+
+            self.assertEqual(executor.lock_retries[0]['retries'], 1)
+
+        self.assertEqual(
+            self.executed_sql,
+            [
+                'SELECT 5',
+                'SELECT 1',
+                'SELECT 2',
+                'SELECT 5',
+                'SELECT 2',
+                'SELECT 3',
+            ])
+
+    def test_run_sql_with_failure_resets_lock_timeout(self):
+        """Testing SQLExecutor.run_sql with lock timeout outside of a
+        transaction resets the lock timeout after a failed statement
+        """
+        with SQLExecutor(DEFAULT_DB_ALIAS) as executor:
+            self._prepare_executor(executor,
+                                   lock_sql='SELECT 2',
+                                   num_failures=0)
+            executor._evolver_backend.get_reset_lock_timeout_sql = \
+                lambda use_transaction: ['SELECT 0']
+
+            with self.assertRaises(DatabaseError):
+                executor.run_sql(
+                    [NoTransactionSQL(['SELECT 1', 'INVALID SQL'])],
+                    execute=True)
+
+        self.assertEqual(
+            self.executed_sql,
+            [
+                'SELECT 5',
+                'SELECT 1',
+                'INVALID SQL',
+                'SELECT 0',
+            ])
+
+
+class SQLExecutorTransactionTests(TransactionTestCase):
+    """Unit tests for transactions in SQLExecutor."""
+
+    databases = {DEFAULT_DB_ALIAS, 'db_multi'}
+
+    def tearDown(self):
+        with connections['db_multi'].cursor() as cursor:
+            cursor.execute('DROP TABLE IF EXISTS transaction_test')
+
+        super().tearDown()
+
+    def test_run_sql_with_database(self):
+        """Testing SQLExecutor.run_sql uses transactions on the executor's
+        database
+        """
+        db_connection = connections['db_multi']
+        in_atomic_blocks = []
+
+        def _on_executed_sql_statement(**kwargs):
+            in_atomic_blocks.append((connection.in_atomic_block,
+                                     db_connection.in_atomic_block))
+
+        executed_sql_statement.connect(_on_executed_sql_statement)
+
+        try:
+            with SQLExecutor('db_multi') as executor:
+                executor.run_sql(
+                    ['CREATE TABLE transaction_test (id integer)'],
+                    execute=True)
+        finally:
+            executed_sql_statement.disconnect(_on_executed_sql_statement)
+
+        self.assertEqual(in_atomic_blocks, [(False, True)])
+        self.assertFalse(db_connection.in_atomic_block)
+        self.assertIn('transaction_test',
+                      db_connection.introspection.table_names())
+
+    def test_run_sql_with_database_and_failure(self):
+        """Testing SQLExecutor.run_sql rolls back transactions on the
+        executor's database after a failed statement
+        """
+        db_connection = connections['db_multi']
+
+        with self.assertRaises(DatabaseError):
+            with SQLExecutor('db_multi') as executor:
+                executor.run_sql(
+                    [
+                        'CREATE TABLE transaction_test (id integer)',
+                        'INVALID SQL',
+                    ],
+                    execute=True)
+
+        self.assertFalse(db_connection.in_atomic_block)
+        self.assertNotIn('transaction_test',
+                         db_connection.introspection.table_names())
+
+
+class SQLExecutorFallbackTests(SQLExecutorTestsMixin, TestCase):
+    """Unit tests for fallback statements in SQLExecutor."""
+
+    def test_run_sql_with_fallback(self):
+        """Testing SQLExecutor.run_sql with a failed statement runs the
+        backend's fallback statement
+        """
+        with SQLExecutor(DEFAULT_DB_ALIAS) as executor:
+            self._prepare_executor(executor,
+                                   fallbacks={
+                                       'SELECT 2 FAIL': 'SELECT 2',
+                                   })
+            executor.run_sql(['SELECT 1', 'SELECT 2 FAIL', 'SELECT 3'],
+                             execute=True)
+
+        self.assertEqual(
+            self.executed_sql,
+            [
+                'SELECT 1',
+                'SELECT 2 FAIL',
+                'SELECT 2',
+                'SELECT 3',
+            ])
+
+    def test_run_sql_without_fallback(self):
+        """Testing SQLExecutor.run_sql with a failed statement and no
+        fallback statement raises the error
+        """
+        with SQLExecutor(DEFAULT_DB_ALIAS) as executor:
+            self._prepare_executor(executor, fallbacks={})
+
+            with self.assertRaises(UnsupportedAlgorithmError) as ctx:
+                executor.run_sql(['SELECT 1', 'SELECT 2 FAIL', 'SELECT 3'],
+                                 execute=True)
+
+            self.assertEqual(ctx.exception.last_sql_statement,
+                             ('SELECT 2 FAIL', None))
+
+        self.assertEqual(
+            self.executed_sql,
+            [
+                'SELECT 1',
+                'SELECT 2 FAIL',
+            ])
+
+    def _prepare_executor(self, executor, fallbacks):
+        """Prepare an executor to simulate failed statements.
+
+        Any statement ending in ``FAIL`` will fail.
+
+        Args:
+            executor (django_evolution.utils.sql.SQLExecutor):
+                The executor to prepare.
+
+            fallbacks (dict):
+                A mapping of failing statements to fallback statements.
+        """
+        cursor = executor._cursor
+        orig_execute = cursor.execute
+
+        def _execute(sql, params=None):
+            self.executed_sql.append(sql)
+
+            if sql.endswith('FAIL'):
+                raise UnsupportedAlgorithmError(1846, 'Not supported')
+
+            return orig_execute(sql, params)
+
+        cursor.execute = _execute
+        executor._evolver_backend.get_sql_statement_fallback = \
+            lambda sql, error: fallbacks.get(sql)
+
+
+class MySQLSQLStatementFallbackTests(TestCase):
+    """Unit tests for mysql.EvolutionOperations.get_sql_statement_fallback.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        self.evolver_backend = MySQLEvolutionOperations(
+            database_state=DatabaseState(DEFAULT_DB_ALIAS, scan=False),
+            connection=connection)
+
+    @override_settings(DJANGO_EVOLUTION={
+        'MYSQL_ONLINE_DDL': 'prefer',
+    })
+    def test_with_prefer(self):
+        """Testing mysql.EvolutionOperations.get_sql_statement_fallback with
+        MYSQL_ONLINE_DDL=prefer removes ALGORITHM and LOCK
+        """
+        with self.assertLogs('django_evolution.db.mysql') as logs:
+            sql = self.evolver_backend.get_sql_statement_fallback(
+                'ALTER TABLE `foo` ADD COLUMN `bar` integer NULL,'
+                ' ALGORITHM=INPLACE, LOCK=NONE;',
+                UnsupportedAlgorithmError(1846, 'Not supported'))
+
+        self.assertEqual(
+            sql,
+            'ALTER TABLE `foo` ADD COLUMN `bar` integer NULL;')
+        self.assertEqual(len(logs.records), 1)
+
+    @override_settings(DJANGO_EVOLUTION={
+        'MYSQL_ONLINE_DDL': 'require',
+    })
+    def test_with_require(self):
+        """Testing mysql.EvolutionOperations.get_sql_statement_fallback with
+        MYSQL_ONLINE_DDL=require
+        """
+        self.assertIsNone(self.evolver_backend.get_sql_statement_fallback(
+            'ALTER TABLE `foo` ADD COLUMN `bar` integer NULL,'
+            ' ALGORITHM=INSTANT;',
+            UnsupportedAlgorithmError(1846, 'Not supported')))
+
+    @override_settings(DJANGO_EVOLUTION={
+        'MYSQL_ONLINE_DDL': 'prefer',
+    })
+    def test_with_other_error(self):
+        """Testing mysql.EvolutionOperations.get_sql_statement_fallback with
+        an unrelated error
+        """
+        self.assertIsNone(self.evolver_backend.get_sql_statement_fallback(
+            'ALTER TABLE `foo` ADD COLUMN `bar` integer NULL,'
+            ' ALGORITHM=INSTANT;',
+            UnsupportedAlgorithmError(1060, 'Duplicate column')))
+
+    @override_settings(DJANGO_EVOLUTION={
+        'MYSQL_ONLINE_DDL': 'prefer',
+    })
+    def test_without_algorithm(self):
+        """Testing mysql.EvolutionOperations.get_sql_statement_fallback with
+        a statement not requesting an algorithm
+        """
+        self.assertIsNone(self.evolver_backend.get_sql_statement_fallback(
+            'ALTER TABLE `foo` ADD COLUMN `bar` integer NULL;',
+            UnsupportedAlgorithmError(1846, 'Not supported')))
+
+
+class MySQLLockTimeoutTests(TestCase):
+    """Unit tests for lock timeouts in mysql.EvolutionOperations."""
+
+    def setUp(self):
+        super().setUp()
+
+        self.evolver_backend = MySQLEvolutionOperations(
+            database_state=DatabaseState(DEFAULT_DB_ALIAS, scan=False),
+            connection=connection)
+
+    def test_get_lock_timeout_sql(self):
+        """Testing mysql.EvolutionOperations.get_lock_timeout_sql saves the
+        session's timeout
+        """
+        self.assertEqual(
+            self.evolver_backend.get_lock_timeout_sql(2.5,
+                                                      use_transaction=True),
+            [
+                'SET @django_evolution_lock_wait_timeout ='
+                ' COALESCE(@django_evolution_lock_wait_timeout,'
+                ' @@SESSION.lock_wait_timeout);',
+
+                'SET SESSION lock_wait_timeout = 2;',
+            ])
+
+    def test_get_reset_lock_timeout_sql(self):
+        """Testing mysql.EvolutionOperations.get_reset_lock_timeout_sql
+        restores the saved timeout
+        """
+        self.assertEqual(
+            self.evolver_backend.get_reset_lock_timeout_sql(
+                use_transaction=True),
+            [
+                'SET SESSION lock_wait_timeout ='
+                ' COALESCE(@django_evolution_lock_wait_timeout,'
+                ' @@SESSION.lock_wait_timeout);',
+
+                'SET @django_evolution_lock_wait_timeout = NULL;',
+            ])
+
+
+@override_settings(DJANGO_EVOLUTION={
+    'SQL_BATCH_SIZE': 3,
+})
+class SQLExecutorBatchingTests(SQLExecutorTestsMixin, TestCase):
+    """Unit tests for executing multiple statements in SQLExecutor."""
+
+    test_table_name = 'batch_test'
+
+    def test_run_sql_groups_statements(self):
+        """Testing SQLExecutor.run_sql with SQL_BATCH_SIZE groups
+        statements
+        """
+        with SQLExecutor(DEFAULT_DB_ALIAS) as executor:
+            self._prepare_executor(executor)
+            executor.run_sql(
+                [
+                    'CREATE TABLE batch_test (id integer)',
+                    'INSERT INTO batch_test (id) VALUES (1)',
+                    'INSERT INTO batch_test (id) VALUES (2)',
+                    'INSERT INTO batch_test (id) VALUES (3)',
+                    ('INSERT INTO batch_test (id) VALUES (%s)', (4,)),
+                    'INSERT INTO batch_test (id) VALUES (5)',
+                ],
+                execute=True)
+
+            executor._cursor.execute('SELECT COUNT(*) FROM batch_test')
+            self.assertEqual(executor._cursor.fetchone()[0], 5)
+
+        self.assertEqual(
+            self.executed_sql,
+            [
+                'SAVEPOINT django_evolution_multi;\n'
+                'CREATE TABLE batch_test (id integer);\n'
+                'INSERT INTO batch_test (id) VALUES (1);\n'
+                'INSERT INTO batch_test (id) VALUES (2);\n'
+                'RELEASE SAVEPOINT django_evolution_multi;',
+
+                'INSERT INTO batch_test (id) VALUES (3)',
+                'INSERT INTO batch_test (id) VALUES (%s)',
+                'INSERT INTO batch_test (id) VALUES (5)',
+                'SELECT COUNT(*) FROM batch_test',
+            ])
+
+    def test_run_sql_with_failure(self):
+        """Testing SQLExecutor.run_sql with SQL_BATCH_SIZE and failed
+        statement sets last_sql_statement
+        """
+        with SQLExecutor(DEFAULT_DB_ALIAS) as executor:
+            self._prepare_executor(executor)
+
+            with self.assertRaises(Exception) as ctx:
+                executor.run_sql(
+                    [
+                        'CREATE TABLE batch_test (id integer)',
+                        'INVALID SQL',
+                        'SELECT 1',
+                    ],
+                    execute=True)
+
+        self.assertEqual(ctx.exception.last_sql_statement,
+                         ('INVALID SQL', None))
+
+        # The table creation will have been rolled back and run again.
+        self.assertEqual(
+            self.executed_sql,
+            [
+                'SAVEPOINT django_evolution_multi;\n'
+                'CREATE TABLE batch_test (id integer);\n'
+                'INVALID SQL;\n'
+                'SELECT 1;\n'
+                'RELEASE SAVEPOINT django_evolution_multi;',
+
+                'ROLLBACK TO SAVEPOINT django_evolution_multi;',
+                'CREATE TABLE batch_test (id integer)',
+                'INVALID SQL',
+            ])
+
+    def test_run_sql_unsupported(self):
+        """Testing SQLExecutor.run_sql with SQL_BATCH_SIZE and database
+        without multi-statement support
+        """
+        with SQLExecutor(DEFAULT_DB_ALIAS) as executor:
+            self._prepare_executor(executor)
+            executor._evolver_backend.supports_multi_statement_sql = False
+            executor.run_sql(['SELECT 1', 'SELECT 2'],
+                             execute=True)
+
+        self.assertEqual(self.executed_sql, ['SELECT 1', 'SELECT 2'])
+
+    @override_settings(DJANGO_EVOLUTION={
+        'LOCK_TIMEOUT': 0.5,
+        'LOCK_TIMEOUT_RETRIES': 2,
+        'LOCK_TIMEOUT_RETRY_DELAY': 0,
+        'SQL_BATCH_SIZE': 3,
+    })
+    def test_run_sql_with_lock_timeout(self):
+        """Testing SQLExecutor.run_sql with SQL_BATCH_SIZE and lock timeout
+        retries the group without executing statements individually
+        """
+        with SQLExecutor(DEFAULT_DB_ALIAS) as executor:
+            self._prepare_executor(executor,
+                                   lock_sql='SELECT 2;',
+                                   num_failures=1)
+            executor.run_sql(['SELECT 1', 'SELECT 2'],
+                             execute=True)
+
+            self.assertEqual(executor.lock_retries[0]['retries'], 1)
+
+        group_sql = (
+            'SAVEPOINT django_evolution_multi;\n'
+            'SELECT 1;\n'
+            'SELECT 2;\n'
+            'RELEASE SAVEPOINT django_evolution_multi;'
+        )
+
+        self.assertEqual(
+            self.executed_sql,
+            [
+                'SELECT 5',
+                group_sql,
+                'ROLLBACK TO SAVEPOINT django_evolution_multi;',
+                'SELECT 5',
+                group_sql,
+            ])
+
+    def _prepare_executor(self, executor, lock_sql=None, num_failures=0):
+        """Prepare an executor to simulate executing multiple statements.
+
+        Statements sent together will be split up and executed
+        individually.
+
+        Args:
+            executor (django_evolution.utils.sql.SQLExecutor):
+                The executor to prepare.
+
+            lock_sql (str, optional):
+                A SQL statement that will fail to acquire a lock.
+
+            num_failures (int, optional):
+                The number of times ``lock_sql`` will fail.
+        """
+        cursor = executor._cursor
+        evolver_backend = executor._evolver_backend
+        orig_execute = cursor.execute
+        failures = [num_failures]
+
+        def _execute(sql, params=None):
+            self.executed_sql.append(sql)
+
+            for statement in sql.split('\n'):
+                if statement == lock_sql and failures[0] > 0:
+                    failures[0] -= 1
+
+                    raise LockTimeoutError('Lock timeout')
+
+                orig_execute(statement, params)
+
+        cursor.execute = _execute
+        evolver_backend.supports_multi_statement_sql = True
+        evolver_backend.is_lock_timeout_error = \
+            lambda e: isinstance(e, LockTimeoutError)
+        evolver_backend.get_lock_timeout_sql = \
+            lambda timeout, use_transaction: ['SELECT %d' % (timeout * 10)]
+
+
+class SQLExecutorTransactionBatchesTests(TestCase):
+    """Unit tests for batching statements into transactions in
+    SQLExecutor.
+    """
+
+    def test_run_sql_with_new_transaction_sql(self):
+        """Testing SQLExecutor.run_sql with NewTransactionSQL runs
+        statements after it in a new transaction
+        """
+        with SQLExecutor(DEFAULT_DB_ALIAS) as executor:
+            sql = executor.run_sql(
+                [
+                    'SELECT 1',
+                    NewTransactionSQL(['SELECT 2', 'SELECT 3']),
+                    lambda cursor: [
+                        'SELECT 4',
+                        NewTransactionSQL(['SELECT 5']),
+                    ],
+                    'SELECT 6',
+                    NoTransactionSQL(['SELECT 7']),
+                    'SELECT 8',
+                ],
+                capture=True,
+                execute=True)
+
+        self.assertEqual(
+            sql,
+            [
+                'SELECT 1',
+                '-- Start of a new transaction:',
+                'SELECT 2',
+                'SELECT 3',
+                '-- Start of a new transaction:',
+                'SELECT 4',
+                '-- Start of a new transaction:',
+                'SELECT 5',
+                '-- Start of a new transaction:',
+                'SELECT 6',
+                '-- Run outside of a transaction:',
+                'SELECT 7',
+                '-- Start of a new transaction:',
+                'SELECT 8',
+            ])
+
+
+class SQLExecutorSignalsTests(TestCase):
+    """Unit tests for SQLExecutor instrumentation."""
+
+    def setUp(self):
+        super().setUp()
+
+        self.saw_signals = []
+        self.saw_signal_kwargs = []
+        executing_sql_batch.connect(self._on_executing_sql_batch)
+        executed_sql_batch.connect(self._on_executed_sql_batch)
+        executed_sql_statement.connect(self._on_executed_sql_statement)
+
+    def tearDown(self):
+        super().tearDown()
+
+        executing_sql_batch.disconnect(self._on_executing_sql_batch)
+        executed_sql_batch.disconnect(self._on_executed_sql_batch)
+        executed_sql_statement.disconnect(self._on_executed_sql_statement)
+
+    def test_run_sql_emits_signals(self):
+        """Testing SQLExecutor.run_sql emits signals when executing SQL"""
+        class DummyTask:
+            app_label = 'tests'
+
+        task = DummyTask()
+
+        with SQLExecutor(DEFAULT_DB_ALIAS) as executor:
+            executor.run_sql(
+                [
+                    'SELECT 1',
+                    NewTransactionSQL([
+                        ('SELECT %s', (2,)),
+                    ]),
+                ],
+                execute=True,
+                task=task)
+
+        self.assertEqual(
+            self.saw_signals,
+            [
+                ('executing_sql_batch', 0, 1, True),
+                ('executed_sql_statement', 0, 'SELECT 1', None),
+                ('executed_sql_batch', 0, 1, True),
+                ('executing_sql_batch', 1, 1, True),
+                ('executed_sql_statement', 1, 'SELECT %s', (2,)),
+                ('executed_sql_batch', 1, 1, True),
+            ])
+
+        for kwargs in self.saw_signal_kwargs:
+            self.assertEqual(kwargs['database'], DEFAULT_DB_ALIAS)
+            self.assertEqual(kwargs['app_label'], 'tests')
+            self.assertIs(kwargs['task'], task)
+
+    def test_run_sql_capture_only(self):
+        """Testing SQLExecutor.run_sql does not emit signals when only
+        capturing SQL
+        """
+        with SQLExecutor(DEFAULT_DB_ALIAS) as executor:
+            executor.run_sql(['SELECT 1'],
+                             capture=True)
+
+        self.assertEqual(self.saw_signals, [])
+
+    def test_run_sql_logs_statements(self):
+        """Testing SQLExecutor.run_sql logs executed statements"""
+        with self.assertLogs('django_evolution.utils.sql',
+                             level='DEBUG') as logs:
+            with SQLExecutor(DEFAULT_DB_ALIAS) as executor:
+                executor.run_sql(['SELECT 1'],
+                                 execute=True)
+
+        self.assertEqual(len(logs.records), 1)
+
+        sql_execution = logs.records[0].sql_execution
+        self.assertGreaterEqual(sql_execution.pop('duration'), 0)
+        self.assertEqual(
+            sql_execution,
+            {
+                'app_label': None,
+                'batch_index': 0,
+                'database': DEFAULT_DB_ALIAS,
+                'params': None,
+                'rowcount': -1,
+                'sql': 'SELECT 1',
+                'use_transaction': True,
+            })
+
+    def _on_executing_sql_batch(self, batch_index, num_statements,
+                                use_transaction, **kwargs):
+        self._record_signal(kwargs,
+                            'executing_sql_batch', batch_index,
+                            num_statements, use_transaction)
+
+    def _on_executed_sql_batch(self, batch_index, num_statements,
+                               use_transaction, duration, **kwargs):
+        self.assertGreaterEqual(duration, 0)
+        self._record_signal(kwargs,
+                            'executed_sql_batch', batch_index,
+                            num_statements, use_transaction)
+
+    def _on_executed_sql_statement(self, batch_index, sql, params, duration,
+                                   rowcount, **kwargs):
+        self.assertGreaterEqual(duration, 0)
+        self._record_signal(kwargs,
+                            'executed_sql_statement', batch_index, sql,
+                            params)
+
+    def _record_signal(self, kwargs, *info):
+        self.saw_signals.append(info)
+        self.saw_signal_kwargs.append(kwargs)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import re
 from collections import OrderedDict
 from contextlib import contextmanager
 from functools import partial
@@ -12,6 +13,7 @@ from django.db import connections
 from django.db.utils import ConnectionHandler, DEFAULT_DB_ALIAS
 
 from django_evolution.db import EvolutionOperationsMulti
+from django_evolution.models import Evolution, Version
 from django_evolution.signature import (AppSignature, ModelSignature,
                                         ProjectSignature)
 from django_evolution.tests import models as evo_test
@@ -54,6 +56,15 @@ else:
     VALUE_EXPRESSIONS_TYPE = 'django.db.models.expressions.Value'
 
 
+_DDL_QUERY_RE = re.compile(
+    r'^\s*(ALTER|COMMENT|CREATE|DROP|RENAME|TRUNCATE)\b',
+    re.I)
+_INTROSPECTION_QUERY_RE = re.compile(
+    r'^\s*(PRAGMA|SHOW)\b|\b(information_schema|pg_catalog|pg_class|'
+    r'pg_constraint|pg_index|sqlite_master|sqlite_schema)\b',
+    re.I)
+
+
 def register_models(database_state, models, register_indexes=False,
                     new_app_label='tests', db_name='default', app=evo_test):
     """Register models for testing purposes.
@@ -468,6 +479,132 @@ def ensure_test_db(model_entries=[], end_model_entries=None,
                          database=database)
 
 
+class CapturedQueries:
+    """Queries captured during a test, grouped by category.
+
+    Queries are placed into one of the following categories:
+
+    ``introspection``:
+        Queries inspecting the database schema.
+
+    ``bookkeeping``:
+        Queries reading or writing the stored evolution, project version,
+        or migration history.
+
+    ``ddl``:
+        Schema-changing statements.
+
+    ``other``:
+        Anything else, such as transaction management.
+
+    Version Added:
+        3.0
+
+    Attributes:
+        queries (dict):
+            A mapping of category names to lists of SQL statements.
+    """
+
+    CATEGORIES = ('introspection', 'bookkeeping', 'ddl', 'other')
+
+    def __init__(self):
+        """Initialize the captured queries."""
+        self.queries = {
+            category: []
+            for category in self.CATEGORIES
+        }
+        self._bookkeeping_tables = (
+            Evolution._meta.db_table,
+            Version._meta.db_table,
+            'django_migrations',
+        )
+
+    def get_counts(self):
+        """Return the number of queries in each category.
+
+        Returns:
+            dict:
+            A mapping of category names to query counts.
+        """
+        return {
+            category: len(queries)
+            for category, queries in self.queries.items()
+        }
+
+    def categorize(self, sql):
+        """Return the category for a SQL statement.
+
+        Args:
+            sql (str):
+                The SQL statement.
+
+        Returns:
+            str:
+            The category for the statement.
+        """
+        if _DDL_QUERY_RE.match(sql):
+            return 'ddl'
+        elif _INTROSPECTION_QUERY_RE.search(sql):
+            return 'introspection'
+        elif any(table_name in sql
+                 for table_name in self._bookkeeping_tables):
+            return 'bookkeeping'
+        else:
+            return 'other'
+
+    def _capture_query(self, execute, sql, params, many, context):
+        """Capture a query executed on the database.
+
+        This is installed as a database execution wrapper.
+
+        Args:
+            execute (callable):
+                The function to execute the query.
+
+            sql (str):
+                The SQL to execute.
+
+            params (tuple):
+                The parameters for the SQL.
+
+            many (bool):
+                Whether the SQL is being executed for many sets of
+                parameters.
+
+            context (dict):
+                Context for the execution.
+
+        Returns:
+            object:
+            The result of the execution.
+        """
+        self.queries[self.categorize(sql)].append(sql)
+
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def capture_queries(database=DEFAULT_DB_ALIAS):
+    """Capture and categorize all queries executed on a database.
+
+    Version Added:
+        3.0
+
+    Args:
+        database (str, optional):
+            The name of the database to capture queries on.
+
+    Context:
+        CapturedQueries:
+        The captured queries. This will be populated as queries are
+        executed.
+    """
+    captured = CapturedQueries()
+
+    with connections[database].execute_wrapper(captured._capture_query):
+        yield captured
+
+
 def get_sql_mappings(mapping_key, db_name):
     """Return the test SQL mappings dictionary for the current database type.
 
@@ -516,6 +653,49 @@ def get_sql_mappings(mapping_key, db_name):
     return mapping
 
 
+def get_postgres_evolver_backend(database_state, pg_version=120000,
+                                 db_name=DEFAULT_DB_ALIAS):
+    """Return a Postgres evolution operations backend for a test database.
+
+    This allows Postgres-specific SQL to be generated and inspected when
+    testing against other types of databases. The resulting SQL must not be
+    executed.
+
+    Version Added:
+        3.0
+
+    Args:
+        database_state (django_evolution.db.state.DatabaseState):
+            The database state to track information through.
+
+        pg_version (int, optional):
+            The Postgres version to simulate, in the form used by
+            ``connection.pg_version``.
+
+        db_name (str, optional):
+            The name of the database whose connection will be wrapped.
+
+    Returns:
+        django_evolution.db.postgresql.EvolutionOperations:
+        The evolution operations backend.
+    """
+    from django_evolution.db.postgresql import EvolutionOperations
+
+    class PostgresConnection:
+        vendor = 'postgresql'
+
+        def __init__(self, connection):
+            self._connection = connection
+            self.pg_version = pg_version
+
+        def __getattr__(self, name):
+            return getattr(self._connection, name)
+
+    return EvolutionOperations(
+        database_state=database_state,
+        connection=PostgresConnection(connections[db_name]))
+
+
 def get_default_tablespace(db_name):
     """Return the default tablespace for a database.
 
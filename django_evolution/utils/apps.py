@@ -11,6 +11,8 @@ from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.utils.module_loading import module_has_submodule
 
+from django_evolution.utils.models import update_model_rel_tree
+
 
 def get_apps():
     """Return the list of all installed apps with models.
@@ -168,7 +170,8 @@ def register_app(app_label, app):
 
     Version Changed:
         3.0:
-        Moved from ``django.compat.apps``.
+        * Moved from ``django.compat.apps``.
+        * The model relationship tree is now updated for the changed models.
 
     Args:
         app_label (str):
@@ -186,6 +189,9 @@ def register_app(app_label, app):
         app_config,
     ])
 
+    update_model_rel_tree(
+        added_models=list(apps.all_models[app_label].values()))
+
 
 def unregister_app(app_label):
     """Unregister an app in the registry.
@@ -194,7 +200,8 @@ def unregister_app(app_label):
 
     Version Changed:
         3.0:
-        Moved from ``django.compat.apps``.
+        * Moved from ``django.compat.apps``.
+        * The model relationship tree is now updated for the changed models.
 
     Args:
         app_label (str):
@@ -204,7 +211,10 @@ def unregister_app(app_label):
     # :py:func:`register_app` here.
     apps.unset_installed_apps()
 
-    apps.all_models[app_label].clear()
+    app_models = apps.all_models[app_label]
+    update_model_rel_tree(removed_models=list(app_models.values()))
+
+    app_models.clear()
     apps.clear_cache()
 
 
@@ -215,7 +225,8 @@ def register_app_models(app_label, model_infos, reset=False):
 
     Version Changed:
         3.0:
-        Moved from ``django.compat.apps``.
+        * Moved from ``django.compat.apps``.
+        * The model relationship tree is now updated for the changed models.
 
     Args:
         app_label (str):
@@ -234,22 +245,35 @@ def register_app_models(app_label, model_infos, reset=False):
         apps.all_models[app_label] = OrderedDict()
 
     model_dict = apps.all_models[app_label]
+    added_models = []
+    removed_models = []
 
     if reset:
+        removed_models += model_dict.values()
         model_dict.clear()
 
     for model_name, model in model_infos:
+        old_model = model_dict.get(model_name)
+
+        if old_model is not None and old_model is not model:
+            removed_models.append(old_model)
+
         model_dict[model_name] = model
+        added_models.append(model)
 
     apps.clear_cache()
 
+    update_model_rel_tree(added_models=added_models,
+                          removed_models=removed_models)
+
 
 def unregister_app_model(app_label, model_name):
     """Unregister a model with the given name from the given app.
 
     Version Changed:
         3.0:
-        Moved from ``django.compat.apps``.
+        * Moved from ``django.compat.apps``.
+        * The model relationship tree is now updated for the changed models.
 
     Args:
         app_label (str):
@@ -258,5 +282,7 @@ def unregister_app_model(app_label, model_name):
         model_name (str):
             The name of the model to unregister.
     """
-    del apps.all_models[app_label][model_name]
+    model = apps.all_models[app_label].pop(model_name)
     apps.clear_cache()
+
+    update_model_rel_tree(removed_models=[model])
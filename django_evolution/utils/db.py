@@ -240,9 +240,38 @@ def sql_create_for_many_to_many_field(connection, model, field):
     return schema_editor.collected_sql
 
 
-def sql_indexes_for_field(connection, model, field):
+def _get_concurrent_index_kwargs(concurrently):
+    """Return keyword arguments for building concurrent index SQL.
+
+    Only the Postgres schema editor accepts a ``concurrently`` argument, so
+    this is only included when needed.
+
+    Version Added:
+        3.0
+
+    Args:
+        concurrently (bool):
+            Whether the index is being built concurrently.
+
+    Returns:
+        dict:
+        Keyword arguments to pass when generating index SQL.
+    """
+    if concurrently:
+        return {
+            'concurrently': True,
+        }
+
+    return {}
+
+
+def sql_indexes_for_field(connection, model, field, concurrently=False):
     """Return SQL statements for creating indexes for a field.
 
+    Version Changed:
+        3.0:
+        Added the ``concurrently`` argument.
+
     Args:
         connection (object):
             The database connection.
@@ -253,6 +282,10 @@ def sql_indexes_for_field(connection, model, field):
         field (django.db.models.Field):
             The field being indexed.
 
+        concurrently (bool, optional):
+            Whether to build the index without blocking writes to the
+            table. This is only supported on Postgres.
+
     Returns:
         list:
         The list of SQL statements for creating the indexes.
@@ -264,13 +297,20 @@ def sql_indexes_for_field(connection, model, field):
         return []
 
     with collect_sql_schema_editor(connection) as schema_editor:
-        return ['%s;' % schema_editor._create_index_sql(model,
-                                                        fields=[field])]
+        return ['%s;' % schema_editor._create_index_sql(
+            model,
+            fields=[field],
+            **_get_concurrent_index_kwargs(concurrently))]
 
 
-def sql_indexes_for_fields(connection, model, fields, index_together=False):
+def sql_indexes_for_fields(connection, model, fields, index_together=False,
+                           concurrently=False):
     """Return SQL statements for creating indexes covering multiple fields.
 
+    Version Changed:
+        3.0:
+        Added the ``concurrently`` argument.
+
     Args:
         connection (object):
             The database connection.
@@ -284,6 +324,10 @@ def sql_indexes_for_fields(connection, model, fields, index_together=False):
         index_together (bool, optional):
             Whether this is from an index_together rule.
 
+        concurrently (bool, optional):
+            Whether to build the index without blocking writes to the
+            table. This is only supported on Postgres.
+
     Returns:
         list:
         The list of SQL statements for creating the indexes.
@@ -294,9 +338,11 @@ def sql_indexes_for_fields(connection, model, fields, index_together=False):
         suffix = ''
 
     with collect_sql_schema_editor(connection) as schema_editor:
-        return ['%s;' % schema_editor._create_index_sql(model,
-                                                        fields=fields,
-                                                        suffix=suffix)]
+        return ['%s;' % schema_editor._create_index_sql(
+            model,
+            fields=fields,
+            suffix=suffix,
+            **_get_concurrent_index_kwargs(concurrently))]
 
 
 def sql_indexes_for_model(connection, model):
@@ -320,9 +366,13 @@ def sql_indexes_for_model(connection, model):
         ]
 
 
-def sql_delete_index(connection, model, index_name):
+def sql_delete_index(connection, model, index_name, concurrently=False):
     """Return SQL statements for deleting an index.
 
+    Version Changed:
+        3.0:
+        Added the ``concurrently`` argument.
+
     Args:
         connection (object):
             The database connection.
@@ -333,14 +383,23 @@ def sql_delete_index(connection, model, index_name):
         index_name (str):
             The name of the index to delete.
 
+        concurrently (bool, optional):
+            Whether to drop the index without blocking access to the
+            table. This is only supported on Postgres.
+
     Returns:
         list:
         The list of SQL statements for deleting the index.
     """
     with collect_sql_schema_editor(connection) as schema_editor:
+        if concurrently:
+            template = schema_editor.sql_delete_index_concurrently
+        else:
+            template = schema_editor.sql_delete_index
+
         return [
             '%s;' % schema_editor._delete_constraint_sql(
-                template=schema_editor.sql_delete_index,
+                template=template,
                 model=model,
                 name=index_name),
         ]
@@ -391,9 +450,13 @@ def sql_delete_constraints(connection, model, remove_refs):
     return sql
 
 
-def sql_add_constraints(connection, model, refs):
+def sql_add_constraints(connection, model, refs, not_valid=False):
     """Return SQL statements for adding constraints.
 
+    Version Changed:
+        3.0:
+        Added the ``not_valid`` argument.
+
     Args:
         connection (object):
             The database connection.
@@ -413,6 +476,20 @@ def sql_add_constraints(connection, model, refs):
                 pass in a copy of the dictionary if the original dictionary
                 msut be preserved.
 
+        not_valid (bool, optional):
+            Whether to add the constraints without validating existing rows.
+
+            If ``True``, each constraint will be added with ``NOT VALID``,
+            avoiding a scan of the referencing table while it's locked. This
+            is only supported on Postgres. The constraints must later be
+            validated using the SQL from :py:func:`sql_validate_constraints`.
+
+            This defaults to ``False``, validating existing rows when the
+            constraints are added.
+
+            Version Added:
+                3.0
+
     Returns:
         list:
         The list of SQL statements for adding constraints.
@@ -446,20 +523,11 @@ def sql_add_constraints(connection, model, refs):
                 #         '_fk_%(to_table)s_%(to_column)s'))
                 #
                 rel_meta = rel_class._meta
-                to_column = (
-                    meta.get_field(f.remote_field.field_name)
-                    .column
-                )
-
-                suffix = '_fk_%(to_table)s_%(to_column)s' % {
-                    'to_table': meta.db_table,
-                    'to_column': to_column,
-                }
-
-                name = create_index_name(connection=connection,
-                                         table_name=rel_meta.db_table,
-                                         col_names=[f.column],
-                                         suffix=suffix)
+                name, to_column = _get_constraint_ref_info(
+                    connection=connection,
+                    model=model,
+                    rel_class=rel_class,
+                    field=f)
 
                 create_sql = schema_editor.sql_create_fk % {
                     'table': qn(rel_meta.db_table),
@@ -470,6 +538,9 @@ def sql_add_constraints(connection, model, refs):
                     'deferrable': connection.ops.deferrable_sql(),
                 }
 
+                if not_valid:
+                    create_sql = '%s NOT VALID' % create_sql
+
                 sql.append('%s;' % create_sql)
 
         del refs[model]
@@ -477,6 +548,92 @@ def sql_add_constraints(connection, model, refs):
     return sql
 
 
+def sql_validate_constraints(connection, model, refs):
+    """Return SQL statements for validating added constraints.
+
+    This is used along with :py:func:`sql_add_constraints` when constraints
+    were added with ``not_valid=True``. It's only supported on Postgres.
+
+    Version Added:
+        3.0
+
+    Args:
+        connection (object):
+            The database connection.
+
+        model (django.db.models.Model):
+            The database model the constraints were added on.
+
+        refs (dict):
+            A dictionary of constraint references, in the form passed to
+            :py:func:`sql_add_constraints`. This will not be modified.
+
+    Returns:
+        list:
+        The list of SQL statements for validating the constraints.
+    """
+    meta = model._meta
+
+    if not meta.managed or meta.swapped or model not in refs:
+        return []
+
+    qn = connection.ops.quote_name
+    sql = []
+
+    for rel_class, f in refs[model]:
+        name = _get_constraint_ref_info(connection=connection,
+                                        model=model,
+                                        rel_class=rel_class,
+                                        field=f)[0]
+
+        sql.append('ALTER TABLE %s VALIDATE CONSTRAINT %s;'
+                   % (qn(rel_class._meta.db_table), qn(name)))
+
+    return sql
+
+
+def _get_constraint_ref_info(connection, model, rel_class, field):
+    """Return information on a foreign key constraint reference.
+
+    Version Added:
+        3.0
+
+    Args:
+        connection (object):
+            The database connection.
+
+        model (django.db.models.Model):
+            The model being referenced.
+
+        rel_class (django.db.models.Model):
+            The model owning the foreign key.
+
+        field (django.db.models.Field):
+            The foreign key field.
+
+    Returns:
+        tuple:
+        A 2-tuple containing:
+
+        1. The name of the constraint.
+        2. The name of the referenced column.
+    """
+    meta = model._meta
+    to_column = meta.get_field(field.remote_field.field_name).column
+
+    suffix = '_fk_%(to_table)s_%(to_column)s' % {
+        'to_table': meta.db_table,
+        'to_column': to_column,
+    }
+
+    name = create_index_name(connection=connection,
+                             table_name=rel_class._meta.db_table,
+                             col_names=[field.column],
+                             suffix=suffix)
+
+    return name, to_column
+
+
 def create_index_name(connection, table_name, field_names=[], col_names=[],
                       unique=False, suffix=''):
     """Return the name for an index for a field.
@@ -633,5 +790,6 @@ __all__ = [
     'sql_indexes_for_field',
     'sql_indexes_for_fields',
     'sql_indexes_for_model',
+    'sql_validate_constraints',
     'truncate_name',
 ]
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import os
+import threading
 from importlib import import_module
+from importlib.util import find_spec
 
 from django.apps.registry import apps
 from django.core.management.sql import (emit_post_migrate_signal,
@@ -13,8 +16,11 @@ from django.db.migrations.executor import (MigrationExecutor as
                                            DjangoMigrationExecutor)
 from django.db.migrations.loader import (MigrationLoader as
                                          DjangoMigrationLoader)
+from django.db.migrations.operations import (RunPython, RunSQL,
+                                             SeparateDatabaseAndState)
 from django.db.migrations.recorder import MigrationRecorder
 from django.db.migrations.state import ModelState
+from django.db.models import Q
 
 from django_evolution.errors import (DjangoEvolutionSupportError,
                                      MigrationConflictsError,
@@ -24,20 +30,46 @@ from django_evolution.support import supports_migrations
 from django_evolution.utils.apps import get_app_name
 
 
-#: A list of all globally-registered custom migrations.
+#: Storage for the globally-registered custom migrations.
 #:
-#: These migrations may not exist on disk. This is primarily useful for
-#: unit testing.
+#: The ``migrations`` attribute contains the list of custom migrations,
+#: which may not exist on disk. This is primarily useful for unit testing.
 #:
-#: This list is managed by :py:func:`register_global_custom_migrations` and
+#: This is managed by :py:func:`register_global_custom_migrations` and
 #: :py:func:`clear_global_custom_migrations`.
 #:
 #: Version Added:
 #:     2.2
 #:
+#: Version Changed:
+#:     3.0:
+#:     This is now thread-local, so that multiple databases can be evolved
+#:     concurrently.
+#:
 #: Type:
-#:     MigrationList
-_global_custom_migrations = None
+#:     threading.local
+_global_custom_migrations = threading.local()
+
+
+#: Cached migrations and migration graphs for MigrationLoader.
+#:
+#: ``disk`` maps keys from :py:meth:`MigrationLoader._get_disk_cache_key` to
+#: the migrations loaded from disk. ``graphs`` maps those keys to migration
+#: graphs built from the migrations.
+#:
+#: This is managed by :py:class:`MigrationLoader` and
+#: :py:func:`clear_migration_loader_cache`.
+#:
+#: Version Added:
+#:     3.0
+#:
+#: Type:
+#:     dict
+_migration_loader_cache = {
+    'disk': {},
+    'graphs': {},
+}
+_migration_loader_cache_lock = threading.Lock()
 
 
 class MigrationList:
@@ -397,15 +429,31 @@ class MigrationLoader(DjangoMigrationLoader):
     :py:class:`~django.db.migrations.loader.MigrationLoader` that allows for
     providing additional migrations not available on disk.
 
+    Loaded migrations and the resulting migration graph are cached for the
+    process, keyed off the files in each app's migrations module, their
+    modification times, and any custom migrations. A new loader will reuse
+    these if nothing has changed, rather than importing every migration
+    again. The cache can be cleared with
+    :py:func:`clear_migration_loader_cache`.
+
+    Version Changed:
+        3.0:
+        Added caching of loaded migrations and migration graphs.
+
     Attributes:
         extra_applied_migrations (MigrationList):
             Migrations to mark as already applied. This can be used to
             augment the results calculated from the database.
     """
 
-    def __init__(self, connection, custom_migrations=None, *args, **kwargs):
+    def __init__(self, connection, custom_migrations=None, *args,
+                 use_cache=True, **kwargs):
         """Initialize the loader.
 
+        Version Changed:
+            3.0:
+            Added the ``use_cache`` argument.
+
         Args:
             connection (django.db.backends.base.BaseDatabaseWrapper):
                 The connection to load applied migrations from.
@@ -416,12 +464,19 @@ class MigrationLoader(DjangoMigrationLoader):
             *args (tuple):
                 Additional positional arguments for the parent class.
 
+            use_cache (bool, optional):
+                Whether the initial load can use cached migrations and
+                migration graphs. Later calls to :py:meth:`build_graph`
+                will always rebuild the graph.
+
             **kwargs (dict):
                 Additional keyword arguments for the parent class.
         """
         self._custom_migrations = custom_migrations or MigrationList()
         self._applied_migrations = None
         self._lock_migrations = False
+        self._use_cache = use_cache
+        self._disk_cache_key = None
 
         self.extra_applied_migrations = MigrationList()
 
@@ -480,6 +535,15 @@ class MigrationLoader(DjangoMigrationLoader):
     def build_graph(self, reload_migrations=True):
         """Rebuild the migrations graph.
 
+        The initial load performed when constructing the loader may use a
+        cached graph. Graphs are only cached if there are no replacing
+        (squashed) migrations, as those graphs depend on which migrations
+        have been applied.
+
+        Version Changed:
+            3.0:
+            Added caching of migration graphs.
+
         Args:
             reload_migrations (bool, optional):
                 Whether to reload migration instances from disk. If ``False``,
@@ -489,30 +553,155 @@ class MigrationLoader(DjangoMigrationLoader):
             self._lock_migrations = True
 
         try:
-            super().build_graph()
+            self.load_disk()
+
+            graph_key = (self._disk_cache_key, self.replace_migrations)
+            cacheable = (
+                self._disk_cache_key is not None and
+                not any(migration.replaces
+                        for migration in self.disk_migrations.values())
+            )
+            graph = None
+
+            if cacheable and self._use_cache:
+                with _migration_loader_cache_lock:
+                    graph = _migration_loader_cache['graphs'].get(graph_key)
+
+            if graph is None:
+                # Migrations were loaded above, so don't load them again.
+                self._lock_migrations = True
+                super().build_graph()
+
+                if cacheable:
+                    with _migration_loader_cache_lock:
+                        _migration_loader_cache['graphs'][graph_key] = \
+                            self.graph
+            else:
+                if self.connection is None:
+                    self.applied_migrations = {}
+                else:
+                    recorder = MigrationRecorder(self.connection)
+                    self.applied_migrations = recorder.applied_migrations()
+
+                self.graph = graph
+                self.replacements = {}
         finally:
             self._lock_migrations = False
+            self._use_cache = False
 
     def load_disk(self):
         """Load migrations from disk.
 
         This will also load any custom migrations.
+
+        During the initial load, cached migrations will be used if the
+        migration modules and custom migrations haven't changed since they
+        were last loaded.
+
+        Version Changed:
+            3.0:
+            Added caching of loaded migrations.
         """
         if self._lock_migrations:
             return
 
-        super().load_disk()
+        disk_cache_key = self._get_disk_cache_key()
+        cached = None
 
-        for info in self._custom_migrations:
-            migration = info['migration']
-            assert migration is not None
+        if disk_cache_key is not None and self._use_cache:
+            with _migration_loader_cache_lock:
+                cached = _migration_loader_cache['disk'].get(disk_cache_key)
 
-            app_label = info['app_label']
-            name = info['name']
+        if cached is None:
+            super().load_disk()
+
+            for info in self._custom_migrations:
+                migration = info['migration']
+                assert migration is not None
 
-            self.migrated_apps.add(app_label)
-            self.unmigrated_apps.discard(app_label)
-            self.disk_migrations[(app_label, name)] = migration
+                app_label = info['app_label']
+                name = info['name']
+
+                self.migrated_apps.add(app_label)
+                self.unmigrated_apps.discard(app_label)
+                self.disk_migrations[(app_label, name)] = migration
+
+            if disk_cache_key is not None:
+                with _migration_loader_cache_lock:
+                    _migration_loader_cache['disk'][disk_cache_key] = (
+                        dict(self.disk_migrations),
+                        set(self.migrated_apps),
+                        set(self.unmigrated_apps),
+                    )
+        else:
+            disk_migrations, migrated_apps, unmigrated_apps = cached
+
+            self.disk_migrations = dict(disk_migrations)
+            self.migrated_apps = set(migrated_apps)
+            self.unmigrated_apps = set(unmigrated_apps)
+
+        self._disk_cache_key = disk_cache_key
+
+    def _get_disk_cache_key(self):
+        """Return a key for caching migrations loaded from disk.
+
+        This is based on the migrations module for each installed app, the
+        files in those modules and their modification times, and the custom
+        migrations provided to the loader.
+
+        Version Added:
+            3.0
+
+        Returns:
+            tuple:
+            The cache key, or ``None`` if the migrations can't be cached.
+        """
+        modules_key = []
+
+        for app_config in apps.get_app_configs():
+            app_label = app_config.label
+            module_name = self.migrations_module(app_label)[0]
+
+            if module_name is None:
+                modules_key.append((app_label, None))
+                continue
+
+            try:
+                spec = find_spec(module_name)
+            except ImportError:
+                spec = None
+
+            try:
+                if spec is None:
+                    module_key = None
+                elif spec.submodule_search_locations is not None:
+                    module_key = tuple(
+                        (entry.path, entry.stat().st_mtime_ns)
+                        for path in spec.submodule_search_locations
+                        for entry in sorted(os.scandir(path),
+                                            key=lambda entry: entry.name)
+                        if entry.is_file()
+                    )
+                elif spec.has_location:
+                    module_key = (spec.origin,
+                                  os.stat(spec.origin).st_mtime_ns)
+                else:
+                    return None
+            except OSError:
+                # The migrations aren't loaded from files we can check, so
+                # they can't be cached.
+                return None
+
+            modules_key.append((app_label, module_name, module_key))
+
+        # Custom migrations are identified by their instances. The cache
+        # holds onto these, so their IDs won't be reused while cached.
+        custom_key = tuple(
+            (info['app_label'], info['name'], id(info['migration']))
+            for info in self._custom_migrations
+        )
+
+        return (tuple(modules_key), custom_key, self.ignore_no_migrations)
 
 
 class MigrationExecutor(DjangoMigrationExecutor):
@@ -549,7 +738,8 @@ class MigrationExecutor(DjangoMigrationExecutor):
                 to this instance.
         """
         if custom_migrations is None:
-            custom_migrations = _global_custom_migrations
+            custom_migrations = getattr(_global_custom_migrations,
+                                        'migrations', None)
 
         self._signal_sender = signal_sender or self
 
@@ -615,19 +805,37 @@ class MigrationExecutor(DjangoMigrationExecutor):
                                    migration=migration)
 
 
+def clear_migration_loader_cache():
+    """Clear the cached migrations and migration graphs.
+
+    The next :py:class:`MigrationLoader` will load all migrations from disk.
+    This is primarily useful for unit testing.
+
+    Version Added:
+        3.0
+    """
+    with _migration_loader_cache_lock:
+        _migration_loader_cache['disk'].clear()
+        _migration_loader_cache['graphs'].clear()
+
+
 def register_global_custom_migrations(custom_migrations):
     """Register a global list of custom migrations.
 
     These will be used by default when constructing a
     :py:class:`MigrationExecutor`.
 
-    Only one list of custom migrations can be added at a time.
+    Only one list of custom migrations can be added at a time in a thread.
 
     This is primarily useful for unit testing.
 
     Version Added:
         2.2
 
+    Version Changed:
+        3.0:
+        Custom migrations are now registered for the current thread.
+
     Args:
         custom_migrations (MigrationList):
             The list of custom migrations.
@@ -636,15 +844,13 @@ def register_global_custom_migrations(custom_migrations):
         AssertionError:
             Custom migrations were already registered.
     """
-    global _global_custom_migrations
-
-    assert _global_custom_migrations is None, (
+    assert getattr(_global_custom_migrations, 'migrations', None) is None, (
         'register_global_custom_migrations() cannot be called until any '
         'existing migrations are unregistered through '
         'clear_global_custom_migrations()'
     )
 
-    _global_custom_migrations = custom_migrations
+    _global_custom_migrations.migrations = custom_migrations
 
 
 def clear_global_custom_migrations():
@@ -652,10 +858,13 @@ def clear_global_custom_migrations():
 
     Version Added:
         2.2
-    """
-    global _global_custom_migrations
 
-    _global_custom_migrations = None
+    Version Changed:
+        3.0:
+        This only clears custom migrations registered for the current
+        thread.
+    """
+    _global_custom_migrations.migrations = None
 
 
 def has_migrations_module(app):
@@ -704,34 +913,64 @@ def record_applied_migrations(connection, migrations):
     )
 
 
-def unrecord_applied_migrations(connection, app_label, migration_names=None):
+def unrecord_applied_migrations(connection, app_label=None,
+                                migration_names=None, migrations=None):
     """Remove the recordings of applied migrations from the database.
 
+    Migrations can be unrecorded for a single app, or for a list of
+    migrations spanning any number of apps. Either way, this is performed in
+    a single query.
+
     This can only be called when on Django 1.7 or higher.
 
+    Version Changed:
+        3.0:
+        Added the ``migrations`` argument, and made ``app_label`` optional.
+
     Args:
         connection (django.db.backends.base.BaseDatabaseWrapper):
             The connection used to unrecord applied migrations.
 
-        app_label (str):
-            The app label that the migrations pertain to.
+        app_label (str, optional):
+            The app label that the migrations pertain to. This is required
+            if ``migrations`` is not provided.
 
         migration_names (list of str, optional):
-            The list of migration names to unrecord. If not provided, all
-            migrations for the app will be unrecorded.
+            The list of migration names to unrecord for ``app_label``. If not
+            provided, all migrations for the app will be unrecorded.
+
+        migrations (MigrationList, optional):
+            The list of migrations to unrecord. This can't be combined with
+            ``app_label``.
     """
     assert supports_migrations, \
         'This cannot be called on Django 1.6 or earlier.'
+    assert (app_label is None) != (migrations is None), \
+        'Either app_label or migrations must be provided.'
 
-    recorder = MigrationRecorder(connection)
-    recorder.ensure_schema()
+    if migrations is not None:
+        names_by_app_label = {}
+
+        for info in migrations:
+            names_by_app_label.setdefault(info['app_label'], []).append(
+                info['name'])
 
-    queryset = recorder.migration_qs.filter(app=app_label)
+        if not names_by_app_label:
+            return
+
+        q = Q()
+
+        for migrations_app_label, names in names_by_app_label.items():
+            q |= Q(app=migrations_app_label, name__in=names)
+    else:
+        q = Q(app=app_label)
 
-    if migration_names:
-        queryset = queryset.filter(name__in=migration_names)
+        if migration_names:
+            q &= Q(name__in=migration_names)
 
-    queryset.delete()
+    recorder = MigrationRecorder(connection)
+    recorder.ensure_schema()
+    recorder.migration_qs.filter(q).delete()
 
 
 def filter_migration_targets(targets, app_labels=None, exclude=None):
@@ -816,6 +1055,70 @@ def is_migration_initial(migration):
     return True
 
 
+def is_migration_schema_only(migration):
+    """Return whether a migration only performs schema changes.
+
+    Schema-only migrations consist solely of Django's built-in schema
+    operations. Their end result on a fresh database is the same as
+    creating the tables directly from the models, so they can be safely
+    recorded as applied without being run.
+
+    :py:class:`~django.db.migrations.operations.RunPython` and
+    :py:class:`~django.db.migrations.operations.RunSQL` operations are
+    only allowed if they're no-ops when applied, or if they're marked as
+    elidable. Custom operations (such as those that install database
+    extensions) are never allowed.
+
+    Version Added:
+        3.0
+
+    Args:
+        migration (django.db.migrations.Migration):
+            The migration to check.
+
+    Returns:
+        bool:
+        ``True`` if the migration only performs schema changes. ``False``
+        if it may perform other operations.
+    """
+    return _are_operations_schema_only(migration.operations)
+
+
+def _are_operations_schema_only(operations):
+    """Return whether a list of migration operations only change schema.
+
+    Version Added:
+        3.0
+
+    Args:
+        operations (list of django.db.migrations.operations.base.Operation):
+            The operations to check.
+
+    Returns:
+        bool:
+        ``True`` if the operations only perform schema changes. ``False``
+        if they may perform other operations.
+    """
+    for operation in operations:
+        if isinstance(operation, SeparateDatabaseAndState):
+            if not _are_operations_schema_only(
+                operation.database_operations):
+                return False
+        elif isinstance(operation, RunPython):
+            if (not operation.elidable and
+                operation.code is not RunPython.noop):
+                return False
+        elif isinstance(operation, RunSQL):
+            if (not operation.elidable and
+                operation.sql != RunSQL.noop):
+                return False
+        elif not type(operation).__module__.startswith(
+            'django.db.migrations.operations.'):
+            return False
+
+    return True
+
+
 def create_pre_migrate_state(executor):
     """Create state needed before migrations are applied.
 
@@ -837,7 +1140,8 @@ def create_pre_migrate_state(executor):
     return executor._create_project_state(with_applied_migrations=True)
 
 
-def apply_migrations(executor, targets, plan, pre_migrate_state):
+def apply_migrations(executor, targets, plan, pre_migrate_state,
+                     isolate_state=True):
     """Apply migrations to the database.
 
     Migrations will be applied using the ``fake_initial`` mode, which means
@@ -850,8 +1154,19 @@ def apply_migrations(executor, targets, plan, pre_migrate_state):
     to Django to handle, as this is part of the upgrade method when going
     from pre-1.7 to 1.7+ anyway.
 
+    By default, the provided pre-migration state is cloned before applying
+    migrations, leaving it untouched. Cloning a state is expensive for large
+    projects, as it copies every rendered model. Callers applying several
+    batches of migrations in sequence can pass ``isolate_state=False`` to
+    thread the state from one batch directly into the next, in which case
+    the provided state will be updated in place and returned.
+
     This can only be called when on Django 1.7 or higher.
 
+    Version Changed:
+        3.0:
+        Added the ``isolate_state`` argument.
+
     Args:
         executor (django.db.migrations.executor.MigrationExecutor):
             The migration executor that will handle applying the migrations.
@@ -867,6 +1182,10 @@ def apply_migrations(executor, targets, plan, pre_migrate_state):
             This must be generated with :py:func:`create_pre_migrate_state`
             or a previous call to :py:func:`apply_migrations`.
 
+        isolate_state (bool, optional):
+            Whether to clone the pre-migration state before applying
+            migrations. If ``False``, the state will be modified in place.
+
     Returns:
         object:
         The state generated from applying migrations. Any final state must
@@ -884,7 +1203,11 @@ def apply_migrations(executor, targets, plan, pre_migrate_state):
     # Mark any migrations that introduce new models that are already in
     # the database as applied.
     migrate_kwargs['fake_initial'] = True
-    migrate_kwargs['state'] = pre_migrate_state.clone()
+
+    if isolate_state:
+        pre_migrate_state = pre_migrate_state.clone()
+
+    migrate_kwargs['state'] = pre_migrate_state
 
     # Perform the migration and record the result. This only returns a value
     # on Django >= 1.10.
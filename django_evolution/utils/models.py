@@ -7,10 +7,12 @@ from typing import TYPE_CHECKING
 
 from django.apps.registry import apps
 from django.db import router
+from django.db.models.signals import class_prepared
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Iterable, Iterator
     from types import ModuleType
+    from typing import Any
 
     from django.db.models import Field, Model
 
@@ -143,7 +145,276 @@ def walk_model_tree(
         yield from walk_model_tree(parent)
 
 
-def get_model_rel_tree():
+class ModelRelTree(dict):
+    """A relationship tree for registered models.
+
+    This maps each table to a list of relation fields that point to it. It
+    also indexes the non-many-to-many relation fields by the table and the
+    name of the field they point to, so that references to a specific
+    field can be looked up directly.
+
+    The tree can be updated as individual models are added, removed, or
+    replaced, without needing to be rebuilt.
+
+    Version Added:
+        3.0
+    """
+
+    def __init__(
+        self,
+        models: Iterable[type[Model]] = (),
+    ) -> None:
+        """Initialize the tree.
+
+        Args:
+            models (list of type, optional):
+                The models to add to the tree.
+        """
+        super().__init__()
+
+        self._fields_by_model = {}
+        self._fields_by_remote_model = defaultdict(list)
+        self._fields_by_target = defaultdict(list)
+        self._field_keys = {}
+        self._pending_fields = []
+
+        for model in models:
+            self.add_model(model)
+
+    def add_model(
+        self,
+        model: type[Model],
+    ) -> None:
+        """Add a model's relation fields to the tree.
+
+        Any relation fields on other models that point to this model will be
+        re-indexed, in case this model's table has changed or their relations
+        have since been resolved.
+
+        Args:
+            model (type):
+                The model to add.
+        """
+        if model._meta.abstract or model in self._fields_by_model:
+            return
+
+        fields = [
+            field
+            for field in iter_model_fields(model,
+                                           include_parent_models=False,
+                                           include_forward_fields=True,
+                                           include_reverse_fields=False,
+                                           include_hidden_fields=False)
+            if field.is_relation and field.related_model is not None
+        ]
+        self._fields_by_model[model] = fields
+
+        for field in fields:
+            self._add_field(field)
+
+        # Re-index anything that points to this model, along with any
+        # relations that couldn't be resolved before.
+        reindex_fields = self._fields_by_remote_model.get(model, [])
+
+        if self._pending_fields:
+            reindex_fields = reindex_fields + [
+                field
+                for field in self._pending_fields
+                if self._is_model_resolved(field.remote_field.model)
+            ]
+
+        for field in list(reindex_fields):
+            self._remove_field(field)
+            self._add_field(field)
+
+    def remove_model(
+        self,
+        model: type[Model],
+    ) -> None:
+        """Remove a model's relation fields from the tree.
+
+        Relation fields on other models that point to this model will remain
+        in the tree.
+
+        Args:
+            model (type):
+                The model to remove.
+        """
+        for field in self._fields_by_model.pop(model, []):
+            self._remove_field(field)
+
+    def replace_model(
+        self,
+        old_model: type[Model],
+        new_model: type[Model],
+    ) -> None:
+        """Replace a model's relation fields in the tree.
+
+        Args:
+            old_model (type):
+                The model to remove.
+
+            new_model (type):
+                The model to add in its place. This may be the same as
+                ``old_model``, if its fields or table have changed.
+        """
+        self.remove_model(old_model)
+        self.add_model(new_model)
+
+    def get_field_refs(
+        self,
+        db_table: str,
+        field_name: str,
+        is_primary_key: bool = False,
+    ) -> list[Field]:
+        """Return the non-many-to-many relation fields pointing to a field.
+
+        Args:
+            db_table (str):
+                The table containing the field.
+
+            field_name (str):
+                The name of the field.
+
+            is_primary_key (bool, optional):
+                Whether the field is the table's primary key. If set,
+                relations that implicitly point to the primary key will be
+                included.
+
+        Returns:
+            list of django.db.models.Field:
+            The relation fields pointing to the field.
+        """
+        fields_by_target = self._fields_by_target
+        refs = list(fields_by_target.get((db_table, field_name), []))
+
+        if is_primary_key:
+            refs += fields_by_target.get((db_table, None), [])
+
+        return refs
+
+    def _add_field(
+        self,
+        field: Field,
+    ) -> None:
+        """Add a relation field to the tree.
+
+        If the field's relation hasn't yet been resolved, it will be tracked
+        until a later call to :py:meth:`add_model`.
+
+        Args:
+            field (django.db.models.Field):
+                The relation field to add.
+        """
+        remote_field_model = field.remote_field.model
+
+        # Make sure this isn't a "self" relation or similar, or a relation
+        # to a model whose class is still being created (which happens for
+        # auto-created many-to-many intermediary models).
+        if not self._is_model_resolved(remote_field_model):
+            self._pending_fields.append(field)
+            return
+
+        db_table = remote_field_model._meta.concrete_model._meta.db_table
+        target_keys = []
+
+        if not field.many_to_many:
+            to_fields = getattr(field, 'to_fields', [])
+
+            if to_fields == [None]:
+                target_keys.append((db_table, None))
+            else:
+                target_keys += [
+                    (db_table, to_field)
+                    for to_field in to_fields
+                    if to_field is not None
+                ]
+
+        self.setdefault(db_table, []).append(field)
+        self._fields_by_remote_model[remote_field_model].append(field)
+
+        for target_key in target_keys:
+            self._fields_by_target[target_key].append(field)
+
+        self._field_keys[id(field)] = (remote_field_model, db_table,
+                                       target_keys)
+
+    def _remove_field(
+        self,
+        field: Field,
+    ) -> None:
+        """Remove a relation field from the tree.
+
+        Args:
+            field (django.db.models.Field):
+                The relation field to remove.
+        """
+        try:
+            remote_field_model, db_table, target_keys = \
+                self._field_keys.pop(id(field))
+        except KeyError:
+            if field in self._pending_fields:
+                self._pending_fields.remove(field)
+
+            return
+
+        self._remove_from_list(self, db_table, field)
+        self._remove_from_list(self._fields_by_remote_model,
+                               remote_field_model, field)
+
+        for target_key in target_keys:
+            self._remove_from_list(self._fields_by_target, target_key, field)
+
+    @staticmethod
+    def _is_model_resolved(
+        model: (type[Model] | str),
+    ) -> bool:
+        """Return whether a relation's model has been fully resolved.
+
+        Args:
+            model (type or str):
+                The model referenced by the relation.
+
+        Returns:
+            bool:
+            ``True`` if the model is a fully-created model class. ``False``
+            if it's a string reference or is still being created.
+        """
+        return (not isinstance(model, str) and
+                model._meta.concrete_model is not None)
+
+    @staticmethod
+    def _remove_from_list(
+        d: dict,
+        key: Any,
+        field: Field,
+    ) -> None:
+        """Remove a field from a list in a dictionary.
+
+        The list will be removed from the dictionary once empty.
+
+        Args:
+            d (dict):
+                The dictionary containing the list.
+
+            key (object):
+                The key for the list.
+
+            field (django.db.models.Field):
+                The field to remove. This is matched by identity.
+        """
+        fields = d[key]
+        fields[:] = [
+            other_field
+            for other_field in fields
+            if other_field is not field
+        ]
+
+        if not fields:
+            del d[key]
+
+
+def get_model_rel_tree() -> ModelRelTree:
     """Return the full field relationship tree for all registered models.
 
     This will walk through every field in every model registered in Django,
@@ -162,44 +433,53 @@ def get_model_rel_tree():
     Version Added:
         2.2
 
+    Version Changed:
+        3.0:
+        This now returns a :py:class:`ModelRelTree`, which can be updated
+        through :py:func:`update_model_rel_tree`.
+
     Returns:
-        dict:
+        ModelRelTree:
         The model relation tree.
     """
     global _rel_tree_cache
 
-    if _rel_tree_cache is not None:
-        return _rel_tree_cache
+    if _rel_tree_cache is None:
+        _rel_tree_cache = ModelRelTree(
+            get_models(include_auto_created=True))
 
-    rel_tree = defaultdict(list)
-    all_models = get_models(include_auto_created=True)
+    return _rel_tree_cache
 
-    # We'll walk the entire model tree, looking for any immediate fields on
-    # each model, building a mapping of models to fields that reference the
-    # model.
-    for cur_model in all_models:
-        if cur_model._meta.abstract:
-            continue
 
-        for field in iter_model_fields(cur_model,
-                                       include_parent_models=False,
-                                       include_forward_fields=True,
-                                       include_reverse_fields=False,
-                                       include_hidden_fields=False):
-            if (field.is_relation and
-                field.related_model is not None):
-                remote_field = field.remote_field
-                remote_field_model = remote_field.model
+def update_model_rel_tree(
+    added_models: Iterable[type[Model]] = (),
+    removed_models: Iterable[type[Model]] = (),
+) -> None:
+    """Update the model relationship tree for registry changes.
+
+    This should be called when models are registered or unregistered
+    outside of Django's model class creation, which updates the tree
+    automatically. If the tree hasn't been computed, this will do nothing.
+
+    Version Added:
+        3.0
 
-                # Make sure this isn't a "self" relation or similar.
-                if not isinstance(remote_field_model, str):
-                    db_table = \
-                        remote_field_model._meta.concrete_model._meta.db_table
-                    rel_tree[db_table].append(field)
+    Args:
+        added_models (list of type, optional):
+            The models that were registered. If a model is already in the
+            tree, it will be replaced.
 
-    _rel_tree_cache = rel_tree
+        removed_models (list of type, optional):
+            The models that were unregistered.
+    """
+    rel_tree = _rel_tree_cache
 
-    return rel_tree
+    if rel_tree is not None:
+        for model in removed_models:
+            rel_tree.remove_model(model)
+
+        for model in added_models:
+            rel_tree.replace_model(model, model)
 
 
 def clear_model_rel_tree():
@@ -327,12 +607,25 @@ def iter_non_m2m_reverse_relations(
     This will exclude any :py:class:`~django.db.models.ManyToManyField`s,
     but will include the relation fields on their "through" tables.
 
+    Relations are looked up in the relationship tree for registered models
+    (see :py:func:`get_model_rel_tree`), by the table of the field's model
+    (and any parent models) and the name of the field. When ``field``
+    belongs to a mock model built from a signature, the results belong to
+    the registered models, and point to the registered version of the field
+    rather than to ``field`` itself. Callers that need relations bound to
+    ``field`` must rebind them.
+
     Note that this may return duplicate results, or multiple relations
     pointing to the same field. It's up to the caller to handle this.
 
     Version Added:
         2.2
 
+    Version Changed:
+        3.0:
+        Relations are now looked up directly by the referenced field in the
+        relationship tree.
+
     Args:
         field (django.db.models.Field):
             The field that relations must point to.
@@ -343,24 +636,71 @@ def iter_non_m2m_reverse_relations(
 
         The type of the relation object depends on the version of Django.
     """
+    rel_tree = get_model_rel_tree()
     is_primary_key = field.primary_key
     field_name = field.name
+    seen_tables = set()
+
+    for cur_model in walk_model_tree(field.model):
+        db_table = cur_model._meta.concrete_model._meta.db_table
+
+        if db_table in seen_tables:
+            continue
+
+        seen_tables.add(db_table)
+
+        rel_from_fields = rel_tree.get_field_refs(
+            db_table=db_table,
+            field_name=field_name,
+            is_primary_key=is_primary_key)
+
+        for rel_from_field in rel_from_fields:
+            rel = rel_from_field.remote_field
 
-    for rel in iter_model_fields(field.model,
-                                 include_parent_models=True,
-                                 include_forward_fields=False,
-                                 include_reverse_fields=True,
-                                 include_hidden_fields=True):
-        rel_from_field = rel.field
-
-        # Exclude any ManyToManyFields, and make sure the referencing fields
-        # point directly to the ID on this field.
-        if (not rel_from_field.many_to_many and
-            ((is_primary_key and rel_from_field.to_fields == [None]) or
-             field_name in rel_from_field.to_fields)):
             yield rel
 
             # Now do the same for the fields on the model of the related field.
             other_rel_fields = iter_non_m2m_reverse_relations(rel.remote_field)
 
             yield from other_rel_fields
+
+
+def _on_class_prepared(
+    sender: type[Model],
+    **kwargs,
+) -> None:
+    """Update the model relationship tree when a model class is created.
+
+    Django registers models as their classes are created, replacing any
+    model with the same name. This keeps the tree in sync with those
+    registrations.
+
+    Version Added:
+        3.0
+
+    Args:
+        sender (type):
+            The newly-created model class.
+
+        **kwargs (dict, unused):
+            Additional keyword arguments from the signal.
+    """
+    meta = sender._meta
+
+    if _rel_tree_cache is None or meta.abstract or meta.apps is not apps:
+        return
+
+    # Django registers the model once this signal has been handled, so the
+    # model being replaced is still in the registry.
+    old_model = apps.all_models.get(meta.app_label, {}).get(meta.model_name)
+
+    if old_model is None:
+        removed_models = ()
+    else:
+        removed_models = (old_model,)
+
+    update_model_rel_tree(added_models=(sender,),
+                          removed_models=removed_models)
+
+
+class_prepared.connect(_on_class_prepared)
@@ -0,0 +1,320 @@
+"""Utilities for profiling the evolution process.
+
+Version Added:
+    3.0
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, TYPE_CHECKING
+
+from django.db import connections
+from django.db.utils import DEFAULT_DB_ALIAS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class EvolutionProfiler:
+    """Records timing, query, and memory information for evolution phases.
+
+    Each phase of the evolution process (such as scanning the database,
+    preparing tasks, or executing a task for an app) can be recorded using
+    :py:meth:`phase`. Phases may be nested, and will record:
+
+    * The number of seconds spent in the phase.
+    * The number of queries executed on the database.
+    * The peak amount of memory allocated during the phase, if memory
+      tracking is enabled.
+
+    The profiler can optionally collect a :py:mod:`cProfile` profile for the
+    entire run, which can be written using :py:meth:`write_cprofile`.
+
+    The profiler must be started using :py:meth:`start` and stopped using
+    :py:meth:`stop` (or used as a context manager) before phases are
+    recorded.
+
+    Queries are only counted on the database connection for the thread that
+    started the profiler, and the :py:mod:`cProfile` profile only covers
+    that thread. When tasks are prepared in worker threads (with
+    ``prepare_workers`` greater than 1), the queries and function calls made
+    by those threads won't be included, though the time spent waiting for
+    them will be.
+
+    Version Added:
+        3.0
+
+    Attributes:
+        database_name (str):
+            The name of the database queries are counted on.
+
+        phases (list of dict):
+            The recorded phases, in the order they were started. Each
+            contains:
+
+            ``name`` (:py:class:`str`):
+                The name of the phase.
+
+            ``app_label`` (:py:class:`str`):
+                The app label the phase applies to, if any.
+
+            ``depth`` (:py:class:`int`):
+                The nesting depth of the phase, starting at 0.
+
+            ``duration`` (:py:class:`float`):
+                The number of seconds spent in the phase.
+
+            ``queries`` (:py:class:`int`):
+                The number of queries executed on the profiling thread's
+                connection during the phase.
+
+            ``peak_memory`` (:py:class:`int`):
+                The peak number of bytes allocated during the phase, beyond
+                what was allocated when the phase began, or ``None`` if
+                memory isn't being tracked.
+    """
+
+    def __init__(
+        self,
+        database_name: str = DEFAULT_DB_ALIAS,
+        use_cprofile: bool = False,
+        track_memory: bool = False,
+    ) -> None:
+        """Initialize the profiler.
+
+        Args:
+            database_name (str, optional):
+                The name of the database to count queries on.
+
+            use_cprofile (bool, optional):
+                Whether to collect a :py:mod:`cProfile` profile.
+
+            track_memory (bool, optional):
+                Whether to track peak memory usage using
+                :py:mod:`tracemalloc`. This is off by default, since it
+                slows down execution considerably.
+        """
+        self.database_name = database_name
+        self.phases: list[dict[str, Any]] = []
+
+        self._track_memory = track_memory
+        self._started_tracemalloc = False
+        self._cprofile = cProfile.Profile() if use_cprofile else None
+        self._query_count = 0
+        self._query_wrapper_cm = None
+        self._active_phases: list[dict[str, Any]] = []
+        self._start_time = None
+        self._total_duration = None
+
+    def __enter__(self) -> EvolutionProfiler:
+        """Start profiling as a context manager.
+
+        Context:
+            EvolutionProfiler:
+            This instance.
+        """
+        self.start()
+
+        return self
+
+    def __exit__(self, *args, **kwargs) -> None:
+        """Stop profiling when exiting the context manager.
+
+        Args:
+            *args (tuple, unused):
+                Unused positional arguments.
+
+            **kwargs (dict, unused):
+                Unused keyword arguments.
+        """
+        self.stop()
+
+    def start(self) -> None:
+        """Start profiling.
+
+        This will begin counting queries, tracking memory allocations, and
+        collecting a :py:mod:`cProfile` profile, if enabled.
+        """
+        assert self._start_time is None, 'The profiler was already started.'
+
+        self._query_wrapper_cm = \
+            connections[self.database_name].execute_wrapper(
+                self._count_query)
+        self._query_wrapper_cm.__enter__()
+
+        if self._track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+        if self._cprofile is not None:
+            self._cprofile.enable()
+
+        self._start_time = time.perf_counter()
+
+    def stop(self) -> None:
+        """Stop profiling."""
+        assert self._start_time is not None, 'The profiler was not started.'
+
+        self._total_duration = time.perf_counter() - self._start_time
+
+        if self._cprofile is not None:
+            self._cprofile.disable()
+
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+        self._query_wrapper_cm.__exit__(None, None, None)
+        self._query_wrapper_cm = None
+
+    @contextmanager
+    def phase(
+        self,
+        name: str,
+        app_label: (str | None) = None,
+    ) -> Iterator[None]:
+        """Record a phase of the evolution process.
+
+        Args:
+            name (str):
+                The name of the phase.
+
+            app_label (str, optional):
+                The app label the phase applies to, if any.
+
+        Context:
+            The phase will be recorded for the duration of the context.
+        """
+        track_memory = tracemalloc.is_tracing()
+        active_phases = self._active_phases
+
+        phase_info = {
+            'name': name,
+            'app_label': app_label,
+            'depth': len(active_phases),
+            'duration': 0.0,
+            'queries': 0,
+            'peak_memory': None,
+        }
+        self.phases.append(phase_info)
+
+        if track_memory:
+            # Store the peak for any phases we're nested within before
+            # resetting it for this phase.
+            self._update_peak_memory()
+            tracemalloc.reset_peak()
+
+            phase_info['_start_memory'] = tracemalloc.get_traced_memory()[0]
+            phase_info['_peak_memory'] = phase_info['_start_memory']
+
+        active_phases.append(phase_info)
+        start_queries = self._query_count
+        start_time = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            phase_info['duration'] = time.perf_counter() - start_time
+            phase_info['queries'] = self._query_count - start_queries
+
+            if track_memory and tracemalloc.is_tracing():
+                self._update_peak_memory()
+                phase_info['peak_memory'] = (phase_info.pop('_peak_memory') -
+                                             phase_info.pop('_start_memory'))
+            else:
+                phase_info.pop('_peak_memory', None)
+                phase_info.pop('_start_memory', None)
+
+            active_phases.pop()
+
+    def to_json(self) -> dict[str, Any]:
+        """Return a JSON-serializable report of the profiled phases.
+
+        Returns:
+            dict:
+            The report, containing ``database``, ``total_duration``,
+            ``total_queries``, and ``phases`` keys.
+        """
+        return {
+            'database': self.database_name,
+            'phases': [
+                dict(phase_info)
+                for phase_info in self.phases
+            ],
+            'total_duration': self._total_duration,
+            'total_queries': self._query_count,
+        }
+
+    def write_report(
+        self,
+        filename: str,
+    ) -> None:
+        """Write a JSON report of the profiled phases to a file.
+
+        Args:
+            filename (str):
+                The path to the file to write.
+        """
+        with open(filename, 'w', encoding='utf-8') as fp:
+            json.dump(self.to_json(), fp, indent=2, sort_keys=True)
+
+    def write_cprofile(
+        self,
+        filename: str,
+    ) -> None:
+        """Write the collected cProfile statistics to a file.
+
+        The file can be loaded using :py:mod:`pstats` or other profile
+        viewers.
+
+        Args:
+            filename (str):
+                The path to the file to write.
+        """
+        assert self._cprofile is not None, 'cProfile was not enabled.'
+
+        self._cprofile.dump_stats(filename)
+
+    def _update_peak_memory(self) -> None:
+        """Update the peak memory for all active phases."""
+        peak = tracemalloc.get_traced_memory()[1]
+
+        for phase_info in self._active_phases:
+            if '_peak_memory' in phase_info:
+                phase_info['_peak_memory'] = max(phase_info['_peak_memory'],
+                                                 peak)
+
+    def _count_query(self, execute, sql, params, many, context):
+        """Count a query executed on the database.
+
+        This is installed as a database execution wrapper.
+
+        Args:
+            execute (callable):
+                The function to execute the query.
+
+            sql (str):
+                The SQL to execute.
+
+            params (tuple):
+                The parameters for the SQL.
+
+            many (bool):
+                Whether the SQL is being executed for many sets of
+                parameters.
+
+            context (dict):
+                Context for the execution.
+
+        Returns:
+            object:
+            The result of the execution.
+        """
+        self._query_count += 1
+
+        return execute(sql, params, many, context)
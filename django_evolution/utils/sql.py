@@ -3,14 +3,20 @@
 from __future__ import annotations
 
 import logging
+import random
+import time
 from collections.abc import Callable, Sequence
 from typing import Any, TYPE_CHECKING
 
-from django.db import connections
+from django.db import DatabaseError, connections
 from django.db.backends.utils import CursorWrapper
 from django.db.transaction import atomic, TransactionManagementError
 
+from django_evolution.conf import django_evolution_settings
 from django_evolution.db import EvolutionOperationsMulti
+from django_evolution.signals import (executed_sql_batch,
+                                      executed_sql_statement,
+                                      executing_sql_batch)
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
@@ -18,6 +24,8 @@ if TYPE_CHECKING:
 
     from typing_extensions import Self
 
+    from django_evolution.evolve.base import BaseEvolutionTask
+
 
 logger = logging.getLogger(__name__)
 
@@ -93,13 +101,88 @@ SQLStatement: TypeAlias = (
 
 
 class NewTransactionSQL(BaseGroupedSQL):
-    """A list of SQL statements to execute in its own transaction."""
+    """A list of SQL statements to execute in its own transaction.
+
+    Any statements following these will be executed in a new transaction,
+    so that the transaction only contains these statements.
+
+    Version Changed:
+        3.0:
+        Statements following these are now executed in a new transaction,
+        rather than in this one.
+    """
 
 
 class NoTransactionSQL(BaseGroupedSQL):
     """A list of SQL statements to execute outside of a transaction."""
 
 
+class ChunkedSQL:
+    """SQL statements computed in chunks at the time of execution.
+
+    This wraps a callable that computes the statements to run from the
+    current contents of a table, such as ranges of rows to update in their
+    own transactions. It can be run like any other callable statement.
+
+    Reports on planned SQL can describe the work through a single statement
+    summarizing all chunks, without calling the function.
+
+    Version Added:
+        3.0
+
+    Attributes:
+        build_chunks (callable):
+            The function computing the statements, as allowed by
+            :py:func:`run_sql`.
+
+        sql (str or tuple):
+            A statement summarizing the work of all chunks. This is only
+            used for reporting, and won't be executed.
+
+        table_name (str):
+            The name of the table being operated on.
+    """
+
+    def __init__(
+        self,
+        sql: str | tuple[Any, ...],
+        table_name: str,
+        build_chunks: Callable[[CursorWrapper],
+                               Sequence[SQLStatement]],
+    ) -> None:
+        """Initialize the chunked SQL.
+
+        Args:
+            sql (str or tuple):
+                A statement summarizing the work of all chunks.
+
+            table_name (str):
+                The name of the table being operated on.
+
+            build_chunks (callable):
+                The function computing the statements.
+        """
+        self.sql = sql
+        self.table_name = table_name
+        self.build_chunks = build_chunks
+
+    def __call__(
+        self,
+        cursor: CursorWrapper,
+    ) -> Sequence[SQLStatement]:
+        """Compute the statements to run.
+
+        Args:
+            cursor (django.db.backends.utils.CursorWrapper):
+                The cursor used to inspect the table.
+
+        Returns:
+            list:
+            The list of statements to run.
+        """
+        return self.build_chunks(cursor)
+
+
 class SQLExecutor:
     """Management for the execution of SQL.
 
@@ -112,14 +195,50 @@ class SQLExecutor:
     Through this, it can effectively script a set of transactions and queries
     in a more loose form than normally allowed by Django.
 
+    If ``settings.DJANGO_EVOLUTION['LOCK_TIMEOUT']`` is set, statements
+    will give up waiting on locks after the timeout, and will be retried
+    (with a backoff) up to
+    ``settings.DJANGO_EVOLUTION['LOCK_TIMEOUT_RETRIES']`` times. Transactions
+    are retried in full, while statements outside of a transaction are
+    retried individually.
+
+    If ``settings.DJANGO_EVOLUTION['SQL_BATCH_SIZE']`` is set, multiple
+    statements in a transaction may be sent to the database in a single
+    round trip.
+
     Version Added:
         2.1
+
+    Version Changed:
+        3.0:
+        Added support for lock timeouts and retries, and for executing
+        multiple statements in a single round trip.
     """
 
     ######################
     # Instance variables #
     ######################
 
+    #: Information on statements that were retried due to lock timeouts.
+    #:
+    #: Each entry is a dictionary containing:
+    #:
+    #: ``sql`` (:py:class:`str`):
+    #:     The statement that failed to acquire a lock.
+    #:
+    #: ``params`` (:py:class:`tuple`):
+    #:     The parameters for the statement.
+    #:
+    #: ``retries`` (:py:class:`int`):
+    #:     The number of times the statement (or its transaction) was retried.
+    #:
+    #: ``wait_time`` (:py:class:`float`):
+    #:     The total number of seconds spent waiting between retries.
+    #:
+    #: Version Added:
+    #:     3.0
+    lock_retries: list[dict[str, Any]]
+
     #: The database cursor.
     _cursor: CursorWrapper | None
 
@@ -151,6 +270,8 @@ class SQLExecutor:
         self._evolver_backend = None
         self._latest_transaction = None
 
+        self.lock_retries = []
+
     def __enter__(self) -> Self:
         """Enter the context manager.
 
@@ -182,21 +303,34 @@ class SQLExecutor:
 
         return self
 
-    def __exit__(self, *args, **kwargs) -> None:
+    def __exit__(self, exc_type, exc_value, tb) -> None:
         """Exit the context manager.
 
         This will commit any transaction that may be in progress, close the
         database cursor, and re-enable constraint checking if it were
         previously disabled.
 
+        If exiting due to an error, the transaction will be rolled back
+        instead.
+
+        Version Changed:
+            3.0:
+            Transactions are now rolled back when exiting due to an error.
+
         Args:
-            *args (tuple, unused):
-                Unused positional arguments.
+            exc_type (type):
+                The type of error raised within the context, if any.
+
+            exc_value (Exception):
+                The error raised within the context, if any.
 
-            **kwargs (dict, unused):
-                Unused keyword arguments.
+            tb (traceback):
+                The traceback for the error, if any.
         """
-        self.finish_transaction()
+        if exc_value is None:
+            self.finish_transaction()
+        else:
+            self._rollback_transaction(exc_value)
 
         assert self._cursor is not None
         self._cursor.close()
@@ -213,7 +347,7 @@ class SQLExecutor:
         """
         self.finish_transaction()
 
-        transaction = atomic()
+        transaction = atomic(using=self._database)
         transaction.__enter__()
         self._latest_transaction = transaction
 
@@ -238,9 +372,22 @@ class SQLExecutor:
         sql: Sequence[SQLStatement],
         capture: bool = False,
         execute: bool = False,
+        task: (BaseEvolutionTask | None) = None,
     ) -> Sequence[str]:
         """Run (execute and/or capture) a list of SQL statements.
 
+        When executing, the
+        :py:data:`~django_evolution.signals.executing_sql_batch`,
+        :py:data:`~django_evolution.signals.executed_sql_batch`, and
+        :py:data:`~django_evolution.signals.executed_sql_statement` signals
+        will be emitted with timing information, and a debug log record
+        will be emitted for each statement with the same information in a
+        ``sql_execution`` attribute.
+
+        Version Changed:
+            3.0:
+            Added the ``task`` argument, and timing signals.
+
         Args:
             sql (list):
                 A list of SQL statements. Each entry might be a string, a
@@ -254,6 +401,10 @@ class SQLExecutor:
             execute (bool, optional):
                 Whether to execute any executed SQL statements and return them.
 
+            task (django_evolution.evolve.base.BaseEvolutionTask, optional):
+                The task executing the SQL. This will be provided in any
+                signals and log records.
+
         Returns:
             list of str:
             The list of SQL statements executed, if passing
@@ -265,9 +416,8 @@ class SQLExecutor:
                 existing transaction.
         """
         assert self._evolver_backend is not None
+        assert self._cursor is not None
         qp = self._evolver_backend.quote_sql_param
-        cursor = self._cursor
-        assert cursor is not None
 
         statement = None
         params = None
@@ -295,20 +445,14 @@ class SQLExecutor:
                             'information.')
 
             for i, (batch, use_transaction) in enumerate(batches):
-                if execute:
-                    if use_transaction:
-                        self.new_transaction()
-                    else:
-                        self.finish_transaction()
-
-                if capture and i > 0:
-                    if use_transaction:
-                        out_sql.append('-- Start of a new transaction:')
-                    else:
-                        out_sql.append('-- Run outside of a transaction:')
+                if capture:
+                    if i > 0:
+                        if use_transaction:
+                            out_sql.append('-- Start of a new transaction:')
+                        else:
+                            out_sql.append('-- Run outside of a transaction:')
 
-                for statement, params in batch:
-                    if capture:
+                    for statement, params in batch:
                         if params:
                             out_sql.append(statement % tuple(
                                 qp(param)
@@ -317,20 +461,420 @@ class SQLExecutor:
                         else:
                             out_sql.append(statement)
 
-                    if execute:
-                        cursor.execute(statement, params)
+                if execute:
+                    self._execute_batch(batch=batch,
+                                        use_transaction=use_transaction,
+                                        batch_index=i,
+                                        task=task)
+
+                statement, params = batch[-1]
         except Exception as e:
             # Augment the exception so that callers can get the SQL statement
-            # that failed.
-            e.last_sql_statement = (statement, params)
+            # that failed, if it wasn't already set when executing it.
+            if not hasattr(e, 'last_sql_statement'):
+                e.last_sql_statement = (statement, params)
 
             raise
 
         return out_sql
 
+    def _execute_batch(
+        self,
+        batch: Sequence[tuple[str, tuple[Any, ...] | None]],
+        use_transaction: bool,
+        batch_index: int = 0,
+        task: (BaseEvolutionTask | None) = None,
+    ) -> None:
+        """Execute a batch of SQL statements.
+
+        If a lock timeout is configured, it will be set for the batch, and
+        any statements failing due to the timeout will be retried after a
+        backoff delay.
+
+        If the batch is run in a transaction that can be rolled back, the
+        transaction will be rolled back and the full batch retried.
+        Otherwise, only the failed statement will be retried, since prior
+        statements have already taken effect.
+
+        If ``settings.DJANGO_EVOLUTION['SQL_BATCH_SIZE']`` is set, and the
+        database supports it, statements in a transaction will be sent to the
+        database in groups. If a group fails, it will be rolled back and its
+        statements executed individually, so that the failed statement can
+        be reported. If it failed due to a lock timeout, the group will be
+        retried as a whole instead.
+
+        If a statement fails, the evolution operations backend may provide
+        a fallback statement to run in its place (see
+        :py:meth:`BaseEvolutionOperations.get_sql_statement_fallback()
+        <django_evolution.db.common.BaseEvolutionOperations.
+        get_sql_statement_fallback>`).
+
+        The lock timeout is restored once the batch has finished, whether
+        or not it succeeded.
+
+        Version Added:
+            3.0
+
+        Args:
+            batch (list of tuple):
+                The list of statements and parameters to execute.
+
+            use_transaction (bool):
+                Whether to execute the statements in a transaction.
+
+            batch_index (int, optional):
+                The index of the batch within the call to :py:meth:`run_sql`.
+
+            task (django_evolution.evolve.base.BaseEvolutionTask, optional):
+                The task executing the SQL.
+
+        Raises:
+            Exception:
+                A statement failed to execute, and could not be retried.
+                This will have a ``last_sql_statement`` attribute set to the
+                statement and parameters that failed.
+        """
+        cursor = self._cursor
+        evolver_backend = self._evolver_backend
+        assert cursor is not None
+        assert evolver_backend is not None
+
+        lock_timeout = django_evolution_settings.LOCK_TIMEOUT
+        max_retries = django_evolution_settings.LOCK_TIMEOUT_RETRIES
+        retry_transaction = (use_transaction and
+                             self._connection.features.can_rollback_ddl)
+        retries = 0
+        start_index = 0
+        retry_info = None
+
+        signal_kwargs = {
+            'app_label': getattr(task, 'app_label', None),
+            'batch_index': batch_index,
+            'database': self._database,
+            'task': task,
+            'use_transaction': use_transaction,
+        }
+
+        executing_sql_batch.send(sender=self,
+                                 num_statements=len(batch),
+                                 **signal_kwargs)
+        batch_start_time = time.perf_counter()
+
+        try:
+            while True:
+                if use_transaction:
+                    if retry_transaction or retries == 0:
+                        self.new_transaction()
+                else:
+                    self.finish_transaction()
+
+                index = None
+                statement = None
+                params = None
+
+                try:
+                    if lock_timeout:
+                        for statement in evolver_backend.get_lock_timeout_sql(
+                            lock_timeout, use_transaction):
+                            cursor.execute(statement)
+
+                    index = start_index
+                    ungrouped_end = start_index
+
+                    while index < len(batch):
+                        if use_transaction and index >= ungrouped_end:
+                            group_size = self._get_statement_group_size(
+                                batch, index)
+                        else:
+                            group_size = 1
+
+                        if group_size > 1:
+                            statements = [
+                                group_statement
+                                for group_statement, group_params in
+                                batch[index:index + group_size]
+                            ]
+                            statement = \
+                                evolver_backend.get_multi_statement_sql(
+                                    statements)
+                            params = None
+
+                            try:
+                                self._execute_statement(statement, None,
+                                                        signal_kwargs)
+                            except DatabaseError as e:
+                                # Roll back anything run as part of this
+                                # group.
+                                cursor.execute(
+                                    evolver_backend
+                                    .get_multi_statement_rollback_sql())
+
+                                if (lock_timeout and
+                                    evolver_backend.is_lock_timeout_error(e)):
+                                    # Running the statements individually
+                                    # would only wait out the lock timeout
+                                    # again, so retry the group as a whole.
+                                    raise
+
+                                # Run the statements individually so that
+                                # the failed statement can be reported.
+                                ungrouped_end = index + group_size
+                            else:
+                                index += group_size
+                        else:
+                            statement, params = batch[index]
+
+                            try:
+                                self._execute_statement(statement, params,
+                                                        signal_kwargs)
+                            except DatabaseError as e:
+                                fallback_statement = \
+                                    evolver_backend.get_sql_statement_fallback(
+                                        statement, e)
+
+                                if fallback_statement is None:
+                                    raise
+
+                                statement = fallback_statement
+                                self._execute_statement(statement, params,
+                                                        signal_kwargs)
+
+                            index += 1
+
+                    index = None
+                    params = None
+
+                    executed_sql_batch.send(
+                        sender=self,
+                        num_statements=len(batch),
+                        duration=time.perf_counter() - batch_start_time,
+                        **signal_kwargs)
+
+                    return
+                except Exception as e:
+                    e.last_sql_statement = (statement, params)
+
+                    if (index is None or
+                        not lock_timeout or
+                        retries >= max_retries or
+                        not evolver_backend.is_lock_timeout_error(e)):
+                        raise
+
+                    retries += 1
+
+                    if retry_transaction:
+                        # Roll back everything in the transaction and
+                        # start over.
+                        self._rollback_transaction(e)
+                    else:
+                        start_index = index
+
+                    delay = self._get_lock_retry_delay(retries)
+
+                    if retry_info is None or retry_info['sql'] != statement:
+                        retry_info = {
+                            'params': params,
+                            'retries': 0,
+                            'sql': statement,
+                            'wait_time': 0.0,
+                        }
+                        self.lock_retries.append(retry_info)
+
+                    retry_info['retries'] += 1
+                    retry_info['wait_time'] += delay
+
+                    logger.warning('Timed out waiting for a lock when '
+                                   'executing SQL (attempt %s of %s). '
+                                   'Retrying in %.2f seconds: %s',
+                                   retries, max_retries + 1, delay, statement)
+
+                    time.sleep(delay)
+        finally:
+            if lock_timeout:
+                # This must be reset even if the batch failed, since the
+                # timeout may have been set for the whole session.
+                self._reset_lock_timeout(use_transaction)
+
+    def _execute_statement(
+        self,
+        statement: str,
+        params: (tuple[Any, ...] | None),
+        signal_kwargs: dict[str, Any],
+    ) -> None:
+        """Execute and time a single SQL statement.
+
+        This will emit the
+        :py:data:`~django_evolution.signals.executed_sql_statement` signal
+        and a debug log record once the statement has executed.
+
+        Version Added:
+            3.0
+
+        Args:
+            statement (str):
+                The SQL statement to execute.
+
+            params (tuple):
+                The parameters for the statement, if any.
+
+            signal_kwargs (dict):
+                Information on the batch being executed, to include in the
+                signal and log record.
+        """
+        cursor = self._cursor
+        assert cursor is not None
+
+        start_time = time.perf_counter()
+        cursor.execute(statement, params)
+        duration = time.perf_counter() - start_time
+
+        rowcount = cursor.rowcount
+
+        if rowcount is None:
+            rowcount = -1
+
+        executed_sql_statement.send(sender=self,
+                                    sql=statement,
+                                    params=params,
+                                    duration=duration,
+                                    rowcount=rowcount,
+                                    **signal_kwargs)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Executed SQL in %.3f seconds (%s rows): %s',
+                duration, rowcount, statement,
+                extra={
+                    'sql_execution': {
+                        'app_label': signal_kwargs['app_label'],
+                        'batch_index': signal_kwargs['batch_index'],
+                        'database': signal_kwargs['database'],
+                        'duration': duration,
+                        'params': params,
+                        'rowcount': rowcount,
+                        'sql': statement,
+                        'use_transaction': signal_kwargs['use_transaction'],
+                    },
+                })
+
+    def _reset_lock_timeout(
+        self,
+        use_transaction: bool,
+    ) -> None:
+        """Restore the default lock timeout after executing a batch.
+
+        Errors restoring the timeout are logged, rather than raised, so that
+        they don't mask any error from executing the batch.
+
+        Version Added:
+            3.0
+
+        Args:
+            use_transaction (bool):
+                Whether the batch of statements was run in a transaction.
+        """
+        assert self._cursor is not None
+        assert self._evolver_backend is not None
+
+        try:
+            for statement in self._evolver_backend.get_reset_lock_timeout_sql(
+                use_transaction):
+                self._cursor.execute(statement)
+        except DatabaseError:
+            logger.exception('Unable to restore the lock timeout after '
+                             'executing SQL.')
+
+    def _get_statement_group_size(
+        self,
+        batch: Sequence[tuple[str, tuple[Any, ...] | None]],
+        index: int,
+    ) -> int:
+        """Return the number of statements to execute in one round trip.
+
+        This will group consecutive statements without parameters, up to
+        ``settings.DJANGO_EVOLUTION['SQL_BATCH_SIZE']``, if the database
+        supports executing multiple statements at once.
+
+        Version Added:
+            3.0
+
+        Args:
+            batch (list of tuple):
+                The list of statements and parameters in the batch.
+
+            index (int):
+                The index of the first statement in the group.
+
+        Returns:
+            int:
+            The number of statements to group together, starting at
+            ``index``. This will be 1 if statements should not be grouped.
+        """
+        assert self._evolver_backend is not None
+
+        max_size = django_evolution_settings.SQL_BATCH_SIZE
+
+        if (not max_size or
+            not self._evolver_backend.supports_multi_statement_sql):
+            return 1
+
+        end = min(index + max_size, len(batch))
+        size = 0
+
+        while index + size < end and not batch[index + size][1]:
+            size += 1
+
+        return max(size, 1)
+
+    def _rollback_transaction(
+        self,
+        error: Exception,
+    ) -> None:
+        """Roll back the current transaction after an error.
+
+        Version Added:
+            3.0
+
+        Args:
+            error (Exception):
+                The error that caused the rollback.
+        """
+        transaction = self._latest_transaction
+
+        if transaction:
+            self._latest_transaction = None
+            transaction.__exit__(type(error), error, error.__traceback__)
+
+    def _get_lock_retry_delay(
+        self,
+        retries: int,
+    ) -> float:
+        """Return the time to wait before retrying after a lock timeout.
+
+        This uses an exponential backoff based on the number of retries,
+        with half of the delay randomized to avoid retrying in lockstep with
+        other clients waiting on the same locks.
+
+        Version Added:
+            3.0
+
+        Args:
+            retries (int):
+                The number of the retry about to be performed, starting at 1.
+
+        Returns:
+            float:
+            The number of seconds to wait.
+        """
+        backoff = (django_evolution_settings.LOCK_TIMEOUT_RETRY_DELAY *
+                   (2 ** (retries - 1)))
+
+        return backoff / 2 + random.uniform(0, backoff / 2)
+
     def _prepare_sql(
         self,
         sql: Sequence[SQLStatement],
+        _state: (dict[str, bool] | None) = None,
     ) -> Iterator[PreparedSQLStatement]:
         """Prepare batches of SQL statements for execution.
 
@@ -339,10 +883,19 @@ class SQLExecutor:
 
         All comments and blank lines will be filtered out.
 
+        Version Changed:
+            3.0:
+            Statements following a :py:class:`NewTransactionSQL` are now
+            flagged as starting a new transaction.
+
         Args:
             sql (list of SQLStatement):
                 A list of SQL statements.
 
+            _state (dict, optional):
+                State shared with calls for nested statements. This is
+                internal.
+
         Yields:
             PreparedSQLStatement:
             A tuple containing a statement to execute, in order
@@ -351,19 +904,28 @@ class SQLExecutor:
         assert self._evolver_backend is not None
         normalize_value = self._evolver_backend.normalize_value
 
+        if _state is None:
+            _state = {
+                'end_transaction': False,
+            }
+
         for statements in sql:
             if callable(statements):
                 statements = statements(self._cursor)
 
-                yield from self._prepare_sql(statements)
+                yield from self._prepare_sql(statements, _state)
             else:
-                new_transaction = False
+                # If the last statements were in their own transaction, these
+                # will need to start a new one.
+                new_transaction = _state['end_transaction']
+                end_transaction = False
 
                 if isinstance(statements, NoTransactionSQL):
                     use_transaction = False
                     statements = statements.sql
                 elif isinstance(statements, NewTransactionSQL):
                     new_transaction = True
+                    end_transaction = True
                     use_transaction = True
                     statements = statements.sql
                 else:
@@ -396,6 +958,7 @@ class SQLExecutor:
                         # If we've set this above, reset it. We only want the
                         # first statement in a batch to flag a new transaction.
                         new_transaction = False
+                        _state['end_transaction'] = end_transaction
 
     def _prepare_transaction_batches(
         self,
@@ -0,0 +1,5 @@
+"""Benchmarks for measuring how Django Evolution scales.
+
+These are run through :file:`tests/runbenchmarks.py`, and operate on a
+synthetic project generated by :py:mod:`tests.benchmarks.project`.
+"""
@@ -0,0 +1,280 @@
+"""Generation of synthetic projects for benchmarks."""
+
+from __future__ import annotations
+
+import os
+
+
+class ProjectSpec:
+    """The shape of a synthetic project used for benchmarks.
+
+    Each app contains a number of models. Each model contains a number of
+    fields (some of which are indexed), a foreign key to the previous model
+    in the app (or the first model of the previous app), a composite index,
+    and a unique constraint.
+
+    Each app also contains a number of historical evolutions, each adding
+    a field to one of the models. The first evolution of each app depends
+    on the evolutions of the previous app.
+
+    Attributes:
+        num_apps (int):
+            The number of apps to generate.
+
+        num_models (int):
+            The number of models to generate per app.
+
+        num_fields (int):
+            The number of fields to generate per model, not including
+            foreign keys or fields added by evolutions.
+
+        num_evolutions (int):
+            The number of historical evolutions to generate per app.
+    """
+
+    def __init__(self, num_apps=10, num_models=10, num_fields=10,
+                 num_evolutions=5):
+        """Initialize the specification.
+
+        Args:
+            num_apps (int, optional):
+                The number of apps to generate.
+
+            num_models (int, optional):
+                The number of models to generate per app.
+
+            num_fields (int, optional):
+                The number of fields to generate per model.
+
+            num_evolutions (int, optional):
+                The number of historical evolutions to generate per app.
+        """
+        assert num_apps > 0
+        assert num_models > 0
+        assert num_fields >= 2
+        assert num_evolutions >= 0
+
+        self.num_apps = num_apps
+        self.num_models = num_models
+        self.num_fields = num_fields
+        self.num_evolutions = num_evolutions
+
+    @property
+    def app_labels(self):
+        """The labels of all apps in the project.
+
+        Type:
+            list of str
+        """
+        return [
+            'bench_app_%s' % i
+            for i in range(self.num_apps)
+        ]
+
+    def get_evolution_labels(self):
+        """Return the labels of the evolutions for each app.
+
+        Returns:
+            list of str:
+            The evolution labels, in sequence order.
+        """
+        return [
+            'bench_evolution_%s' % i
+            for i in range(self.num_evolutions)
+        ]
+
+    def get_evolved_fields(self, model_index):
+        """Return the fields added to a model through evolutions.
+
+        Args:
+            model_index (int):
+                The index of the model in the app.
+
+        Returns:
+            list of tuple:
+            A list of ``(evolution_label, field_name)`` tuples.
+        """
+        return [
+            (label, 'evolved_field_%s' % i)
+            for i, label in enumerate(self.get_evolution_labels())
+            if i % self.num_models == model_index
+        ]
+
+    def to_json(self):
+        """Return a JSON-serializable version of the specification.
+
+        Returns:
+            dict:
+            The specification.
+        """
+        return {
+            'num_apps': self.num_apps,
+            'num_evolutions': self.num_evolutions,
+            'num_fields': self.num_fields,
+            'num_models': self.num_models,
+        }
+
+
+def generate_project(spec, path):
+    """Generate the apps for a synthetic project.
+
+    Each app will be written as a Python package in the provided path,
+    which must be added to :py:data:`sys.path` before the apps can be
+    used.
+
+    Args:
+        spec (ProjectSpec):
+            The specification for the project.
+
+        path (str):
+            The directory to write the apps to.
+
+    Returns:
+        list of str:
+        The module names of the generated apps, suitable for
+        ``settings.INSTALLED_APPS``.
+    """
+    app_labels = spec.app_labels
+
+    for app_index, app_label in enumerate(app_labels):
+        if app_index > 0:
+            prev_app_label = app_labels[app_index - 1]
+        else:
+            prev_app_label = None
+
+        app_dir = os.path.join(path, app_label)
+        evolutions_dir = os.path.join(app_dir, 'evolutions')
+        os.makedirs(evolutions_dir)
+
+        _write_file(os.path.join(app_dir, '__init__.py'), [])
+        _write_file(os.path.join(app_dir, 'models.py'),
+                    _generate_models(spec, app_label, prev_app_label))
+
+        evolution_labels = spec.get_evolution_labels()
+
+        _write_file(
+            os.path.join(evolutions_dir, '__init__.py'),
+            ['SEQUENCE = ['] +
+            [
+                '    %r,' % label
+                for label in evolution_labels
+            ] +
+            [']'])
+
+        for model_index in range(spec.num_models):
+            for label, field_name in spec.get_evolved_fields(model_index):
+                lines = [
+                    'from django.db import models',
+                    '',
+                    'from django_evolution.mutations import AddField',
+                    '',
+                ]
+
+                if prev_app_label and label == evolution_labels[0]:
+                    lines += [
+                        'AFTER_EVOLUTIONS = [%r]' % prev_app_label,
+                        '',
+                    ]
+
+                lines += [
+                    'MUTATIONS = [',
+                    '    AddField(%r, %r, models.IntegerField, null=True),'
+                    % ('Model%s' % model_index, field_name),
+                    ']',
+                ]
+
+                _write_file(os.path.join(evolutions_dir, '%s.py' % label),
+                            lines)
+
+    return app_labels
+
+
+def _generate_models(spec, app_label, prev_app_label):
+    """Return the lines for an app's models.py.
+
+    Args:
+        spec (ProjectSpec):
+            The specification for the project.
+
+        app_label (str):
+            The label of the app.
+
+        prev_app_label (str):
+            The label of the previous app, if any.
+
+    Returns:
+        list of str:
+        The lines of the file.
+    """
+    lines = [
+        'from django.db import models',
+    ]
+
+    for model_index in range(spec.num_models):
+        model_name = 'Model%s' % model_index
+
+        lines += [
+            '',
+            '',
+            'class %s(models.Model):' % model_name,
+        ]
+
+        for field_index in range(spec.num_fields):
+            field_name = 'field_%s' % field_index
+
+            if field_index % 3 == 0:
+                lines.append('    %s = models.CharField(max_length=100, '
+                             'db_index=True)'
+                             % field_name)
+            elif field_index % 3 == 1:
+                lines.append('    %s = models.IntegerField(default=0)'
+                             % field_name)
+            else:
+                lines.append('    %s = models.BooleanField(default=False)'
+                             % field_name)
+
+        if model_index > 0:
+            lines.append("    parent = models.ForeignKey('Model%s', "
+                         "on_delete=models.CASCADE)"
+                         % (model_index - 1))
+        elif prev_app_label:
+            lines.append("    parent = models.ForeignKey('%s.Model0', "
+                         "on_delete=models.CASCADE)"
+                         % prev_app_label)
+
+        for label, field_name in spec.get_evolved_fields(model_index):
+            lines.append('    %s = models.IntegerField(null=True)'
+                         % field_name)
+
+        lines += [
+            '',
+            '    class Meta:',
+            '        indexes = [',
+            "            models.Index(fields=['field_0', 'field_1'],",
+            "                         name='%s_m%s_idx')," % (app_label,
+                                                           model_index),
+            '        ]',
+            '        constraints = [',
+            "            models.UniqueConstraint(fields=['field_0', "
+            "'field_1'],",
+            "                                    name='%s_m%s_uniq'),"
+            % (app_label, model_index),
+            '        ]',
+        ]
+
+    return lines
+
+
+def _write_file(filename, lines):
+    """Write lines to a file.
+
+    Args:
+        filename (str):
+            The name of the file to write.
+
+        lines (list of str):
+            The lines to write.
+    """
+    with open(filename, 'w', encoding='utf-8') as fp:
+        fp.write('\n'.join(lines))
+        fp.write('\n')
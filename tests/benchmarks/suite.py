@@ -0,0 +1,273 @@
+"""The benchmarks run against a synthetic project."""
+
+from __future__ import annotations
+
+import logging
+import os
+import platform
+import statistics
+import time
+
+import django
+from django.db import connections
+from django.db.utils import DEFAULT_DB_ALIAS
+
+import django_evolution
+from django_evolution.db.state import DatabaseState
+from django_evolution.diff import Diff
+from django_evolution.evolve import Evolver
+from django_evolution.models import Evolution
+from django_evolution.mutators import AppMutator
+from django_evolution.signature import ProjectSignature
+from django_evolution.utils.apps import get_app, get_app_label
+from django_evolution.utils.evolutions import (get_app_mutations,
+                                               get_evolution_sequence)
+from django_evolution.utils.graph import EvolutionGraph
+
+
+logger = logging.getLogger(__name__)
+
+
+class BenchmarkSuite:
+    """Runs benchmarks against a synthetic project.
+
+    The synthetic project's apps must already be installed, and the
+    default database must be a file-based SQLite database, which will be
+    recreated for each run of the evolve benchmark.
+
+    Attributes:
+        repeat (int):
+            The number of times each benchmark is run.
+
+        results (dict):
+            The results of each benchmark, keyed by name.
+
+        spec (tests.benchmarks.project.ProjectSpec):
+            The specification for the synthetic project.
+    """
+
+    def __init__(self, spec, repeat=5):
+        """Initialize the suite.
+
+        Args:
+            spec (tests.benchmarks.project.ProjectSpec):
+                The specification for the synthetic project.
+
+            repeat (int, optional):
+                The number of times each benchmark is run.
+        """
+        self.spec = spec
+        self.repeat = repeat
+        self.results = {}
+
+    def run(self):
+        """Run all benchmarks.
+
+        The evolve benchmarks are run first, since all other benchmarks work
+        against the evolved database. The speedup of a fresh install over
+        a normal evolve is recorded in the ``fresh_install_evolve`` results.
+
+        Returns:
+            dict:
+            The JSON-serializable results, suitable for comparing between
+            releases.
+        """
+        apps = [
+            get_app(app_label)
+            for app_label in self.spec.app_labels
+        ]
+
+        self.benchmark('evolve',
+                       self._evolve,
+                       setup=self._reset_database)
+        self.benchmark('fresh_install_evolve',
+                       lambda: self._evolve(fresh_install=True),
+                       setup=self._reset_database)
+
+        fresh_install_results = self.results['fresh_install_evolve']
+        fresh_install_results['speedup'] = (
+            self.results['evolve']['min'] / fresh_install_results['min'])
+
+        logger.info('fresh_install_evolve speedup: %.2fx',
+                    fresh_install_results['speedup'])
+
+        project_sig = ProjectSignature.from_database(DEFAULT_DB_ALIAS)
+        serialized_sig = project_sig.serialize()
+        orig_project_sig = self._make_unevolved_project_sig(project_sig)
+
+        self.benchmark(
+            'signature_from_database',
+            lambda: ProjectSignature.from_database(DEFAULT_DB_ALIAS))
+        self.benchmark('signature_serialize',
+                       project_sig.serialize)
+        self.benchmark(
+            'signature_deserialize',
+            lambda: ProjectSignature.deserialize(serialized_sig))
+        self.benchmark(
+            'diff',
+            lambda: Diff(orig_project_sig, project_sig).evolution())
+        self.benchmark(
+            'evolution_graph',
+            lambda: self._build_evolution_graph(apps))
+
+        database_state = DatabaseState(DEFAULT_DB_ALIAS)
+        app_mutations = [
+            (app, get_app_mutations(app))
+            for app in apps
+        ]
+
+        self.benchmark(
+            'app_mutator_sql',
+            lambda: self._generate_mutation_sql(
+                app_mutations=app_mutations,
+                project_sig=orig_project_sig,
+                database_state=database_state))
+
+        return self.to_json()
+
+    def benchmark(self, name, func, setup=None):
+        """Run a benchmark and record its results.
+
+        Args:
+            name (str):
+                The name of the benchmark.
+
+            func (callable):
+                The function to time.
+
+            setup (callable, optional):
+                A function to call before each run. This is not timed.
+        """
+        timings = []
+
+        for i in range(self.repeat):
+            if setup is not None:
+                setup()
+
+            start_time = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start_time)
+
+        self.results[name] = {
+            'max': max(timings),
+            'mean': statistics.mean(timings),
+            'median': statistics.median(timings),
+            'min': min(timings),
+            'timings': timings,
+        }
+
+        logger.info('%s: %.4fs (min of %s)', name, min(timings), self.repeat)
+
+    def to_json(self):
+        """Return the JSON-serializable results.
+
+        Returns:
+            dict:
+            The results, containing ``environment``, ``project``, and
+            ``results`` keys.
+        """
+        return {
+            'environment': {
+                'django': django.get_version(),
+                'django_evolution': django_evolution.get_package_version(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+            },
+            'project': dict(self.spec.to_json(),
+                            repeat=self.repeat),
+            'results': self.results,
+        }
+
+    def _reset_database(self):
+        """Reset the SQLite database to an empty state."""
+        connection = connections[DEFAULT_DB_ALIAS]
+        db_name = connection.settings_dict['NAME']
+
+        connection.close()
+
+        if os.path.exists(db_name):
+            os.unlink(db_name)
+
+    def _evolve(self, fresh_install=False):
+        """Evolve all apps on an empty database.
+
+        Args:
+            fresh_install (bool, optional):
+                Whether to use the fast path for fresh installs.
+        """
+        evolver = Evolver(fresh_install=fresh_install)
+        evolver.queue_evolve_all_apps()
+        evolver.evolve()
+
+    def _make_unevolved_project_sig(self, project_sig):
+        """Return a project signature prior to applying evolutions.
+
+        Args:
+            project_sig (django_evolution.signature.ProjectSignature):
+                The project signature for the evolved project.
+
+        Returns:
+            django_evolution.signature.ProjectSignature:
+            The project signature without any fields added by evolutions.
+        """
+        orig_project_sig = project_sig.clone()
+
+        for app_label in self.spec.app_labels:
+            app_sig = orig_project_sig.get_app_sig(app_label, required=True)
+
+            for model_index in range(self.spec.num_models):
+                model_sig = app_sig.get_model_sig('Model%s' % model_index,
+                                                  required=True)
+
+                for label, field_name in \
+                        self.spec.get_evolved_fields(model_index):
+                    model_sig.remove_field_sig(field_name)
+
+        return orig_project_sig
+
+    def _build_evolution_graph(self, apps):
+        """Build and order an evolution graph for all apps.
+
+        Args:
+            apps (list of module):
+                The apps to add to the graph.
+        """
+        graph = EvolutionGraph()
+
+        for app in apps:
+            graph.add_evolutions(
+                app=app,
+                evolutions=[
+                    Evolution(app_label=get_app_label(app),
+                              label=label)
+                    for label in get_evolution_sequence(app)
+                ])
+
+        graph.finalize()
+        list(graph.iter_batches())
+
+    def _generate_mutation_sql(self, app_mutations, project_sig,
+                               database_state):
+        """Generate SQL for all evolutions on all apps.
+
+        Args:
+            app_mutations (list of tuple):
+                A list of ``(app, mutations)`` tuples.
+
+            project_sig (django_evolution.signature.ProjectSignature):
+                The project signature to mutate. This will be cloned.
+
+            database_state (django_evolution.db.state.DatabaseState):
+                The database state to mutate. This will be cloned.
+        """
+        project_sig = project_sig.clone()
+        database_state = database_state.clone()
+
+        for app, mutations in app_mutations:
+            app_mutator = AppMutator(
+                app_label=get_app_label(app),
+                project_sig=project_sig,
+                database_state=database_state,
+                database=DEFAULT_DB_ALIAS)
+            app_mutator.run_mutations(mutations)
+            app_mutator.to_sql()
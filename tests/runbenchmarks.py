@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""Run benchmarks against a synthetic project.
+
+This generates a project with a configurable number of apps, models,
+fields, and evolutions, and times the major operations performed by
+Django Evolution against a SQLite database. Results are written as JSON,
+so they can be compared between releases.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+
+import django
+from django.conf import settings
+
+
+top_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, top_dir)
+
+
+def main():
+    """Run the benchmarks."""
+    parser = argparse.ArgumentParser(
+        description='Run benchmarks against a synthetic project.')
+    parser.add_argument(
+        '--apps',
+        type=int,
+        default=10,
+        help='The number of apps to generate.')
+    parser.add_argument(
+        '--models',
+        type=int,
+        default=10,
+        help='The number of models to generate per app.')
+    parser.add_argument(
+        '--fields',
+        type=int,
+        default=10,
+        help='The number of fields to generate per model (minimum 2).')
+    parser.add_argument(
+        '--evolutions',
+        type=int,
+        default=5,
+        help='The number of historical evolutions to generate per app.')
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=5,
+        help='The number of times to run each benchmark.')
+    parser.add_argument(
+        '-o',
+        '--output',
+        help='The file to write JSON results to. Defaults to standard '
+             'output.')
+    options = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO,
+                        format='%(message)s',
+                        stream=sys.stderr)
+
+    from tests.benchmarks.project import ProjectSpec, generate_project
+
+    spec = ProjectSpec(num_apps=options.apps,
+                       num_models=options.models,
+                       num_fields=options.fields,
+                       num_evolutions=options.evolutions)
+
+    tempdir = tempfile.mkdtemp(prefix='django-evolution-bench.')
+
+    try:
+        sys.path.insert(0, tempdir)
+
+        settings.configure(
+            DATABASES={
+                'default': {
+                    'ENGINE': 'django.db.backends.sqlite3',
+                    'NAME': os.path.join(tempdir, 'benchmark.db'),
+                },
+            },
+            DEFAULT_AUTO_FIELD='django.db.models.AutoField',
+            INSTALLED_APPS=[
+                'django.contrib.contenttypes',
+                'django_evolution',
+                *generate_project(spec, tempdir),
+            ],
+            USE_TZ=True)
+
+        from django_evolution.compat.patches import apply_patches
+        apply_patches()
+
+        django.setup()
+
+        from tests.benchmarks.suite import BenchmarkSuite
+
+        results = BenchmarkSuite(spec, repeat=options.repeat).run()
+    finally:
+        shutil.rmtree(tempdir)
+
+    if options.output:
+        with open(options.output, 'w', encoding='utf-8') as fp:
+            json.dump(results, fp, indent=2, sort_keys=True)
+    else:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()